@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark: game_accelerator collision kernels
+Compares the nested-list API against the flat SoA buffer API, the SIMD loop
+against the scalar loop, and one thread against all cores on bullet-enemy
+and player-hit batches of increasing size, and the ProjectileIndex range
+queries against a linear scan over the same projectiles.
+Run: python bench_accelerator.py
+"""
+
+import os
+import random
+import time
+from array import array
+
+import game_accelerator
+
+REPEATS = 50
+BATCH_SIZES = [(100, 20), (500, 50), (2000, 100), (4000, 400)]  # (bullets, enemies)
+
+
+def make_batch(num_bullets, num_enemies, rng):
+    bullets = [[rng.uniform(0, 900), rng.uniform(0, 700)] for _ in range(num_bullets)]
+    enemies = [[rng.uniform(0, 900), rng.uniform(0, 700)] for _ in range(num_enemies)]
+    return bullets, enemies
+
+
+def time_call(fn, *args):
+    """Average ms per call, including building the call arguments inside fn"""
+    fn(*args)  # warm-up
+    start_time = time.perf_counter()
+    for _ in range(REPEATS):
+        fn(*args)
+    return (time.perf_counter() - start_time) * 1000.0 / REPEATS
+
+
+def pairs_nested(bullets, enemies):
+    return game_accelerator.check_bullet_enemy_collisions(
+        [[b[0], b[1]] for b in bullets], [[e[0], e[1]] for e in enemies], 7, 22, 45, 35)
+
+
+def pairs_soa(bullets, enemies):
+    return game_accelerator.check_bullet_enemy_collisions_soa(
+        array("f", [b[0] for b in bullets]), array("f", [b[1] for b in bullets]),
+        array("f", [e[0] for e in enemies]), array("f", [e[1] for e in enemies]), 7, 22, 45, 35)
+
+
+def player_hits_nested(player, rects, counts):
+    offsets = [sum(counts[:c]) for c in range(4)]
+    groups = [[list(r) for r in rects[offsets[c]:offsets[c] + counts[c]]] for c in range(4)]
+    return game_accelerator.check_player_hits(player, *groups)
+
+
+def player_hits_soa(player, rects, counts):
+    return game_accelerator.check_player_hits_soa(
+        player, array("f", [r[0] for r in rects]), array("f", [r[1] for r in rects]),
+        array("f", [r[2] for r in rects]), array("f", [r[3] for r in rects]), counts)
+
+
+def main():
+    info = game_accelerator.accelerator_info()
+    all_cores = os.cpu_count() or 1
+    print("=" * 84)
+    print(f"Accelerator benchmark - {game_accelerator.BACKEND_LABEL} backend (GAME_ACCEL_BACKEND to pick another)")
+    print(f"SIMD: {info['simd']}, cores: {all_cores}, {REPEATS} calls per cell")
+    print("=" * 84)
+
+    rng = random.Random(1234)
+    print(f"{'bullets x enemies':>18} {'nested ms':>10} {'soa scalar':>11} {'soa simd':>9} {'soa simd+mt':>12} {'speedup':>8}")
+    for num_bullets, num_enemies in BATCH_SIZES:
+        bullets, enemies = make_batch(num_bullets, num_enemies, rng)
+        game_accelerator.set_parallelism(1)
+        game_accelerator.set_simd_enabled(True)
+        nested_ms = time_call(pairs_nested, bullets, enemies)
+        game_accelerator.set_simd_enabled(False)
+        scalar_ms = time_call(pairs_soa, bullets, enemies)
+        game_accelerator.set_simd_enabled(True)
+        simd_ms = time_call(pairs_soa, bullets, enemies)
+        game_accelerator.set_parallelism(all_cores)
+        threaded_ms = time_call(pairs_soa, bullets, enemies)
+        best_ms = min(simd_ms, threaded_ms)
+        print(f"{num_bullets:>9} x {num_enemies:<6} {nested_ms:>10.3f} {scalar_ms:>11.3f} {simd_ms:>9.3f} {threaded_ms:>12.3f} "
+              f"{nested_ms / best_ms if best_ms > 0 else float('inf'):>7.2f}x")
+
+    print("-" * 84)
+    print(f"{'player-hit rects':>18} {'nested ms':>10} {'soa scalar':>11} {'soa simd':>9} {'':>12} {'speedup':>8}")
+    game_accelerator.set_parallelism(1)
+    player = [420.0, 500.0, 55.0, 45.0]
+    for num_rects in (100, 1000, 4000, 16000):
+        rects = [(rng.uniform(0, 900), rng.uniform(0, 700), 7.0, 14.0) for _ in range(num_rects)]
+        counts = [num_rects // 50, num_rects // 2, num_rects - num_rects // 2 - num_rects // 50 - num_rects // 20, num_rects // 20]
+        game_accelerator.set_simd_enabled(True)
+        nested_ms = time_call(player_hits_nested, player, rects, counts)
+        game_accelerator.set_simd_enabled(False)
+        scalar_ms = time_call(player_hits_soa, player, rects, counts)
+        game_accelerator.set_simd_enabled(True)
+        simd_ms = time_call(player_hits_soa, player, rects, counts)
+        print(f"{num_rects:>18} {nested_ms:>10.3f} {scalar_ms:>11.3f} {simd_ms:>9.3f} {'':>12} "
+              f"{nested_ms / simd_ms if simd_ms > 0 else float('inf'):>7.2f}x")
+    game_accelerator.set_parallelism(all_cores)
+
+    print("-" * 84)
+    print(f"{'projectiles':>18} {'rebuild ms':>10} {'100 queries':>11} {'linear':>9} {'':>12} {'speedup':>8}")
+    index = game_accelerator.ProjectileIndex(900, 700)
+    for num_rects in (500, 2000, 8000, 32000):
+        cols = [array("f", [rng.uniform(0, 900) for _ in range(num_rects)]), array("f", [rng.uniform(0, 700) for _ in range(num_rects)]),
+                array("f", [7.0] * num_rects), array("f", [14.0] * num_rects)]
+        queries = [(rng.uniform(0, 900), rng.uniform(0, 700), 90.0, 70.0) for _ in range(100)]
+        rebuild_ms = time_call(index.rebuild, *cols)
+        query_ms = time_call(lambda: [index.query_rect(*q) for q in queries])
+        linear_ms = time_call(lambda: [game_accelerator.check_player_hits_soa(list(q), *cols, [0, num_rects, 0, 0]) for q in queries])
+        print(f"{num_rects:>18} {rebuild_ms:>10.3f} {query_ms:>11.3f} {linear_ms:>9.3f} {'':>12} "
+              f"{linear_ms / query_ms if query_ms > 0 else float('inf'):>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
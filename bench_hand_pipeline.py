@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Benchmark: hand-tracking pipeline on a recorded input source
+Feeds a video file or image directory through the same mirror + colour
+conversion + MediaPipe Hands + landmark conversion steps the game runs on its
+camera thread, as fast as possible (or paced in real time), and reports
+per-stage cost, throughput, the hand-detection rate and how often each
+gesture was recognized. Runs on headless Linux, no camera or window.
+Run: python bench_hand_pipeline.py hand_clip.mp4 [--pace realtime] [--max-frames 600]
+"""
+
+import argparse
+import collections
+import time
+
+import cv2
+import mediapipe as mp
+
+from input_source import open_input_source, PACE_REALTIME, PACE_FAST
+from stress_mode import percentile
+from hand_landmarks import HandLandmarks, GestureClassifier, INDEX_FINGER_TIP_ID, THUMB_TIP_ID
+
+PINCH_GESTURE_THRESHOLD = 0.040  # = airplane.py
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MediaPipe / OpenCV pipeline benchmark on a recorded source")
+    parser.add_argument("source", help="video file or image directory")
+    parser.add_argument("--pace", choices=(PACE_REALTIME, PACE_FAST), default=PACE_FAST)
+    parser.add_argument("--source-fps", type=float, default=None)
+    parser.add_argument("--max-frames", type=int, default=0, help="stop after this many frames (0 = whole source)")
+    parser.add_argument("--min-detection-confidence", type=float, default=0.7)
+    parser.add_argument("--min-tracking-confidence", type=float, default=0.7)
+    args = parser.parse_args()
+
+    source = open_input_source(args.source, args.pace, loop=args.max_frames > 0, fps=args.source_fps)
+    if not source.isOpened():
+        print(f"Could not open {args.source}")
+        return
+    hands_detector = mp.solutions.hands.Hands(max_num_hands=1, min_detection_confidence=args.min_detection_confidence,
+                                              min_tracking_confidence=args.min_tracking_confidence)
+
+    stage_ms = {"read": [], "preprocess": [], "inference": [], "landmarks": []}
+    frames_with_hand = 0
+    gesture_classifier = GestureClassifier()
+    gesture_frames = collections.Counter()
+    perf_counter = time.perf_counter
+    start_s = perf_counter()
+    while not args.max_frames or len(stage_ms["read"]) < args.max_frames:
+        read_start_s = perf_counter()
+        was_read, raw_frame = source.read()
+        if not was_read:
+            break
+        preprocess_start_s = perf_counter()
+        frame_rgb = cv2.cvtColor(cv2.flip(raw_frame, 1), cv2.COLOR_BGR2RGB)
+        inference_start_s = perf_counter()
+        hand_results = hands_detector.process(frame_rgb)
+        inference_end_s = perf_counter()
+        hand = HandLandmarks.from_results(hand_results, read_start_s)
+        gesture = None
+        if hand is None: gesture_classifier.reset()
+        else: gesture = gesture_classifier.update(hand, hand.distance(THUMB_TIP_ID, INDEX_FINGER_TIP_ID) < PINCH_GESTURE_THRESHOLD)
+        landmarks_end_s = perf_counter()
+        stage_ms["read"].append((preprocess_start_s - read_start_s) * 1000.0)
+        stage_ms["preprocess"].append((inference_start_s - preprocess_start_s) * 1000.0)
+        stage_ms["inference"].append((inference_end_s - inference_start_s) * 1000.0)
+        stage_ms["landmarks"].append((landmarks_end_s - inference_end_s) * 1000.0)
+        if hand is not None: frames_with_hand += 1
+        gesture_frames[gesture or "none"] += 1
+    elapsed_s = perf_counter() - start_s
+    source.release()
+    hands_detector.close()
+
+    num_frames = len(stage_ms["read"])
+    if num_frames == 0:
+        print("No frames read")
+        return
+    print("=" * 64)
+    print(f"Hand pipeline benchmark - {source.name}, pace: {args.pace}")
+    print("=" * 64)
+    print(f"{'stage':>12} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for stage, times_ms in stage_ms.items():
+        sorted_times = sorted(times_ms)
+        print(f"{stage:>12} {sum(times_ms) / num_frames:>9.2f} {percentile(sorted_times, 50):>8.2f} "
+              f"{percentile(sorted_times, 95):>8.2f} {sorted_times[-1]:>8.2f}")
+    print("-" * 64)
+    print(f"{num_frames} frames in {elapsed_s:.2f} s ({num_frames / elapsed_s:.1f} FPS), "
+          f"hand detected in {frames_with_hand / num_frames:.1%} of frames")
+    print("gestures: " + ", ".join(f"{gesture} {count / num_frames:.1%}" for gesture, count in gesture_frames.most_common()))
+
+
+if __name__ == "__main__":
+    main()
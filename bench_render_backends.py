@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Benchmark: surface rendering vs. the SDL2 Renderer/Texture backend
+Steps the same seeded stress world for both backends and times only
+render + present per frame, at the native 900x700 and at larger window
+sizes. Larger windows show the 900x700 game letterboxed: the surface path
+draws at --render-scale x 900x700 and pays one scaled blit per frame, the
+texture backend scales via its logical size.
+Run: python bench_render_backends.py [--headless] [--projectiles 0,500,2000] [--resolutions 900x700,1920x1080] [--render-scale 0.5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+HEADLESS = "--headless" in sys.argv[1:]
+if HEADLESS: os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+import pygame
+
+from game_session import GameSession, FrameInput, FixedStepClock, SCREEN_WIDTH, SCREEN_HEIGHT
+from stress_mode import StressConfig, StressRunner, percentile
+from render_scale import ScaledDisplay, parse_render_scale
+from texture_renderer import TextureCanvas, RENDER_BACKEND_SURFACE, RENDER_BACKEND_TEXTURE
+
+DEFAULT_RESOLUTIONS = [(900, 700), (1920, 1080), (2560, 1440)]
+DEFAULT_PROJECTILE_COUNTS = [0, 500, 2000]
+WARMUP_FRAMES = 60
+MEASURED_FRAMES = 300
+
+
+def open_target(backend, resolution, render_scale=1.0):
+    """(draw target, present function, close function) for one backend at one window size"""
+    logical_size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+    if backend == RENDER_BACKEND_TEXTURE:
+        canvas = TextureCanvas(resolution, "render benchmark", logical_size)
+        return canvas, canvas.present, canvas.close
+    display = ScaledDisplay(resolution, logical_size, render_scale)
+    return display.target, display.present, pygame.display.quit
+
+
+def run(backend, resolution, projectile_count, render_scale=1.0, seed=1234):
+    """Render/present p50 and p95 in ms over MEASURED_FRAMES of a seeded stress world"""
+    pygame.display.init()
+    runner = StressRunner(StressConfig(seed=seed, headless=True, projectile_tiers=[projectile_count]))
+    session = GameSession(runner.session_config(), FixedStepClock(90))
+    runner.prepare_session(session)
+    target, present, close = open_target(backend, resolution, render_scale)
+    frame_times_ms = []
+    for frame_idx in range(WARMUP_FRAMES + MEASURED_FRAMES):
+        pygame.event.pump()
+        session.clock.tick()
+        runner.before_step(session)
+        session.step(FrameInput(False, False, *runner.synthetic_input()))
+        runner.after_step(session)
+        runner.frame_index += 1
+        start_s = time.perf_counter()
+        session.render(target)
+        present()
+        if frame_idx >= WARMUP_FRAMES: frame_times_ms.append((time.perf_counter() - start_s) * 1000.0)
+    close()
+    pygame.display.quit()
+    frame_times_ms.sort()
+    return percentile(frame_times_ms, 50), percentile(frame_times_ms, 95), session.entity_count()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--headless", action="store_true", help="SDL dummy video driver (software renderer only)")
+    parser.add_argument("--projectiles", type=str, default=None, help="comma separated EnemyProjectile counts")
+    parser.add_argument("--resolutions", type=str, default=None, help="comma separated WIDTHxHEIGHT window sizes")
+    parser.add_argument("--render-scale", type=parse_render_scale, default=1.0, help="surface path internal scale or 'native'")
+    args = parser.parse_args()
+    projectile_counts = [int(c) for c in args.projectiles.split(",")] if args.projectiles else DEFAULT_PROJECTILE_COUNTS
+    resolutions = ([tuple(int(v) for v in r.split("x")) for r in args.resolutions.split(",")]
+                   if args.resolutions else DEFAULT_RESOLUTIONS)
+
+    pygame.init()
+    print("=" * 78)
+    print(f"Render backends - render + present per frame, {MEASURED_FRAMES} frames, surface render scale "
+          f"{'native' if args.render_scale is None else args.render_scale}"
+          f"{' (headless: SDL dummy driver)' if HEADLESS else ''}")
+    print("=" * 78)
+    print(f"{'window':>10} {'entities':>9} {'surface p50':>12} {'p95':>7} {'texture p50':>12} {'p95':>7} {'speedup':>8}")
+    for resolution in resolutions:
+        for projectile_count in projectile_counts:
+            surface_p50, surface_p95, entity_count = run(RENDER_BACKEND_SURFACE, resolution, projectile_count, args.render_scale)
+            texture_p50, texture_p95, _ = run(RENDER_BACKEND_TEXTURE, resolution, projectile_count)
+            print(f"{resolution[0]:>5}x{resolution[1]:<4} {entity_count:>9} {surface_p50:>12.2f} {surface_p95:>7.2f} "
+                  f"{texture_p50:>12.2f} {texture_p95:>7.2f} {surface_p50 / max(texture_p50, 1e-6):>7.2f}x")
+    print("-" * 78)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
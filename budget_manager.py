@@ -0,0 +1,123 @@
+"""
+Budget Manager - Graceful degradation when frame time or entity counts run over budget
+Watches the host's frame work time (smoothed) and the live entity count. While
+either stays over its threshold it steps one degradation level up, in a fixed
+order; once both are comfortably below again for a while it steps back down:
+
+    1  fewer particles per Explosion
+    2  cap on live explosions (new ones are skipped)
+    3  cull the enemy / boss projectiles farthest from the player down to a cap
+    4  fewer background stars
+
+The session only asks the attached manager (session.budget) for the current
+limits, so runs without one (benchmarks, sweeps, replays) stay deterministic.
+"""
+
+import heapq
+import math
+
+DEGRADATION_LEVEL_NAMES = ("full detail", "fewer particles", "explosion cap", "projectile cull", "fewer stars")
+LEVEL_FEWER_PARTICLES = 1
+LEVEL_EXPLOSION_CAP = 2
+LEVEL_PROJECTILE_CULL = 3
+LEVEL_FEWER_STARS = 4
+MAX_DEGRADATION_LEVEL = len(DEGRADATION_LEVEL_NAMES) - 1
+FRAME_BUDGET_MARGIN_MS = 2.0  # head room left in the refresh period for the present and the pacing spin
+
+
+def frame_budget_for_fps(target_fps, margin_ms=FRAME_BUDGET_MARGIN_MS):
+    """Work time a frame may take at target_fps: the refresh period minus margin_ms (9.1 ms at 90 FPS)"""
+    return max(1.0, 1000.0 / target_fps - margin_ms)
+
+
+class BudgetConfig:
+    """Thresholds and per-level limits; the defaults target 90 FPS on low-end kiosk hardware"""
+
+    def __init__(self, frame_budget_ms=9.0, entity_budget=1500, recover_ratio=0.7, frame_time_smoothing=0.1,
+                 escalate_after_frames=20, recover_after_frames=270, particle_scale=0.4, explosion_cap=16,
+                 projectile_cap=600, star_count=60):
+        self.frame_budget_ms = frame_budget_ms  # work time per frame, excluding the present and the frame-cap wait
+        self.entity_budget = entity_budget
+        # both measurements must stay below recover_ratio * threshold for recover_after_frames to step down
+        self.recover_ratio = recover_ratio
+        self.frame_time_smoothing = frame_time_smoothing  # EMA factor, so single spikes don't escalate
+        self.escalate_after_frames = escalate_after_frames
+        self.recover_after_frames = recover_after_frames
+        self.particle_scale = particle_scale
+        self.explosion_cap = explosion_cap
+        self.projectile_cap = projectile_cap
+        self.star_count = star_count
+
+
+class BudgetManager:
+    """Degradation level from frame time / entity count, plus the limits that level implies"""
+
+    def __init__(self, config=None):
+        self.config = config if config else BudgetConfig()
+        self.level = 0
+        self.frame_ms_avg = 0.0
+        self.projectiles_culled = 0
+        self._over_frames = 0
+        self._under_frames = 0
+
+    def update(self, frame_ms, entity_count):
+        """Feed one frame's work time (up to the present) and entity count, once per frame; returns the level"""
+        config = self.config
+        self.frame_ms_avg += config.frame_time_smoothing * (frame_ms - self.frame_ms_avg)
+        if self.frame_ms_avg > config.frame_budget_ms or entity_count > config.entity_budget:
+            self._under_frames = 0
+            self._over_frames += 1
+            if self._over_frames >= config.escalate_after_frames and self.level < MAX_DEGRADATION_LEVEL:
+                self.level += 1
+                self._over_frames = 0  # give the new level time to take effect before judging again
+        elif (self.frame_ms_avg < config.frame_budget_ms * config.recover_ratio and
+              entity_count < config.entity_budget * config.recover_ratio):
+            self._over_frames = 0
+            self._under_frames += 1
+            if self._under_frames >= config.recover_after_frames and self.level > 0:
+                self.level -= 1
+                self._under_frames = 0
+        else:
+            self._over_frames = self._under_frames = 0
+        return self.level
+
+    def reset(self):
+        self.level = 0
+        self.frame_ms_avg = 0.0
+        self._over_frames = self._under_frames = 0
+
+    def particle_count(self, num_particles):
+        if self.level < LEVEL_FEWER_PARTICLES:
+            return num_particles
+        return max(1, int(math.ceil(num_particles * self.config.particle_scale)))
+
+    @property
+    def explosion_cap(self):
+        return self.config.explosion_cap if self.level >= LEVEL_EXPLOSION_CAP else None
+
+    @property
+    def star_count(self):
+        return self.config.star_count if self.level >= LEVEL_FEWER_STARS else None
+
+    def cull_projectiles(self, session):
+        """Mark the enemy / boss projectiles farthest from the player until at most projectile_cap survive"""
+        if self.level < LEVEL_PROJECTILE_CULL:
+            return
+        enemy_bullets, boss_bullets = session.enemy_bullets_master_list, session.boss_bullets_master_list
+        enemy_marks, boss_marks = session.enemy_bullet_marks, session.boss_bullet_marks
+        excess = len(enemy_bullets) - len(enemy_marks) + len(boss_bullets) - len(boss_marks) - self.config.projectile_cap
+        if excess <= 0:
+            return
+        player_x, player_y = session.player_rect.center
+        candidates = []
+        for marks, bullets in ((enemy_marks, enemy_bullets), (boss_marks, boss_bullets)):
+            for idx, bullet in enumerate(bullets):
+                if marks.is_marked(idx): continue
+                bullet_x, bullet_y = bullet.rect.center
+                candidates.append(((bullet_x - player_x) ** 2 + (bullet_y - player_y) ** 2, idx, marks))
+        for _, idx, marks in heapq.nlargest(excess, candidates, key=lambda candidate: candidate[0]):
+            marks.mark(idx)
+        self.projectiles_culled += excess
+
+    def hud_text(self):
+        return f"Detail {self.level}/{MAX_DEGRADATION_LEVEL}: {DEGRADATION_LEVEL_NAMES[self.level]}"
@@ -3,36 +3,48 @@
 اسکریپت ساخت برای C++ acceleration module
 برای Windows: python build.py
 برای Linux/Mac: python build.py
+Builds every -march variant in place (cached: unchanged variants are not recompiled).
+  python build.py --pgo        profile-guided build (GCC), trained by pgo_training.py
+  python build.py --clean      drop the build cache first
+  python build.py --wheel      wheel for this machine into dist/
+  python build.py --manylinux  manylinux wheels into wheelhouse/ (cibuildwheel + Docker, config in pyproject.toml)
 """
 
+import argparse
 import os
 import sys
+import shutil
 import subprocess
 import platform
 
-def build_extension():
+def build_env(pgo):
+    env = dict(os.environ)
+    if pgo:
+        env["GAME_ACCEL_PGO"] = "1"
+    # reproducible wheels: timestamps come from the last commit instead of the clock
+    commit_time = subprocess.run(["git", "log", "-1", "--format=%ct"], capture_output=True, text=True)
+    if commit_time.returncode == 0 and commit_time.stdout.strip():
+        env.setdefault("SOURCE_DATE_EPOCH", commit_time.stdout.strip())
+    return env
+
+def build_extension(pgo=False):
     """کامپایل کردن C++ extension"""
     print("=" * 60)
     print("🔨 Building C++ Acceleration Module...")
     print("=" * 60)
-    
-    # پاک کردن build directory قدیمی
-    if os.path.exists("build"):
-        print("Cleaning old build directory...")
-        subprocess.run([sys.executable, "setup.py", "clean", "--all"], 
-                      capture_output=True)
-    
+
     # کامپایل
-    print("\nCompiling C++ code...")
+    print("\nCompiling C++ code" + (" with profile-guided optimization..." if pgo else "..."))
     result = subprocess.run([sys.executable, "setup.py", "build_ext", "--inplace"],
-                          capture_output=False)
-    
+                          capture_output=False, env=build_env(pgo))
+
     if result.returncode == 0:
         print("\n" + "=" * 60)
         print("✅ Build successful!")
         print("=" * 60)
-        print("\nThe game_accelerator module is now available.")
-        print("Run: python airplane.py")
+        # which variant this machine will load (a fresh process, so the new modules are picked up)
+        subprocess.run([sys.executable, "-c", "import game_accelerator; print('Loaded:', game_accelerator.backend_report())"])
+        print("\nRun: python airplane.py")
         return True
     else:
         print("\n" + "=" * 60)
@@ -47,13 +59,23 @@ def build_extension():
         print("  macOS: xcode-select --install")
         return True  # Return True because fallback is available
 
-def check_requirements():
+def build_wheels(manylinux=False, pgo=False):
+    """Wheels: this machine's into dist/, or manylinux ones (every variant, PGO) into wheelhouse/"""
+    if manylinux:
+        command = [sys.executable, "-m", "cibuildwheel", "--platform", "linux", "--output-dir", "wheelhouse"]
+    else:
+        command = [sys.executable, "-m", "pip", "wheel", "--no-deps", "--wheel-dir", "dist", "."]
+    print("Running: " + " ".join(command))
+    return subprocess.run(command, env=build_env(pgo)).returncode == 0
+
+def check_requirements(manylinux=False):
     """بررسی requirement‌ها"""
     print("Checking requirements...")
-    
-    required = ['pybind11', 'setuptools']
+
+    # pip / cibuildwheel install the build requirements themselves (pyproject.toml)
+    required = ['cibuildwheel'] if manylinux else ['pybind11', 'setuptools']
     missing = []
-    
+
     for package in required:
         try:
             __import__(package)
@@ -61,21 +83,41 @@ def check_requirements():
         except ImportError:
             print(f"  ✗ {package}")
             missing.append(package)
-    
+
     if missing:
-        print(f"\nInstalling missing packages: {', '.join(missing)}")
-        subprocess.run([sys.executable, "-m", "pip", "install"] + missing)
-    
-    return True  # Always return True because fallback works
+        # no installs at runtime: the build should not change the environment behind your back
+        print(f"\nMissing packages: {', '.join(missing)}")
+        print(f"Install them with: {sys.executable} -m pip install {' '.join(missing)}")
+        return False
+
+    return True
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AI Enhanced Finger Shooter")
+    parser.add_argument("--pgo", action="store_true", help="Profile-guided build (GCC), trained by pgo_training.py")
+    parser.add_argument("--clean", action="store_true", help="Remove the build cache before building")
+    parser.add_argument("--wheel", action="store_true", help="Build a wheel for this machine into dist/")
+    parser.add_argument("--manylinux", action="store_true", help="Build manylinux wheels into wheelhouse/ (needs Docker)")
+    args = parser.parse_args(argv)
 
-def main():
     print("\n🎮 Game Accelerator Build Script")
     print(f"Platform: {platform.system()}")
     print(f"Python: {sys.version}\n")
-    
-    check_requirements()
-    build_extension()
-    
+
+    if args.clean and os.path.exists("build"):
+        print("Cleaning build cache...")
+        shutil.rmtree("build")
+
+    if args.wheel or args.manylinux:
+        if args.manylinux and not check_requirements(manylinux=True):
+            return False
+        return build_wheels(args.manylinux, args.pgo)
+
+    if not check_requirements():
+        print("\nSkipping the C++ build.")
+    else:
+        build_extension(args.pgo)
+
     print("\n" + "=" * 60)
     print("✅ Ready to play!")
     print("=" * 60)
@@ -0,0 +1,131 @@
+"""
+Bullet Patterns - Declarative volleys with precomputed unit-vector tables
+A pattern is built once per (kind, volley size) and holds the unit vector of
+every bullet it can fire, so firing a volley is table lookups, one multiply per
+axis and a single list.extend into the projectile list - no cos / sin / hypot
+per bullet. Patterns are immutable after construction (fire() only reads the
+tables and draws from the rng it is given), so game_session caches them at
+module level and every session shares them. Spread volleys quantize their per-bullet angle jitter into the
+table; aimed fans index a table by the integer x distance to the target.
+
+Patterns: SpreadPattern (fan with jitter), AimedFanPattern (row of muzzles
+aimed at a target), RingPattern (full circle), SpiralPattern (rotating ring).
+Every fire() takes the emitter position; bullets spawn bullet_offset_x left of
+their muzzle (-3 centres the 7 px EnemyProjectile).
+"""
+
+import math
+from array import array
+
+JITTER_STEPS = 201  # 0.001 rad resolution for the boss's +-0.1 rad jitter
+
+
+def aimed_unit_vector(dx, dy):
+    """Direction of (dx, dy) for single aimed shots (one hypot; a zero vector gives (0, 0))"""
+    dist = math.hypot(dx, dy) or 1
+    return dx / dist, dy / dist
+
+
+def helper_unit_vector_table(angles):
+    """Interleaved (cos, sin) doubles for every angle"""
+    table = array("d")
+    for angle in angles:
+        table.append(math.cos(angle)); table.append(math.sin(angle))
+    return table
+
+
+class SpreadPattern:
+    """num_shots bullets fanned over arc_rad from start_rad (excluding both ends), each jittered by +-jitter_rad.
+    Muzzles sit origin_spacing apart, centred on the emitter; bullets that would not move down fly straight down."""
+
+    def __init__(self, num_shots, start_rad=-math.pi / 2, arc_rad=math.pi, jitter_rad=0.1, origin_spacing=20, bullet_offset_x=-3):
+        self.num_shots = num_shots
+        self.jitter_rad = jitter_rad
+        self.origin_spacing = origin_spacing
+        angle_spread = arc_rad / (num_shots + 1)
+        jitter_steps = JITTER_STEPS if jitter_rad > 0 else 1
+        self.jitter_steps = jitter_steps
+        jitter_values = [(-jitter_rad + 2 * jitter_rad * j / (jitter_steps - 1)) if jitter_steps > 1 else 0.0 for j in range(jitter_steps)]
+        # row per shot, column per jitter step
+        self.unit_vectors = helper_unit_vector_table((shot_idx + 1) * angle_spread + start_rad + jitter
+                                                     for shot_idx in range(num_shots) for jitter in jitter_values)
+        self.origin_offsets = [(shot_idx - num_shots // 2) * origin_spacing + bullet_offset_x for shot_idx in range(num_shots)]
+
+    def fire(self, projectile_list, projectile_cls, emitter_x, emitter_y, speed, rng):
+        """Append the volley in one extend; draws one rng.uniform per bullet like the per-bullet version did"""
+        unit_vectors, jitter_steps, jitter_rad = self.unit_vectors, self.jitter_steps, self.jitter_rad
+        jitter_scale = (jitter_steps - 1) / (2 * jitter_rad) if jitter_steps > 1 else 0.0
+        volley = []
+        for shot_idx, offset_x in enumerate(self.origin_offsets):
+            jitter_idx = int((rng.uniform(-jitter_rad, jitter_rad) + jitter_rad) * jitter_scale + 0.5) if jitter_steps > 1 else 0
+            table_idx = 2 * (shot_idx * jitter_steps + jitter_idx)
+            vel_y = unit_vectors[table_idx + 1] * speed
+            volley.append(projectile_cls(emitter_x + offset_x, emitter_y, unit_vectors[table_idx] * speed, vel_y if vel_y > 0 else speed))
+        projectile_list.extend(volley)
+
+
+class AimedFanPattern:
+    """Muzzles at offsets * origin_spacing, each aimed at a target aim_dy below it.
+    The unit vector depends only on the integer x distance, so it is one table per pattern."""
+
+    def __init__(self, muzzle_offsets, origin_spacing=30, aim_dy=700, max_abs_dx=2048, bullet_offset_x=-3):
+        self.muzzle_offsets = [offset * origin_spacing for offset in muzzle_offsets]
+        self.bullet_offset_x = bullet_offset_x
+        self.aim_dy = aim_dy
+        self.max_abs_dx = max_abs_dx
+        self.unit_x = array("d"); self.unit_y = array("d")
+        for dx in range(-max_abs_dx, max_abs_dx + 1):
+            unit_x, unit_y = aimed_unit_vector(dx, aim_dy)
+            self.unit_x.append(unit_x); self.unit_y.append(unit_y)
+
+    def fire(self, projectile_list, projectile_cls, emitter_x, emitter_y, target_x, speed):
+        unit_x, unit_y, max_abs_dx = self.unit_x, self.unit_y, self.max_abs_dx
+        bullet_offset_x = self.bullet_offset_x
+        volley = []
+        for offset_x in self.muzzle_offsets:
+            dx = target_x - (emitter_x + offset_x)
+            if -max_abs_dx <= dx <= max_abs_dx:
+                dir_x, dir_y = unit_x[dx + max_abs_dx], unit_y[dx + max_abs_dx]
+            else:
+                dir_x, dir_y = aimed_unit_vector(dx, self.aim_dy)
+            vel_y = dir_y * speed
+            volley.append(projectile_cls(emitter_x + offset_x + bullet_offset_x, emitter_y, dir_x * speed, vel_y if vel_y > 0 else speed))
+        projectile_list.extend(volley)
+
+
+class RingPattern:
+    """num_shots bullets evenly around the full circle, starting at start_rad"""
+
+    def __init__(self, num_shots, start_rad=0.0, bullet_offset_x=-3):
+        self.num_shots = num_shots
+        self.bullet_offset_x = bullet_offset_x
+        self.unit_vectors = helper_unit_vector_table(start_rad + 2 * math.pi * shot_idx / num_shots for shot_idx in range(num_shots))
+
+    def fire(self, projectile_list, projectile_cls, emitter_x, emitter_y, speed):
+        unit_vectors = self.unit_vectors
+        origin_x = emitter_x + self.bullet_offset_x
+        projectile_list.extend(projectile_cls(origin_x, emitter_y, unit_vectors[2 * shot_idx] * speed, unit_vectors[2 * shot_idx + 1] * speed)
+                               for shot_idx in range(self.num_shots))
+
+
+class SpiralPattern:
+    """A ring of num_arms bullets turned by step_rad every volley; the rotation repeats after steps_per_cycle volleys"""
+
+    def __init__(self, num_arms, step_rad=0.2, steps_per_cycle=None, bullet_offset_x=-3):
+        self.num_arms = num_arms
+        self.bullet_offset_x = bullet_offset_x
+        if steps_per_cycle is None:
+            # snap the step so the last volley of a cycle lines up with the first one of the next
+            steps_per_cycle = max(1, round(2 * math.pi / num_arms / step_rad))
+            step_rad = 2 * math.pi / num_arms / steps_per_cycle
+        self.steps_per_cycle = steps_per_cycle
+        self.unit_vectors = helper_unit_vector_table(step_idx * step_rad + 2 * math.pi * arm_idx / num_arms
+                                                     for step_idx in range(steps_per_cycle) for arm_idx in range(num_arms))
+
+    def fire(self, projectile_list, projectile_cls, emitter_x, emitter_y, speed, volley_index):
+        unit_vectors = self.unit_vectors
+        origin_x = emitter_x + self.bullet_offset_x
+        base_idx = 2 * (volley_index % self.steps_per_cycle) * self.num_arms
+        projectile_list.extend(projectile_cls(origin_x, emitter_y, unit_vectors[base_idx + 2 * arm_idx] * speed,
+                                              unit_vectors[base_idx + 2 * arm_idx + 1] * speed)
+                               for arm_idx in range(self.num_arms))
@@ -0,0 +1,53 @@
+"""
+Entity Compaction - In-place removal for per-frame entity lists
+Entities are only marked for removal while the frame runs; every container
+is compacted once at the end of the frame with a swap-remove pass, so no
+replacement lists are allocated and indices stay valid for the whole frame.
+"""
+
+
+class RemovalMarks:
+    """Indices of one container that should be dropped at the end of the frame"""
+
+    __slots__ = ("indices",)
+
+    def __init__(self):
+        self.indices = set()
+
+    def __len__(self):
+        return len(self.indices)
+
+    def mark(self, idx):
+        self.indices.add(idx)
+
+    def is_marked(self, idx):
+        return idx in self.indices
+
+    def mark_rejected(self, items, keep_fn):
+        """Call keep_fn on every item that is still alive and mark the ones it rejects"""
+        indices = self.indices
+        for idx, item in enumerate(items):
+            if idx not in indices and not keep_fn(item):
+                indices.add(idx)
+
+    def first_unmarked(self, candidate_indices):
+        """First index from candidate_indices that has not been removed yet (or None)"""
+        for idx in candidate_indices:
+            if idx not in self.indices:
+                return idx
+        return None
+
+    def compact(self, items):
+        """Swap-remove every marked index from items in place, then reset the marks"""
+        if self.indices:
+            swap_remove_indices(items, self.indices)
+            self.indices.clear()
+
+
+def swap_remove_indices(items, indices):
+    """Remove indices from items in O(len(indices)) by moving the tail into each hole.
+    The order of the surviving items is not preserved."""
+    for idx in sorted(indices, reverse=True):
+        last_item = items.pop()
+        if idx < len(items):
+            items[idx] = last_item
@@ -0,0 +1,199 @@
+"""
+Frame Scheduler - Frame pacing for live play, in place of clock.tick(90)
+clock.tick sleeps for whatever is left since the previous tick with ms
+granularity, so frames drift and jitter. The scheduler instead paces to
+absolute deadlines one refresh period apart (60 / 90 / 120 / 144 Hz):
+it measures each frame's work, sleeps until just before the deadline and
+spins the last stretch on perf_counter. With vsync the present already
+waits for the display, so it does not sleep at all.
+
+Spare time before the deadline runs deferred work: garbage collection
+through the attached GCPolicy (gc_policy.py: automatic GC off, collections
+in these idle windows) and whatever was handed to defer() (cache warm-up
+and the like, one step per slot).
+
+Frame interval / work time statistics (mean, standard deviation, p99,
+missed deadlines) feed the debug overlay, the metrics exporter and the
+report printed on exit.
+
+Run:
+    python airplane.py --target-fps 144
+    python airplane.py --renderer texture --vsync --target-fps 60
+"""
+
+import argparse
+import collections
+import math
+import time
+
+import pygame
+
+from gc_policy import GCPolicy
+
+
+class FrameSchedulerConfig:
+    """Target rate and timing margins; the defaults pace 90 FPS without vsync"""
+
+    def __init__(self, target_fps=90, vsync=False, spin_ms=1.0, idle_margin_ms=1.0, stats_window=600):
+        self.target_fps = target_fps
+        self.vsync = vsync  # the present blocks until the display refresh; the scheduler then only measures
+        self.spin_ms = spin_ms  # sleep() overshoots, so the last spin_ms before the deadline are busy-waited
+        self.idle_margin_ms = idle_margin_ms  # idle work stops this long before the deadline
+        self.stats_window = stats_window  # frames kept for the variance statistics
+
+
+class FrameScheduler:
+    """Clock for the live game loop (tick / get_ticks / get_fps, like PygameClock) with deadline pacing,
+    idle-time deferred work and GC, and frame-time variance statistics"""
+
+    def __init__(self, config=None, gc_policy=None):
+        self.config = config if config else FrameSchedulerConfig()
+        self.gc_policy = gc_policy if gc_policy else GCPolicy()
+        self.period_s = 1.0 / self.config.target_fps
+        self.intervals_ms = collections.deque(maxlen=self.config.stats_window)
+        self.work_ms = collections.deque(maxlen=self.config.stats_window)
+        self.frames_total = 0
+        self.deadlines_missed = 0
+        self.idle_ms_total = 0.0
+        self._deferred = collections.deque()
+        self._step_cost_ms = 0.5  # EMA of one deferred step
+        self._deadline_s = None
+        self._frame_start_s = None
+        self._work_end_s = None
+        self._work_ema_ms = 0.0
+
+    def start(self):
+        """Hand garbage collection to the GC policy (call once, right before the loop; stop() gives it back)"""
+        self.gc_policy.start()
+
+    def stop(self):
+        self.gc_policy.stop()
+
+    def defer(self, work):
+        """Run work in idle time: a callable runs once, an iterator is advanced one step per idle slot"""
+        self._deferred.append(work)
+
+    def end_work(self):
+        """Optional: mark the end of the frame's work just before a vsync'd present, so the wait is not counted as work"""
+        self._work_end_s = time.perf_counter()
+
+    def tick(self):
+        """Call at the top of every frame: runs idle work, waits for the frame deadline; returns ms since the previous tick"""
+        now_s = time.perf_counter()
+        if self._frame_start_s is None:
+            self._frame_start_s = now_s
+            self._deadline_s = now_s + self.period_s
+            return 0
+        work_end_s = self._work_end_s if self._work_end_s is not None else now_s
+        self._work_end_s = None
+        work_ms = (work_end_s - self._frame_start_s) * 1000.0
+        self.work_ms.append(work_ms)
+        self._work_ema_ms += 0.1 * (work_ms - self._work_ema_ms)
+
+        if self.config.vsync:
+            # the present returned at the refresh: what is left of this period after the next frame's work is idle
+            idle_end_s = now_s + (self.period_s * 1000.0 - self._work_ema_ms - self.config.idle_margin_ms) / 1000.0
+        else:
+            if now_s > self._deadline_s:
+                self.deadlines_missed += 1
+            idle_end_s = self._deadline_s - self.config.idle_margin_ms / 1000.0
+        self._run_idle(now_s, idle_end_s)
+        self.gc_policy.collect_if_overdue()
+        if not self.config.vsync: self._wait_until(self._deadline_s)
+
+        frame_start_s = time.perf_counter()
+        interval_ms = (frame_start_s - self._frame_start_s) * 1000.0
+        self.intervals_ms.append(interval_ms)
+        self.frames_total += 1
+        self._frame_start_s = frame_start_s
+        self._deadline_s += self.period_s
+        if self._deadline_s < frame_start_s:
+            self._deadline_s = frame_start_s + self.period_s  # fell behind: re-anchor instead of rushing to catch up
+        return interval_ms
+
+    def get_ticks(self):
+        return pygame.time.get_ticks()
+
+    def get_fps(self):
+        total_ms = sum(self.intervals_ms)
+        return len(self.intervals_ms) * 1000.0 / total_ms if total_ms > 0 else 0.0
+
+    def _run_idle(self, now_s, idle_end_s):
+        idle_start_s = now_s
+        now_s = self.gc_policy.collect_in_idle(now_s, idle_end_s)
+        deferred = self._deferred
+        while deferred and now_s + self._step_cost_ms / 1000.0 < idle_end_s:
+            work = deferred[0]
+            if callable(work):
+                deferred.popleft(); work()
+            elif next(work, StopIteration) is StopIteration:
+                deferred.popleft()
+            step_end_s = time.perf_counter()
+            self._step_cost_ms += 0.2 * ((step_end_s - now_s) * 1000.0 - self._step_cost_ms)
+            now_s = step_end_s
+        self.idle_ms_total += (now_s - idle_start_s) * 1000.0
+
+    def _wait_until(self, deadline_s):
+        sleep_s = deadline_s - time.perf_counter() - self.config.spin_ms / 1000.0
+        if sleep_s > 0: time.sleep(sleep_s)
+        while time.perf_counter() < deadline_s:
+            pass
+
+    def frame_stats(self):
+        """Frame interval and work time over the last stats_window frames, plus totals since start"""
+        intervals = sorted(self.intervals_ms)
+        work = sorted(self.work_ms)
+        interval_mean = sum(intervals) / len(intervals) if intervals else 0.0
+        variance = sum((value - interval_mean) ** 2 for value in intervals) / len(intervals) if intervals else 0.0
+        return {
+            "target_fps": self.config.target_fps,
+            "fps": self.get_fps(),
+            "interval_ms_mean": interval_mean,
+            "interval_ms_stdev": math.sqrt(variance),
+            "interval_ms_p99": intervals[min(len(intervals) - 1, int(len(intervals) * 0.99))] if intervals else 0.0,
+            "interval_ms_max": intervals[-1] if intervals else 0.0,
+            "work_ms_mean": sum(work) / len(work) if work else 0.0,
+            "work_ms_p95": work[min(len(work) - 1, int(len(work) * 0.95))] if work else 0.0,
+            "frames_total": self.frames_total,
+            "deadlines_missed": self.deadlines_missed,
+            "idle_ms_total": self.idle_ms_total,
+        }
+
+    def overlay_text(self):
+        stats = self.frame_stats()
+        return (f"Pace {stats['target_fps']} Hz: {stats['interval_ms_mean']:.2f}+-{stats['interval_ms_stdev']:.2f} ms "
+                f"(p99 {stats['interval_ms_p99']:.1f}) work {stats['work_ms_mean']:.1f} ms miss {stats['deadlines_missed']}")
+
+    def report(self):
+        stats = self.frame_stats()
+        print("=" * 78)
+        print(f"Frame pacing - target {stats['target_fps']} FPS{' (vsync)' if self.config.vsync else ''}, "
+              f"{stats['frames_total']} frames, last {len(self.intervals_ms)} in the statistics")
+        print(f"  interval  mean {stats['interval_ms_mean']:.2f} ms  stdev {stats['interval_ms_stdev']:.3f} ms  "
+              f"p99 {stats['interval_ms_p99']:.2f} ms  max {stats['interval_ms_max']:.2f} ms")
+        print(f"  work      mean {stats['work_ms_mean']:.2f} ms  p95 {stats['work_ms_p95']:.2f} ms  "
+              f"missed deadlines {stats['deadlines_missed']}")
+        print(f"  idle      {stats['idle_ms_total']:.0f} ms of deferred work and GC")
+        for line in self.gc_policy.report_lines(): print(line)
+        print("=" * 78)
+
+
+def parse_target_fps(text):
+    try:
+        target_fps = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a frame rate, got {text!r}")
+    if target_fps <= 0:
+        raise argparse.ArgumentTypeError("--target-fps must be positive")
+    return target_fps
+
+
+def add_scheduler_arguments(parser):
+    """--target-fps / --vsync, on the game's argument parser"""
+    group = parser.add_argument_group("frame pacing")
+    group.add_argument("--target-fps", type=parse_target_fps, default=90, help="frame rate to pace to, ideally the display refresh (60 / 90 / 120 / 144)")
+    group.add_argument("--vsync", action="store_true", help="let the present wait for the display refresh (texture renderer)")
+
+
+def scheduler_config_from_args(args):
+    return FrameSchedulerConfig(args.target_fps, args.vsync)
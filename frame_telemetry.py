@@ -0,0 +1,201 @@
+"""
+Frame Telemetry - Async camera ring buffer with motion-to-photon latency tracking
+A background thread captures camera frames and runs hand inference; every
+frame is stamped at capture, inference start/end, consume (game loop picks it
+up) and present (display flip). The worker also converts the hand result into
+a HandLandmarks array (hand_landmarks.py), so the game thread never walks the
+protobuf result. Latency percentiles and per-stage histograms go to the
+debug overlay (one text bar per stage) and to a log file.
+"""
+
+import collections
+import threading
+import time
+
+from hand_landmarks import HandLandmarks
+
+HISTOGRAM_BUCKET_MS = 5
+HISTOGRAM_MAX_MS = 250
+LATENCY_STAGES = ("queue", "inference", "handoff", "render", "total")
+OVERLAY_HISTOGRAM_BUCKETS = 20  # 0-100 ms in the overlay; slower frames fold into the last bucket
+OVERLAY_HISTOGRAM_LEVELS = " .:-=+*#%@"
+
+
+def histogram_bar(counts, num_buckets=OVERLAY_HISTOGRAM_BUCKETS, levels=OVERLAY_HISTOGRAM_LEVELS):
+    """One character per bucket, denser = more frames (relative to the fullest bucket); any count shows up"""
+    shown = list(counts[:num_buckets - 1]) + [sum(counts[num_buckets - 1:])]
+    peak = max(shown)
+    if not peak:
+        return " " * num_buckets
+    top = len(levels) - 1
+    return "".join(levels[max(1, round(top * count / peak)) if count else 0] for count in shown)
+
+
+class FrameRecord:
+    """One camera frame and its hand results (raw and as HandLandmarks), with a timestamp per pipeline stage"""
+
+    __slots__ = ("frame_id", "frame", "hand_results", "hand_landmarks",
+                 "capture_s", "inference_start_s", "inference_end_s", "consume_s", "present_s")
+
+    def __init__(self, frame_id, frame, capture_s):
+        self.frame_id = frame_id
+        self.frame = frame
+        self.hand_results = None
+        self.hand_landmarks = None  # first hand as a compact array, None when no hand was detected
+        self.capture_s = capture_s
+        self.inference_start_s = 0.0
+        self.inference_end_s = 0.0
+        self.consume_s = 0.0
+        self.present_s = 0.0
+
+
+class CameraFrameRing:
+    """Fixed-size ring of inferred frames; the consumer always takes the newest one"""
+
+    def __init__(self, capacity=4):
+        self._records = collections.deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.frames_superseded = 0  # inferred but never consumed (a newer frame was ready)
+        self.frames_stale = 0       # dropped because they exceeded the latency budget
+
+    def push(self, record):
+        with self._lock:
+            self._records.append(record)
+
+    def take_latest(self, max_age_ms=None):
+        """Newest unconsumed record (or None); older unconsumed records count as superseded"""
+        with self._lock:
+            if not self._records:
+                return None
+            record = self._records.pop()
+            self.frames_superseded += len(self._records)
+            self._records.clear()
+        now_s = time.perf_counter()
+        if max_age_ms is not None and (now_s - record.capture_s) * 1000.0 > max_age_ms:
+            self.frames_stale += 1
+            return None
+        record.consume_s = now_s
+        return record
+
+
+class AsyncCameraPipeline:
+    """Background capture + inference thread feeding a CameraFrameRing
+
+    process_fn(raw_frame) -> (display_frame, hand_results) runs on the worker
+    thread; it and the landmark conversion are stamped as the inference stage.
+    """
+
+    def __init__(self, video_capture, process_fn, ring_capacity=4, latency_budget_ms=None):
+        self.video_capture = video_capture
+        self.process_fn = process_fn
+        self.ring = CameraFrameRing(ring_capacity)
+        self.latency_budget_ms = latency_budget_ms
+        self.frames_failed = 0
+        self._next_frame_id = 0
+        self._stop_event = None
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        # each worker gets its own stop flag, so a stopped worker can never be revived by a later start()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._worker, args=(self._stop_event,), name="camera-pipeline", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the worker and wait until it has left read() / process_fn, so the caller may use the camera and detector"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def take_latest(self):
+        return self.ring.take_latest(self.latency_budget_ms)
+
+    @property
+    def frames_captured(self):
+        """Frames read and inferred so far (frame ids are handed out sequentially)"""
+        return self._next_frame_id
+
+    def _worker(self, stop_event):
+        while not stop_event.is_set():
+            was_read, raw_frame = self.video_capture.read()
+            capture_s = time.perf_counter()
+            if not was_read:
+                self.frames_failed += 1
+                time.sleep(0.005)
+                continue
+            record = FrameRecord(self._next_frame_id, None, capture_s)
+            self._next_frame_id += 1
+            record.inference_start_s = time.perf_counter()
+            record.frame, record.hand_results = self.process_fn(raw_frame)
+            record.hand_landmarks = HandLandmarks.from_results(record.hand_results, capture_s)
+            record.inference_end_s = time.perf_counter()
+            self.ring.push(record)
+
+
+class LatencyTelemetry:
+    """Per-stage latency windows, fixed-bucket histograms and a periodic log file"""
+
+    def __init__(self, log_path="latency_telemetry.log", window_size=300, log_interval_s=5.0):
+        self.log_path = log_path
+        self.log_interval_s = log_interval_s
+        self._windows = {stage: collections.deque(maxlen=window_size) for stage in LATENCY_STAGES}
+        self._histograms = {stage: [0] * (HISTOGRAM_MAX_MS // HISTOGRAM_BUCKET_MS + 1) for stage in LATENCY_STAGES}
+        self._last_log_s = time.perf_counter()
+        self.frames_presented = 0
+
+    def on_present(self, record):
+        """Stamp present time and fold the record's stage latencies into the stats"""
+        record.present_s = time.perf_counter()
+        stage_ms = (
+            (record.inference_start_s - record.capture_s) * 1000.0,
+            (record.inference_end_s - record.inference_start_s) * 1000.0,
+            (record.consume_s - record.inference_end_s) * 1000.0,
+            (record.present_s - record.consume_s) * 1000.0,
+            (record.present_s - record.capture_s) * 1000.0,
+        )
+        for stage, value_ms in zip(LATENCY_STAGES, stage_ms):
+            self._windows[stage].append(value_ms)
+            bucket = min(int(value_ms // HISTOGRAM_BUCKET_MS), len(self._histograms[stage]) - 1)
+            self._histograms[stage][max(0, bucket)] += 1
+        self.frames_presented += 1
+
+    def percentile(self, stage, pct):
+        values = sorted(self._windows[stage])
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(len(values) * pct / 100.0))]
+
+    def overlay_text(self):
+        return (f"Lat cap->present p50 {self.percentile('total', 50):.0f} p95 {self.percentile('total', 95):.0f} ms | "
+                f"infer {self.percentile('inference', 50):.0f} ms")
+
+    def overlay_histogram_lines(self):
+        """Per stage: p50 / p95 and the histogram since start as a text bar, 5 ms per character"""
+        overflow_ms = (OVERLAY_HISTOGRAM_BUCKETS - 1) * HISTOGRAM_BUCKET_MS
+        return [f"{stage:<9} p50 {self.percentile(stage, 50):>3.0f} p95 {self.percentile(stage, 95):>3.0f} "
+                f"|{histogram_bar(self._histograms[stage])}| 0-{overflow_ms}+ ms" for stage in LATENCY_STAGES]
+
+    def maybe_write_log(self, ring=None):
+        """Append a summary line with percentiles and histograms every log_interval_s"""
+        now_s = time.perf_counter()
+        if now_s - self._last_log_s < self.log_interval_s or self.frames_presented == 0:
+            return
+        self._last_log_s = now_s
+        parts = [time.strftime("%Y-%m-%d %H:%M:%S"), f"frames={self.frames_presented}"]
+        if ring is not None:
+            parts.append(f"superseded={ring.frames_superseded} stale={ring.frames_stale}")
+        for stage in LATENCY_STAGES:
+            parts.append(f"{stage}_p50={self.percentile(stage, 50):.1f} {stage}_p95={self.percentile(stage, 95):.1f} "
+                         f"{stage}_p99={self.percentile(stage, 99):.1f}")
+            hist = self._histograms[stage]
+            last_used = max((i for i, count in enumerate(hist) if count), default=0)
+            parts.append(f"{stage}_hist[{HISTOGRAM_BUCKET_MS}ms]=" + ",".join(str(c) for c in hist[:last_used + 1]))
+        try:
+            with open(self.log_path, "a") as log_file:
+                log_file.write(" ".join(parts) + "\n")
+        except OSError:
+            pass
@@ -3,6 +3,35 @@
 #include <cmath>
 #include <vector>
 #include <algorithm>
+#include <tuple>
+#include <thread>
+#include <optional>
+#include <stdexcept>
+#include <limits>
+
+#if defined(__AVX__)
+#include <immintrin.h>
+#define GA_SIMD_NAME "AVX"
+#define GA_SIMD_AVX 1
+#elif defined(__SSE2__) || defined(_M_X64) || (defined(_M_IX86_FP) && _M_IX86_FP >= 2)
+#include <emmintrin.h>
+#define GA_SIMD_NAME "SSE2"
+#define GA_SIMD_SSE2 1
+#else
+#define GA_SIMD_NAME "scalar"
+#endif
+
+// setup.py builds one module per -march variant (game_accelerator/_variants.py);
+// the package imports the fastest one this CPU runs
+#ifndef GA_MODULE_NAME
+#define GA_MODULE_NAME _native
+#endif
+#ifndef GA_VARIANT
+#define GA_VARIANT "baseline"
+#endif
+#ifndef GA_PGO
+#define GA_PGO 0
+#endif
 
 namespace py = pybind11;
 
@@ -13,9 +42,11 @@ struct Rect {
     Rect(float x = 0, float y = 0, float w = 0, float h = 0) 
         : x(x), y(y), width(w), height(h) {}
     
+    // Interiors overlap (game_accelerator/spec.py): touching edges and empty rects don't collide
     bool collides_with(const Rect& other) const {
-        return !(x + width < other.x || other.x + other.width < x ||
-                 y + height < other.y || other.y + other.height < y);
+        return width > 0 && height > 0 && other.width > 0 && other.height > 0 &&
+               x < other.x + other.width && other.x < x + width &&
+               y < other.y + other.height && other.y < y + height;
     }
     
     float distance_to(const Rect& other) const {
@@ -39,6 +70,174 @@ struct Vector3D {
     }
 };
 
+// Structure-of-arrays rect batch: one contiguous float array per field
+struct RectSoA {
+    std::vector<float> x, y, w, h;
+    
+    size_t size() const { return x.size(); }
+    
+    void reserve(size_t n) {
+        x.reserve(n); y.reserve(n); w.reserve(n); h.reserve(n);
+    }
+    
+    void push_back(float rx, float ry, float rw, float rh) {
+        x.push_back(rx); y.push_back(ry); w.push_back(rw); h.push_back(rh);
+    }
+};
+
+// Pack nested [x, y, ...] lists into SoA; w/h come from the row when fixed_w < 0
+static RectSoA to_soa(const std::vector<std::vector<float>>& rows, float fixed_w = -1, float fixed_h = -1) {
+    RectSoA soa;
+    soa.reserve(rows.size());
+    for (const auto& row : rows) {
+        soa.push_back(row[0], row[1], fixed_w < 0 ? row[2] : fixed_w, fixed_h < 0 ? row[3] : fixed_h);
+    }
+    return soa;
+}
+
+// Copy a 1-D float32/float64 buffer (array.array, numpy, memoryview) into an owned float vector
+static std::vector<float> to_owned_floats(const py::buffer& buffer) {
+    py::buffer_info info = buffer.request();
+    if (info.ndim != 1) {
+        throw std::invalid_argument("expected a 1-D float buffer");
+    }
+    std::vector<float> out(static_cast<size_t>(info.shape[0]));
+    const char* base = static_cast<const char*>(info.ptr);
+    if (info.format == py::format_descriptor<float>::format()) {
+        for (size_t i = 0; i < out.size(); ++i) out[i] = *reinterpret_cast<const float*>(base + i * info.strides[0]);
+    } else if (info.format == py::format_descriptor<double>::format()) {
+        for (size_t i = 0; i < out.size(); ++i) out[i] = static_cast<float>(*reinterpret_cast<const double*>(base + i * info.strides[0]));
+    } else {
+        throw std::invalid_argument("expected a float32 or float64 buffer");
+    }
+    return out;
+}
+
+// Batch kernels copy their inputs into owned C++ buffers while holding the GIL, then release it
+// for the actual work so camera / inference threads keep running. set_release_gil(false) turns this
+// off (for comparing against the old behaviour).
+static bool g_release_gil = true;
+
+struct ReleaseGil {
+    std::optional<py::gil_scoped_release> release;
+    
+    ReleaseGil() {
+        if (g_release_gil) release.emplace();
+    }
+};
+
+// Worker threads for batches above this many rect pairs; smaller batches stay on the calling thread
+static size_t g_parallel_min_pairs = 1 << 16;
+static size_t g_max_threads = std::max(1u, std::thread::hardware_concurrency());
+static bool g_simd_enabled = true;  // false forces the scalar loop (benchmarks / conformance checks)
+
+static size_t worker_count_for(size_t pair_count, size_t outer_count) {
+    if (pair_count < g_parallel_min_pairs || g_max_threads <= 1) return 1;
+    return std::min(g_max_threads, outer_count);
+}
+
+// Append base + i for every rect i in [0, n) that collides with `r`.
+// Same semantics as Rect::collides_with: touching edges and empty rects are not a hit.
+static void colliding_indices(
+    const Rect& r,
+    const float* xs, const float* ys, const float* ws, const float* hs, size_t n,
+    std::vector<int>& out, int base = 0) {
+    
+    if (!(r.width > 0 && r.height > 0)) return;
+    const float r_x2 = r.x + r.width;
+    const float r_y2 = r.y + r.height;
+    size_t i = 0;
+#if defined(GA_SIMD_AVX)
+    if (g_simd_enabled) {
+        const __m256 rx = _mm256_set1_ps(r.x), rx2 = _mm256_set1_ps(r_x2);
+        const __m256 ry = _mm256_set1_ps(r.y), ry2 = _mm256_set1_ps(r_y2);
+        const __m256 zero = _mm256_setzero_ps();
+        for (; i + 8 <= n; i += 8) {
+            const __m256 ox = _mm256_loadu_ps(xs + i);
+            const __m256 oy = _mm256_loadu_ps(ys + i);
+            const __m256 ow = _mm256_loadu_ps(ws + i);
+            const __m256 oh = _mm256_loadu_ps(hs + i);
+            const __m256 ox2 = _mm256_add_ps(ox, ow);
+            const __m256 oy2 = _mm256_add_ps(oy, oh);
+            const __m256 overlap = _mm256_and_ps(
+                _mm256_and_ps(_mm256_cmp_ps(ox, rx2, _CMP_LT_OQ), _mm256_cmp_ps(rx, ox2, _CMP_LT_OQ)),
+                _mm256_and_ps(_mm256_cmp_ps(oy, ry2, _CMP_LT_OQ), _mm256_cmp_ps(ry, oy2, _CMP_LT_OQ)));
+            const __m256 hit = _mm256_and_ps(overlap,
+                _mm256_and_ps(_mm256_cmp_ps(ow, zero, _CMP_GT_OQ), _mm256_cmp_ps(oh, zero, _CMP_GT_OQ)));
+            int bits = _mm256_movemask_ps(hit);
+            for (int k = 0; bits; ++k, bits >>= 1) {
+                if (bits & 1) out.push_back(base + static_cast<int>(i) + k);
+            }
+        }
+    }
+#elif defined(GA_SIMD_SSE2)
+    if (g_simd_enabled) {
+        const __m128 rx = _mm_set1_ps(r.x), rx2 = _mm_set1_ps(r_x2);
+        const __m128 ry = _mm_set1_ps(r.y), ry2 = _mm_set1_ps(r_y2);
+        const __m128 zero = _mm_setzero_ps();
+        for (; i + 4 <= n; i += 4) {
+            const __m128 ox = _mm_loadu_ps(xs + i);
+            const __m128 oy = _mm_loadu_ps(ys + i);
+            const __m128 ow = _mm_loadu_ps(ws + i);
+            const __m128 oh = _mm_loadu_ps(hs + i);
+            const __m128 ox2 = _mm_add_ps(ox, ow);
+            const __m128 oy2 = _mm_add_ps(oy, oh);
+            const __m128 overlap = _mm_and_ps(
+                _mm_and_ps(_mm_cmplt_ps(ox, rx2), _mm_cmplt_ps(rx, ox2)),
+                _mm_and_ps(_mm_cmplt_ps(oy, ry2), _mm_cmplt_ps(ry, oy2)));
+            const __m128 hit = _mm_and_ps(overlap, _mm_and_ps(_mm_cmpgt_ps(ow, zero), _mm_cmpgt_ps(oh, zero)));
+            int bits = _mm_movemask_ps(hit);
+            for (int k = 0; bits; ++k, bits >>= 1) {
+                if (bits & 1) out.push_back(base + static_cast<int>(i) + k);
+            }
+        }
+    }
+#endif
+    // scalar tail (and the whole batch when no SIMD is available)
+    for (; i < n; ++i) {
+        if (xs[i] < r_x2 && r.x < xs[i] + ws[i] && ys[i] < r_y2 && r.y < ys[i] + hs[i] && ws[i] > 0 && hs[i] > 0) {
+            out.push_back(base + static_cast<int>(i));
+        }
+    }
+}
+
+static void colliding_indices(const Rect& r, const RectSoA& rects, std::vector<int>& out, int base = 0) {
+    colliding_indices(r, rects.x.data(), rects.y.data(), rects.w.data(), rects.h.data(), rects.size(), out, base);
+}
+
+// Every colliding (bullet, enemy) pair, ordered by bullet then enemy.
+// Bullets are split into contiguous chunks across threads for large batches.
+static std::vector<std::pair<int, int>> bullet_enemy_pairs(const RectSoA& bullets, const RectSoA& enemies) {
+    auto run_range = [&](size_t begin, size_t end, std::vector<std::pair<int, int>>& out) {
+        std::vector<int> hits;
+        for (size_t b_idx = begin; b_idx < end; ++b_idx) {
+            hits.clear();
+            colliding_indices(Rect(bullets.x[b_idx], bullets.y[b_idx], bullets.w[b_idx], bullets.h[b_idx]), enemies, hits);
+            for (int e_idx : hits) out.emplace_back(static_cast<int>(b_idx), e_idx);
+        }
+    };
+    
+    std::vector<std::pair<int, int>> collisions;
+    const size_t workers = worker_count_for(bullets.size() * enemies.size(), bullets.size());
+    if (workers <= 1) {
+        run_range(0, bullets.size(), collisions);
+        return collisions;
+    }
+    
+    std::vector<std::vector<std::pair<int, int>>> parts(workers);
+    std::vector<std::thread> threads;
+    const size_t chunk = (bullets.size() + workers - 1) / workers;
+    for (size_t t = 0; t < workers; ++t) {
+        const size_t begin = t * chunk;
+        const size_t end = std::min(bullets.size(), begin + chunk);
+        if (begin >= end) break;
+        threads.emplace_back(run_range, begin, end, std::ref(parts[t]));
+    }
+    for (auto& thread : threads) thread.join();
+    for (const auto& part : parts) collisions.insert(collisions.end(), part.begin(), part.end());
+    return collisions;
+}
+
 // Fast collision detection function for bullets and enemies
 std::vector<std::pair<int, int>> check_bullet_enemy_collisions(
     const std::vector<std::vector<float>>& bullets,
@@ -46,21 +245,33 @@ std::vector<std::pair<int, int>> check_bullet_enemy_collisions(
     float bullet_w, float bullet_h,
     float enemy_w, float enemy_h) {
     
-    std::vector<std::pair<int, int>> collisions;
+    ReleaseGil release;
+    RectSoA bullet_soa = to_soa(bullets, bullet_w, bullet_h);
+    RectSoA enemy_soa = to_soa(enemies, enemy_w, enemy_h);
+    return bullet_enemy_pairs(bullet_soa, enemy_soa);
+}
+
+// Same as check_bullet_enemy_collisions, but positions arrive as flat x / y float buffers
+std::vector<std::pair<int, int>> check_bullet_enemy_collisions_soa(
+    const py::buffer& bullet_xs, const py::buffer& bullet_ys,
+    const py::buffer& enemy_xs, const py::buffer& enemy_ys,
+    float bullet_w, float bullet_h,
+    float enemy_w, float enemy_h) {
     
-    for (size_t b_idx = 0; b_idx < bullets.size(); ++b_idx) {
-        Rect bullet(bullets[b_idx][0], bullets[b_idx][1], bullet_w, bullet_h);
-        
-        for (size_t e_idx = 0; e_idx < enemies.size(); ++e_idx) {
-            Rect enemy(enemies[e_idx][0], enemies[e_idx][1], enemy_w, enemy_h);
-            
-            if (bullet.collides_with(enemy)) {
-                collisions.push_back({b_idx, e_idx});
-            }
-        }
+    RectSoA bullet_soa, enemy_soa;
+    bullet_soa.x = to_owned_floats(bullet_xs);
+    bullet_soa.y = to_owned_floats(bullet_ys);
+    enemy_soa.x = to_owned_floats(enemy_xs);
+    enemy_soa.y = to_owned_floats(enemy_ys);
+    if (bullet_soa.x.size() != bullet_soa.y.size() || enemy_soa.x.size() != enemy_soa.y.size()) {
+        throw std::invalid_argument("x and y buffers must have the same length");
     }
-    
-    return collisions;
+    bullet_soa.w.assign(bullet_soa.x.size(), bullet_w);
+    bullet_soa.h.assign(bullet_soa.x.size(), bullet_h);
+    enemy_soa.w.assign(enemy_soa.x.size(), enemy_w);
+    enemy_soa.h.assign(enemy_soa.x.size(), enemy_h);
+    ReleaseGil release;
+    return bullet_enemy_pairs(bullet_soa, enemy_soa);
 }
 
 // Collision detection function for player and enemies
@@ -70,17 +281,9 @@ std::vector<int> check_player_enemy_collisions(
     float player_w, float player_h,
     float enemy_w, float enemy_h) {
     
+    ReleaseGil release;
     std::vector<int> collisions;
-    Rect player_rect(player[0], player[1], player_w, player_h);
-    
-    for (size_t e_idx = 0; e_idx < enemies.size(); ++e_idx) {
-        Rect enemy(enemies[e_idx][0], enemies[e_idx][1], enemy_w, enemy_h);
-        
-        if (player_rect.collides_with(enemy)) {
-            collisions.push_back(e_idx);
-        }
-    }
-    
+    colliding_indices(Rect(player[0], player[1], player_w, player_h), to_soa(enemies, enemy_w, enemy_h), collisions);
     return collisions;
 }
 
@@ -123,24 +326,212 @@ std::vector<float> map_finger_position(
     return {screen_x, screen_y};
 }
 
-// Update enemy positions
-std::vector<std::vector<float>> update_enemy_positions(
-    const std::vector<std::vector<float>>& enemies,
-    const std::vector<float>& enemy_speeds,
-    int screen_width, int screen_height) {
+// ---- Movement integrator (semantics: game_accelerator/spec.py) ----
+// Entities move by their velocity, snap to whole pixels like pygame.Rect assignment (round half
+// away from zero), then are optionally clamped into / culled outside a (left, top, right, bottom) box.
+
+enum MotionFlags { MOTION_CLAMP = 1, MOTION_CULL = 2, MOTION_CULL_BEFORE = 4 };  // = spec.MOTION_*
+
+struct Bounds {
+    double left, top, right, bottom;
+};
+
+// None = unbounded; otherwise (left, top, right, bottom)
+static Bounds to_bounds(const py::object& bounds) {
+    const double inf = std::numeric_limits<double>::infinity();
+    if (bounds.is_none()) return {-inf, -inf, inf, inf};
+    auto values = bounds.cast<std::vector<double>>();
+    if (values.size() != 4) throw std::invalid_argument("bounds must be (left, top, right, bottom)");
+    return {values[0], values[1], values[2], values[3]};
+}
+
+// One value per entity from a 1-D float32/float64 buffer, or the same scalar for every entity
+class PerEntityValues {
+public:
+    PerEntityValues(const py::object& values, size_t n) {
+        if (py::isinstance<py::float_>(values) || py::isinstance<py::int_>(values)) {
+            scalar_ = values.cast<double>();
+            return;
+        }
+        if (!py::isinstance<py::buffer>(values)) throw std::invalid_argument("expected a float, an int or a 1-D float buffer");
+        info_ = py::reinterpret_borrow<py::buffer>(values).request();
+        if (info_.ndim != 1 || static_cast<size_t>(info_.shape[0]) != n) {
+            throw std::invalid_argument("per-entity buffers must be 1-D with one value per entity");
+        }
+        if (info_.format == py::format_descriptor<double>::format()) is_double_ = true;
+        else if (info_.format != py::format_descriptor<float>::format()) throw std::invalid_argument("expected a float32 or float64 buffer");
+        base_ = static_cast<const char*>(info_.ptr);
+    }
     
-    auto result = enemies;
+    double operator[](size_t i) const {
+        if (!base_) return scalar_;
+        const char* item = base_ + i * info_.strides[0];
+        return is_double_ ? *reinterpret_cast<const double*>(item) : *reinterpret_cast<const float*>(item);
+    }
     
-    for (size_t i = 0; i < result.size(); ++i) {
-        result[i][0] += result[i][4]; // speed_x
-        result[i][1] += enemy_speeds[i]; // speed_y
-        
-        // boundary checks
-        if (result[i][0] < 0) result[i][0] = 0;
-        if (result[i][0] > screen_width) result[i][0] = screen_width;
+private:
+    double scalar_ = 0;
+    py::buffer_info info_;
+    const char* base_ = nullptr;
+    bool is_double_ = false;
+};
+
+// Writable 1-D float32/float64 buffer, updated in place
+class WritableValues {
+public:
+    explicit WritableValues(const py::buffer& buffer) : info_(buffer.request(true)) {
+        if (info_.ndim != 1) throw std::invalid_argument("expected a 1-D float buffer");
+        if (info_.format == py::format_descriptor<double>::format()) is_double_ = true;
+        else if (info_.format != py::format_descriptor<float>::format()) throw std::invalid_argument("expected a float32 or float64 buffer");
     }
     
-    return result;
+    size_t size() const { return static_cast<size_t>(info_.shape[0]); }
+    
+    double get(size_t i) const {
+        const char* item = static_cast<const char*>(info_.ptr) + i * info_.strides[0];
+        return is_double_ ? *reinterpret_cast<const double*>(item) : *reinterpret_cast<const float*>(item);
+    }
+    
+    void set(size_t i, double value) {
+        char* item = static_cast<char*>(info_.ptr) + i * info_.strides[0];
+        if (is_double_) *reinterpret_cast<double*>(item) = value;
+        else *reinterpret_cast<float*>(item) = static_cast<float>(value);
+    }
+    
+private:
+    py::buffer_info info_;
+    bool is_double_ = false;
+};
+
+static bool inside_bounds(const Bounds& b, double x, double y, double w, double h) {
+    return x < b.right && x + w > b.left && y < b.bottom && y + h > b.top;
+}
+
+// pygame.Rect.clamp_ip on one axis: too-large rects are centred (integer division), others pushed inside
+static void clamp_axis(double& pos, double size, double low, double high) {
+    const double extent = high - low;
+    if (size >= extent) pos = low + std::trunc(extent / 2) - std::trunc(size / 2);
+    else if (pos < low) pos = low;
+    else if (pos + size > high) pos = high - size;
+}
+
+// Advance one entity; true when it is culled
+static bool step_motion(double& x, double& y, double w, double h, double vx, double vy,
+                        int flags, const Bounds& clamp_bounds, const Bounds& keep_bounds) {
+    if ((flags & MOTION_CULL_BEFORE) && !inside_bounds(keep_bounds, x, y, w, h)) return true;
+    x = std::round(x + vx);
+    y = std::round(y + vy);
+    if (flags & MOTION_CLAMP) {
+        clamp_axis(x, w, clamp_bounds.left, clamp_bounds.right);
+        clamp_axis(y, h, clamp_bounds.top, clamp_bounds.bottom);
+    }
+    return (flags & MOTION_CULL) && !inside_bounds(keep_bounds, x, y, w, h);
+}
+
+static Bounds checked_clamp_bounds(int flags, const py::object& clamp_bounds) {
+    if ((flags & MOTION_CLAMP) && clamp_bounds.is_none()) throw std::invalid_argument("MOTION_CLAMP needs clamp bounds");
+    return to_bounds(clamp_bounds);
+}
+
+// Move entities stored as x / y buffers in place; returns the culled indices (ascending)
+std::vector<int> integrate_positions(
+    const py::buffer& xs, const py::buffer& ys, const py::object& ws, const py::object& hs,
+    const py::object& vxs, const py::object& vys, int flags,
+    const py::object& clamp_bounds, const py::object& keep_bounds) {
+    
+    WritableValues x_values(xs), y_values(ys);
+    const size_t n = x_values.size();
+    if (y_values.size() != n) throw std::invalid_argument("xs and ys must have the same length");
+    PerEntityValues widths(ws, n), heights(hs, n), vel_x(vxs, n), vel_y(vys, n);
+    const Bounds clamp = checked_clamp_bounds(flags, clamp_bounds), keep = to_bounds(keep_bounds);
+    
+    std::vector<int> culled;
+    for (size_t i = 0; i < n; ++i) {
+        double x = x_values.get(i), y = y_values.get(i);
+        if (step_motion(x, y, widths[i], heights[i], vel_x[i], vel_y[i], flags, clamp, keep)) culled.push_back(static_cast<int>(i));
+        x_values.set(i, x);
+        y_values.set(i, y);
+    }
+    return culled;
+}
+
+// pygame.Rect objects are PyObject_HEAD followed by an SDL_Rect (four ints). The layout is checked once
+// against a probe Rect; if it does not match, rects are read and written through their x / y attributes.
+struct PygameRectLayout {
+    PyObject_HEAD
+    int x, y, w, h;
+};
+
+static PyTypeObject* g_rect_type = nullptr;
+static bool g_rect_layout_ok = false;
+
+static void init_rect_access() {
+    if (g_rect_type) return;
+    py::object rect_cls = py::module_::import("pygame").attr("Rect");
+    py::object probe = rect_cls(11, 22, 33, 44);
+    auto* raw = reinterpret_cast<PygameRectLayout*>(probe.ptr());
+    g_rect_type = reinterpret_cast<PyTypeObject*>(rect_cls.release().ptr());  // keep the type alive for good
+    g_rect_layout_ok = g_rect_type->tp_basicsize >= static_cast<Py_ssize_t>(sizeof(PygameRectLayout)) &&
+                       raw->x == 11 && raw->y == 22 && raw->w == 33 && raw->h == 44;
+}
+
+static int to_pixel(double value) {
+    if (!(value >= std::numeric_limits<int>::min() && value <= std::numeric_limits<int>::max())) {
+        throw std::overflow_error("rect position out of range");
+    }
+    return static_cast<int>(value);
+}
+
+// Move pygame.Rect objects in place (no Python code per rect); returns the culled indices (ascending)
+std::vector<int> integrate_rects(
+    const py::sequence& rects, const py::object& vxs, const py::object& vys, int flags,
+    const py::object& clamp_bounds, const py::object& keep_bounds) {
+    
+    init_rect_access();
+    py::object fast = py::reinterpret_steal<py::object>(PySequence_Fast(rects.ptr(), "rects must be a sequence"));
+    if (!fast) throw py::error_already_set();
+    const size_t n = static_cast<size_t>(PySequence_Fast_GET_SIZE(fast.ptr()));
+    PyObject** items = PySequence_Fast_ITEMS(fast.ptr());
+    PerEntityValues vel_x(vxs, n), vel_y(vys, n);
+    const Bounds clamp = checked_clamp_bounds(flags, clamp_bounds), keep = to_bounds(keep_bounds);
+    
+    std::vector<int> culled;
+    for (size_t i = 0; i < n; ++i) {
+        PyObject* item = items[i];
+        if (g_rect_layout_ok && PyObject_TypeCheck(item, g_rect_type)) {
+            auto* rect = reinterpret_cast<PygameRectLayout*>(item);
+            double x = rect->x, y = rect->y;
+            if (step_motion(x, y, rect->w, rect->h, vel_x[i], vel_y[i], flags, clamp, keep)) culled.push_back(static_cast<int>(i));
+            rect->x = to_pixel(x);
+            rect->y = to_pixel(y);
+        } else {
+            py::handle rect(item);
+            double x = rect.attr("x").cast<double>(), y = rect.attr("y").cast<double>();
+            const double w = rect.attr("width").cast<double>(), h = rect.attr("height").cast<double>();
+            if (step_motion(x, y, w, h, vel_x[i], vel_y[i], flags, clamp, keep)) culled.push_back(static_cast<int>(i));
+            rect.attr("x") = to_pixel(x);
+            rect.attr("y") = to_pixel(y);
+        }
+    }
+    return culled;
+}
+
+// Move [x, y, w, h, speed_x] enemy rows in place: x += speed_x (clamped to [0, screen_width]), y += enemy_speeds[i]
+py::list update_enemy_positions(
+    py::list enemies,
+    const std::vector<double>& enemy_speeds,
+    int screen_width, int screen_height) {
+    
+    if (enemy_speeds.size() != enemies.size()) {
+        throw std::invalid_argument("enemy_speeds must hold one speed per enemy");
+    }
+    for (size_t i = 0; i < enemies.size(); ++i) {
+        py::list enemy = enemies[i];
+        const double x = enemy[0].cast<double>() + enemy[4].cast<double>();
+        enemy[0] = std::min(std::max(x, 0.0), static_cast<double>(screen_width));
+        enemy[1] = enemy[1].cast<double>() + enemy_speeds[i];
+    }
+    return enemies;
 }
 
 // Function to calculate enemy firing direction
@@ -193,21 +584,277 @@ std::vector<bool> check_player_powerup_collisions(
     float player_w, float player_h,
     float powerup_w, float powerup_h) {
     
+    ReleaseGil release;
     std::vector<bool> collisions(powerups.size(), false);
-    Rect player_rect(player[0], player[1], player_w, player_h);
+    std::vector<int> hits;
+    colliding_indices(Rect(player[0], player[1], player_w, player_h), to_soa(powerups, powerup_w, powerup_h), hits);
+    for (int i : hits) collisions[i] = true;
+    
+    return collisions;
+}
+
+// Append the index of every rect in `rects` ([x, y, w, h]) that collides with the player
+static void collect_player_hits(
+    const Rect& player_rect,
+    const std::vector<std::vector<float>>& rects,
+    std::vector<int>& hits) {
+    
+    colliding_indices(player_rect, to_soa(rects), hits);
+}
+
+// Batched player-vs-everything query: one call per frame instead of one per object
+std::tuple<std::vector<int>, std::vector<int>, std::vector<int>, std::vector<int>> check_player_hits(
+    const std::vector<float>& player,
+    const std::vector<std::vector<float>>& powerups,
+    const std::vector<std::vector<float>>& enemy_bullets,
+    const std::vector<std::vector<float>>& boss_bullets,
+    const std::vector<std::vector<float>>& enemies) {
+    
+    ReleaseGil release;
+    Rect player_rect(player[0], player[1], player[2], player[3]);
+    std::vector<int> powerup_hits, enemy_bullet_hits, boss_bullet_hits, enemy_hits;
+    
+    collect_player_hits(player_rect, powerups, powerup_hits);
+    collect_player_hits(player_rect, enemy_bullets, enemy_bullet_hits);
+    collect_player_hits(player_rect, boss_bullets, boss_bullet_hits);
+    collect_player_hits(player_rect, enemies, enemy_hits);
+    
+    return {powerup_hits, enemy_bullet_hits, boss_bullet_hits, enemy_hits};
+}
+
+// check_player_hits over one SoA batch: all four categories are packed back to back into
+// xs/ys/ws/hs and `counts` gives the category sizes (powerups, enemy bullets, boss bullets, enemies)
+std::tuple<std::vector<int>, std::vector<int>, std::vector<int>, std::vector<int>> check_player_hits_soa(
+    const std::vector<float>& player,
+    const py::buffer& xs, const py::buffer& ys, const py::buffer& ws, const py::buffer& hs,
+    const std::vector<int>& counts) {
+    
+    RectSoA rects;
+    rects.x = to_owned_floats(xs);
+    rects.y = to_owned_floats(ys);
+    rects.w = to_owned_floats(ws);
+    rects.h = to_owned_floats(hs);
+    const size_t n = rects.size();
+    if (rects.y.size() != n || rects.w.size() != n || rects.h.size() != n) {
+        throw std::invalid_argument("xs, ys, ws and hs must have the same length");
+    }
+    if (counts.size() != 4 || static_cast<size_t>(counts[0] + counts[1] + counts[2] + counts[3]) != n) {
+        throw std::invalid_argument("counts must hold 4 category sizes that add up to the batch length");
+    }
     
-    for (size_t i = 0; i < powerups.size(); ++i) {
-        Rect pu(powerups[i][0], powerups[i][1], powerup_w, powerup_h);
+    ReleaseGil release;
+    Rect player_rect(player[0], player[1], player[2], player[3]);
+    std::vector<int> category_hits[4];
+    size_t offset = 0;
+    for (int c = 0; c < 4; ++c) {
+        colliding_indices(player_rect, rects.x.data() + offset, rects.y.data() + offset,
+                         rects.w.data() + offset, rects.h.data() + offset, counts[c], category_hits[c]);
+        offset += counts[c];
+    }
+    return {category_hits[0], category_hits[1], category_hits[2], category_hits[3]};
+}
+
+// Loose quadtree over projectile AABBs, stored as one grid per level and rebuilt from scratch each
+// frame (projectiles all move every frame, so a counting-sort rebuild beats refitting node links).
+// An item lives in the deepest level whose cell is at least as large as the item, in the cell that
+// holds its centre; the loose bounds of that cell (core grown by half a cell per side) then contain
+// the whole item, so a range query only visits the few cells per level near the query rect.
+// Items whose centre is outside the world go to level 0, which queries always scan.
+class ProjectileIndex {
+public:
+    ProjectileIndex(float world_w, float world_h, int max_depth)
+        : world_w_(world_w), world_h_(world_h), max_depth_(std::max(0, std::min(max_depth, 10))) {
+        if (world_w <= 0 || world_h <= 0) {
+            throw std::invalid_argument("world size must be positive");
+        }
+        level_offset_.resize(max_depth_ + 2);
+        int total_cells = 0;
+        for (int d = 0; d <= max_depth_; ++d) {
+            level_offset_[d] = total_cells;
+            total_cells += (1 << d) * (1 << d);
+        }
+        level_offset_[max_depth_ + 1] = total_cells;
+        cell_start_.assign(total_cells + 1, 0);
+        level_items_.assign(max_depth_ + 1, 0);
+    }
+    
+    // Replace the indexed set with rects i = 0..n-1 from the xs/ys/ws/hs buffers
+    void rebuild(const py::buffer& xs, const py::buffer& ys, const py::buffer& ws, const py::buffer& hs) {
+        RectSoA input;
+        input.x = to_owned_floats(xs);
+        input.y = to_owned_floats(ys);
+        input.w = to_owned_floats(ws);
+        input.h = to_owned_floats(hs);
+        const size_t n = input.size();
+        if (input.y.size() != n || input.w.size() != n || input.h.size() != n) {
+            throw std::invalid_argument("xs, ys, ws and hs must have the same length");
+        }
+        
+        ReleaseGil release;
+        std::vector<int> item_cell(n);
+        std::fill(cell_start_.begin(), cell_start_.end(), 0);
+        std::fill(level_items_.begin(), level_items_.end(), 0);
+        for (size_t i = 0; i < n; ++i) {
+            const int cell = cell_for(input.x[i], input.y[i], input.w[i], input.h[i]);
+            item_cell[i] = cell;
+            ++cell_start_[cell + 1];
+        }
+        for (size_t c = 1; c < cell_start_.size(); ++c) cell_start_[c] += cell_start_[c - 1];
+        for (int d = 0; d <= max_depth_; ++d) {
+            level_items_[d] = cell_start_[level_offset_[d + 1]] - cell_start_[level_offset_[d]];
+        }
         
-        if (player_rect.collides_with(pu)) {
-            collisions[i] = true;
+        // counting sort: items of one cell end up contiguous in the SoA arrays
+        std::vector<int> cursor(cell_start_.begin(), cell_start_.end() - 1);
+        items_.x.resize(n); items_.y.resize(n); items_.w.resize(n); items_.h.resize(n);
+        ids_.resize(n);
+        for (size_t i = 0; i < n; ++i) {
+            const int slot = cursor[item_cell[i]]++;
+            items_.x[slot] = input.x[i]; items_.y[slot] = input.y[i];
+            items_.w[slot] = input.w[i]; items_.h[slot] = input.h[i];
+            ids_[slot] = static_cast<int>(i);
         }
     }
     
-    return collisions;
+    // Indices (ascending) of the indexed rects colliding with (x, y, w, h), same semantics as check_player_hits
+    std::vector<int> query_rect(float x, float y, float w, float h) const {
+        ReleaseGil release;
+        std::vector<int> hits;
+        collect(Rect(x, y, w, h), hits);
+        std::sort(hits.begin(), hits.end());
+        return hits;
+    }
+    
+    // One query per rect in the buffers; (query index, item index) pairs sorted by query then item
+    std::vector<std::pair<int, int>> query_rects(
+        const py::buffer& xs, const py::buffer& ys, const py::buffer& ws, const py::buffer& hs) const {
+        
+        RectSoA queries;
+        queries.x = to_owned_floats(xs);
+        queries.y = to_owned_floats(ys);
+        queries.w = to_owned_floats(ws);
+        queries.h = to_owned_floats(hs);
+        const size_t n = queries.size();
+        if (queries.y.size() != n || queries.w.size() != n || queries.h.size() != n) {
+            throw std::invalid_argument("xs, ys, ws and hs must have the same length");
+        }
+        
+        ReleaseGil release;
+        std::vector<std::pair<int, int>> pairs;
+        std::vector<int> hits;
+        for (size_t q = 0; q < n; ++q) {
+            hits.clear();
+            collect(Rect(queries.x[q], queries.y[q], queries.w[q], queries.h[q]), hits);
+            std::sort(hits.begin(), hits.end());
+            for (int hit : hits) pairs.emplace_back(static_cast<int>(q), hit);
+        }
+        return pairs;
+    }
+    
+    size_t size() const { return ids_.size(); }
+    
+    // Items per level, for tuning max_depth
+    std::vector<int> level_counts() const { return level_items_; }
+    
+private:
+    int cell_for(float x, float y, float w, float h) const {
+        const float cx = x + w * 0.5f;
+        const float cy = y + h * 0.5f;
+        if (!(cx >= 0 && cx < world_w_ && cy >= 0 && cy < world_h_)) return 0;
+        int d = max_depth_;
+        while (d > 0 && (w > world_w_ / (1 << d) || h > world_h_ / (1 << d))) --d;
+        const int side = 1 << d;
+        const int col = std::min(side - 1, static_cast<int>(cx / (world_w_ / side)));
+        const int row = std::min(side - 1, static_cast<int>(cy / (world_h_ / side)));
+        return level_offset_[d] + row * side + col;
+    }
+    
+    void collect(const Rect& q, std::vector<int>& hits) const {
+        const float* xs = items_.x.data();
+        const float* ys = items_.y.data();
+        const float* ws = items_.w.data();
+        const float* hs = items_.h.data();
+        std::vector<int> local;
+        
+        // level 0: the root cell plus everything outside the world; no bounds to prune on
+        const int root_end = cell_start_[level_offset_[1]];
+        colliding_indices(q, xs, ys, ws, hs, root_end, local, 0);
+        
+        for (int d = 1; d <= max_depth_; ++d) {
+            if (level_items_[d] == 0) continue;
+            const int side = 1 << d;
+            const float cell_w = world_w_ / side, cell_h = world_h_ / side;
+            // cells whose loose bounds reach the query; the small pad absorbs float rounding at cell edges
+            const float pad_x = cell_w * 0.5f + cell_w * 1e-3f, pad_y = cell_h * 0.5f + cell_h * 1e-3f;
+            const int col0 = std::max(0, static_cast<int>(std::floor((q.x - pad_x) / cell_w)));
+            const int col1 = std::min(side - 1, static_cast<int>(std::floor((q.x + q.width + pad_x) / cell_w)));
+            const int row0 = std::max(0, static_cast<int>(std::floor((q.y - pad_y) / cell_h)));
+            const int row1 = std::min(side - 1, static_cast<int>(std::floor((q.y + q.height + pad_y) / cell_h)));
+            if (col0 > col1 || row0 > row1) continue;  // query lies beyond this side of the world
+            for (int row = row0; row <= row1; ++row) {
+                const int first_cell = level_offset_[d] + row * side;
+                // cells of one row are contiguous, so one span covers col0..col1
+                const int begin = cell_start_[first_cell + col0];
+                const int end = cell_start_[first_cell + col1 + 1];
+                if (begin < end) {
+                    colliding_indices(q, xs + begin, ys + begin, ws + begin, hs + begin, end - begin, local, begin);
+                }
+            }
+        }
+        for (int slot : local) hits.push_back(ids_[slot]);
+    }
+    
+    float world_w_, world_h_;
+    int max_depth_;
+    std::vector<int> level_offset_;  // first cell id of each level, plus the total at the end
+    std::vector<int> cell_start_;    // items of cell c live in slots [cell_start_[c], cell_start_[c + 1])
+    std::vector<int> level_items_;
+    RectSoA items_;                  // indexed rects in cell order
+    std::vector<int> ids_;           // slot -> caller's index
+};
+
+// Build / runtime info for benchmarks and the startup banner
+py::dict accelerator_info() {
+    py::dict info;
+    info["simd"] = g_simd_enabled ? GA_SIMD_NAME : "scalar";
+    info["max_threads"] = g_max_threads;
+    info["parallel_min_pairs"] = g_parallel_min_pairs;
+    info["release_gil"] = g_release_gil;
+    info["variant"] = GA_VARIANT;
+    info["pgo"] = GA_PGO != 0;
+    return info;
+}
+
+// What this CPU (and OS) supports, for picking a variant before importing it
+py::dict cpu_features() {
+    py::dict features;
+#if (defined(__GNUC__) || defined(__clang__)) && (defined(__x86_64__) || defined(__i386__))
+    __builtin_cpu_init();
+    features["sse4_2"] = __builtin_cpu_supports("sse4.2") != 0;
+    features["avx"] = __builtin_cpu_supports("avx") != 0;
+    features["avx2"] = __builtin_cpu_supports("avx2") != 0;
+    features["bmi"] = __builtin_cpu_supports("bmi") != 0;
+    features["bmi2"] = __builtin_cpu_supports("bmi2") != 0;
+    features["fma"] = __builtin_cpu_supports("fma") != 0;
+    features["avx512f"] = __builtin_cpu_supports("avx512f") != 0;
+#endif
+    return features;
 }
 
-PYBIND11_MODULE(game_accelerator, m) {
+void set_parallelism(size_t max_threads, size_t parallel_min_pairs) {
+    g_max_threads = std::max<size_t>(1, max_threads);
+    g_parallel_min_pairs = parallel_min_pairs;
+}
+
+void set_simd_enabled(bool enabled) {
+    g_simd_enabled = enabled;
+}
+
+void set_release_gil(bool enabled) {
+    g_release_gil = enabled;
+}
+
+PYBIND11_MODULE(GA_MODULE_NAME, m) {
     m.def("check_bullet_enemy_collisions", &check_bullet_enemy_collisions,
         "Fast bullet-enemy collision detection");
     
@@ -224,7 +871,18 @@ PYBIND11_MODULE(game_accelerator, m) {
         "Map normalized finger position to screen coordinates");
     
     m.def("update_enemy_positions", &update_enemy_positions,
-        "Update all enemy positions");
+        "Move [x, y, w, h, speed_x] enemy rows in place; returns the same list");
+    
+    m.def("integrate_positions", &integrate_positions,
+        py::arg("xs"), py::arg("ys"), py::arg("ws"), py::arg("hs"), py::arg("vxs"), py::arg("vys"),
+        py::arg("flags") = 0, py::arg("clamp_bounds") = py::none(), py::arg("keep_bounds") = py::none(),
+        "Move x / y float buffers in place by per-entity velocity; returns the culled indices");
+    
+    m.def("integrate_rects", &integrate_rects,
+        py::arg("rects"), py::arg("vxs"), py::arg("vys"),
+        py::arg("flags") = 0, py::arg("clamp_bounds") = py::none(), py::arg("keep_bounds") = py::none(),
+        "Move pygame.Rect objects in place by per-entity velocity; returns the culled indices");
+
     
     m.def("calculate_aim_direction", &calculate_aim_direction,
         "Calculate aim direction for enemy shots");
@@ -240,4 +898,44 @@ PYBIND11_MODULE(game_accelerator, m) {
     
     m.def("check_player_powerup_collisions", &check_player_powerup_collisions,
         "Check player-powerup collisions");
+    
+    m.def("check_player_hits", &check_player_hits,
+        "Player vs power-ups, enemy bullets, boss bullets and enemies in one call");
+    
+    m.def("check_bullet_enemy_collisions_soa", &check_bullet_enemy_collisions_soa,
+        "Bullet-enemy collision detection on flat x / y float buffers");
+    
+    m.def("check_player_hits_soa", &check_player_hits_soa,
+        "check_player_hits on one packed SoA batch with per-category counts");
+    
+    m.def("accelerator_info", &accelerator_info,
+        "SIMD path, build variant and threading settings");
+    
+    m.def("cpu_features", &cpu_features,
+        "CPU features the -march variants need (empty off x86)");
+    
+    m.def("set_parallelism", &set_parallelism,
+        py::arg("max_threads"), py::arg("parallel_min_pairs") = 1 << 16,
+        "Thread cap and the pair count above which batches are split across threads");
+    
+    m.def("set_simd_enabled", &set_simd_enabled,
+        "Switch between the SIMD and the scalar AABB loop");
+    
+    m.def("set_release_gil", &set_release_gil,
+        "Release the GIL inside batch kernels (default on)");
+    
+    // module_local: every -march variant registers its own type, so several variants can be loaded at once
+    py::class_<ProjectileIndex>(m, "ProjectileIndex", py::module_local(),
+        "Loose quadtree over projectile rects, rebuilt once per frame for range queries")
+        .def(py::init<float, float, int>(),
+            py::arg("world_w"), py::arg("world_h"), py::arg("max_depth") = 6)
+        .def("rebuild", &ProjectileIndex::rebuild,
+            "Replace the indexed rects with the xs / ys / ws / hs float buffers")
+        .def("query_rect", &ProjectileIndex::query_rect,
+            "Ascending indices of the indexed rects colliding with (x, y, w, h)")
+        .def("query_rects", &ProjectileIndex::query_rects,
+            "(query, item) index pairs for a batch of query rects")
+        .def("level_counts", &ProjectileIndex::level_counts,
+            "Number of indexed rects on each tree level")
+        .def("__len__", &ProjectileIndex::size);
 }
@@ -0,0 +1,137 @@
+"""
+Game Accelerator - One API over the C++, Python and NumPy-fallback backends
+`import game_accelerator` loads the first backend that imports, in the order
+native (C++ pybind11 module, built by build.py), python, fallback, and exposes
+its functions at package level. All backends follow the semantics in
+game_accelerator/spec.py and are checked against it by
+tests/test_game_accelerator.py, so switching backends never changes gameplay.
+The native backend comes in -march variants (_variants.py); the fastest one
+built here that this CPU supports is imported, and backend_report() says which.
+
+Run:
+    GAME_ACCEL_BACKEND=python python airplane.py     # force one backend
+    GAME_ACCEL_VARIANT=baseline python airplane.py   # force one native variant
+    python -m pytest tests/test_game_accelerator.py
+"""
+
+import importlib
+import importlib.util
+import os
+import types
+import warnings
+
+from ._variants import NATIVE_VARIANTS
+from .spec import API_FUNCTIONS, API_CLASSES, MOTION_CLAMP, MOTION_CULL, MOTION_CULL_BEFORE
+
+BACKEND_NAMES = ("native", "python", "fallback")
+BACKEND_LABELS = {"native": "C++", "python": "Python", "fallback": "Python fallback"}
+_BACKEND_MODULES = {"native": "._native", "python": "._python", "fallback": "._fallback"}
+NATIVE_VARIANT_NAMES = tuple(variant for variant, _, _, _ in NATIVE_VARIANTS)
+_VARIANT_MODULES = {variant: "." + module for variant, module, _, _ in NATIVE_VARIANTS}
+_VARIANT_REQUIREMENTS = {variant: required for variant, _, _, required in NATIVE_VARIANTS}
+
+
+def _cpu_features():
+    """cpu_features() of the baseline native module (always safe to import); None when it is not built"""
+    try:
+        return importlib.import_module(_BACKEND_MODULES["native"], __name__).cpu_features()
+    except (ImportError, AttributeError):
+        return None
+
+
+def native_variants():
+    """Native variants that are built here and that this CPU runs, slowest first"""
+    features = _cpu_features()
+    if features is None:
+        return []
+    return [variant for variant in NATIVE_VARIANT_NAMES
+            if all(features.get(feature) for feature in _VARIANT_REQUIREMENTS[variant])
+            and importlib.util.find_spec(_VARIANT_MODULES[variant], __name__) is not None]
+
+
+def _native_module(variant):
+    runnable = native_variants()
+    if variant is not None:
+        if variant not in _VARIANT_MODULES:
+            raise ValueError(f"unknown native variant: {variant} (expected one of {', '.join(NATIVE_VARIANT_NAMES)})")
+        if variant not in runnable:
+            raise ImportError(f"native variant {variant} is not built or not supported by this CPU")
+        return importlib.import_module(_VARIANT_MODULES[variant], __name__), variant
+    error = ImportError("native backend is not built (python build.py)")
+    for candidate in reversed(runnable):
+        try:
+            return importlib.import_module(_VARIANT_MODULES[candidate], __name__), candidate
+        except ImportError as exc:
+            error = exc
+    raise error
+
+
+def load_backend(name, variant=None):
+    """Namespace with the full API of one backend; ImportError when it is not built / importable or incomplete.
+    For native, variant picks the build (default: the fastest this CPU runs)"""
+    if name not in _BACKEND_MODULES:
+        raise ValueError(f"unknown accelerator backend: {name} (expected one of {', '.join(BACKEND_NAMES)})")
+    if name == "native":
+        module, variant = _native_module(variant)
+    elif variant is not None:
+        raise ValueError(f"accelerator backend {name} has no variants")
+    else:
+        module = importlib.import_module(_BACKEND_MODULES[name], __name__)
+    implementation = getattr(module, "game_accelerator", module)  # the fallback exposes one GameAccelerator instance
+    missing = [attr for attr in API_FUNCTIONS + API_CLASSES if not hasattr(implementation, attr)]
+    if missing:
+        raise ImportError(f"accelerator backend {name} lacks {', '.join(missing)}")
+    return types.SimpleNamespace(name=name, label=BACKEND_LABELS[name], variant=variant,
+                                 **{attr: getattr(implementation, attr) for attr in API_FUNCTIONS + API_CLASSES})
+
+
+def available_backends():
+    """Names of the backends that load here"""
+    names = []
+    for name in BACKEND_NAMES:
+        try:
+            load_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def _select_backend():
+    requested = os.environ.get("GAME_ACCEL_BACKEND") or None
+    variant = os.environ.get("GAME_ACCEL_VARIANT") or None
+    if requested or variant:
+        try:
+            return load_backend(requested or "native", variant)
+        except (ImportError, ValueError) as exc:
+            # a typo in the environment must not stop the game: say so and pick as if nothing was forced
+            forced = " ".join(f"{env_name}={value}" for env_name, value in (("GAME_ACCEL_BACKEND", requested), ("GAME_ACCEL_VARIANT", variant)) if value)
+            warnings.warn(f"{forced}: {exc}; using the default backend order", RuntimeWarning, stacklevel=2)
+    for name in BACKEND_NAMES:
+        try:
+            return load_backend(name)
+        except ImportError:
+            continue
+    raise ImportError("no accelerator backend could be loaded")
+
+
+def backend_report():
+    """One line on what was loaded: backend, native variant, PGO, SIMD path, and a faster variant left unbuilt"""
+    built = native_variants()
+    if BACKEND != "native":
+        return f"{BACKEND_LABEL} backend" + ("" if built else ", native accelerator not built (python build.py)")
+    info = _backend.accelerator_info()
+    report = f"{BACKEND_LABEL} backend, {BACKEND_VARIANT} variant ({'PGO, ' if info.get('pgo') else ''}{info['simd']} SIMD)"
+    features = _cpu_features() or {}
+    unbuilt = [variant for variant in NATIVE_VARIANT_NAMES[NATIVE_VARIANT_NAMES.index(BACKEND_VARIANT) + 1:]
+               if variant not in built and all(features.get(feature) for feature in _VARIANT_REQUIREMENTS[variant])]
+    if unbuilt:
+        report += f"; this CPU also runs {', '.join(unbuilt)}, which is not built here"
+    return report
+
+
+_backend = _select_backend()
+BACKEND = _backend.name
+BACKEND_LABEL = _backend.label
+BACKEND_VARIANT = _backend.variant  # native build variant, None for the Python backends
+globals().update({attr: getattr(_backend, attr) for attr in API_FUNCTIONS + API_CLASSES})
@@ -0,0 +1,382 @@
+"""
+Game Accelerator - Optimized Python Implementation using NumPy
+If C++ module is not available, these NumPy-powered functions are used (semantics: spec.py)
+"""
+
+import math
+import numpy as np
+import pygame
+
+from .spec import motion_step, inside_bounds, MOTION_CLAMP, MOTION_CULL, MOTION_CULL_BEFORE
+
+class ProjectileIndex:
+    """Uniform grid over projectile rects, rebuilt once per frame for range queries"""
+    
+    def __init__(self, world_w, world_h, max_depth=6):
+        if world_w <= 0 or world_h <= 0:
+            raise ValueError("world size must be positive")
+        self.world_w = world_w
+        self.world_h = world_h
+        self.cell_size = max(world_w, world_h) / (1 << min(max(max_depth, 0), 4))
+        self._cells = {}
+        self._rects = []
+    
+    def rebuild(self, xs, ys, ws, hs):
+        """Replace the indexed rects with the xs / ys / ws / hs buffers"""
+        if not len(xs) == len(ys) == len(ws) == len(hs):
+            raise ValueError("xs, ys, ws and hs must have the same length")
+        cell_size = self.cell_size
+        cells = {}
+        rects = list(zip(xs, ys, ws, hs))
+        for idx, (x, y, w, h) in enumerate(rects):
+            for col in range(math.floor(x / cell_size), math.floor((x + w) / cell_size) + 1):
+                for row in range(math.floor(y / cell_size), math.floor((y + h) / cell_size) + 1):
+                    cells.setdefault((col, row), []).append(idx)
+        self._cells = cells
+        self._rects = rects
+    
+    def query_rect(self, x, y, w, h):
+        """Ascending indices of the indexed rects overlapping (x, y, w, h)"""
+        cell_size = self.cell_size
+        cells = self._cells
+        rects = self._rects
+        right, bottom = x + w, y + h
+        hits = set()
+        if w <= 0 or h <= 0:
+            return []
+        for col in range(math.floor(x / cell_size), math.floor(right / cell_size) + 1):
+            for row in range(math.floor(y / cell_size), math.floor(bottom / cell_size) + 1):
+                for idx in cells.get((col, row), ()):
+                    r_x, r_y, r_w, r_h = rects[idx]
+                    if right > r_x and r_x + r_w > x and bottom > r_y and r_y + r_h > y and r_w > 0 and r_h > 0:
+                        hits.add(idx)
+        return sorted(hits)
+    
+    def query_rects(self, xs, ys, ws, hs):
+        """(query, item) index pairs for a batch of query rects"""
+        if not len(xs) == len(ys) == len(ws) == len(hs):
+            raise ValueError("xs, ys, ws and hs must have the same length")
+        return [(q_idx, hit) for q_idx in range(len(xs)) for hit in self.query_rect(xs[q_idx], ys[q_idx], ws[q_idx], hs[q_idx])]
+    
+    def level_counts(self):
+        """Number of indexed rects per level (a grid has one level)"""
+        return [len(self._rects)]
+    
+    def __len__(self):
+        return len(self._rects)
+
+
+class GameAccelerator:
+    """NumPy-optimized game acceleration functions"""
+    
+    ProjectileIndex = ProjectileIndex  # game_accelerator.ProjectileIndex(...) like the other backends
+    
+    def __init__(self):
+        self.use_numpy = True
+        try:
+            import numpy
+        except ImportError:
+            self.use_numpy = False
+            print("⚠️  NumPy not available, using pure Python math")
+    
+    @staticmethod
+    def calculate_landmark_distance(x1, y1, z1, x2, y2, z2):
+        """Calculate distance between two 3D points - optimized"""
+        dx = x1 - x2
+        dy = y1 - y2
+        dz = z1 - z2
+        return math.sqrt(dx*dx + dy*dy + dz*dz)
+    
+    @staticmethod
+    def is_pinch_detected(thumb_x, thumb_y, thumb_z, index_x, index_y, index_z, threshold):
+        """Check pinch gesture - optimized"""
+        dist = GameAccelerator.calculate_landmark_distance(
+            thumb_x, thumb_y, thumb_z,
+            index_x, index_y, index_z
+        )
+        return dist < threshold
+    
+    @staticmethod
+    def map_finger_position(norm_x, norm_y, in_x_min, in_x_max, in_y_min, in_y_max,
+                           out_x_min, out_x_max, out_y_min, out_y_max):
+        """Convert finger position - optimized"""
+        # Calculate scale
+        x_scale = (out_x_max - out_x_min) / (in_x_max - in_x_min)
+        y_scale = (out_y_max - out_y_min) / (in_y_max - in_y_min)
+        
+        screen_x = (norm_x - in_x_min) * x_scale + out_x_min
+        screen_y = (norm_y - in_y_min) * y_scale + out_y_min
+        return [screen_x, screen_y]
+    
+    @staticmethod
+    def rect_collision(x1, y1, w1, h1, x2, y2, w2, h2):
+        """Check collision between two rectangles - fastest method"""
+        # AABB (Axis-Aligned Bounding Box) collision; touching edges and empty rects don't collide
+        return (w1 > 0 and h1 > 0 and w2 > 0 and h2 > 0 and
+                x1 < x2 + w2 and x2 < x1 + w1 and y1 < y2 + h2 and y2 < y1 + h1)
+    
+    @staticmethod
+    def check_bullet_enemy_collisions(bullets, enemies, bullet_w, bullet_h,
+                                     enemy_w, enemy_h):
+        """Detect bullet-enemy collisions - optimized"""
+        collisions = []
+        if bullet_w <= 0 or bullet_h <= 0 or enemy_w <= 0 or enemy_h <= 0:
+            return collisions
+        
+        # Use inline loop without function calls for speed
+        for b_idx in range(len(bullets)):
+            bullet = bullets[b_idx]
+            b_x, b_y = bullet[0], bullet[1]
+            b_right = b_x + bullet_w
+            b_bottom = b_y + bullet_h
+            
+            for e_idx in range(len(enemies)):
+                enemy = enemies[e_idx]
+                e_x, e_y = enemy[0], enemy[1]
+                e_right = e_x + enemy_w
+                e_bottom = e_y + enemy_h
+                
+                # Fast collision test
+                if b_right > e_x and e_right > b_x and b_bottom > e_y and e_bottom > b_y:
+                    collisions.append((b_idx, e_idx))
+        
+        return collisions
+    
+    @staticmethod
+    def check_player_enemy_collisions(player, enemies, player_w, player_h,
+                                     enemy_w, enemy_h):
+        """Detect player-enemy collisions - optimized"""
+        collisions = []
+        if player_w <= 0 or player_h <= 0 or enemy_w <= 0 or enemy_h <= 0:
+            return collisions
+        
+        p_x, p_y = player[0], player[1]
+        p_right = p_x + player_w
+        p_bottom = p_y + player_h
+        
+        for e_idx in range(len(enemies)):
+            enemy = enemies[e_idx]
+            e_x, e_y = enemy[0], enemy[1]
+            e_right = e_x + enemy_w
+            e_bottom = e_y + enemy_h
+            
+            if p_right > e_x and e_right > p_x and p_bottom > e_y and e_bottom > p_y:
+                collisions.append(e_idx)
+        
+        return collisions
+    
+    @staticmethod
+    def player_bullet_collision(player_x, player_y, player_w, player_h,
+                               bullet_x, bullet_y, bullet_w, bullet_h):
+        """Detect player-bullet collision - optimized"""
+        return (player_w > 0 and player_h > 0 and bullet_w > 0 and bullet_h > 0 and
+                player_x + player_w > bullet_x and 
+                bullet_x + bullet_w > player_x and
+                player_y + player_h > bullet_y and 
+                bullet_y + bullet_h > player_y)
+    
+    @staticmethod
+    def bullet_boss_collision(bullet_x, bullet_y, bullet_w, bullet_h, boss_x, boss_y, boss_w, boss_h):
+        """Detect bullet-boss collision - optimized"""
+        return GameAccelerator.rect_collision(bullet_x, bullet_y, bullet_w, bullet_h, boss_x, boss_y, boss_w, boss_h)
+    
+    @staticmethod
+    def update_enemy_positions(enemies, enemy_speeds, screen_width, screen_height):
+        """Move [x, y, w, h, speed_x] enemy rows in place, x clamped to the screen; returns the same list"""
+        if len(enemy_speeds) != len(enemies):
+            raise ValueError("enemy_speeds must hold one speed per enemy")
+        for enemy, speed_y in zip(enemies, enemy_speeds):
+            enemy[0] = min(max(enemy[0] + enemy[4], 0), screen_width)
+            enemy[1] += speed_y
+        return enemies
+    
+    @staticmethod
+    def _per_entity(values, count):
+        if isinstance(values, (int, float)):
+            return [values] * count
+        if len(values) != count:
+            raise ValueError("per-entity buffers must hold one value per entity")
+        return values
+    
+    @staticmethod
+    def integrate_positions(xs, ys, ws, hs, vxs, vys, flags=0, clamp_bounds=None, keep_bounds=None):
+        """Move x / y float buffers in place by per-entity velocity; returns the culled indices"""
+        count = len(xs)
+        if len(ys) != count:
+            raise ValueError("xs and ys must have the same length")
+        if flags & MOTION_CLAMP and clamp_bounds is None:
+            raise ValueError("MOTION_CLAMP needs clamp bounds")
+        per_entity = GameAccelerator._per_entity
+        ws, hs, vxs, vys = per_entity(ws, count), per_entity(hs, count), per_entity(vxs, count), per_entity(vys, count)
+        culled = []
+        for i in range(count):
+            xs[i], ys[i], is_culled = motion_step(xs[i], ys[i], ws[i], hs[i], vxs[i], vys[i], flags, clamp_bounds, keep_bounds)
+            if is_culled:
+                culled.append(i)
+        return culled
+    
+    @staticmethod
+    def integrate_rects(rects, vxs, vys, flags=0, clamp_bounds=None, keep_bounds=None):
+        """Move pygame.Rect objects in place - float assignment and clamp_ip are pygame's own pixel rules"""
+        count = len(rects)
+        if flags & MOTION_CLAMP and clamp_bounds is None:
+            raise ValueError("MOTION_CLAMP needs clamp bounds")
+        vxs, vys = GameAccelerator._per_entity(vxs, count), GameAccelerator._per_entity(vys, count)
+        clamp_rect = (pygame.Rect(clamp_bounds[0], clamp_bounds[1], clamp_bounds[2] - clamp_bounds[0], clamp_bounds[3] - clamp_bounds[1])
+                      if flags & MOTION_CLAMP else None)
+        culled = []
+        for i, rect in enumerate(rects):
+            if flags & MOTION_CULL_BEFORE and not inside_bounds(keep_bounds, rect.x, rect.y, rect.width, rect.height):
+                culled.append(i)
+                continue
+            rect.x += vxs[i]
+            rect.y += vys[i]
+            if clamp_rect is not None:
+                rect.clamp_ip(clamp_rect)
+            if flags & MOTION_CULL and not inside_bounds(keep_bounds, rect.x, rect.y, rect.width, rect.height):
+                culled.append(i)
+        return culled
+    
+    @staticmethod
+    def point_distance(x1, y1, x2, y2):
+        """Calculate distance between two 2D points - optimized"""
+        dx = x1 - x2
+        dy = y1 - y2
+        return math.sqrt(dx*dx + dy*dy)
+    
+    @staticmethod
+    def calculate_aim_direction(enemy_x, enemy_y, player_x, player_y):
+        """Calculate firing direction - optimized"""
+        dx = player_x - enemy_x
+        dy = player_y - enemy_y
+        dist_sq = dx*dx + dy*dy
+        
+        if dist_sq == 0:
+            return [0, 0]
+        
+        dist = math.sqrt(dist_sq)
+        return [dx / dist, dy / dist]
+    
+    @staticmethod
+    def check_player_powerup_collisions(player, powerups, player_w, player_h,
+                                       powerup_w, powerup_h):
+        """Detect player-powerup collisions - optimized"""
+        collisions = [False] * len(powerups)
+        if player_w <= 0 or player_h <= 0 or powerup_w <= 0 or powerup_h <= 0:
+            return collisions
+        
+        p_x, p_y = player[0], player[1]
+        p_right = p_x + player_w
+        p_bottom = p_y + player_h
+        
+        for i in range(len(powerups)):
+            pu = powerups[i]
+            pu_x, pu_y = pu[0], pu[1]
+            pu_right = pu_x + powerup_w
+            pu_bottom = pu_y + powerup_h
+            
+            if p_right > pu_x and pu_right > p_x and p_bottom > pu_y and pu_bottom > p_y:
+                collisions[i] = True
+        
+        return collisions
+    
+    @staticmethod
+    def check_player_hits(player, powerups, enemy_bullets, boss_bullets, enemies):
+        """Player vs power-ups, enemy bullets, boss bullets and enemies - one call per frame"""
+        p_x, p_y = player[0], player[1]
+        p_right = p_x + player[2]
+        p_bottom = p_y + player[3]
+        
+        def _hits(rects):
+            hits = []
+            if player[2] <= 0 or player[3] <= 0:
+                return hits
+            for i in range(len(rects)):
+                r = rects[i]
+                if p_right > r[0] and r[0] + r[2] > p_x and p_bottom > r[1] and r[1] + r[3] > p_y and r[2] > 0 and r[3] > 0:
+                    hits.append(i)
+            return hits
+        
+        return _hits(powerups), _hits(enemy_bullets), _hits(boss_bullets), _hits(enemies)
+    
+    @staticmethod
+    def check_bullet_enemy_collisions_soa(bullet_xs, bullet_ys, enemy_xs, enemy_ys,
+                                         bullet_w, bullet_h, enemy_w, enemy_h):
+        """Detect bullet-enemy collisions on flat x / y arrays - optimized"""
+        collisions = []
+        if len(bullet_xs) != len(bullet_ys) or len(enemy_xs) != len(enemy_ys):
+            raise ValueError("x and y buffers must have the same length")
+        if bullet_w <= 0 or bullet_h <= 0 or enemy_w <= 0 or enemy_h <= 0:
+            return collisions
+        enemy_rects = [(e_x, e_y, e_x + enemy_w, e_y + enemy_h) for e_x, e_y in zip(enemy_xs, enemy_ys)]
+        
+        for b_idx, (b_x, b_y) in enumerate(zip(bullet_xs, bullet_ys)):
+            b_right = b_x + bullet_w
+            b_bottom = b_y + bullet_h
+            
+            for e_idx, (e_x, e_y, e_right, e_bottom) in enumerate(enemy_rects):
+                if b_right > e_x and e_right > b_x and b_bottom > e_y and e_bottom > b_y:
+                    collisions.append((b_idx, e_idx))
+        
+        return collisions
+    
+    @staticmethod
+    def check_player_hits_soa(player, xs, ys, ws, hs, counts):
+        """check_player_hits on one packed SoA batch; counts = sizes of the 4 categories"""
+        if not len(xs) == len(ys) == len(ws) == len(hs):
+            raise ValueError("xs, ys, ws and hs must have the same length")
+        if len(counts) != 4 or sum(counts) != len(xs):
+            raise ValueError("counts must hold 4 category sizes that add up to the batch length")
+        if player[2] <= 0 or player[3] <= 0:
+            return [], [], [], []
+        p_x, p_y = player[0], player[1]
+        p_right = p_x + player[2]
+        p_bottom = p_y + player[3]
+        
+        results = []
+        offset = 0
+        for count in counts:
+            hits = []
+            for i in range(count):
+                r_x, r_y = xs[offset + i], ys[offset + i]
+                r_w, r_h = ws[offset + i], hs[offset + i]
+                if p_right > r_x and r_x + r_w > p_x and p_bottom > r_y and r_y + r_h > p_y and r_w > 0 and r_h > 0:
+                    hits.append(i)
+            results.append(hits)
+            offset += count
+        
+        return results[0], results[1], results[2], results[3]
+    
+    @staticmethod
+    def accelerator_info():
+        """SIMD path and threading settings (Python fallback: neither)"""
+        return {"simd": "none", "max_threads": 1, "parallel_min_pairs": 0, "release_gil": False}
+    
+    @staticmethod
+    def set_parallelism(max_threads, parallel_min_pairs=1 << 16):
+        """No-op: the fallback is single threaded"""
+    
+    @staticmethod
+    def set_simd_enabled(enabled):
+        """No-op: the fallback has no SIMD path"""
+    
+    @staticmethod
+    def set_release_gil(enabled):
+        """No-op: pure Python code always holds the GIL"""
+    
+    @staticmethod
+    def bulk_point_distance(points1, points2):
+        """Calculate distance for multiple points - uses NumPy if available"""
+        try:
+            import numpy as np
+            p1 = np.array(points1)
+            p2 = np.array(points2)
+            diff = p1 - p2
+            return np.sqrt(np.sum(diff**2, axis=1)).tolist()
+        except (ImportError, Exception):
+            # Fallback to regular calculation
+            return [GameAccelerator.point_distance(p1[0], p1[1], p2[0], p2[1]) 
+                   for p1, p2 in zip(points1, points2)]
+
+# Global instance
+game_accelerator = GameAccelerator()
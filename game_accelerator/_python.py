@@ -0,0 +1,400 @@
+"""
+Game Accelerator - Pure Python Implementation
+Provides fast collision detection and game calculations (semantics: spec.py)
+"""
+
+import math
+from typing import List, Tuple, Dict, Sequence, Optional, Union
+
+from .spec import motion_step, MOTION_CLAMP
+
+# Collision detection functions
+
+def check_bullet_enemy_collisions(
+    bullets: List[List[float]],
+    enemies: List[List[float]],
+    bullet_w: float,
+    bullet_h: float,
+    enemy_w: float,
+    enemy_h: float
+) -> List[Tuple[int, int]]:
+    """Fast bullet-enemy collision detection"""
+    collisions = []
+    
+    for b_idx, bullet in enumerate(bullets):
+        bullet_x, bullet_y = bullet[0], bullet[1]
+        bullet_rect = (bullet_x, bullet_y, bullet_w, bullet_h)
+        
+        for e_idx, enemy in enumerate(enemies):
+            enemy_x, enemy_y = enemy[0], enemy[1]
+            enemy_rect = (enemy_x, enemy_y, enemy_w, enemy_h)
+            
+            if _rects_collide(bullet_rect, enemy_rect):
+                collisions.append((b_idx, e_idx))
+    
+    return collisions
+
+
+def check_player_enemy_collisions(
+    player: List[float],
+    enemies: List[List[float]],
+    player_w: float,
+    player_h: float,
+    enemy_w: float,
+    enemy_h: float
+) -> List[int]:
+    """Fast player-enemy collision detection"""
+    collisions = []
+    player_x, player_y = player[0], player[1]
+    player_rect = (player_x, player_y, player_w, player_h)
+    
+    for e_idx, enemy in enumerate(enemies):
+        enemy_x, enemy_y = enemy[0], enemy[1]
+        enemy_rect = (enemy_x, enemy_y, enemy_w, enemy_h)
+        
+        if _rects_collide(player_rect, enemy_rect):
+            collisions.append(e_idx)
+    
+    return collisions
+
+
+def calculate_landmark_distance(
+    x1: float, y1: float, z1: float,
+    x2: float, y2: float, z2: float
+) -> float:
+    """Calculate distance between two 3D points"""
+    dx = x1 - x2
+    dy = y1 - y2
+    dz = z1 - z2
+    return math.sqrt(dx*dx + dy*dy + dz*dz)
+
+
+def is_pinch_detected(
+    thumb_x: float, thumb_y: float, thumb_z: float,
+    index_x: float, index_y: float, index_z: float,
+    threshold: float
+) -> bool:
+    """Check if pinch gesture is detected"""
+    dist = calculate_landmark_distance(
+        thumb_x, thumb_y, thumb_z,
+        index_x, index_y, index_z
+    )
+    return dist < threshold
+
+
+def map_finger_position(
+    norm_x: float, norm_y: float,
+    in_x_min: float, in_x_max: float, in_y_min: float, in_y_max: float,
+    out_x_min: float, out_x_max: float, out_y_min: float, out_y_max: float
+) -> List[float]:
+    """Map normalized finger position to screen coordinates"""
+    screen_x = (norm_x - in_x_min) * (out_x_max - out_x_min) / (in_x_max - in_x_min) + out_x_min
+    screen_y = (norm_y - in_y_min) * (out_y_max - out_y_min) / (in_y_max - in_y_min) + out_y_min
+    return [screen_x, screen_y]
+
+
+def update_enemy_positions(
+    enemies: List[List[float]],
+    enemy_speeds: List[float],
+    screen_width: int,
+    screen_height: int
+) -> List[List[float]]:
+    """Move [x, y, w, h, speed_x] enemy rows in place; returns the same list"""
+    if len(enemy_speeds) != len(enemies):
+        raise ValueError("enemy_speeds must hold one speed per enemy")
+    
+    for i, enemy in enumerate(enemies):
+        enemy[0] += enemy[4]  # speed_x
+        enemy[1] += enemy_speeds[i]  # speed_y
+        
+        # Boundary check
+        if enemy[0] < 0:
+            enemy[0] = 0
+        if enemy[0] > screen_width:
+            enemy[0] = screen_width
+    
+    return enemies
+
+
+def _per_entity(values: Union[float, Sequence[float]], count: int) -> Sequence[float]:
+    """One value per entity from a number (broadcast) or a buffer of count values"""
+    if isinstance(values, (int, float)):
+        return [values] * count
+    if len(values) != count:
+        raise ValueError("per-entity buffers must hold one value per entity")
+    return values
+
+
+def _checked_clamp_bounds(flags: int, clamp_bounds: Optional[Sequence[float]]) -> Optional[Sequence[float]]:
+    if flags & MOTION_CLAMP and clamp_bounds is None:
+        raise ValueError("MOTION_CLAMP needs clamp bounds")
+    return clamp_bounds
+
+
+def integrate_positions(
+    xs: Sequence[float], ys: Sequence[float],
+    ws: Union[float, Sequence[float]], hs: Union[float, Sequence[float]],
+    vxs: Union[float, Sequence[float]], vys: Union[float, Sequence[float]],
+    flags: int = 0,
+    clamp_bounds: Optional[Sequence[float]] = None,
+    keep_bounds: Optional[Sequence[float]] = None
+) -> List[int]:
+    """Move x / y float buffers in place by per-entity velocity; returns the culled indices"""
+    count = len(xs)
+    if len(ys) != count:
+        raise ValueError("xs and ys must have the same length")
+    ws, hs, vxs, vys = (_per_entity(values, count) for values in (ws, hs, vxs, vys))
+    clamp_bounds = _checked_clamp_bounds(flags, clamp_bounds)
+    culled = []
+    
+    for i in range(count):
+        xs[i], ys[i], is_culled = motion_step(xs[i], ys[i], ws[i], hs[i], vxs[i], vys[i], flags, clamp_bounds, keep_bounds)
+        if is_culled:
+            culled.append(i)
+    
+    return culled
+
+
+def integrate_rects(
+    rects: Sequence,
+    vxs: Union[float, Sequence[float]], vys: Union[float, Sequence[float]],
+    flags: int = 0,
+    clamp_bounds: Optional[Sequence[float]] = None,
+    keep_bounds: Optional[Sequence[float]] = None
+) -> List[int]:
+    """Move pygame.Rect objects in place by per-entity velocity; returns the culled indices"""
+    count = len(rects)
+    vxs, vys = _per_entity(vxs, count), _per_entity(vys, count)
+    clamp_bounds = _checked_clamp_bounds(flags, clamp_bounds)
+    culled = []
+    
+    for i, rect in enumerate(rects):
+        new_x, new_y, is_culled = motion_step(rect.x, rect.y, rect.width, rect.height, vxs[i], vys[i], flags, clamp_bounds, keep_bounds)
+        rect.x, rect.y = int(new_x), int(new_y)
+        if is_culled:
+            culled.append(i)
+    
+    return culled
+
+
+def calculate_aim_direction(
+    enemy_x: float, enemy_y: float,
+    player_x: float, player_y: float
+) -> List[float]:
+    """Calculate aim direction for enemy shots"""
+    dx = player_x - enemy_x
+    dy = player_y - enemy_y
+    dist = math.sqrt(dx*dx + dy*dy)
+    
+    if dist == 0:
+        return [0, 0]
+    
+    return [dx / dist, dy / dist]
+
+
+def bullet_boss_collision(
+    bullet_x: float, bullet_y: float, bullet_w: float, bullet_h: float,
+    boss_x: float, boss_y: float, boss_w: float, boss_h: float
+) -> bool:
+    """Check bullet-boss collision"""
+    bullet_rect = (bullet_x, bullet_y, bullet_w, bullet_h)
+    boss_rect = (boss_x, boss_y, boss_w, boss_h)
+    return _rects_collide(bullet_rect, boss_rect)
+
+
+def player_bullet_collision(
+    player_x: float, player_y: float, player_w: float, player_h: float,
+    bullet_x: float, bullet_y: float, bullet_w: float, bullet_h: float
+) -> bool:
+    """Check player-bullet collision"""
+    player_rect = (player_x, player_y, player_w, player_h)
+    bullet_rect = (bullet_x, bullet_y, bullet_w, bullet_h)
+    return _rects_collide(player_rect, bullet_rect)
+
+
+def point_distance(x1: float, y1: float, x2: float, y2: float) -> float:
+    """Calculate distance between two 2D points"""
+    dx = x1 - x2
+    dy = y1 - y2
+    return math.sqrt(dx*dx + dy*dy)
+
+
+def check_player_powerup_collisions(
+    player: List[float],
+    powerups: List[List[float]],
+    player_w: float,
+    player_h: float,
+    powerup_w: float,
+    powerup_h: float
+) -> List[bool]:
+    """Check player-powerup collisions"""
+    collisions = [False] * len(powerups)
+    player_x, player_y = player[0], player[1]
+    player_rect = (player_x, player_y, player_w, player_h)
+    
+    for i, powerup in enumerate(powerups):
+        powerup_x, powerup_y = powerup[0], powerup[1]
+        powerup_rect = (powerup_x, powerup_y, powerup_w, powerup_h)
+        
+        if _rects_collide(player_rect, powerup_rect):
+            collisions[i] = True
+    
+    return collisions
+
+
+def check_player_hits(
+    player: List[float],
+    powerups: List[List[float]],
+    enemy_bullets: List[List[float]],
+    boss_bullets: List[List[float]],
+    enemies: List[List[float]]
+) -> Tuple[List[int], List[int], List[int], List[int]]:
+    """Player vs power-ups, enemy bullets, boss bullets and enemies in one call
+
+    Every rect is [x, y, w, h]. Returns the hit indices for each category,
+    in the same order as the arguments.
+    """
+    player_rect = (player[0], player[1], player[2], player[3])
+    
+    def _hits(rects):
+        return [i for i, r in enumerate(rects)
+                if _rects_collide(player_rect, (r[0], r[1], r[2], r[3]))]
+    
+    return _hits(powerups), _hits(enemy_bullets), _hits(boss_bullets), _hits(enemies)
+
+
+def check_bullet_enemy_collisions_soa(
+    bullet_xs: Sequence[float], bullet_ys: Sequence[float],
+    enemy_xs: Sequence[float], enemy_ys: Sequence[float],
+    bullet_w: float, bullet_h: float,
+    enemy_w: float, enemy_h: float
+) -> List[Tuple[int, int]]:
+    """Bullet-enemy collision detection on flat x / y arrays"""
+    if len(bullet_xs) != len(bullet_ys) or len(enemy_xs) != len(enemy_ys):
+        raise ValueError("x and y buffers must have the same length")
+    collisions = []
+    enemy_positions = list(zip(enemy_xs, enemy_ys))
+    
+    for b_idx, (bullet_x, bullet_y) in enumerate(zip(bullet_xs, bullet_ys)):
+        bullet_rect = (bullet_x, bullet_y, bullet_w, bullet_h)
+        
+        for e_idx, (enemy_x, enemy_y) in enumerate(enemy_positions):
+            if _rects_collide(bullet_rect, (enemy_x, enemy_y, enemy_w, enemy_h)):
+                collisions.append((b_idx, e_idx))
+    
+    return collisions
+
+
+def check_player_hits_soa(
+    player: List[float],
+    xs: Sequence[float], ys: Sequence[float], ws: Sequence[float], hs: Sequence[float],
+    counts: Sequence[int]
+) -> Tuple[List[int], List[int], List[int], List[int]]:
+    """check_player_hits on one packed SoA batch
+
+    The four categories are stored back to back in xs/ys/ws/hs; counts holds
+    their sizes (powerups, enemy bullets, boss bullets, enemies).
+    """
+    if not len(xs) == len(ys) == len(ws) == len(hs):
+        raise ValueError("xs, ys, ws and hs must have the same length")
+    if len(counts) != 4 or sum(counts) != len(xs):
+        raise ValueError("counts must hold 4 category sizes that add up to the batch length")
+    player_rect = (player[0], player[1], player[2], player[3])
+    results = []
+    offset = 0
+    
+    for count in counts:
+        results.append([i for i in range(count)
+                         if _rects_collide(player_rect, (xs[offset + i], ys[offset + i], ws[offset + i], hs[offset + i]))])
+        offset += count
+    
+    return results[0], results[1], results[2], results[3]
+
+
+def accelerator_info() -> Dict[str, object]:
+    """SIMD path and threading settings (pure Python: neither)"""
+    return {"simd": "none", "max_threads": 1, "parallel_min_pairs": 0, "release_gil": False}
+
+
+def set_parallelism(max_threads: int, parallel_min_pairs: int = 1 << 16) -> None:
+    """No-op: the pure Python backend is single threaded"""
+
+
+def set_simd_enabled(enabled: bool) -> None:
+    """No-op: the pure Python backend has no SIMD path"""
+
+
+def set_release_gil(enabled: bool) -> None:
+    """No-op: pure Python code always holds the GIL"""
+
+
+class ProjectileIndex:
+    """Uniform grid over projectile rects, rebuilt once per frame for range queries
+
+    Same interface as the C++ loose quadtree: rebuild() from x / y / w / h
+    buffers, then query_rect() / query_rects() return indices into them.
+    """
+    
+    def __init__(self, world_w: float, world_h: float, max_depth: int = 6):
+        if world_w <= 0 or world_h <= 0:
+            raise ValueError("world size must be positive")
+        self.world_w = world_w
+        self.world_h = world_h
+        # max_depth picks the cell size the way the quadtree picks its finest level (capped for Python)
+        self.cell_size = max(world_w, world_h) / (1 << min(max(max_depth, 0), 4))
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        self._rects: List[Tuple[float, float, float, float]] = []
+    
+    def rebuild(self, xs: Sequence[float], ys: Sequence[float], ws: Sequence[float], hs: Sequence[float]) -> None:
+        """Replace the indexed rects with the xs / ys / ws / hs buffers"""
+        if not len(xs) == len(ys) == len(ws) == len(hs):
+            raise ValueError("xs, ys, ws and hs must have the same length")
+        cell_size = self.cell_size
+        cells: Dict[Tuple[int, int], List[int]] = {}
+        rects = list(zip(xs, ys, ws, hs))
+        for idx, (x, y, w, h) in enumerate(rects):
+            for col in range(int(math.floor(x / cell_size)), int(math.floor((x + w) / cell_size)) + 1):
+                for row in range(int(math.floor(y / cell_size)), int(math.floor((y + h) / cell_size)) + 1):
+                    cells.setdefault((col, row), []).append(idx)
+        self._cells = cells
+        self._rects = rects
+    
+    def query_rect(self, x: float, y: float, w: float, h: float) -> List[int]:
+        """Ascending indices of the indexed rects colliding with (x, y, w, h)"""
+        cell_size = self.cell_size
+        cells = self._cells
+        rects = self._rects
+        query = (x, y, w, h)
+        hits = set()
+        for col in range(int(math.floor(x / cell_size)), int(math.floor((x + w) / cell_size)) + 1):
+            for row in range(int(math.floor(y / cell_size)), int(math.floor((y + h) / cell_size)) + 1):
+                for idx in cells.get((col, row), ()):
+                    if idx not in hits and _rects_collide(query, rects[idx]):
+                        hits.add(idx)
+        return sorted(hits)
+    
+    def query_rects(self, xs: Sequence[float], ys: Sequence[float], ws: Sequence[float],
+                    hs: Sequence[float]) -> List[Tuple[int, int]]:
+        """(query, item) index pairs for a batch of query rects"""
+        if not len(xs) == len(ys) == len(ws) == len(hs):
+            raise ValueError("xs, ys, ws and hs must have the same length")
+        return [(q_idx, hit) for q_idx in range(len(xs)) for hit in self.query_rect(xs[q_idx], ys[q_idx], ws[q_idx], hs[q_idx])]
+    
+    def level_counts(self) -> List[int]:
+        """Number of indexed rects per level (a grid has one level)"""
+        return [len(self._rects)]
+    
+    def __len__(self) -> int:
+        return len(self._rects)
+
+
+# Helper functions
+
+def _rects_collide(rect1: Tuple[float, float, float, float], 
+                   rect2: Tuple[float, float, float, float]) -> bool:
+    """Check if two rectangles collide (AABB; touching edges and empty rects don't)"""
+    x1, y1, w1, h1 = rect1
+    x2, y2, w2, h2 = rect2
+    
+    return (w1 > 0 and h1 > 0 and w2 > 0 and h2 > 0 and
+            x1 < x2 + w2 and x2 < x1 + w1 and y1 < y2 + h2 and y2 < y1 + h1)
@@ -0,0 +1,12 @@
+"""
+Native Variants - The -march builds of the C++ backend
+setup.py builds one extension module per row; the package imports the last
+(fastest) one whose CPU features this machine has. Kept free of imports so
+setup.py can read it without importing the package.
+"""
+
+# (variant name, module name, extra compile flags, cpu_features() keys required), slowest first
+NATIVE_VARIANTS = (
+    ("baseline", "_native", (), ()),
+    ("x86-64-v3", "_native_x86_64_v3", ("-march=x86-64-v3",), ("avx", "avx2", "bmi", "bmi2", "fma")),
+)
@@ -0,0 +1,111 @@
+"""
+Game Accelerator Spec - The semantics every backend must implement
+The C++, Python and NumPy-fallback backends are interchangeable only if they
+agree on every result, so the rules live here once, with plain reference
+implementations that tests/test_game_accelerator.py checks each backend against:
+
+- Rects are (x, y, w, h). Two rects collide when their interiors overlap:
+  a.x < b.x + b.w and b.x < a.x + a.w (same for y). Touching edges do NOT
+  collide, exactly like pygame.Rect.colliderect, so the accelerated paths and
+  the plain-pygame path of game_session give the same gameplay.
+- A rect with w <= 0 or h <= 0 is empty and never collides (pygame: zero-size rects).
+- Index results are ascending; pair results are ordered by the first index, then the second.
+- Coordinates are compared after rounding to float32 (the native backend's storage);
+  game rects are integers, which float32 holds exactly.
+- Batch functions raise ValueError on mismatched buffer lengths or category counts.
+
+Movement (integrate_positions on x / y float buffers, integrate_rects on pygame.Rects)
+works in place. For each entity, in order:
+- MOTION_CULL_BEFORE: if it is outside keep_bounds, it is culled and does not move.
+- x += vx and y += vy, then both snap to whole pixels by rounding half away from zero
+  (what assigning a float to pygame.Rect.x does; move_ip truncates, so pass int velocities for it).
+- MOTION_CLAMP: pygame.Rect.clamp_ip into clamp_bounds.
+- MOTION_CULL: if it is now outside keep_bounds, it is culled.
+Bounds are (left, top, right, bottom), and None means unbounded. An entity is inside when
+x < right and x + w > left and y < bottom and y + h > top; this is the overlap test without the
+empty-rect rule, so zero-size points work too. Velocities, widths and heights are either one
+number for every entity or a buffer with one value per entity. The culled indices are returned
+in ascending order; the caller removes them.
+"""
+
+import math
+
+# The one API: every backend provides all of these names
+API_FUNCTIONS = (
+    "check_bullet_enemy_collisions", "check_player_enemy_collisions", "calculate_landmark_distance",
+    "is_pinch_detected", "map_finger_position", "update_enemy_positions", "calculate_aim_direction",
+    "bullet_boss_collision", "player_bullet_collision", "point_distance", "check_player_powerup_collisions",
+    "check_player_hits", "check_bullet_enemy_collisions_soa", "check_player_hits_soa",
+    "integrate_positions", "integrate_rects",
+    "accelerator_info", "set_parallelism", "set_simd_enabled", "set_release_gil",
+)
+API_CLASSES = ("ProjectileIndex",)
+
+MOTION_CLAMP = 1
+MOTION_CULL = 2
+MOTION_CULL_BEFORE = 4
+
+
+def rects_overlap(ax, ay, aw, ah, bx, by, bw, bh):
+    """Reference collision test: strict interior overlap, empty rects never collide"""
+    if aw <= 0 or ah <= 0 or bw <= 0 or bh <= 0:
+        return False
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+def overlapping_indices(rect, rects):
+    """Ascending indices of the (x, y, w, h) rects colliding with rect"""
+    return [idx for idx, other in enumerate(rects) if rects_overlap(*rect, *other)]
+
+
+def overlapping_pairs(rects_a, rects_b):
+    """(a index, b index) for every colliding pair, ordered by a then b"""
+    return [(a_idx, b_idx) for a_idx, rect in enumerate(rects_a) for b_idx in overlapping_indices(rect, rects_b)]
+
+
+def aim_direction(from_x, from_y, to_x, to_y):
+    """Unit vector from one point to another; [0, 0] when they coincide"""
+    dx, dy = to_x - from_x, to_y - from_y
+    dist = math.sqrt(dx * dx + dy * dy)
+    return [0, 0] if dist == 0 else [dx / dist, dy / dist]
+
+
+def moved_enemy(enemy, speed_y, screen_width):
+    """update_enemy_positions (in place) for one [x, y, w, h, speed_x] row: x += speed_x, y += speed_y, x clamped to [0, screen_width]"""
+    moved = list(enemy)
+    moved[0] = min(max(moved[0] + moved[4], 0), screen_width)
+    moved[1] += speed_y
+    return moved
+
+
+def round_half_away(value):
+    """C round(): pygame.Rect's float-to-pixel rule"""
+    whole = math.trunc(value)
+    if abs(value - whole) >= 0.5: whole += 1 if value > 0 else -1
+    return float(whole)
+
+
+def inside_bounds(bounds, x, y, w, h):
+    if bounds is None: return True
+    left, top, right, bottom = bounds
+    return x < right and x + w > left and y < bottom and y + h > top
+
+
+def clamp_axis(pos, size, low, high):
+    """pygame.Rect.clamp_ip on one axis (too-large rects are centred with integer division)"""
+    extent = high - low
+    if size >= extent: return low + math.trunc(extent / 2) - math.trunc(size / 2)
+    if pos < low: return low
+    if pos + size > high: return high - size
+    return pos
+
+
+def motion_step(x, y, w, h, vx, vy, flags, clamp_bounds=None, keep_bounds=None):
+    """Reference integrator for one entity: (new x, new y, culled)"""
+    if flags & MOTION_CULL_BEFORE and not inside_bounds(keep_bounds, x, y, w, h):
+        return x, y, True
+    x, y = round_half_away(x + vx), round_half_away(y + vy)
+    if flags & MOTION_CLAMP:
+        x = clamp_axis(x, w, clamp_bounds[0], clamp_bounds[2])
+        y = clamp_axis(y, h, clamp_bounds[1], clamp_bounds[3])
+    return x, y, bool(flags & MOTION_CULL) and not inside_bounds(keep_bounds, x, y, w, h)
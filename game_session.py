@@ -0,0 +1,1064 @@
+"""
+Game Session - Importable game engine for the finger shooter
+All world state lives on a GameSession object. The host feeds one FrameInput
+per frame to step() and calls render(surface) to draw; camera, display and
+clock are owned by the host and injected, so sessions can run headless, many
+per process, from tests and benchmarks.
+"""
+
+import math
+import random
+import time
+from array import array
+
+import pygame
+
+from entity_compaction import RemovalMarks
+from bullet_patterns import SpreadPattern, AimedFanPattern, aimed_unit_vector
+from input_calibration import DEFAULT_INPUT_TRANSFORM, InputTransform
+from sprite_cache import (SpriteCache, SpriteBatch, bake_rect_sprite, bake_player_ship, bake_shield_frames,
+                          shield_frame_index, bake_boss, bake_power_up)
+
+# Attempt to import the acceleration package (C++ backend when built, else its Python backends)
+try:
+    import game_accelerator
+    from game_accelerator import MOTION_CLAMP, MOTION_CULL, MOTION_CULL_BEFORE
+    ENABLE_CPP_ACCELERATION = True
+    ACCELERATION_BACKEND = game_accelerator.BACKEND_LABEL + (f" {game_accelerator.BACKEND_VARIANT}" if game_accelerator.BACKEND_VARIANT else "")
+    if game_accelerator.BACKEND == "native": print(f"✅ C++ acceleration enabled! ({game_accelerator.backend_report()})")
+    else: print(f"⚠️  Using {game_accelerator.backend_report()} for acceleration")
+except ImportError:
+    ENABLE_CPP_ACCELERATION = False
+    ACCELERATION_BACKEND = "pure Python"
+    print("⚠️  No acceleration available. Running pure Python.")
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 900, 700
+PLAYFIELD_RECT = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+# (left, top, right, bottom) bounds for the movement integrator
+PLAYFIELD_BOUNDS = (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+PLAYER_BULLET_KEEP_BOUNDS = (-math.inf, 0, math.inf, math.inf)  # bottom > 0
+POWER_UP_KEEP_BOUNDS = (-math.inf, -math.inf, math.inf, SCREEN_HEIGHT)  # top < SCREEN_HEIGHT
+ENEMY_KEEP_BOUNDS = (-math.inf, -math.inf, math.inf, SCREEN_HEIGHT + 21)  # top <= SCREEN_HEIGHT + 20 (whole pixels)
+STAR_KEEP_BOUNDS = (-math.inf, -math.inf, math.inf, SCREEN_HEIGHT + 1)  # y <= SCREEN_HEIGHT (whole pixels)
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+DEEP_RED = (180, 0, 0)
+ORANGE = (255, 165, 0)
+PLAYER_SHIP_COLOR = (0, 200, 255)
+PLAYER_BULLET_COLOR = (255, 255, 0)
+ENEMY_NORMAL_COLOR = (130, 130, 130)
+ENEMY_CHASER_COLOR = (220, 50, 220)
+ENEMY_SHOOTER_COLOR = (255, 100, 0)
+ENEMY_DODGER_COLOR = (0, 200, 100)
+ENEMY_BULLET_COLOR = (255, 60, 60)
+BOSS_COLOR = (60, 60, 60)
+BOSS_SPECIAL_ATTACK_COLOR = (255,0,255)
+BOSS_HEALTH_BAR_COLOR = (0, 255, 0)
+BOSS_HEALTH_BAR_BG_COLOR = (40, 40, 40)
+POWER_UP_SHIELD_COLOR = (0, 100, 255)
+POWER_UP_MULTI_SHOT_COLOR = (255,0,255)
+STAR_COLOR = (200, 200, 200)
+EXPLOSION_COLORS_DEFAULT = [(255,0,0), (255,165,0), (255,255,0)]
+GREEN = (0, 255, 0)
+YELLOW = (255, 255, 0)
+DEBUG_TEXT_COLOR = (200, 200, 0)
+
+GAME_STATE_INSTRUCTIONS = "instructions"
+GAME_STATE_PLAYING = "playing"
+GAME_STATE_LEVEL_UP = "level_up"
+GAME_STATE_BOSS_FIGHT = "boss_fight"
+GAME_STATE_GAME_OVER = "game_over"
+GAME_STATE_PAUSED_NO_HAND = "paused_no_hand"
+
+player_width = 55
+player_height = 45
+player_invincibility_duration_ms = 2500
+player_shield_duration_ms = 7000
+player_multi_shot_duration_ms = 8000
+
+PLAYER_PLAYABLE_Y_MIN = SCREEN_HEIGHT // 3
+PLAYER_PLAYABLE_Y_MAX = SCREEN_HEIGHT - player_height // 2
+
+score_to_next_level_base = 400
+level_up_message_duration_ms = 2500
+boss_fight_trigger_level = 3
+
+enemy_width_std = 45
+enemy_height_std = 35
+
+player_bullet_speed = 15
+player_bullet_width = 7
+player_bullet_height = 22
+player_base_shoot_cooldown_ms = 280
+
+boss_initial_speed_x = 2.5
+boss_initial_shoot_cooldown_ms = 700
+boss_phase_change_health_threshold_factor = 0.5
+
+POWER_UP_TYPE_SHIELD = "shield"
+POWER_UP_TYPE_MULTI_SHOT = "multi_shot"
+
+NUM_STARS_BG = 200
+
+
+class SessionConfig:
+    """Tunable gameplay parameters; defaults are the shipped game balance"""
+
+    def __init__(self, seed=None, player_lives_start=3, base_enemy_speed_y=2.2, enemy_spawn_rate_initial=65,
+                 enemy_bullet_base_speed=4.5, boss_max_health_base=40, power_up_base_drop_chance=0.08,
+                 enemies_per_spawn=1, boss_volley_multiplier=1, enemy_shoot_cooldown_frames=120,
+                 enemy_dodge_cooldown_frames=45, dodger_dodge_cooldown_frames=35, chaser_aggressiveness=0.45 * 1.2,
+                 aimed_shot_speed_factor=2.0, bullets_cancel_bullets=False):
+        self.seed = seed
+        self.player_lives_start = player_lives_start
+        self.base_enemy_speed_y = base_enemy_speed_y
+        self.enemy_spawn_rate_initial = enemy_spawn_rate_initial
+        self.enemy_bullet_base_speed = enemy_bullet_base_speed
+        self.boss_max_health_base = boss_max_health_base
+        self.power_up_base_drop_chance = power_up_base_drop_chance
+        self.enemies_per_spawn = enemies_per_spawn
+        self.boss_volley_multiplier = boss_volley_multiplier
+        # EnemyAI constants
+        self.enemy_shoot_cooldown_frames = enemy_shoot_cooldown_frames
+        self.enemy_dodge_cooldown_frames = enemy_dodge_cooldown_frames
+        self.dodger_dodge_cooldown_frames = dodger_dodge_cooldown_frames
+        self.chaser_aggressiveness = chaser_aggressiveness
+        self.aimed_shot_speed_factor = aimed_shot_speed_factor
+        # Player bullets and enemy / boss bullets that touch destroy each other
+        self.bullets_cancel_bullets = bullets_cancel_bullets
+
+
+class FrameInput:
+    """Input for one step: hand_frame is True when a new inferred camera frame arrived"""
+
+    __slots__ = ("hand_frame", "hand_present", "finger_x_norm", "finger_y_norm", "pinched", "gesture")
+
+    def __init__(self, hand_frame=False, hand_present=False, finger_x_norm=None, finger_y_norm=None, pinched=False, gesture=None):
+        self.hand_frame = hand_frame
+        self.hand_present = hand_present
+        self.finger_x_norm = finger_x_norm
+        self.finger_y_norm = finger_y_norm
+        self.pinched = pinched
+        self.gesture = gesture  # hand_landmarks.GESTURE_* from the host's classifier; the simulation does not read it
+
+
+class FixedStepClock:
+    """Deterministic clock for headless runs: every tick advances a fixed frame time"""
+
+    def __init__(self, fps=90):
+        self.step_ms = 1000.0 / fps
+        self.ticks_ms = 0.0
+
+    def tick(self):
+        self.ticks_ms += self.step_ms
+        return self.step_ms
+
+    def get_ticks(self):
+        return int(self.ticks_ms)
+
+    def get_fps(self):
+        return 1000.0 / self.step_ms
+
+
+class PygameClock:
+    """Wall clock for live play; tick() sleeps to hold target_fps (0 = uncapped)"""
+
+    def __init__(self, target_fps=90):
+        self.target_fps = target_fps
+        self.clock = pygame.time.Clock()
+
+    def tick(self):
+        return self.clock.tick(self.target_fps)
+
+    def get_ticks(self):
+        return pygame.time.get_ticks()
+
+    def get_fps(self):
+        return self.clock.get_fps()
+
+
+class Explosion:
+    def __init__(self, center_pos, now_ms, rng, num_particles=20, max_radius=35, duration=450, colors=None, particle_speed_range=(1,3.5)):
+        self.center_pos = center_pos
+        self.creation_time = now_ms
+        self.particles = []
+        self.colors_to_use = colors if colors else EXPLOSION_COLORS_DEFAULT
+        self.particle_min_speed, self.particle_max_speed = particle_speed_range
+        for _ in range(num_particles):
+            angle = rng.uniform(0, 2 * math.pi)
+            speed = rng.uniform(self.particle_min_speed, self.particle_max_speed)
+            radius = rng.uniform(max_radius * 0.08, max_radius * 0.18)
+            color = rng.choice(self.colors_to_use)
+            self.particles.append({
+                'x': center_pos[0], 'y': center_pos[1],
+                'vx': math.cos(angle) * speed, 'vy': math.sin(angle) * speed,
+                'radius': radius, 'color': color, 'alpha': 255, 'start_radius': radius
+            })
+        self.duration = duration
+
+    def update(self, now_ms):
+        age_ms = now_ms - self.creation_time
+        if age_ms > self.duration: return False
+        for p_data in self.particles:
+            p_data['x'] += p_data['vx']
+            p_data['y'] += p_data['vy']
+            p_data['alpha'] = max(0, 255 - (age_ms / self.duration) * 255)
+            p_data['radius'] = p_data['start_radius'] * (1 - age_ms / self.duration)
+        return True
+
+    def draw(self, surface_to_draw_on):
+        draw_particle = getattr(surface_to_draw_on, "draw_particle", None)
+        if draw_particle is not None:  # texture backend: one tinted circle texture instead of a fresh surface per particle
+            for p_data in self.particles:
+                if p_data['alpha'] > 0 and p_data['radius'] > 0.5:
+                    draw_particle(p_data['color'], int(p_data['alpha']), int(p_data['x']), int(p_data['y']), int(p_data['radius']))
+            return
+        for p_data in self.particles:
+            if p_data['alpha'] > 0 and p_data['radius'] > 0.5:
+                particle_surf = pygame.Surface((int(p_data['radius']*2), int(p_data['radius']*2)), pygame.SRCALPHA)
+                pygame.draw.circle(particle_surf, (*p_data['color'], int(p_data['alpha'])), (int(p_data['radius']), int(p_data['radius'])), int(p_data['radius']))
+                surface_to_draw_on.blit(particle_surf, (int(p_data['x'] - p_data['radius']), int(p_data['y'] - p_data['radius'])))
+
+
+class EnemyAI:
+    def __init__(self, session, x_pos, y_pos, enemy_variant, player_lvl):
+        self.session = session
+        rng = session.rng
+        config = session.config
+        self.variant = enemy_variant
+        self.player_level_modifier = player_lvl
+        self.rect = pygame.Rect(x_pos, y_pos, enemy_width_std, enemy_height_std)
+        self.current_speed_y = config.base_enemy_speed_y + (self.player_level_modifier - 1) * 0.25
+        self.current_speed_x = 0
+        self.ai_state = 'ENTERING'
+        self.ai_state_timer_frames = 0
+        self.shoot_action_cooldown_frames = config.enemy_shoot_cooldown_frames
+        self.shoot_action_timer_frames = rng.randint(0, self.shoot_action_cooldown_frames // 2)
+        self.dodge_timer_frames = 0
+        self.dodge_direction = 1  # initialize dodge_direction
+        self.patrol_direction = 1 if rng.random() < 0.5 else -1
+        self.patrol_range_x = (self.rect.x - 50, self.rect.x + 50)
+        self.dodge_cooldown_frames = config.enemy_dodge_cooldown_frames  # default for dodging
+        self.dodge_duration_frames = 15  # added default dodge duration to fix attribute error
+
+        if self.variant == 'chaser':
+            self.health_points = int((2 + self.player_level_modifier // 2) * 1.5)  # increased health
+            self.color_fill = ENEMY_CHASER_COLOR
+            self.chase_aggressiveness = config.chaser_aggressiveness + (self.player_level_modifier - 1) * 0.02  # increased aggressiveness
+        elif self.variant == 'shooter':
+            self.health_points = int((1 + self.player_level_modifier // 3) * 1.5)  # increased health
+            self.color_fill = ENEMY_SHOOTER_COLOR
+            self.shoot_action_cooldown_frames = max(20, int((100 - (self.player_level_modifier - 1) * 7) * 0.8))  # faster shooting
+        elif self.variant == 'dodger':
+            self.health_points = int(1 * 1.5)  # increased health
+            self.color_fill = ENEMY_DODGER_COLOR
+            self.current_speed_y *= 1.2 * 1.1  # further increase speed
+            self.dodge_cooldown_frames = config.dodger_dodge_cooldown_frames  # reduced cooldown for more frequent dodging
+            self.dodge_duration_frames = 15
+        else:
+            self.color_fill = ENEMY_NORMAL_COLOR
+            self.health_points = int((1 + self.player_level_modifier // 4) * 1.5)  # increased health
+
+    def update_behavior(self, player_main_rect, player_bullet_list_ref, all_other_enemies_list_ref, move_x=True):
+        """AI step; move_x=False leaves the horizontal move, clamp and off-screen check to helper_move_rects"""
+        rng = self.session.rng
+        enemy_bullet_base_speed = self.session.config.enemy_bullet_base_speed
+        aimed_shot_speed_factor = self.session.config.aimed_shot_speed_factor
+        self.ai_state_timer_frames += 1
+        self.current_speed_x = 0
+        # New: For normal enemies, dodge incoming player bullets to leave gap when player shoots
+        if self.variant not in ['dodger', 'chaser', 'shooter'] and self.dodge_timer_frames <= 0:
+            p_bullet = self.find_bullet_in(self.rect.inflate(self.rect.width, self.rect.height), player_bullet_list_ref)
+            if p_bullet is not None: self.start_dodge(p_bullet)
+
+        # Existing dodge for chaser/shooter remains
+        if self.variant in ['chaser', 'shooter'] and self.dodge_timer_frames <= 0:
+            p_bullet = self.find_bullet_in(self.rect.inflate(self.rect.width * 1.0, self.rect.height * 1.3), player_bullet_list_ref)
+            if p_bullet is not None: self.start_dodge(p_bullet)
+
+        if self.ai_state == 'ENTERING':
+            self.rect.y += self.current_speed_y * 0.6
+            if self.rect.top > rng.randint(30, 70):
+                self.ai_state = 'PATROLLING' if self.variant != 'chaser' else 'CHASING'
+                self.ai_state_timer_frames = 0
+                self.patrol_range_x = (max(20, self.rect.x - rng.randint(40,80)), min(SCREEN_WIDTH - self.rect.width - 20, self.rect.x + rng.randint(40,80)))
+        elif self.ai_state == 'PATROLLING':
+            self.rect.y += self.current_speed_y
+            self.current_speed_x = (self.current_speed_y * 0.5 + self.player_level_modifier * 0.1) * self.patrol_direction
+            if self.rect.x <= self.patrol_range_x[0] or self.rect.x >= self.patrol_range_x[1]:
+                self.patrol_direction *= -1
+                self.current_speed_x = (self.current_speed_y * 0.5 + self.player_level_modifier * 0.1) * self.patrol_direction
+            if self.variant == 'shooter' and self.rect.centery < SCREEN_HEIGHT * 0.55:
+                self.shoot_action_timer_frames -= 1
+                if self.shoot_action_timer_frames <= 0:
+                    self.ai_state = 'AIMING_SHOT'
+                    self.ai_state_timer_frames = 0
+            if self.variant == 'dodger' and self.dodge_timer_frames <= 0:
+                p_bullet = self.find_bullet_in(self.rect.inflate(self.rect.width * 1.5, self.rect.height * 2), player_bullet_list_ref,
+                                               min_centery=self.rect.centery - 50)
+                if p_bullet is not None: self.start_dodge(p_bullet)
+            # New: For normal enemy, add a small chance to target and shoot the player
+            if self.variant not in ['dodger', 'chaser', 'shooter']:
+                if rng.random() < 0.005:
+                    self.ai_state = 'AIMING_SHOT'
+                    self.ai_state_timer_frames = 0
+        elif self.ai_state == 'CHASING':
+            self.rect.y += self.current_speed_y * 0.9
+            target_x_diff = player_main_rect.centerx - self.rect.centerx
+            if abs(target_x_diff) > 5:
+                self.current_speed_x = math.copysign(min(abs(target_x_diff * 0.05), self.current_speed_y * self.chase_aggressiveness), target_x_diff)
+            if self.rect.centery < SCREEN_HEIGHT * 0.65:
+                self.shoot_action_timer_frames -=1
+                if self.shoot_action_timer_frames <= 0:
+                    self.ai_state = 'AIMING_SHOT'
+                    self.ai_state_timer_frames = 0
+        elif self.ai_state == 'AIMING_SHOT':
+            self.rect.y += self.current_speed_y * 0.3
+            if self.ai_state_timer_frames > 20:
+                aim_x, aim_y = aimed_unit_vector(player_main_rect.centerx - self.rect.centerx, player_main_rect.bottom - self.rect.bottom)
+                # Increased multipliers for stronger shooting
+                bullet_vel_x = aim_x * (enemy_bullet_base_speed * aimed_shot_speed_factor + self.player_level_modifier * 0.5)
+                bullet_vel_y = aim_y * (enemy_bullet_base_speed * aimed_shot_speed_factor + self.player_level_modifier * 0.5)
+                if bullet_vel_y <= 0:
+                    bullet_vel_y = enemy_bullet_base_speed * aimed_shot_speed_factor
+                self.session.enemy_bullets_master_list.append(EnemyProjectile(self.rect.centerx - 3, self.rect.bottom, bullet_vel_x, bullet_vel_y))
+                self.shoot_action_timer_frames = self.shoot_action_cooldown_frames + rng.randint(-10,10)
+                # After shooting, immediately switch to DODGING to leave gap
+                self.ai_state = 'DODGING'
+                self.ai_state_timer_frames = 0
+        elif self.ai_state == 'DODGING':
+            self.rect.y += self.current_speed_y * 0.8
+            self.current_speed_x = (self.current_speed_y * 2.5 + self.player_level_modifier * 0.3) * self.dodge_direction
+            if self.ai_state_timer_frames > self.dodge_duration_frames:
+                self.ai_state = 'PATROLLING'
+                self.ai_state_timer_frames = 0
+        if self.dodge_timer_frames > 0 and self.variant in ['dodger', 'chaser', 'shooter']:
+            self.dodge_timer_frames -= 1
+        if not move_x:
+            return True
+
+        self.rect.x += self.current_speed_x
+        self.rect.clamp_ip(PLAYFIELD_RECT)
+
+        if self.rect.top > SCREEN_HEIGHT + 20:
+            return False
+        return True
+
+    def find_bullet_in(self, detection_rect, player_bullet_list_ref, min_centery=None):
+        """First player bullet (in list order) inside detection_rect, optionally only those below min_centery"""
+        bullet_index = self.session.player_bullet_index
+        if bullet_index is not None:
+            # range query on this frame's index; colliderect keeps pygame's strict edge test
+            candidates = bullet_index.query_rect(detection_rect.x, detection_rect.y, detection_rect.width, detection_rect.height)
+        else:
+            candidates = range(len(player_bullet_list_ref))
+        for pb_idx in candidates:
+            p_bullet = player_bullet_list_ref[pb_idx]
+            if detection_rect.colliderect(p_bullet) and (min_centery is None or p_bullet.centery > min_centery):
+                return p_bullet
+        return None
+
+    def start_dodge(self, p_bullet):
+        self.ai_state = 'DODGING'
+        self.ai_state_timer_frames = 0
+        self.dodge_timer_frames = self.dodge_cooldown_frames + self.dodge_duration_frames
+        self.dodge_direction = 1 if p_bullet.centerx < self.rect.centerx else -1
+
+    def apply_damage(self, damage_amount):
+        self.health_points -= damage_amount
+        return self.health_points <= 0
+
+    def draw_self(self, sprite_batch, sprites, debug_font=None):
+        sprite_batch.add(sprites.get(("enemy", self.color_fill)), self.rect.x, self.rect.y)
+        if debug_font is not None:
+            state_txt = debug_font.render(f"{self.variant[:3]}:{self.ai_state[:3]} H:{self.health_points}", True, DEBUG_TEXT_COLOR)
+            sprite_batch.add_surface(state_txt, self.rect.x, self.rect.y - 18)
+
+
+class EnemyProjectile:
+    def __init__(self, x_pos, y_pos, vel_x, vel_y):
+        self.rect = pygame.Rect(x_pos, y_pos, 7, 14)
+        self.velocity_x = vel_x
+        self.velocity_y = vel_y
+        self.color_fill = ENEMY_BULLET_COLOR
+
+    def update_pos(self):
+        self.rect.x += self.velocity_x
+        self.rect.y += self.velocity_y
+        if not PLAYFIELD_RECT.colliderect(self.rect): return False
+        return True
+
+    def draw_self(self, sprite_batch, sprites):
+        sprite_batch.add(sprites.get("enemy_bullet"), self.rect.x, self.rect.y)
+
+
+def helper_draw_text_on_screen(surface_to_draw_on, text_to_show, font_obj, x_coord, y_coord, color_rgb, center_txt=True):
+    draw_text = getattr(surface_to_draw_on, "draw_text", None)
+    if draw_text is not None:
+        draw_text(text_to_show, font_obj, color_rgb, x_coord, y_coord, center_txt); return
+    text_surf_obj = font_obj.render(text_to_show, True, color_rgb)
+    text_rect_obj = text_surf_obj.get_rect()
+    if center_txt: text_rect_obj.midtop = (x_coord, y_coord)
+    else: text_rect_obj.topleft = (x_coord, y_coord)
+    surface_to_draw_on.blit(text_surf_obj, text_rect_obj)
+
+def helper_record_phase(phase_timings, phase_name, phase_start_s):
+    """Store the ms since phase_start_s under phase_name; returns now as the next phase's start"""
+    now_s = time.perf_counter()
+    phase_timings[phase_name] = (now_s - phase_start_s) * 1000.0
+    return now_s
+
+# Boss volleys: one immutable pattern (with its unit-vector tables) per kind and size, shared by every session
+BOSS_VOLLEY_PATTERNS = {}
+
+def helper_boss_volley_pattern(kind, size):
+    """'spread': size-shot fan (PHASE_1_ATTACK), 'aimed_fan': 4 * size + 1 muzzles aimed at the player (PHASE_2_ATTACK)"""
+    pattern = BOSS_VOLLEY_PATTERNS.get((kind, size))
+    if pattern is None:
+        if kind == "spread": pattern = SpreadPattern(size, start_rad=-math.pi / 2, arc_rad=math.pi, jitter_rad=0.1, origin_spacing=20)
+        else: pattern = AimedFanPattern(range(-2 * size, 2 * size + 1), origin_spacing=30, aim_dy=SCREEN_HEIGHT)
+        BOSS_VOLLEY_PATTERNS[(kind, size)] = pattern
+    return pattern
+
+def helper_move_rects(rects, vxs, vys, flags, clamp_bounds, keep_bounds, removal_marks):
+    """Move one entity kind's rects in place with a single integrator call and mark the culled ones for removal"""
+    if not rects: return
+    for idx in game_accelerator.integrate_rects(rects, vxs, vys, flags, clamp_bounds, keep_bounds):
+        removal_marks.mark(idx)
+
+def helper_move_projectiles(projectiles, removal_marks):
+    """EnemyProjectile.update_pos for a whole list"""
+    if not projectiles: return
+    helper_move_rects([proj.rect for proj in projectiles], array("d", [proj.velocity_x for proj in projectiles]),
+                      array("d", [proj.velocity_y for proj in projectiles]), MOTION_CULL, None, PLAYFIELD_BOUNDS, removal_marks)
+
+def helper_rect_buffers(rects):
+    """Flat x / y / w / h float arrays for the accelerator's SoA entry points"""
+    return (array("f", [r.x for r in rects]), array("f", [r.y for r in rects]),
+            array("f", [r.width for r in rects]), array("f", [r.height for r in rects]))
+
+def helper_query_player_hits(player_current_rect, p_ups_list, enemy_bullets, boss_bullets, enemies):
+    """Test the player against power-ups, enemy bullets, boss bullets and enemies in one call.
+    Returns the hit indices per category: (power_ups, enemy_bullets, boss_bullets, enemies)"""
+    if ENABLE_CPP_ACCELERATION:
+        # one packed SoA batch: every category back to back in flat float arrays
+        rects = [pu_r for pu_r, _ in p_ups_list]
+        rects.extend(eb.rect for eb in enemy_bullets)
+        rects.extend(bb.rect for bb in boss_bullets)
+        rects.extend(en.rect for en in enemies)
+        return game_accelerator.check_player_hits_soa(
+            [player_current_rect.x, player_current_rect.y, player_current_rect.width, player_current_rect.height],
+            *helper_rect_buffers(rects),
+            [len(p_ups_list), len(enemy_bullets), len(boss_bullets), len(enemies)])
+    return ([i for i, (pu_r, _) in enumerate(p_ups_list) if player_current_rect.colliderect(pu_r)],
+            [i for i, eb in enumerate(enemy_bullets) if player_current_rect.colliderect(eb.rect)],
+            [i for i, bb in enumerate(boss_bullets) if player_current_rect.colliderect(bb.rect)],
+            [i for i, en in enumerate(enemies) if player_current_rect.colliderect(en.rect)])
+
+
+class SessionRenderer:
+    """Fonts, baked sprites and the star field for drawing one session"""
+
+    def __init__(self, session):
+        self.session = session
+        if not pygame.font.get_init(): pygame.font.init()
+        self.title_font = pygame.font.SysFont("Arial", 70, bold=True)
+        self.main_font = pygame.font.SysFont("Arial", 45)
+        self.hud_font = pygame.font.SysFont("Consolas", 35)
+        self.small_hud_font = pygame.font.SysFont("Consolas", 22)
+        # Pre-rendered sprites; entity drawing is queued into one batch and flushed with a single Surface.blits per frame
+        self.sprite_cache = SpriteCache()
+        self.frame_sprite_batch = SpriteBatch()
+        # stars are purely cosmetic, so they get their own RNG and never disturb the gameplay sequence
+        self.star_rng = random.Random(session.config.seed)
+        # x / y / radius buffers; each star falls by its radius per frame
+        self.star_xs, self.star_ys, self.star_radii = array("d"), array("d"), array("d")
+        for _ in range(NUM_STARS_BG):
+            self.star_xs.append(self.star_rng.randint(0, SCREEN_WIDTH)); self.star_ys.append(self.star_rng.randint(0, SCREEN_HEIGHT))
+            self.star_radii.append(self.star_rng.randint(1, 4))
+        self.bake_sprites()
+
+    def bake_power_up_sprite(self, pu_type_item, diameter):
+        color_to_use = POWER_UP_SHIELD_COLOR if pu_type_item == POWER_UP_TYPE_SHIELD else POWER_UP_MULTI_SHOT_COLOR
+        label = "S" if pu_type_item == POWER_UP_TYPE_SHIELD else "M"
+        pu_surf, pu_offset = bake_power_up(diameter, color_to_use, label, self.hud_font, BLACK)
+        self.sprite_cache.store(("power_up", pu_type_item, diameter), pu_surf, pu_offset)
+
+    def bake_sprites(self):
+        """Render every ship, enemy variant, boss phase and power-up type once"""
+        sprites = self.sprite_cache
+        sprites.store("player_ship", bake_player_ship(player_width, player_height, PLAYER_SHIP_COLOR, WHITE))
+        for frame_idx, shield_surf in enumerate(bake_shield_frames(player_width, player_height, POWER_UP_SHIELD_COLOR)):
+            sprites.store(("shield", frame_idx), shield_surf, (-10, -10))
+        for enemy_color in (ENEMY_NORMAL_COLOR, ENEMY_CHASER_COLOR, ENEMY_SHOOTER_COLOR, ENEMY_DODGER_COLOR):
+            sprites.store(("enemy", enemy_color), bake_rect_sprite(enemy_width_std, enemy_height_std, enemy_color))
+        sprites.store("enemy_bullet", bake_rect_sprite(7, 14, ENEMY_BULLET_COLOR))
+        sprites.store("player_bullet", bake_rect_sprite(player_bullet_width, player_bullet_height, PLAYER_BULLET_COLOR))
+        boss_rect = self.session.boss_main_rect
+        for phase in (1, 2):
+            sprites.store(("boss", phase), bake_boss(boss_rect.width, boss_rect.height, BOSS_COLOR, DEEP_RED, RED))
+        sprites.store("boss_hp_bg", bake_rect_sprite(150, 15, BOSS_HEALTH_BAR_BG_COLOR))
+        sprites.store("boss_hp", bake_rect_sprite(150, 15, BOSS_HEALTH_BAR_COLOR))
+        for pu_type_item in (POWER_UP_TYPE_SHIELD, POWER_UP_TYPE_MULTI_SHOT):
+            for diameter in (36, 40):  # enemy drop / boss drop
+                self.bake_power_up_sprite(pu_type_item, diameter)
+
+    def draw_star_bg(self, surface_to_draw_on):
+        budget = self.session.budget
+        star_count = budget.star_count if budget else None
+        draw_circle = getattr(surface_to_draw_on, "draw_circle", None)
+        star_xs, star_ys, star_radii = self.star_xs, self.star_ys, self.star_radii
+        if star_count is not None and star_count < len(star_xs):
+            star_xs, star_ys, star_radii = memoryview(star_xs)[:star_count], memoryview(star_ys)[:star_count], memoryview(star_radii)[:star_count]
+        if ENABLE_CPP_ACCELERATION:
+            wrapped_indices = game_accelerator.integrate_positions(star_xs, star_ys, 0, 0, 0, star_radii, MOTION_CULL, None, STAR_KEEP_BOUNDS)
+        else:
+            wrapped_indices = []
+            for star_idx in range(len(star_ys)):
+                star_ys[star_idx] += star_radii[star_idx]
+                if star_ys[star_idx] > SCREEN_HEIGHT: wrapped_indices.append(star_idx)
+        for star_idx in wrapped_indices:
+            star_ys[star_idx] = 0; star_xs[star_idx] = self.star_rng.randint(0, SCREEN_WIDTH)
+        for star_x, star_y, star_radius in zip(star_xs, star_ys, star_radii):
+            if draw_circle is not None: draw_circle(STAR_COLOR, (int(star_x), int(star_y)), int(star_radius))
+            else: pygame.draw.circle(surface_to_draw_on, STAR_COLOR, (int(star_x), int(star_y)), int(star_radius))
+
+    def draw_player_ship(self, sprite_batch, player_current_rect, is_invincible_now, shield_is_active, now_ms):
+        if is_invincible_now and (now_ms // 120) % 2 == 0: return
+        sprite_batch.add(self.sprite_cache.get("player_ship"), player_current_rect.x, player_current_rect.y)
+        if shield_is_active:
+            shield_sprite = self.sprite_cache.get(("shield", shield_frame_index(now_ms)))
+            sprite_batch.add(shield_sprite, player_current_rect.x, player_current_rect.y)
+
+    def draw_projectiles(self, sprite_batch, projectile_list, projectile_sprite):
+        for proj_rect in projectile_list:
+            sprite_batch.add(projectile_sprite, proj_rect.x, proj_rect.y)
+
+    def draw_power_ups(self, sprite_batch, p_ups_list):
+        for pu_rect_item, pu_type_item in p_ups_list:
+            pu_key = ("power_up", pu_type_item, pu_rect_item.width)
+            if pu_key not in self.sprite_cache: self.bake_power_up_sprite(pu_type_item, pu_rect_item.width)
+            sprite_batch.add(self.sprite_cache.get(pu_key), pu_rect_item.x, pu_rect_item.y)
+
+    def draw_boss(self, sprite_batch, boss_main_r, boss_hp_curr, boss_hp_max, boss_phase):
+        sprite_batch.add(self.sprite_cache.get(("boss", boss_phase)), boss_main_r.x, boss_main_r.y)
+        hp_bar_w = 150; hp_bar_h = 15
+        hp_bar_x_pos = boss_main_r.centerx - hp_bar_w // 2
+        hp_bar_y_pos = boss_main_r.top - hp_bar_h - 10
+        curr_hp_w = int((boss_hp_curr / boss_hp_max) * hp_bar_w)
+        if curr_hp_w < 0: curr_hp_w = 0
+        sprite_batch.add(self.sprite_cache.get("boss_hp_bg"), hp_bar_x_pos, hp_bar_y_pos)
+        sprite_batch.add(self.sprite_cache.get("boss_hp"), hp_bar_x_pos, hp_bar_y_pos, (0, 0, min(curr_hp_w, hp_bar_w), hp_bar_h))
+
+    def render(self, screen):
+        session = self.session
+        state = session.current_game_state
+        title_font, main_font, hud_font, small_hud_font = self.title_font, self.main_font, self.hud_font, self.small_hud_font
+
+        if state == GAME_STATE_INSTRUCTIONS:
+            screen.fill(BLACK); self.draw_star_bg(screen)
+            helper_draw_text_on_screen(screen, "COSMIC FINGER BLASTER", title_font, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4 - 70, ORANGE)
+            helper_draw_text_on_screen(screen, "Index: Move Ship (All Dirs)", main_font, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 100, WHITE)
+            helper_draw_text_on_screen(screen, "Pinch: Shoot", main_font, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50, WHITE)
+            helper_draw_text_on_screen(screen, "Survive the Alien Onslaught!", main_font, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 0, GREEN)
+            helper_draw_text_on_screen(screen, "Press SPACE to Engage", main_font, SCREEN_WIDTH // 2, SCREEN_HEIGHT * 3 // 4 + 0, WHITE)
+            helper_draw_text_on_screen(screen, "D for Debug", small_hud_font, SCREEN_WIDTH // 2, SCREEN_HEIGHT * 3 // 4 + 60, YELLOW)
+            return
+        elif state == GAME_STATE_GAME_OVER:
+            screen.fill(BLACK); self.draw_star_bg(screen)
+            helper_draw_text_on_screen(screen, "MISSION FAILED!", title_font, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3, RED)
+            helper_draw_text_on_screen(screen, f"SCORE: {session.score}", main_font, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20, WHITE)
+            helper_draw_text_on_screen(screen, f"LEVEL: {session.current_level}", main_font, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 30, WHITE)
+            helper_draw_text_on_screen(screen, "Press 'R' to Retry", main_font, SCREEN_WIDTH // 2, SCREEN_HEIGHT * 2 // 3 + 20, YELLOW)
+            return
+        elif state == GAME_STATE_PAUSED_NO_HAND:
+            screen.fill(BLACK); self.draw_star_bg(screen)
+            helper_draw_text_on_screen(screen, "AWAITING COMMAND INPUT!", title_font, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 60, ORANGE)
+            helper_draw_text_on_screen(screen, "Show Hand to Resume Combat", main_font, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 10, WHITE)
+            helper_draw_text_on_screen(screen, f"Score: {session.score}", hud_font, 20, 20, WHITE, False)
+            helper_draw_text_on_screen(screen, f"Level: {session.current_level}", hud_font, 20, 55, WHITE, False)
+            helper_draw_text_on_screen(screen, "Lives: " + "♥ " * session.player_lives, hud_font, SCREEN_WIDTH - 180, 20, WHITE, False)
+            return
+        elif state == GAME_STATE_LEVEL_UP:
+            screen.fill(BLACK); self.draw_star_bg(screen)
+            helper_draw_text_on_screen(screen, f"LEVEL {session.current_level} ENGAGED!", title_font, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40, GREEN)
+            return
+
+        sprites = self.sprite_cache
+        batch = self.frame_sprite_batch
+        debug_font = small_hud_font if session.show_debug_info else None
+        screen.fill(BLACK); self.draw_star_bg(screen)
+        for enemy_instance_draw in session.all_enemies_list: enemy_instance_draw.draw_self(batch, sprites, debug_font)
+        for eb_proj_obj_draw in session.enemy_bullets_master_list: eb_proj_obj_draw.draw_self(batch, sprites)
+        self.draw_projectiles(batch, session.player_bullets_list, sprites.get("player_bullet"))
+        self.draw_power_ups(batch, session.power_ups_list)
+        if session.boss_active:
+            self.draw_boss(batch, session.boss_main_rect, session.boss_current_health, session.effective_boss_max_health(), session.boss_current_phase)
+            for bb_proj_obj_draw in session.boss_bullets_master_list: bb_proj_obj_draw.draw_self(batch, sprites)
+        self.draw_player_ship(batch, session.player_rect, session.is_player_blinking_invincible, session.player_shield_active, session.now_ms)
+        batch.flush(screen)
+        for expl_obj_draw in session.active_explosions_list: expl_obj_draw.draw(screen)
+
+        helper_draw_text_on_screen(screen, f"Score: {session.score}", hud_font, 20, 15, WHITE, False)
+        helper_draw_text_on_screen(screen, f"Level: {session.current_level}", hud_font, 20, 50, WHITE, False)
+        helper_draw_text_on_screen(screen, "Lives: " + "♥ " * session.player_lives, hud_font, SCREEN_WIDTH - 200, 15, WHITE, False)
+        if session.player_shield_active:
+             helper_draw_text_on_screen(screen, "SHIELD ACTIVE!", hud_font, SCREEN_WIDTH // 2, 15, POWER_UP_SHIELD_COLOR, True)
+        elif session.player_multi_shot_active:
+             helper_draw_text_on_screen(screen, "MULTI-SHOT!", hud_font, SCREEN_WIDTH // 2, 15, POWER_UP_MULTI_SHOT_COLOR, True)
+
+        if session.show_debug_info:
+            debug_y = SCREEN_HEIGHT - 100
+            helper_draw_text_on_screen(screen, f"FPS: {int(session.clock.get_fps())}", small_hud_font, 10, debug_y, DEBUG_TEXT_COLOR, False)
+            helper_draw_text_on_screen(screen, f"Enemies: {len(session.all_enemies_list)}", small_hud_font, 10, debug_y + 20, DEBUG_TEXT_COLOR, False)
+            helper_draw_text_on_screen(screen, f"P_Bull: {len(session.player_bullets_list)} E_Bull: {len(session.enemy_bullets_master_list)} B_Bull: {len(session.boss_bullets_master_list)}", small_hud_font, 10, debug_y+40, DEBUG_TEXT_COLOR, False)
+            helper_draw_text_on_screen(screen, f"State: {state}", small_hud_font, 10, debug_y+60, DEBUG_TEXT_COLOR, False)
+        if session.budget and session.budget.level:
+            helper_draw_text_on_screen(screen, session.budget.hud_text(), small_hud_font, SCREEN_WIDTH - 300, SCREEN_HEIGHT - 30, ORANGE, False)
+
+
+class GameSession:
+    """One game world: step(frame_input) advances it a frame, render(surface) draws it"""
+
+    def __init__(self, config=None, clock=None):
+        self.config = config if config else SessionConfig()
+        self.clock = clock if clock else FixedStepClock()
+        self.rng = random.Random(self.config.seed)
+        self.show_debug_info = False
+        self._renderer = None
+        # Set to a dict before step() to get that frame's per-phase times in ms (metrics sampling)
+        self.phase_timings = None
+        # Optional budget_manager.BudgetManager the host feeds frame times; None = always full detail
+        self.budget = None
+        # Fingertip (normalized camera coordinates) -> player position in pixels; set_input_transform() installs a calibration
+        self.set_input_transform(DEFAULT_INPUT_TRANSFORM)
+
+        self.player_rect = pygame.Rect(SCREEN_WIDTH // 2 - player_width // 2, SCREEN_HEIGHT * 0.75 - player_height // 2, player_width, player_height) # Initial Y
+        self.boss_main_rect = pygame.Rect(SCREEN_WIDTH // 2 - 75, 40, 150, 120)
+
+        # Removal marks per container; each list is compacted once at the end of the frame
+        self.player_bullet_marks = RemovalMarks()
+        self.enemy_marks = RemovalMarks()
+        self.enemy_bullet_marks = RemovalMarks()
+        self.boss_bullet_marks = RemovalMarks()
+        self.power_up_marks = RemovalMarks()
+        self.explosion_marks = RemovalMarks()
+
+        # Spatial indexes over the projectile lists, rebuilt once per frame before they are queried
+        # (None without an accelerator backend: callers fall back to linear scans)
+        if ENABLE_CPP_ACCELERATION:
+            self.player_bullet_index = game_accelerator.ProjectileIndex(SCREEN_WIDTH, SCREEN_HEIGHT)
+            self.enemy_bullet_index = game_accelerator.ProjectileIndex(SCREEN_WIDTH, SCREEN_HEIGHT)
+            self.boss_bullet_index = game_accelerator.ProjectileIndex(SCREEN_WIDTH, SCREEN_HEIGHT)
+        else:
+            self.player_bullet_index = self.enemy_bullet_index = self.boss_bullet_index = None
+
+        self.reset()
+
+    def reset(self):
+        """Back to the instructions screen with a fresh world (was game_logic_reset_all_params)"""
+        config = self.config
+        self.now_ms = self.clock.get_ticks()
+        self.current_game_state = GAME_STATE_INSTRUCTIONS
+        self.player_rect.centerx = SCREEN_WIDTH // 2
+        self.player_rect.centery = SCREEN_HEIGHT * 0.75
+        self.player_lives = config.player_lives_start
+        self.score = 0
+        self.all_enemies_list = []
+        self.player_bullets_list = []
+        self.enemy_bullets_master_list = []
+        self.boss_bullets_master_list = []
+        self.power_ups_list = []
+        self.active_explosions_list = []
+        self.current_level = 1
+        self.score_for_next_level = score_to_next_level_base * self.current_level
+        self.level_up_message_end_time_ms = 0
+        self.boss_active = False
+        self.boss_current_health = config.boss_max_health_base * self.current_level
+        self.boss_main_rect.centerx = SCREEN_WIDTH // 2
+        self.boss_main_rect.top = 40
+        self.boss_state = "ENTERING"
+        self.boss_state_timer = 0
+        self.boss_current_phase = 1
+        self.boss_speed_x_current = boss_initial_speed_x
+        self.boss_base_shoot_cooldown_ms = boss_initial_shoot_cooldown_ms
+        self.boss_last_shot_time_ms = 0
+        self.enemy_spawn_timer = 0
+        self.enemy_spawn_rate_current = config.enemy_spawn_rate_initial
+        self.player_invincible_until_ms = 0
+        self.is_player_blinking_invincible = False
+        self.player_shield_active = False
+        self.player_shield_end_time_ms = 0
+        self.player_multi_shot_active = False
+        self.player_multi_shot_end_time_ms = 0
+        self.player_current_shoot_cooldown_ms = player_base_shoot_cooldown_ms
+        self.player_last_shot_time_ms = 0
+        self.was_hand_detected_this_frame = False
+
+    def start_game(self):
+        """Leave the instructions screen (after calibration) with spawn invincibility"""
+        self.now_ms = self.clock.get_ticks()
+        self.current_game_state = GAME_STATE_PLAYING
+        self.player_invincible_until_ms = self.now_ms + player_invincibility_duration_ms
+
+    def toggle_debug(self):
+        self.show_debug_info = not self.show_debug_info
+
+    def start_boss_fight(self):
+        """Jump straight into the boss fight at the trigger level"""
+        self.current_level = boss_fight_trigger_level
+        self.current_game_state = GAME_STATE_BOSS_FIGHT; self.boss_active = True
+        self.boss_current_health = self.config.boss_max_health_base
+
+    def effective_boss_max_health(self):
+        if self.current_level >= boss_fight_trigger_level:
+            return self.config.boss_max_health_base * (1 + (self.current_level - boss_fight_trigger_level) * 0.5)
+        return self.config.boss_max_health_base
+
+    def entity_count(self):
+        return (len(self.all_enemies_list) + len(self.player_bullets_list) + len(self.enemy_bullets_master_list) +
+                len(self.boss_bullets_master_list) + len(self.power_ups_list) + len(self.active_explosions_list))
+
+    def spawn_explosion(self, center_pos, num_particles=20, *args, **kwargs):
+        budget = self.budget
+        if budget:
+            explosion_cap = budget.explosion_cap
+            if explosion_cap is not None and len(self.active_explosions_list) - len(self.explosion_marks) >= explosion_cap:
+                return
+            num_particles = budget.particle_count(num_particles)
+        self.active_explosions_list.append(Explosion(center_pos, self.now_ms, self.rng, num_particles, *args, **kwargs))
+
+    @property
+    def renderer(self):
+        if self._renderer is None:
+            self._renderer = SessionRenderer(self)
+        return self._renderer
+
+    def render(self, surface):
+        self.renderer.render(surface)
+
+    def _damage_player(self, *explosion_args, **explosion_kwargs):
+        self.player_lives -= 1
+        self.spawn_explosion(self.player_rect.center, *explosion_args, **explosion_kwargs)
+        if self.player_lives > 0: self.player_invincible_until_ms = self.now_ms + player_invincibility_duration_ms
+        else: self.current_game_state = GAME_STATE_GAME_OVER
+
+    def step(self, frame_input):
+        """Advance the world by one frame"""
+        self.now_ms = now_ms = self.clock.get_ticks()
+        config = self.config
+
+        if frame_input.hand_frame:
+            if frame_input.hand_present:
+                self.was_hand_detected_this_frame = True
+                if self.current_game_state == GAME_STATE_PAUSED_NO_HAND: self.current_game_state = GAME_STATE_PLAYING
+            else:
+                self.was_hand_detected_this_frame = False
+                if self.current_game_state in [GAME_STATE_PLAYING, GAME_STATE_BOSS_FIGHT]:
+                    self.current_game_state = GAME_STATE_PAUSED_NO_HAND
+
+        self.is_player_blinking_invincible = now_ms < self.player_invincible_until_ms
+
+        if self.player_shield_active and now_ms > self.player_shield_end_time_ms:
+            self.player_shield_active = False
+        if self.player_multi_shot_active and now_ms > self.player_multi_shot_end_time_ms:
+            self.player_multi_shot_active = False
+            self.player_current_shoot_cooldown_ms = player_base_shoot_cooldown_ms
+
+        if self.current_game_state in (GAME_STATE_INSTRUCTIONS, GAME_STATE_GAME_OVER, GAME_STATE_PAUSED_NO_HAND):
+            return
+        elif self.current_game_state == GAME_STATE_LEVEL_UP:
+            if now_ms > self.level_up_message_end_time_ms:
+                if self.current_level >= boss_fight_trigger_level and not self.boss_active:
+                    self.current_game_state = GAME_STATE_BOSS_FIGHT; self.boss_active = True
+                    self.boss_current_health = int(config.boss_max_health_base * (1 + (self.current_level - boss_fight_trigger_level) * 0.5))
+                    self.all_enemies_list = []
+                    self.boss_state = "ENTERING"; self.boss_current_phase = 1
+                else: self.current_game_state = GAME_STATE_PLAYING
+            return
+
+        phase_timings = self.phase_timings
+        phase_start_s = time.perf_counter() if phase_timings is not None else 0.0
+        self._update_player(frame_input)
+        self._update_projectiles()
+        if phase_timings is not None: phase_start_s = helper_record_phase(phase_timings, "player_projectiles", phase_start_s)
+        self._update_enemies()
+        if phase_timings is not None: phase_start_s = helper_record_phase(phase_timings, "enemies", phase_start_s)
+        is_boss_fight_frame = self._update_boss()
+        if phase_timings is not None: phase_start_s = helper_record_phase(phase_timings, "boss", phase_start_s)
+        self._index_enemy_projectiles(is_boss_fight_frame)
+        if config.bullets_cancel_bullets: self._cancel_bullets(is_boss_fight_frame)
+        self._resolve_player_bullet_hits()
+        self._resolve_player_hits(is_boss_fight_frame)
+        if phase_timings is not None: phase_start_s = helper_record_phase(phase_timings, "collisions", phase_start_s)
+
+        if self.score >= self.score_for_next_level and self.current_game_state == GAME_STATE_PLAYING:
+            self.current_level += 1
+            self.score_for_next_level += score_to_next_level_base * (1 + self.current_level * 0.2)
+            self.current_game_state = GAME_STATE_LEVEL_UP
+            self.level_up_message_end_time_ms = now_ms + level_up_message_duration_ms
+            self.player_invincible_until_ms = now_ms + player_invincibility_duration_ms + 1000
+
+        self.explosion_marks.mark_rejected(self.active_explosions_list, lambda expl_obj: expl_obj.update(now_ms))
+        if self.budget: self.budget.cull_projectiles(self)
+
+        # Single in-place compaction pass per container
+        self.player_bullet_marks.compact(self.player_bullets_list)
+        self.enemy_marks.compact(self.all_enemies_list)
+        self.enemy_bullet_marks.compact(self.enemy_bullets_master_list)
+        self.boss_bullet_marks.compact(self.boss_bullets_master_list)
+        self.power_up_marks.compact(self.power_ups_list)
+        self.explosion_marks.compact(self.active_explosions_list)
+        if phase_timings is not None: helper_record_phase(phase_timings, "effects_compaction", phase_start_s)
+
+    def set_input_transform(self, camera_to_playfield):
+        """Install a camera -> unit playfield transform (input_calibration.py), composed with the playfield's pixel rect"""
+        self.input_transform = camera_to_playfield.then(InputTransform.to_rect(0, SCREEN_WIDTH, PLAYER_PLAYABLE_Y_MIN, PLAYER_PLAYABLE_Y_MAX))
+
+    def _update_player(self, frame_input):
+        player_rect = self.player_rect
+        if frame_input.finger_x_norm is not None and frame_input.finger_y_norm is not None:
+            player_x, player_y = self.input_transform.apply(frame_input.finger_x_norm, frame_input.finger_y_norm)
+            player_rect.centerx = int(player_x); player_rect.centery = int(player_y)
+
+        player_rect.left = max(0, player_rect.left); player_rect.right = min(SCREEN_WIDTH, player_rect.right)
+        player_rect.top = max(PLAYER_PLAYABLE_Y_MIN, player_rect.top); player_rect.bottom = min(PLAYER_PLAYABLE_Y_MAX + player_height // 2, player_rect.bottom)
+
+        if frame_input.pinched and self.now_ms - self.player_last_shot_time_ms > self.player_current_shoot_cooldown_ms:
+            self.player_bullets_list.append(pygame.Rect(player_rect.centerx - player_bullet_width // 2, player_rect.top, player_bullet_width, player_bullet_height))
+            if self.player_multi_shot_active:
+                self.player_bullets_list.append(pygame.Rect(player_rect.left, player_rect.centery - player_bullet_height // 2, player_bullet_width, player_bullet_height))
+                self.player_bullets_list.append(pygame.Rect(player_rect.right - player_bullet_width, player_rect.centery - player_bullet_height // 2, player_bullet_width, player_bullet_height))
+            self.player_last_shot_time_ms = self.now_ms
+
+    def _update_projectiles(self):
+        if ENABLE_CPP_ACCELERATION:
+            # one in-place integrator call per entity kind instead of a move per rect
+            helper_move_rects(self.player_bullets_list, 0, -player_bullet_speed, MOTION_CULL_BEFORE, None, PLAYER_BULLET_KEEP_BOUNDS,
+                              self.player_bullet_marks)
+            helper_move_projectiles(self.enemy_bullets_master_list, self.enemy_bullet_marks)
+            return
+        for pb_idx, b_rect in enumerate(self.player_bullets_list):
+            if b_rect.bottom > 0: b_rect.move_ip(0, -player_bullet_speed)
+            else: self.player_bullet_marks.mark(pb_idx)
+        self.enemy_bullet_marks.mark_rejected(self.enemy_bullets_master_list, EnemyProjectile.update_pos)
+
+    def _update_enemies(self):
+        rng = self.rng
+        config = self.config
+        if self.current_game_state == GAME_STATE_PLAYING:
+            self.enemy_spawn_timer += 1
+            self.enemy_spawn_rate_current = max(15, config.enemy_spawn_rate_initial - (self.current_level -1) * 4)
+            if self.enemy_spawn_timer >= self.enemy_spawn_rate_current:
+                self.enemy_spawn_timer = 0
+                for _ in range(config.enemies_per_spawn):
+                    spawn_x_pos = rng.randint(0, SCREEN_WIDTH - enemy_width_std)
+                    enemy_variant_roll = rng.random() + (self.current_level -1) * 0.03
+                    if enemy_variant_roll < 0.35: enemy_variant = 'normal'
+                    elif enemy_variant_roll < 0.60: enemy_variant = 'shooter'
+                    elif enemy_variant_roll < 0.80: enemy_variant = 'chaser'
+                    else: enemy_variant = 'dodger'
+                    self.all_enemies_list.append(EnemyAI(self, spawn_x_pos, -enemy_height_std, enemy_variant, self.current_level))
+
+        player_rect, player_bullets_list, all_enemies_list = self.player_rect, self.player_bullets_list, self.all_enemies_list
+        if self.player_bullet_index is not None and all_enemies_list:
+            # dodge detection queries this instead of scanning every bullet per enemy
+            self.player_bullet_index.rebuild(*helper_rect_buffers(player_bullets_list))
+        if ENABLE_CPP_ACCELERATION:
+            # the AI never reads another enemy's rect, so the horizontal moves can run as one batch afterwards
+            for enemy_obj_item in all_enemies_list: enemy_obj_item.update_behavior(player_rect, player_bullets_list, all_enemies_list, move_x=False)
+            helper_move_rects([en.rect for en in all_enemies_list], array("d", [en.current_speed_x for en in all_enemies_list]), 0,
+                              MOTION_CLAMP | MOTION_CULL, PLAYFIELD_BOUNDS, ENEMY_KEEP_BOUNDS, self.enemy_marks)
+        else:
+            self.enemy_marks.mark_rejected(all_enemies_list, lambda en: en.update_behavior(player_rect, player_bullets_list, all_enemies_list))
+
+    def _update_boss(self):
+        """Boss state machine and boss-vs-player-bullet hits; returns True if the boss fight ran this frame"""
+        if not (self.boss_active and self.current_game_state == GAME_STATE_BOSS_FIGHT):
+            return False
+        rng = self.rng
+        config = self.config
+        now_ms = self.now_ms
+        boss_main_rect = self.boss_main_rect
+        enemy_bullet_base_speed = config.enemy_bullet_base_speed
+        volley_multiplier = config.boss_volley_multiplier
+
+        self.boss_state_timer += 1
+        if self.boss_state == "ENTERING":
+            boss_main_rect.y += config.base_enemy_speed_y * 0.5
+            if boss_main_rect.top >= 40:
+                self.boss_state = "PHASE_1_ATTACK"
+                self.boss_state_timer = 0
+        elif self.boss_state == "PHASE_1_ATTACK":
+            boss_main_rect.x += self.boss_speed_x_current
+            if boss_main_rect.left < 0 or boss_main_rect.right > SCREEN_WIDTH: self.boss_speed_x_current *= -1
+            if now_ms - self.boss_last_shot_time_ms > self.boss_base_shoot_cooldown_ms:
+                volley_pattern = helper_boss_volley_pattern("spread", (3 + self.boss_current_phase) * volley_multiplier)
+                volley_pattern.fire(self.boss_bullets_master_list, EnemyProjectile, boss_main_rect.centerx, boss_main_rect.bottom,
+                                    enemy_bullet_base_speed + 1.5 + self.boss_current_phase, rng)
+                self.boss_last_shot_time_ms = now_ms
+
+            if self.boss_current_health < config.boss_max_health_base * boss_phase_change_health_threshold_factor * (1 + (self.current_level - boss_fight_trigger_level) * 0.5) and self.boss_current_phase == 1:
+                self.boss_current_phase = 2
+                self.boss_state = "PHASE_TRANSITION"
+                self.boss_state_timer = 0
+                self.spawn_explosion(boss_main_rect.center, 30, 60, 600, colors=[BOSS_SPECIAL_ATTACK_COLOR])
+        elif self.boss_state == "PHASE_TRANSITION":
+            boss_main_rect.x += rng.randint(-5,5)
+            boss_main_rect.y += rng.randint(-2,2)
+            boss_main_rect.clamp_ip(PLAYFIELD_RECT)
+            if self.boss_state_timer > 120 :
+                self.boss_state = "PHASE_2_ATTACK"
+                self.boss_state_timer = 0
+                self.boss_base_shoot_cooldown_ms = max(300, self.boss_base_shoot_cooldown_ms - 150)
+                self.boss_speed_x_current *= 1.3
+        elif self.boss_state == "PHASE_2_ATTACK":
+            boss_main_rect.x += self.boss_speed_x_current
+            if boss_main_rect.left < 0 or boss_main_rect.right > SCREEN_WIDTH: self.boss_speed_x_current *= -1
+            if now_ms - self.boss_last_shot_time_ms > self.boss_base_shoot_cooldown_ms:
+                volley_pattern = helper_boss_volley_pattern("aimed_fan", volley_multiplier)
+                volley_pattern.fire(self.boss_bullets_master_list, EnemyProjectile, boss_main_rect.centerx, boss_main_rect.bottom,
+                                    self.player_rect.centerx, enemy_bullet_base_speed + 3 + self.boss_current_phase)
+                self.boss_last_shot_time_ms = now_ms
+
+        if ENABLE_CPP_ACCELERATION: helper_move_projectiles(self.boss_bullets_master_list, self.boss_bullet_marks)
+        else: self.boss_bullet_marks.mark_rejected(self.boss_bullets_master_list, EnemyProjectile.update_pos)
+        for idx, p_b in enumerate(self.player_bullets_list):
+            if self.player_bullet_marks.is_marked(idx): continue
+            if p_b.colliderect(boss_main_rect):
+                self.player_bullet_marks.mark(idx)
+                self.boss_current_health -= 1
+                self.score += 20
+                self.spawn_explosion(p_b.center, 7, 18, 250)
+                if self.boss_current_health <= 0:
+                    self.score += 750 * self.current_level; self.spawn_explosion(boss_main_rect.center, 100, 150, 2000)
+                    self.boss_active = False; self.current_game_state = GAME_STATE_PLAYING
+                    pu_rect = pygame.Rect(boss_main_rect.centerx - 20, boss_main_rect.centery - 20, 40, 40)
+                    self.power_ups_list.append([pu_rect, rng.choice([POWER_UP_TYPE_SHIELD, POWER_UP_TYPE_MULTI_SHOT])])
+                    break
+        return True
+
+    def _index_enemy_projectiles(self, is_boss_fight_frame):
+        """Rebuild the enemy / boss bullet indexes once all of this frame's bullets have moved and spawned"""
+        if self.enemy_bullet_index is None: return
+        self.enemy_bullet_index.rebuild(*helper_rect_buffers([eb.rect for eb in self.enemy_bullets_master_list]))
+        if is_boss_fight_frame:
+            self.boss_bullet_index.rebuild(*helper_rect_buffers([bb.rect for bb in self.boss_bullets_master_list]))
+
+    def _cancel_bullets(self, is_boss_fight_frame):
+        """Player bullets destroy the enemy / boss bullets they touch, one for one"""
+        player_bullets_list, player_bullet_marks = self.player_bullets_list, self.player_bullet_marks
+        if not player_bullets_list: return
+        targets = [(self.enemy_bullet_index, self.enemy_bullets_master_list, self.enemy_bullet_marks)]
+        if is_boss_fight_frame: targets.append((self.boss_bullet_index, self.boss_bullets_master_list, self.boss_bullet_marks))
+        query_buffers = helper_rect_buffers(player_bullets_list) if self.enemy_bullet_index is not None else None
+        for bullet_index, bullets, bullet_marks in targets:
+            if not bullets: continue
+            if bullet_index is not None: touching_pairs = bullet_index.query_rects(*query_buffers)
+            else: touching_pairs = [(pb_idx, b_idx) for pb_idx, p_b in enumerate(player_bullets_list) for b_idx, b in enumerate(bullets) if p_b.colliderect(b.rect)]
+            for pb_idx, b_idx in touching_pairs:
+                if player_bullet_marks.is_marked(pb_idx) or bullet_marks.is_marked(b_idx): continue
+                player_bullet_marks.mark(pb_idx); bullet_marks.mark(b_idx)
+                self.spawn_explosion(bullets[b_idx].rect.center, 5, 12, 200)
+
+    def _drop_power_up(self, enemy_obj_item):
+        if self.rng.random() < self.config.power_up_base_drop_chance + (self.current_level -1)*0.01:
+            pu_rect = pygame.Rect(enemy_obj_item.rect.centerx - 18, enemy_obj_item.rect.centery - 18, 36, 36)
+            self.power_ups_list.append([pu_rect, self.rng.choice([POWER_UP_TYPE_SHIELD, POWER_UP_TYPE_MULTI_SHOT])])
+
+    def _resolve_player_bullet_hits(self):
+        if ENABLE_CPP_ACCELERATION:
+            # move_ip truncates, so the integrator gets the truncated speed
+            helper_move_rects([pu_item[0] for pu_item in self.power_ups_list], 0, int(self.config.base_enemy_speed_y * 0.6),
+                              MOTION_CULL_BEFORE, None, POWER_UP_KEEP_BOUNDS, self.power_up_marks)
+        else:
+            for pu_idx, pu_item in enumerate(self.power_ups_list):
+                if pu_item[0].top < SCREEN_HEIGHT: pu_item[0].move_ip(0, self.config.base_enemy_speed_y * 0.6)
+                else: self.power_up_marks.mark(pu_idx)
+
+        player_bullets_list, all_enemies_list = self.player_bullets_list, self.all_enemies_list
+        player_bullet_marks, enemy_marks = self.player_bullet_marks, self.enemy_marks
+        if ENABLE_CPP_ACCELERATION and len(player_bullets_list) > 0 and len(all_enemies_list) > 0:
+            # تبدیل به فرمت سازگار با C++ (flat SoA arrays)
+            collisions = game_accelerator.check_bullet_enemy_collisions_soa(
+                array("f", [b.x for b in player_bullets_list]), array("f", [b.y for b in player_bullets_list]),
+                array("f", [e.rect.x for e in all_enemies_list]), array("f", [e.rect.y for e in all_enemies_list]),
+                player_bullet_width, player_bullet_height,
+                enemy_width_std, enemy_height_std)
+
+            # A bullet may hit several enemies in the same frame, so mark it only after the pass
+            player_b_hit_enemy_indices = []
+            for pb_idx, en_idx in collisions:
+                if player_bullet_marks.is_marked(pb_idx) or enemy_marks.is_marked(en_idx): continue
+                player_b_hit_enemy_indices.append(pb_idx)
+                enemy_obj_item = all_enemies_list[en_idx]
+                self.spawn_explosion(enemy_obj_item.rect.center, 12, 30, 350)
+                if enemy_obj_item.apply_damage(1):
+                    enemy_marks.mark(en_idx)
+                    self.score += 15 * enemy_obj_item.player_level_modifier
+                    self._drop_power_up(enemy_obj_item)
+            for pb_idx in player_b_hit_enemy_indices: player_bullet_marks.mark(pb_idx)
+        else:
+            # استفاده از روش Python معمول
+            for pb_idx, p_bullet_rect in enumerate(player_bullets_list):
+                if player_bullet_marks.is_marked(pb_idx): continue
+                for en_idx, enemy_obj_item in enumerate(all_enemies_list):
+                    if enemy_marks.is_marked(en_idx): continue
+                    if p_bullet_rect.colliderect(enemy_obj_item.rect):
+                        player_bullet_marks.mark(pb_idx)
+                        self.spawn_explosion(enemy_obj_item.rect.center, 12, 30, 350)
+                        if enemy_obj_item.apply_damage(1):
+                            enemy_marks.mark(en_idx)
+                            self.score += 15 * enemy_obj_item.player_level_modifier
+                            self._drop_power_up(enemy_obj_item)
+                        break
+
+    def _resolve_player_hits(self, is_boss_fight_frame):
+        # Player vs everything: a single batched query per frame instead of one call per object
+        now_ms = self.now_ms
+        is_player_vulnerable = not self.is_player_blinking_invincible and not self.player_shield_active
+        if self.enemy_bullet_index is not None:
+            # bullets come from this frame's projectile indexes; power-ups and enemies stay one small batch
+            player_rect = self.player_rect
+            pu_hit_indices, _, _, en_hit_indices = helper_query_player_hits(
+                player_rect, self.power_ups_list, [], [], self.all_enemies_list if is_player_vulnerable else [])
+            player_box = (player_rect.x, player_rect.y, player_rect.width, player_rect.height)
+            eb_hit_indices = self.enemy_bullet_index.query_rect(*player_box) if is_player_vulnerable else []
+            bb_hit_indices = self.boss_bullet_index.query_rect(*player_box) if is_player_vulnerable and is_boss_fight_frame else []
+        else:
+            pu_hit_indices, eb_hit_indices, bb_hit_indices, en_hit_indices = helper_query_player_hits(
+                self.player_rect, self.power_ups_list,
+                self.enemy_bullets_master_list if is_player_vulnerable else [],
+                self.boss_bullets_master_list if is_player_vulnerable and is_boss_fight_frame else [],
+                self.all_enemies_list if is_player_vulnerable else [])
+
+        bb_hit_idx = self.boss_bullet_marks.first_unmarked(bb_hit_indices)
+        if bb_hit_idx is not None:
+            self.boss_bullet_marks.mark(bb_hit_idx)
+            self._damage_player()
+
+        en_hit_idx = self.enemy_marks.first_unmarked(en_hit_indices)
+        if en_hit_idx is not None:
+            self.enemy_marks.mark(en_hit_idx)
+            enemy_obj_item_coll = self.all_enemies_list[en_hit_idx]
+            self._damage_player(num_particles=30, max_radius=50)
+            self.spawn_explosion(enemy_obj_item_coll.rect.center)
+
+        eb_hit_idx = self.enemy_bullet_marks.first_unmarked(eb_hit_indices)
+        if eb_hit_idx is not None:
+            self.enemy_bullet_marks.mark(eb_hit_idx)
+            self._damage_player()
+
+        pu_hit_idx = self.power_up_marks.first_unmarked(pu_hit_indices)
+        if pu_hit_idx is not None:
+            self.power_up_marks.mark(pu_hit_idx)
+            pu_item_type = self.power_ups_list[pu_hit_idx][1]
+            if pu_item_type == POWER_UP_TYPE_SHIELD:
+                self.player_shield_active = True
+                self.player_shield_end_time_ms = now_ms + player_shield_duration_ms
+            elif pu_item_type == POWER_UP_TYPE_MULTI_SHOT:
+                self.player_multi_shot_active = True
+                self.player_multi_shot_end_time_ms = now_ms + player_multi_shot_duration_ms
+                self.player_current_shoot_cooldown_ms = player_base_shoot_cooldown_ms // 2
@@ -0,0 +1,233 @@
+"""
+GC Policy - Garbage collection on the game loop's terms
+The loop allocates every frame (explosion particles, Rects, projectiles,
+rebuilt lists), so CPython's automatic collector fires at whatever frame
+crosses a threshold, and the old generation's full scans of every
+startup object (fonts, sprites, MediaPipe graph, modules) show up as
+frame spikes in boss fights. In the scheduled mode the policy:
+
+- collects once and gc.freeze()s everything alive at start(), so later
+  collections never scan the long-lived startup objects again
+- raises the thresholds (fewer, still cheap, young collections)
+- disables automatic collection; the frame scheduler asks for the generation
+  CPython would have collected in its idle window, when the estimated pause
+  fits, and only forces a young collection mid-frame when it is far overdue
+
+Every collection, scheduled or not, is timed through gc.callbacks and
+counted per minute of play, split into idle-window and mid-frame pauses.
+The auto mode keeps CPython's collector and only measures, for comparison.
+
+Run:
+    python airplane.py --gc-mode auto                 (measure CPython's default behaviour)
+    python airplane.py --gc-threshold 5000,20,50 --no-gc-freeze
+"""
+
+import argparse
+import collections
+import gc
+import time
+
+GC_MODE_SCHEDULED = "scheduled"
+GC_MODE_AUTO = "auto"
+GC_MODES = (GC_MODE_SCHEDULED, GC_MODE_AUTO)
+GC_GENERATIONS = 3
+SECONDS_PER_MINUTE = 60.0
+
+
+class GCPolicyConfig:
+    """Collection mode, thresholds and the overdue limits; the defaults schedule collections in idle time"""
+
+    def __init__(self, mode=GC_MODE_SCHEDULED, freeze=True, thresholds=(2000, 20, 50), overdue_factor=8,
+                 max_defer_s=30.0, history_minutes=60):
+        self.mode = mode
+        self.freeze = freeze  # gc.freeze() the objects alive at start()
+        self.thresholds = thresholds  # gc.set_threshold() in the scheduled mode
+        # collect anyway, mid-frame, once the young generation holds overdue_factor x its threshold
+        # or a pending collection has waited max_defer_s
+        self.overdue_factor = overdue_factor
+        self.max_defer_s = max_defer_s
+        self.history_minutes = history_minutes  # finished minutes kept for the report
+
+
+class GCMinute:
+    """GC pauses within one minute of play"""
+
+    def __init__(self, index):
+        self.index = index
+        self.pauses = 0
+        self.pause_ms = 0.0
+        self.max_pause_ms = 0.0
+        self.frame_pauses = 0  # collections that ran inside a frame instead of an idle window
+        self.frame_pause_ms = 0.0
+        self.pauses_by_generation = [0] * GC_GENERATIONS
+
+    def add(self, generation, pause_ms, in_idle):
+        self.pauses += 1
+        self.pause_ms += pause_ms
+        self.max_pause_ms = max(self.max_pause_ms, pause_ms)
+        self.pauses_by_generation[generation] += 1
+        if not in_idle:
+            self.frame_pauses += 1
+            self.frame_pause_ms += pause_ms
+
+
+class GCPolicy:
+    """Freezes startup objects, tunes thresholds and collects in the scheduler's idle windows; times every pause"""
+
+    def __init__(self, config=None):
+        self.config = config if config else GCPolicyConfig()
+        self.scheduled = self.config.mode == GC_MODE_SCHEDULED
+        self.frozen_objects = 0
+        self.collections_forced = 0
+        self.pauses_total = 0
+        self.pause_ms_total = 0.0
+        self.frame_pauses_total = 0
+        self.minutes = collections.deque(maxlen=self.config.history_minutes)
+        self._cost_ms = [0.5, 2.0, 20.0]  # EMA pause per generation, for fitting collections into idle windows
+        self._pending_since_s = None
+        self._in_idle = False
+        self._pause_start_s = None
+        self._start_s = None
+        self._current_minute = None
+        self._saved = None
+
+    def start(self):
+        """Call once everything long-lived exists (right before the game loop)"""
+        if self._start_s is not None:
+            return
+        self._start_s = time.perf_counter()
+        self._current_minute = GCMinute(0)
+        if self.scheduled:
+            self._saved = (gc.isenabled(), gc.get_threshold())
+            gc.collect()
+            if self.config.freeze:
+                gc.freeze()
+                self.frozen_objects = gc.get_freeze_count()
+            gc.set_threshold(*self.config.thresholds)
+            gc.disable()
+        gc.callbacks.append(self._on_gc)
+
+    def stop(self):
+        if self._start_s is None:
+            return
+        if self._on_gc in gc.callbacks: gc.callbacks.remove(self._on_gc)
+        if self._saved is not None:
+            was_enabled, thresholds = self._saved
+            gc.set_threshold(*thresholds)
+            if was_enabled: gc.enable()
+            self._saved = None
+        self._roll_minute(time.perf_counter())
+        self.minutes.append(self._current_minute)  # the minute in progress counts too
+        self._start_s = None
+
+    def pending_generation(self):
+        """The generation CPython's automatic GC would collect now, or None"""
+        counts, thresholds = gc.get_count(), gc.get_threshold()
+        if counts[0] <= thresholds[0]:
+            return None
+        generation = 0
+        for older in range(1, GC_GENERATIONS):
+            if thresholds[older] and counts[older] >= thresholds[older]: generation = older
+        return generation
+
+    def collect_in_idle(self, now_s, idle_end_s):
+        """Collect the pending generation if its estimated pause fits before idle_end_s; returns the time after"""
+        if not self.scheduled or self._start_s is None:
+            return now_s
+        generation = self.pending_generation()
+        if generation is None:
+            return now_s
+        if self._pending_since_s is None: self._pending_since_s = now_s
+        if now_s + self._cost_ms[generation] / 1000.0 >= idle_end_s:
+            return now_s
+        self._in_idle = True
+        try:
+            gc.collect(generation)
+        finally:
+            self._in_idle = False
+        return time.perf_counter()
+
+    def collect_if_overdue(self):
+        """Mid-frame safety valve for when the idle windows stay too short"""
+        if not self.scheduled or self._start_s is None:
+            return
+        generation = self.pending_generation()
+        if generation is None:
+            return
+        if self._pending_since_s is not None and time.perf_counter() - self._pending_since_s > self.config.max_defer_s:
+            self.collections_forced += 1; gc.collect(generation)
+        elif gc.get_count()[0] > gc.get_threshold()[0] * self.config.overdue_factor:
+            self.collections_forced += 1; gc.collect(0)
+
+    def _on_gc(self, phase, info):
+        now_s = time.perf_counter()
+        if phase == "start":
+            self._pause_start_s = now_s
+            return
+        if self._pause_start_s is None:
+            return
+        pause_ms = (now_s - self._pause_start_s) * 1000.0
+        self._pause_start_s = None
+        generation = info["generation"]
+        self._cost_ms[generation] += 0.3 * (pause_ms - self._cost_ms[generation])
+        self._pending_since_s = None
+        self.pauses_total += 1
+        self.pause_ms_total += pause_ms
+        if not self._in_idle: self.frame_pauses_total += 1
+        self._roll_minute(now_s)
+        self._current_minute.add(generation, pause_ms, self._in_idle)
+
+    def _roll_minute(self, now_s):
+        minute_index = int((now_s - self._start_s) / SECONDS_PER_MINUTE)
+        while self._current_minute.index < minute_index:
+            self.minutes.append(self._current_minute)
+            self._current_minute = GCMinute(self._current_minute.index + 1)
+
+    def last_minute(self):
+        """The most recent finished minute (the running one before the first minute is over)"""
+        if self._start_s is None:
+            return self.minutes[-1] if self.minutes else GCMinute(0)
+        self._roll_minute(time.perf_counter())
+        return self.minutes[-1] if self.minutes else self._current_minute
+
+    def overlay_text(self):
+        minute = self.last_minute()
+        return (f"GC {self.config.mode}: {minute.pauses}/min {minute.pause_ms:.1f} ms "
+                f"(max {minute.max_pause_ms:.1f}) in-frame {minute.frame_pauses}")
+
+    def report_lines(self):
+        lines = [f"GC {self.config.mode}" + (f", thresholds {gc.get_threshold()}" if not self.scheduled else
+                                             f", thresholds {self.config.thresholds}, {self.frozen_objects} objects frozen") +
+                 f": {self.pauses_total} pauses, {self.pause_ms_total:.1f} ms, {self.frame_pauses_total} inside frames"
+                 f" ({self.collections_forced} forced)"]
+        minutes = list(self.minutes) if self._start_s is None else list(self.minutes) + [self._current_minute]
+        for minute in minutes:
+            lines.append(f"  minute {minute.index + 1:>3}: {minute.pauses:>4} pauses {minute.pause_ms:>8.1f} ms "
+                         f"max {minute.max_pause_ms:>6.2f} ms  in-frame {minute.frame_pauses:>3} ({minute.frame_pause_ms:.1f} ms)  "
+                         f"gen0/1/2 {'/'.join(str(count) for count in minute.pauses_by_generation)}")
+        return lines
+
+
+def parse_thresholds(text):
+    """'2000,20,50' -> (2000, 20, 50) for --gc-threshold"""
+    try:
+        thresholds = tuple(int(part) for part in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected THRESHOLD0,THRESHOLD1,THRESHOLD2, got {text!r}")
+    if len(thresholds) != GC_GENERATIONS or thresholds[0] <= 0:
+        raise argparse.ArgumentTypeError(f"expected three thresholds with a positive first one, got {text!r}")
+    return thresholds
+
+
+def add_gc_arguments(parser):
+    """--gc-mode / --gc-threshold / --no-gc-freeze, on the game's argument parser"""
+    group = parser.add_argument_group("garbage collection")
+    group.add_argument("--gc-mode", choices=GC_MODES, default=GC_MODE_SCHEDULED,
+                       help="scheduled: collect in idle windows between frames, auto: CPython's collector (measured only)")
+    group.add_argument("--gc-threshold", type=parse_thresholds, default=GCPolicyConfig().thresholds,
+                       help="gc.set_threshold values in the scheduled mode, e.g. 2000,20,50")
+    group.add_argument("--no-gc-freeze", action="store_true", help="do not gc.freeze() the startup objects")
+
+
+def gc_config_from_args(args):
+    return GCPolicyConfig(args.gc_mode, not args.no_gc_freeze, args.gc_threshold)
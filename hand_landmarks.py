@@ -0,0 +1,134 @@
+"""
+Hand Landmarks - MediaPipe hand results as a compact per-frame array, plus a gesture classifier
+Reading a landmark from the MediaPipe result goes through protobuf attribute
+lookups (multi_hand_landmarks[0].landmark[8].x), and the game, the calibration
+screen and the overlays each repeated them. The camera thread now converts
+the first hand once per frame into one array("f") of 21 x (x, y, z), stored
+on the frame record with its capture timestamp; everything downstream reads
+that array.
+
+GestureClassifier runs on the same array, so gestures cost no extra
+inference: pinch, open palm, fist and two-finger (index + middle up). A
+finger counts as extended when its tip is clearly further from the wrist
+than its middle (PIP) joint; a new gesture is only reported once it has held
+for a few camera frames.
+
+Run: python bench_hand_pipeline.py hand_clip.mp4   (conversion cost and gesture counts)
+"""
+
+import math
+from array import array
+
+NUM_HAND_LANDMARKS = 21
+WRIST_ID = 0
+THUMB_IP_ID = 3
+THUMB_TIP_ID = 4
+INDEX_FINGER_PIP_ID = 6
+INDEX_FINGER_TIP_ID = 8
+MIDDLE_FINGER_PIP_ID = 10
+MIDDLE_FINGER_TIP_ID = 12
+RING_FINGER_PIP_ID = 14
+RING_FINGER_TIP_ID = 16
+PINKY_MCP_ID = 17
+PINKY_PIP_ID = 18
+PINKY_TIP_ID = 20
+# (tip, pip) of index, middle, ring and pinky
+FINGER_JOINTS = ((INDEX_FINGER_TIP_ID, INDEX_FINGER_PIP_ID), (MIDDLE_FINGER_TIP_ID, MIDDLE_FINGER_PIP_ID),
+                 (RING_FINGER_TIP_ID, RING_FINGER_PIP_ID), (PINKY_TIP_ID, PINKY_PIP_ID))
+
+GESTURE_PINCH = "pinch"
+GESTURE_OPEN_PALM = "open_palm"
+GESTURE_FIST = "fist"
+GESTURE_TWO_FINGER = "two_finger"
+GESTURES = (GESTURE_PINCH, GESTURE_OPEN_PALM, GESTURE_FIST, GESTURE_TWO_FINGER)
+
+
+class HandLandmarks:
+    """One hand's 21 landmarks as a flat array("f") [x0, y0, z0, x1, ...] (normalized image coordinates)"""
+
+    __slots__ = ("coords", "capture_s")
+
+    def __init__(self, coords, capture_s):
+        self.coords = coords
+        self.capture_s = capture_s
+
+    @classmethod
+    def from_results(cls, hand_results, capture_s):
+        """First hand of a MediaPipe Hands result, or None when no complete hand was detected"""
+        if hand_results is None or not hand_results.multi_hand_landmarks:
+            return None
+        landmark_list = hand_results.multi_hand_landmarks[0].landmark
+        if len(landmark_list) < NUM_HAND_LANDMARKS:
+            return None
+        coords = array("f", bytes(4 * 3 * NUM_HAND_LANDMARKS))
+        offset = 0
+        for landmark_pt in landmark_list[:NUM_HAND_LANDMARKS]:
+            coords[offset] = landmark_pt.x; coords[offset + 1] = landmark_pt.y; coords[offset + 2] = landmark_pt.z
+            offset += 3
+        return cls(coords, capture_s)
+
+    def point(self, landmark_id):
+        offset = 3 * landmark_id
+        return self.coords[offset], self.coords[offset + 1], self.coords[offset + 2]
+
+    def distance(self, landmark_id1, landmark_id2):
+        """3D distance between two landmarks (the pinch distance uses this)"""
+        coords, offset1, offset2 = self.coords, 3 * landmark_id1, 3 * landmark_id2
+        return math.sqrt((coords[offset1] - coords[offset2]) ** 2 + (coords[offset1 + 1] - coords[offset2 + 1]) ** 2 +
+                         (coords[offset1 + 2] - coords[offset2 + 2]) ** 2)
+
+    def distance_2d(self, landmark_id1, landmark_id2):
+        coords, offset1, offset2 = self.coords, 3 * landmark_id1, 3 * landmark_id2
+        return math.hypot(coords[offset1] - coords[offset2], coords[offset1 + 1] - coords[offset2 + 1])
+
+
+class GestureClassifier:
+    """Landmarks (+ the filtered pinch state) in, debounced gesture (or None) out"""
+
+    def __init__(self, extension_ratio=1.15, hold_frames=3):
+        self.extension_ratio = extension_ratio  # tip-to-wrist / pip-to-wrist above this = finger extended
+        self.hold_frames = hold_frames  # camera frames a new gesture must persist before it is reported
+        self.gesture = None
+        self._candidate = None
+        self._candidate_frames = 0
+
+    def reset(self):
+        """Hand lost: drop the current gesture"""
+        self.gesture = self._candidate = None
+        self._candidate_frames = 0
+
+    def extended_fingers(self, hand):
+        """(index, middle, ring, pinky) extended flags"""
+        ratio = self.extension_ratio
+        return tuple(hand.distance_2d(tip_id, WRIST_ID) > ratio * hand.distance_2d(pip_id, WRIST_ID)
+                     for tip_id, pip_id in FINGER_JOINTS)
+
+    def classify(self, hand, pinched):
+        """Gesture of this frame alone; pinched comes from the pinch hysteresis so both agree on what a pinch is"""
+        if pinched:
+            return GESTURE_PINCH
+        index_up, middle_up, ring_up, pinky_up = self.extended_fingers(hand)
+        if index_up and middle_up and ring_up and pinky_up:
+            # a palm also needs the thumb out, away from the pinky side of the hand
+            thumb_out = hand.distance_2d(THUMB_TIP_ID, PINKY_MCP_ID) > hand.distance_2d(THUMB_IP_ID, PINKY_MCP_ID)
+            return GESTURE_OPEN_PALM if thumb_out else None
+        if not (index_up or middle_up or ring_up or pinky_up):
+            return GESTURE_FIST
+        if index_up and middle_up and not (ring_up or pinky_up):
+            return GESTURE_TWO_FINGER
+        return None
+
+    def update(self, hand, pinched):
+        """Classify a new camera frame; returns the debounced gesture"""
+        gesture = self.classify(hand, pinched)
+        if gesture == self.gesture:
+            self._candidate, self._candidate_frames = None, 0
+            return self.gesture
+        if gesture != self._candidate:
+            self._candidate, self._candidate_frames = gesture, 0
+        self._candidate_frames += 1
+        # pinch fires shots, so it is never held back
+        if self._candidate_frames >= self.hold_frames or gesture == GESTURE_PINCH:
+            self.gesture = gesture
+            self._candidate, self._candidate_frames = None, 0
+        return self.gesture
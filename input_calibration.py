@@ -0,0 +1,199 @@
+"""
+Input Calibration - Per-user camera-to-playfield transform, measured once and saved to a profile
+The ship used to follow the index tip through two fixed ranges (x 0.12..0.88,
+y 0.2..0.8 of the camera image), whatever the player's reach, camera angle or
+distance. Calibration now asks the player to point at the four corners of the
+playfield and hold still, takes the median fingertip position at each, and
+fits a perspective transform (homography) from camera space to playfield
+space. The transform goes to a small JSON profile and is loaded on the next
+start; with no profile the old fixed ranges are the (affine) default.
+
+GameSession composes the profile's camera -> unit playfield transform with the
+playfield's pixel rectangle, so each frame maps the fingertip with one 3x3
+matrix application instead of two range mappings.
+
+Run:
+    python airplane.py --recalibrate                          (measure again, overwrite the profile)
+    python airplane.py --input-profile profiles/kiosk_left.json
+"""
+
+import collections
+import json
+import os
+
+PROFILE_VERSION = 1
+DEFAULT_PROFILE_PATH = "input_profile.json"
+DEFAULT_CAMERA_RANGE = (0.12, 0.88, 0.2, 0.8)  # x min, x max, y min, y max of the uncalibrated mapping
+# Where the player is asked to point, in unit playfield coordinates (0..1 across the playfield)
+CALIBRATION_TARGETS = ((0.1, 0.1), (0.9, 0.1), (0.9, 0.9), (0.1, 0.9))
+MIN_CAMERA_AREA = 0.005  # quads smaller than this (normalized camera area) are a failed calibration
+
+
+def solve_linear_system(rows, rhs):
+    """Gaussian elimination with partial pivoting; ValueError when the system is singular"""
+    size = len(rows)
+    matrix = [list(row) + [value] for row, value in zip(rows, rhs)]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda row_idx: abs(matrix[row_idx][column]))
+        if abs(matrix[pivot][column]) < 1e-12:
+            raise ValueError("degenerate calibration points")
+        matrix[column], matrix[pivot] = matrix[pivot], matrix[column]
+        for row_idx in range(column + 1, size):
+            factor = matrix[row_idx][column] / matrix[column][column]
+            for col_idx in range(column, size + 1): matrix[row_idx][col_idx] -= factor * matrix[column][col_idx]
+    solution = [0.0] * size
+    for row_idx in range(size - 1, -1, -1):
+        solution[row_idx] = (matrix[row_idx][size] - sum(matrix[row_idx][col_idx] * solution[col_idx]
+                                                         for col_idx in range(row_idx + 1, size))) / matrix[row_idx][row_idx]
+    return solution
+
+
+def quad_signed_area(points):
+    """Shoelace area; positive for the clockwise-on-screen order of CALIBRATION_TARGETS (y grows downwards)"""
+    return 0.5 * sum(points[idx][0] * points[(idx + 1) % len(points)][1] - points[(idx + 1) % len(points)][0] * points[idx][1]
+                     for idx in range(len(points)))
+
+
+class InputTransform:
+    """Projective 2D transform as a row-major 3x3 matrix; apply(x, y) maps one point"""
+
+    __slots__ = ("matrix",)
+
+    def __init__(self, matrix):
+        if len(matrix) != 9:
+            raise ValueError("an input transform needs 9 matrix entries")
+        self.matrix = tuple(float(value) for value in matrix)
+
+    @classmethod
+    def from_ranges(cls, x_min, x_max, y_min, y_max):
+        """Affine map of the camera rectangle x_min..x_max / y_min..y_max onto the unit playfield"""
+        if x_max == x_min or y_max == y_min:
+            raise ValueError("empty camera range")
+        scale_x, scale_y = 1.0 / (x_max - x_min), 1.0 / (y_max - y_min)
+        return cls((scale_x, 0.0, -x_min * scale_x, 0.0, scale_y, -y_min * scale_y, 0.0, 0.0, 1.0))
+
+    @classmethod
+    def to_rect(cls, left, right, top, bottom):
+        """Unit playfield -> the pixel rectangle left..right / top..bottom"""
+        return cls((right - left, 0.0, left, 0.0, bottom - top, top, 0.0, 0.0, 1.0))
+
+    @classmethod
+    def from_point_pairs(cls, camera_points, playfield_points):
+        """Homography through four (camera point -> playfield point) pairs"""
+        if len(camera_points) != 4 or len(playfield_points) != 4:
+            raise ValueError("a perspective transform needs exactly four point pairs")
+        rows, rhs = [], []
+        for (x, y), (u, v) in zip(camera_points, playfield_points):
+            rows.append((x, y, 1.0, 0.0, 0.0, 0.0, -u * x, -u * y)); rhs.append(u)
+            rows.append((0.0, 0.0, 0.0, x, y, 1.0, -v * x, -v * y)); rhs.append(v)
+        return cls(solve_linear_system(rows, rhs) + [1.0])
+
+    def then(self, other):
+        """The transform that applies self, then other"""
+        a, b = other.matrix, self.matrix
+        return InputTransform([sum(a[3 * row + k] * b[3 * k + col] for k in range(3)) for row in range(3) for col in range(3)])
+
+    @property
+    def is_affine(self):
+        return self.matrix[6] == 0.0 and self.matrix[7] == 0.0 and self.matrix[8] == 1.0
+
+    def apply(self, x, y):
+        m0, m1, m2, m3, m4, m5, m6, m7, m8 = self.matrix
+        w = m6 * x + m7 * y + m8
+        return (m0 * x + m1 * y + m2) / w, (m3 * x + m4 * y + m5) / w
+
+
+DEFAULT_INPUT_TRANSFORM = InputTransform.from_ranges(*DEFAULT_CAMERA_RANGE)
+
+
+class CalibrationRecorder:
+    """Collects the player's fingertip at each target: a target is taken once the tip holds still for hold_frames"""
+
+    def __init__(self, targets=CALIBRATION_TARGETS, hold_frames=15, hold_radius=0.015):
+        self.targets = targets
+        self.hold_frames = hold_frames
+        self.hold_radius = hold_radius  # max distance from the window's median that still counts as holding still
+        self.camera_points = []
+        self._window = collections.deque(maxlen=hold_frames)
+
+    @property
+    def done(self):
+        return len(self.camera_points) == len(self.targets)
+
+    @property
+    def current_target(self):
+        """Unit playfield point to point at now, or None when every target is recorded"""
+        return None if self.done else self.targets[len(self.camera_points)]
+
+    def hold_progress(self):
+        return len(self._window) / self.hold_frames
+
+    def reset_hold(self):
+        """Hand lost or moved: the current target starts over"""
+        self._window.clear()
+
+    def add(self, x, y):
+        """One fingertip sample (normalized camera coordinates); returns True when it completed a target"""
+        if self.done:
+            return False
+        window = self._window
+        window.append((x, y))
+        median_x, median_y = sorted(px for px, _ in window)[len(window) // 2], sorted(py for _, py in window)[len(window) // 2]
+        if (x - median_x) ** 2 + (y - median_y) ** 2 > self.hold_radius ** 2:
+            window.clear(); window.append((x, y))
+            return False
+        if len(window) < self.hold_frames:
+            return False
+        self.camera_points.append((median_x, median_y))
+        window.clear()
+        return True
+
+    def transform(self):
+        """Camera -> unit playfield transform from the recorded points; ValueError if they do not span a usable quad"""
+        if not self.done:
+            raise ValueError("calibration is not finished")
+        area = quad_signed_area(self.camera_points)
+        if abs(area) < MIN_CAMERA_AREA or (area > 0) != (quad_signed_area(self.targets) > 0):
+            raise ValueError("the recorded corners are too close together or out of order")
+        return InputTransform.from_point_pairs(self.camera_points, self.targets)
+
+
+def save_profile(path, transform, camera_points=()):
+    """Write the camera -> unit playfield transform (and the measured corners, for reference) atomically"""
+    profile = {"version": PROFILE_VERSION, "camera_to_playfield": list(transform.matrix),
+               "camera_points": [list(point) for point in camera_points], "playfield_points": [list(point) for point in CALIBRATION_TARGETS]}
+    directory = os.path.dirname(path)
+    if directory: os.makedirs(directory, exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as profile_file:
+        json.dump(profile, profile_file, indent=2)
+    os.replace(temp_path, path)
+
+
+def load_profile(path):
+    """InputTransform from a profile file; None if there is none, ValueError if it is unreadable"""
+    try:
+        with open(path, encoding="utf-8") as profile_file:
+            profile = json.load(profile_file)
+    except FileNotFoundError:
+        return None
+    except json.JSONDecodeError as error:
+        raise ValueError(f"{path}: not a valid input profile ({error})")
+    if not isinstance(profile, dict) or profile.get("version") != PROFILE_VERSION:
+        raise ValueError(f"{path}: unsupported input profile version (expected {PROFILE_VERSION})")
+    try:
+        return InputTransform(profile["camera_to_playfield"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"{path}: input profile without a valid camera_to_playfield matrix")
+
+
+def add_calibration_arguments(parser):
+    """--input-profile / --recalibrate, on the game's argument parser"""
+    group = parser.add_argument_group("hand range calibration")
+    group.add_argument("--input-profile", default=DEFAULT_PROFILE_PATH, help="per-user camera-to-playfield transform (JSON)")
+    group.add_argument("--recalibrate", action="store_true", help="measure the hand's range again at calibration, even with a profile")
+
+
+def calibration_options_from_args(args):
+    """(profile path, recalibrate)"""
+    return args.input_profile, args.recalibrate
@@ -0,0 +1,137 @@
+"""
+Input Filter - Hand input processing between MediaPipe and the game
+Smooths the index-tip position (One-Euro or exponential filter), holds it
+inside a small dead-zone and turns the thumb-index distance into a pinch
+with separate press / release thresholds, so landmark jitter no longer makes
+the ship twitch or the gun stutter. Every stage is O(1) per camera frame.
+"""
+
+import math
+
+
+def smoothing_factor(dt_s, cutoff_hz):
+    """Exponential smoothing factor for a first-order low-pass at cutoff_hz sampled every dt_s"""
+    tau = 1.0 / (2.0 * math.pi * cutoff_hz)
+    return 1.0 / (1.0 + tau / dt_s)
+
+
+class ExponentialFilter:
+    """Fixed-alpha exponential moving average (alpha=1: no smoothing)"""
+
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, alpha=0.5):
+        self.alpha = alpha
+        self.value = None
+
+    def reset(self):
+        self.value = None
+
+    def filter(self, value, t_s):
+        if self.value is None: self.value = value
+        else: self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class OneEuroFilter:
+    """One-Euro filter (Casiez et al. 2012): heavy smoothing while still, little lag on fast moves.
+    min_cutoff_hz sets the jitter removed at rest, beta how quickly the cutoff opens with speed."""
+
+    __slots__ = ("min_cutoff_hz", "beta", "d_cutoff_hz", "value", "derivative", "last_t_s")
+
+    def __init__(self, min_cutoff_hz=1.5, beta=4.0, d_cutoff_hz=1.0):
+        self.min_cutoff_hz = min_cutoff_hz
+        self.beta = beta
+        self.d_cutoff_hz = d_cutoff_hz
+        self.value = None
+        self.derivative = 0.0
+        self.last_t_s = 0.0
+
+    def reset(self):
+        self.value = None
+        self.derivative = 0.0
+
+    def filter(self, value, t_s):
+        if self.value is None:
+            self.value, self.last_t_s = value, t_s
+            return value
+        dt_s = t_s - self.last_t_s
+        if dt_s <= 0: return self.value  # same frame twice: nothing new to filter
+        self.last_t_s = t_s
+        raw_derivative = (value - self.value) / dt_s
+        self.derivative += smoothing_factor(dt_s, self.d_cutoff_hz) * (raw_derivative - self.derivative)
+        cutoff_hz = self.min_cutoff_hz + self.beta * abs(self.derivative)
+        self.value += smoothing_factor(dt_s, cutoff_hz) * (value - self.value)
+        return self.value
+
+
+class PinchHysteresis:
+    """Pinch state from the thumb-index distance: press below press_threshold, release above release_threshold"""
+
+    __slots__ = ("press_threshold", "release_threshold", "pinched")
+
+    def __init__(self, press_threshold, release_threshold):
+        if release_threshold < press_threshold:
+            raise ValueError("release_threshold must be >= press_threshold")
+        self.press_threshold = press_threshold
+        self.release_threshold = release_threshold
+        self.pinched = False
+
+    def reset(self):
+        self.pinched = False
+
+    def update(self, distance):
+        if self.pinched: self.pinched = distance <= self.release_threshold
+        else: self.pinched = distance < self.press_threshold
+        return self.pinched
+
+
+class HandInputConfig:
+    """Filter settings; the defaults suit normalized (0..1) MediaPipe coordinates at 30-60 Hz"""
+
+    def __init__(self, mode="one_euro", min_cutoff_hz=1.5, beta=4.0, d_cutoff_hz=1.0, ema_alpha=0.5,
+                 pinch_threshold=0.040, pinch_hysteresis=0.006, dead_zone=0.004):
+        self.mode = mode  # "one_euro", "ema" or "none"
+        self.min_cutoff_hz = min_cutoff_hz
+        self.beta = beta
+        self.d_cutoff_hz = d_cutoff_hz
+        self.ema_alpha = ema_alpha
+        # press below pinch_threshold - hysteresis, release above pinch_threshold + hysteresis
+        self.pinch_threshold = pinch_threshold
+        self.pinch_hysteresis = pinch_hysteresis
+        # output only moves once the filtered position leaves this radius around the last output
+        self.dead_zone = dead_zone
+
+
+class HandInputProcessor:
+    """Raw index-tip position + thumb-index distance in, filtered position + pinch state out"""
+
+    def __init__(self, config=None):
+        self.config = config if config else HandInputConfig()
+        self.x_filter = self._make_filter()
+        self.y_filter = self._make_filter()
+        self.pinch = PinchHysteresis(self.config.pinch_threshold - self.config.pinch_hysteresis,
+                                     self.config.pinch_threshold + self.config.pinch_hysteresis)
+        self.out_x = None
+        self.out_y = None
+
+    def _make_filter(self):
+        config = self.config
+        if config.mode == "one_euro": return OneEuroFilter(config.min_cutoff_hz, config.beta, config.d_cutoff_hz)
+        if config.mode == "ema": return ExponentialFilter(config.ema_alpha)
+        if config.mode == "none": return ExponentialFilter(1.0)
+        raise ValueError(f"unknown filter mode: {config.mode}")
+
+    def reset(self):
+        """Hand lost: the next detection starts fresh instead of gliding in from the old position"""
+        self.x_filter.reset(); self.y_filter.reset(); self.pinch.reset()
+        self.out_x = self.out_y = None
+
+    def process(self, finger_x_norm, finger_y_norm, thumb_index_dist, t_s):
+        """Returns (finger_x_norm, finger_y_norm, pinched) for the frame captured at t_s (seconds)"""
+        x_val = self.x_filter.filter(finger_x_norm, t_s)
+        y_val = self.y_filter.filter(finger_y_norm, t_s)
+        dead_zone = self.config.dead_zone
+        if self.out_x is None or math.hypot(x_val - self.out_x, y_val - self.out_y) > dead_zone:
+            self.out_x, self.out_y = x_val, y_val
+        return self.out_x, self.out_y, self.pinch.update(thumb_index_dist)
@@ -0,0 +1,146 @@
+"""
+Input Source - Camera, video file or image-sequence frames behind one interface
+Every source looks like a cv2.VideoCapture (read / isOpened / release), so the
+calibration screen, the async camera pipeline and benchmarks consume them
+unchanged. Recorded sources are paced in real time (at the recording's frame
+rate) or delivered as fast as possible for offline benchmarks.
+
+Run:
+    python airplane.py --source hand_clip.mp4
+    python airplane.py --source recordings/session_03/ --source-fps 30 --loop
+"""
+
+import os
+import time
+
+import cv2
+
+PACE_REALTIME = "realtime"
+PACE_FAST = "fast"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class FramePacer:
+    """Sleeps so consecutive frames are handed out 1/fps apart (PACE_FAST: never sleeps)"""
+
+    def __init__(self, fps, pace=PACE_REALTIME):
+        if pace not in (PACE_REALTIME, PACE_FAST):
+            raise ValueError(f"unknown pace: {pace}")
+        self.frame_interval_s = 1.0 / fps if fps and fps > 0 else 0.0
+        self.pace = pace
+        self._next_frame_s = None
+
+    def wait(self):
+        if self.pace == PACE_FAST or self.frame_interval_s == 0.0:
+            return
+        now_s = time.perf_counter()
+        if self._next_frame_s is None or now_s - self._next_frame_s > self.frame_interval_s:
+            self._next_frame_s = now_s  # first frame, or we fell behind: don't burst to catch up
+        elif self._next_frame_s > now_s:
+            time.sleep(self._next_frame_s - now_s)
+        self._next_frame_s += self.frame_interval_s
+
+
+class WebcamSource:
+    """Live camera; reads are paced by the device itself"""
+
+    def __init__(self, device_index=0):
+        self.name = f"camera {device_index}"
+        self.capture = cv2.VideoCapture(device_index)
+        self.frames_read = 0
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def read(self):
+        was_read, frame = self.capture.read()
+        if was_read: self.frames_read += 1
+        return was_read, frame
+
+    def release(self):
+        self.capture.release()
+
+
+class VideoFileSource:
+    """Recorded video file; optional looping for long soak runs"""
+
+    def __init__(self, path, pace=PACE_REALTIME, loop=False, fps=None):
+        self.name = path
+        self.capture = cv2.VideoCapture(path)
+        self.fps = fps or self.capture.get(cv2.CAP_PROP_FPS) or 30.0
+        self.pacer = FramePacer(self.fps, pace)
+        self.loop = loop
+        self.frames_read = 0
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def read(self):
+        self.pacer.wait()
+        was_read, frame = self.capture.read()
+        if not was_read and self.loop and self.frames_read > 0:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            was_read, frame = self.capture.read()
+        if was_read: self.frames_read += 1
+        return was_read, frame
+
+    def release(self):
+        self.capture.release()
+
+
+class ImageSequenceSource:
+    """Directory of still frames, read in file-name order at a fixed frame rate"""
+
+    def __init__(self, directory, pace=PACE_REALTIME, loop=False, fps=30.0):
+        self.name = directory
+        self.paths = sorted(os.path.join(directory, file_name) for file_name in os.listdir(directory)
+                            if file_name.lower().endswith(IMAGE_EXTENSIONS))
+        self.fps = fps
+        self.pacer = FramePacer(fps, pace)
+        self.loop = loop
+        self.frames_read = 0
+        self._next_index = 0
+
+    def isOpened(self):
+        return bool(self.paths)
+
+    def read(self):
+        if self._next_index >= len(self.paths):
+            if not self.loop or not self.paths:
+                return False, None
+            self._next_index = 0
+        self.pacer.wait()
+        frame = cv2.imread(self.paths[self._next_index])
+        self._next_index += 1
+        if frame is None:
+            return False, None
+        self.frames_read += 1
+        return True, frame
+
+    def release(self):
+        self.paths = []
+
+
+def open_input_source(spec="0", pace=PACE_REALTIME, loop=False, fps=None):
+    """Camera index ("0"), image directory or video file path -> input source"""
+    spec = str(spec)
+    if spec.isdigit():
+        return WebcamSource(int(spec))
+    if os.path.isdir(spec):
+        return ImageSequenceSource(spec, pace, loop, fps or 30.0)
+    return VideoFileSource(spec, pace, loop, fps)
+
+
+def add_source_arguments(parser):
+    """--source / --pace / --loop / --source-fps, on the game's argument parser"""
+    group = parser.add_argument_group("input source")
+    group.add_argument("--source", type=str, default="0", help="camera index, video file or image directory")
+    group.add_argument("--pace", choices=(PACE_REALTIME, PACE_FAST), default=PACE_REALTIME,
+                       help="recorded sources: play at their frame rate or as fast as possible")
+    group.add_argument("--loop", action="store_true", help="restart recorded sources at the end")
+    group.add_argument("--source-fps", type=float, default=None, help="frame rate for image directories / override for videos")
+
+
+def source_options_from_args(args):
+    """(spec, pace, loop, fps) for open_input_source"""
+    return args.source, args.pace, args.loop, args.source_fps
@@ -0,0 +1,351 @@
+"""
+Metrics Exporter - Low-overhead runtime metrics for unattended kiosks
+Counts every frame but only measures phases and reads gauges on sampled
+frames, then publishes the Prometheus text format to a textfile (overwritten
+in place, node_exporter textfile-collector style), to a size-rotated history
+file of timestamped samples, and/or to a local HTTP /metrics endpoint.
+
+Run:
+    python airplane.py --metrics-file metrics/finger_shooter.prom
+    python airplane.py --metrics-port 9464      (then: curl localhost:9464/metrics)
+"""
+
+import collections
+import http.server
+import os
+import sys
+import threading
+import time
+
+METRIC_PREFIX = "finger_shooter_"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def read_windows_rss_bytes():
+    """Working set of this process through GetProcessMemoryInfo (no psutil); None if the call fails"""
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    kernel32 = ctypes.WinDLL("kernel32")
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    psapi = ctypes.WinDLL("psapi")
+    psapi.GetProcessMemoryInfo.argtypes = (wintypes.HANDLE, ctypes.POINTER(ProcessMemoryCounters), wintypes.DWORD)
+    if not psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+        return None
+    return counters.WorkingSetSize
+
+
+def read_rss_bytes():
+    """Resident set size of this process (Linux /proc, Windows working set; elsewhere the peak RSS), None if unknown"""
+    if sys.platform == "win32":
+        try:
+            return read_windows_rss_bytes()
+        except (OSError, AttributeError):
+            return None
+    try:
+        with open("/proc/self/statm") as statm_file:
+            return int(statm_file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024  # bytes on macOS, KiB elsewhere
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}"
+
+
+class MetricsRegistry:
+    """Latest value per (metric, labels) plus HELP / TYPE metadata, rendered as Prometheus text"""
+
+    def __init__(self):
+        self.metadata = collections.OrderedDict()  # name -> (type, help)
+        self.values = {}  # (name, labels tuple) -> value
+
+    def declare(self, name, metric_type, help_text):
+        self.metadata[METRIC_PREFIX + name] = (metric_type, help_text)
+
+    def set(self, name, value, labels=()):
+        self.values[(METRIC_PREFIX + name, labels)] = value
+
+    def render(self, timestamp_ms=None):
+        suffix = f" {timestamp_ms}" if timestamp_ms is not None else ""
+        lines = []
+        by_name = collections.defaultdict(list)
+        for (name, labels), value in self.values.items():
+            by_name[name].append((labels, value))
+        for name, (metric_type, help_text) in self.metadata.items():
+            if name not in by_name:
+                continue
+            if timestamp_ms is None:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in sorted(by_name[name]):
+                value_text = str(value) if isinstance(value, int) else f"{value:.6g}"
+                lines.append(f"{name}{format_labels(labels)} {value_text}{suffix}")
+        return "\n".join(lines) + "\n"
+
+
+class RotatingTextLog:
+    """Append-only text file rotated to path.1 .. path.N once it grows past max_bytes"""
+
+    def __init__(self, path, max_bytes=5 * 1024 * 1024, backups=3):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        directory = os.path.dirname(path)
+        if directory: os.makedirs(directory, exist_ok=True)
+
+    def append(self, text):
+        try:
+            if os.path.getsize(self.path) + len(text) > self.max_bytes:
+                self._rotate()
+        except OSError:
+            pass
+        with open(self.path, "a") as log_file:
+            log_file.write(text)
+
+    def _rotate(self):
+        for backup_idx in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{backup_idx}"
+            if os.path.exists(older): os.replace(older, f"{self.path}.{backup_idx + 1}")
+        if self.backups > 0: os.replace(self.path, f"{self.path}.1")
+        else: os.remove(self.path)
+
+
+def write_text_atomically(path, text):
+    """Write to a temp file and rename, so a scraper never reads a half-written file"""
+    directory = os.path.dirname(path)
+    if directory: os.makedirs(directory, exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as temp_file:
+        temp_file.write(text)
+    os.replace(temp_path, path)
+
+
+class MetricsHTTPServer:
+    """GET /metrics on a local port, served from the last rendered text by a daemon thread"""
+
+    def __init__(self, port, host="127.0.0.1"):
+        self.text = ""
+        exporter_server = self
+
+        class MetricsHandler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = exporter_server.text.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # no per-scrape console spam on the kiosk
+
+        self.server = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class MetricsExporter:
+    """Per-frame counters, sampled phase timings and gauges, published every sample_interval_s
+
+    Per frame the host calls begin_frame(session), mark(phase) after its own
+    phases (render, present) and end_frame(session, frame_input, camera_pipeline).
+    Only every phase_sample_every-th frame is timed phase by phase.
+    """
+
+    def __init__(self, textfile_path=None, history_path=None, http_port=None, sample_interval_s=1.0,
+                 phase_sample_every=30, history_max_bytes=5 * 1024 * 1024, history_backups=3):
+        self.textfile_path = textfile_path
+        self.history = RotatingTextLog(history_path, history_max_bytes, history_backups) if history_path else None
+        self.http_server = MetricsHTTPServer(http_port) if http_port else None
+        self.sample_interval_s = sample_interval_s
+        self.phase_sample_every = max(1, phase_sample_every)
+        self.registry = MetricsRegistry()
+        self._declare_metrics()
+
+        self.frames_total = 0
+        self.hand_frames_total = 0
+        self.hand_detected_total = 0
+        self.gesture_frames = collections.Counter()
+        self.frame_time_sum_s = 0.0
+        self.overhead_sum_s = 0.0
+        self.phase_sums_ms = collections.defaultdict(float)
+        self.phase_samples = 0
+        self.write_failures = collections.Counter()  # target -> failed writes (disk full, directory gone, permissions)
+        self._frame_start_s = 0.0
+        self._mark_s = 0.0
+        self._sampling_frame = False
+        self._host_phases = {}
+        self._window_start_s = time.perf_counter()
+        self._window_frames = 0
+
+    def _declare_metrics(self):
+        declare = self.registry.declare
+        declare("fps", "gauge", "Frames per second over the last sample window")
+        declare("frame_time_seconds_avg", "gauge", "Mean frame time over the last sample window")
+        declare("phase_time_seconds_avg", "gauge", "Mean time per frame phase over the sampled frames of the last window")
+        declare("entities", "gauge", "Live entities per kind")
+        declare("frames_total", "counter", "Frames run since start")
+        declare("hand_frames_total", "counter", "New camera frames with inference results consumed")
+        declare("hand_detected_frames_total", "counter", "Consumed camera frames with a detected hand")
+        declare("hand_detection_ratio", "gauge", "Share of consumed camera frames with a detected hand")
+        declare("hand_gesture_frames_total", "counter", "Consumed camera frames per classified gesture")
+        declare("camera_frames_total", "counter", "Camera frames captured and inferred")
+        declare("camera_frames_dropped_total", "counter", "Camera frames dropped, by reason")
+        declare("camera_drop_ratio", "gauge", "Dropped share of captured camera frames")
+        declare("degradation_level", "gauge", "Budget manager degradation level (0 = full detail)")
+        declare("resident_memory_bytes", "gauge", "Resident set size")
+        declare("frame_interval_seconds_stdev", "gauge", "Standard deviation of the frame interval (frame scheduler window)")
+        declare("frame_interval_seconds_p99", "gauge", "99th percentile frame interval (frame scheduler window)")
+        declare("frame_deadlines_missed_total", "counter", "Frames whose work ran past the frame scheduler deadline")
+        declare("gc_pauses_total", "counter", "Garbage collection pauses, in an idle window or inside a frame")
+        declare("gc_pause_seconds_total", "counter", "Time spent in garbage collection")
+        declare("gc_pauses_last_minute", "gauge", "Garbage collection pauses in the last finished minute of play")
+        declare("gc_pause_seconds_last_minute", "gauge", "Garbage collection time in the last finished minute of play")
+        declare("gc_pause_seconds_max_last_minute", "gauge", "Longest garbage collection pause in the last finished minute of play")
+        declare("metrics_overhead_ratio", "gauge", "Share of frame time spent in the metrics exporter")
+        declare("metrics_write_failures_total", "counter", "Textfile / history writes that failed, by target")
+
+    def begin_frame(self, session):
+        now_s = time.perf_counter()
+        self._frame_start_s = self._mark_s = now_s
+        self._sampling_frame = self.frames_total % self.phase_sample_every == 0
+        session.phase_timings = {} if self._sampling_frame else None
+        if self._sampling_frame: self._host_phases = {}
+        self.overhead_sum_s += time.perf_counter() - now_s
+
+    def mark(self, phase_name):
+        """End of a host phase (time since begin_frame or the previous mark); no-op on unsampled frames"""
+        if not self._sampling_frame:
+            return
+        now_s = time.perf_counter()
+        self._host_phases[phase_name] = (now_s - self._mark_s) * 1000.0
+        self._mark_s = now_s
+
+    def end_frame(self, session, frame_input=None, camera_pipeline=None):
+        now_s = time.perf_counter()
+        self.frames_total += 1
+        self._window_frames += 1
+        self.frame_time_sum_s += now_s - self._frame_start_s
+        if frame_input is not None and frame_input.hand_frame:
+            self.hand_frames_total += 1
+            if frame_input.hand_present: self.hand_detected_total += 1
+            if frame_input.gesture: self.gesture_frames[frame_input.gesture] += 1
+        if self._sampling_frame and session.phase_timings is not None:
+            for phase_name, phase_ms in session.phase_timings.items(): self.phase_sums_ms[phase_name] += phase_ms
+            for phase_name, phase_ms in self._host_phases.items(): self.phase_sums_ms[phase_name] += phase_ms
+            self.phase_samples += 1
+            session.phase_timings = None
+        if now_s - self._window_start_s >= self.sample_interval_s:
+            self._publish(session, camera_pipeline, now_s)
+        self.overhead_sum_s += time.perf_counter() - now_s
+
+    def _publish(self, session, camera_pipeline, now_s):
+        registry = self.registry
+        window_s = now_s - self._window_start_s
+        registry.set("fps", self._window_frames / window_s)
+        registry.set("frame_time_seconds_avg", self.frame_time_sum_s / max(1, self._window_frames))
+        for phase_name, phase_sum_ms in self.phase_sums_ms.items():
+            registry.set("phase_time_seconds_avg", phase_sum_ms / 1000.0 / max(1, self.phase_samples), (("phase", phase_name),))
+        for kind, entity_list in (("enemy", session.all_enemies_list), ("player_bullet", session.player_bullets_list),
+                                  ("enemy_bullet", session.enemy_bullets_master_list), ("boss_bullet", session.boss_bullets_master_list),
+                                  ("power_up", session.power_ups_list), ("explosion", session.active_explosions_list)):
+            registry.set("entities", len(entity_list), (("kind", kind),))
+        registry.set("frames_total", self.frames_total)
+        registry.set("hand_frames_total", self.hand_frames_total)
+        registry.set("hand_detected_frames_total", self.hand_detected_total)
+        registry.set("hand_detection_ratio", self.hand_detected_total / max(1, self.hand_frames_total))
+        for gesture, count in self.gesture_frames.items(): registry.set("hand_gesture_frames_total", count, (("gesture", gesture),))
+        if camera_pipeline is not None:
+            ring = camera_pipeline.ring
+            dropped = {"superseded": ring.frames_superseded, "stale": ring.frames_stale, "read_failed": camera_pipeline.frames_failed}
+            captured = camera_pipeline.frames_captured
+            registry.set("camera_frames_total", captured)
+            for reason, count in dropped.items():
+                registry.set("camera_frames_dropped_total", count, (("reason", reason),))
+            registry.set("camera_drop_ratio", (dropped["superseded"] + dropped["stale"]) / max(1, captured))
+        if session.budget is not None: registry.set("degradation_level", session.budget.level)
+        rss_bytes = read_rss_bytes()
+        if rss_bytes is not None: registry.set("resident_memory_bytes", rss_bytes)
+        frame_stats = getattr(session.clock, "frame_stats", None)  # only the live FrameScheduler has them
+        if frame_stats is not None:
+            stats = frame_stats()
+            registry.set("frame_interval_seconds_stdev", stats["interval_ms_stdev"] / 1000.0)
+            registry.set("frame_interval_seconds_p99", stats["interval_ms_p99"] / 1000.0)
+            registry.set("frame_deadlines_missed_total", stats["deadlines_missed"])
+        gc_policy = getattr(session.clock, "gc_policy", None)
+        if gc_policy is not None:
+            registry.set("gc_pauses_total", gc_policy.pauses_total - gc_policy.frame_pauses_total, (("where", "idle"),))
+            registry.set("gc_pauses_total", gc_policy.frame_pauses_total, (("where", "frame"),))
+            registry.set("gc_pause_seconds_total", gc_policy.pause_ms_total / 1000.0)
+            minute = gc_policy.last_minute()
+            registry.set("gc_pauses_last_minute", minute.pauses)
+            registry.set("gc_pause_seconds_last_minute", minute.pause_ms / 1000.0)
+            registry.set("gc_pause_seconds_max_last_minute", minute.max_pause_ms / 1000.0)
+        registry.set("metrics_overhead_ratio", self.overhead_sum_s / max(1e-9, self.frame_time_sum_s))
+        for target, count in self.write_failures.items(): registry.set("metrics_write_failures_total", count, (("target", target),))
+
+        # a full disk or a removed directory must not take the kiosk down: count the failure and try again next sample
+        text = registry.render()
+        if self.textfile_path:
+            try:
+                write_text_atomically(self.textfile_path, text)
+            except OSError:
+                self.write_failures["textfile"] += 1
+        if self.history:
+            try:
+                self.history.append(registry.render(int(time.time() * 1000)))
+            except OSError:
+                self.write_failures["history"] += 1
+        if self.http_server: self.http_server.text = text
+
+        self._window_start_s = now_s
+        self._window_frames = 0
+        self.frame_time_sum_s = 0.0
+        self.overhead_sum_s = 0.0
+        self.phase_sums_ms.clear()
+        self.phase_samples = 0
+
+    def close(self):
+        if self.http_server: self.http_server.close()
+
+
+def add_metrics_arguments(parser):
+    """--metrics-file / --metrics-history / --metrics-port / --metrics-interval, on the game's argument parser"""
+    group = parser.add_argument_group("kiosk metrics")
+    group.add_argument("--metrics-file", type=str, default=None, help="Prometheus textfile, rewritten every sample")
+    group.add_argument("--metrics-history", type=str, default=None, help="size-rotated file of timestamped samples")
+    group.add_argument("--metrics-port", type=int, default=None, help="serve /metrics on 127.0.0.1:PORT")
+    group.add_argument("--metrics-interval", type=float, default=1.0, help="seconds between samples")
+
+
+def metrics_exporter_from_args(args):
+    """MetricsExporter for the --metrics-* flags, or None when none is given"""
+    if not (args.metrics_file or args.metrics_history or args.metrics_port):
+        return None
+    return MetricsExporter(args.metrics_file, args.metrics_history, args.metrics_port, args.metrics_interval)
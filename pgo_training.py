@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+PGO Training - Representative workload for profile-guided builds of the C++ backend
+setup.py (GAME_ACCEL_PGO=1) builds an instrumented variant, runs this script on it and
+rebuilds with the recorded profile. The workload mirrors a busy frame: SoA bullet-enemy and
+player-hit batches (SIMD and threaded), ProjectileIndex rebuild + queries and the movement
+integrators, with a fixed seed so the profile is the same on every build machine.
+Run: python pgo_training.py game_accelerator/_native_x86_64_v3.cpython-311-x86_64-linux-gnu.so
+"""
+
+import importlib.util
+import os
+import random
+import sys
+from array import array
+
+FRAMES = 300
+MOTION_CLAMP, MOTION_CULL = 1, 2  # = game_accelerator.spec; importing the package here would load a second copy of the module
+
+
+def load_module(path):
+    """Import one built variant from its file (its name is in the file name: _native, _native_x86_64_v3, ...)"""
+    name = os.path.basename(path).split(".")[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run(accel, frames=FRAMES):
+    rng = random.Random(2024)
+    index = accel.ProjectileIndex(900, 700)
+    try:
+        import pygame
+    except ImportError:
+        pygame = None  # integrate_rects needs pygame.Rect; the rest of the workload still runs
+    for frame in range(frames):
+        num_bullets, num_enemies = rng.choice([(20, 8), (200, 30), (2000, 100)])
+        num_projectiles = rng.choice([100, 800, 3000])
+        accel.set_parallelism(1 if frame % 3 else (os.cpu_count() or 1), 1 << 16 if frame % 2 else 0)
+        bullet_xs = array("f", [rng.uniform(0, 900) for _ in range(num_bullets)])
+        bullet_ys = array("f", [rng.uniform(0, 700) for _ in range(num_bullets)])
+        enemy_xs = array("f", [rng.uniform(0, 900) for _ in range(num_enemies)])
+        enemy_ys = array("f", [rng.uniform(0, 700) for _ in range(num_enemies)])
+        accel.check_bullet_enemy_collisions_soa(bullet_xs, bullet_ys, enemy_xs, enemy_ys, 7, 22, 45, 35)
+
+        xs = array("f", [rng.uniform(-20, 920) for _ in range(num_projectiles)])
+        ys = array("f", [rng.uniform(-20, 720) for _ in range(num_projectiles)])
+        ws, hs = array("f", [7.0] * num_projectiles), array("f", [14.0] * num_projectiles)
+        index.rebuild(xs, ys, ws, hs)
+        for _ in range(10):
+            index.query_rect(rng.uniform(0, 900), rng.uniform(0, 700), 60, 80)
+        counts = [num_projectiles // 50, num_projectiles // 2, 0, 0]
+        counts[2] = num_projectiles - counts[0] - counts[1]
+        accel.check_player_hits_soa([420.0, 500.0, 55.0, 45.0], xs, ys, ws, hs, counts)
+
+        pos_xs, pos_ys = array("d", xs), array("d", ys)
+        accel.integrate_positions(pos_xs, pos_ys, 7, 14, 0, 3.5, MOTION_CULL, None, (-1e9, -1e9, 1e9, 700))
+        if pygame is not None:
+            rects = [pygame.Rect(int(x), int(y), 7, 14) for x, y in zip(xs, ys)]
+            accel.integrate_rects(rects, array("d", [rng.uniform(-3, 3) for _ in rects]), 4.0, MOTION_CLAMP | MOTION_CULL, (0, 0, 900, 700), (0, 0, 900, 700))
+
+
+def main():
+    if len(sys.argv) != 2:
+        print(__doc__)
+        return 2
+    run(load_module(sys.argv[1]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Render Scale - Logical game resolution decoupled from the window
+Gameplay, collisions and hand mapping always run in SCREEN_WIDTH x SCREEN_HEIGHT
+logical units. The frame is drawn at an internal resolution of logical size *
+render_scale (e.g. 0.5 on weak CPUs, or "native" to match the window) and put
+on screen with one scaled blit into the letterboxed window area, so a large
+kiosk display no longer means a tiny game or full-resolution software rendering.
+
+Run:
+    python airplane.py --window 1920x1080 --render-scale 1.0
+    python airplane.py --fullscreen --render-scale native
+"""
+
+import collections
+import math
+
+import pygame
+
+RENDER_SCALE_NATIVE = None  # internal resolution = letterboxed window area
+MAX_SCALED_SURFACES = 512
+MAX_TEXT_SURFACES = 128
+
+
+def scaled_pixel(value, scale):
+    """Logical coordinate -> internal pixel, rounding half up (also for negative coordinates) on every draw path"""
+    return math.floor(value * scale + 0.5)
+
+
+def letterbox_rect(logical_size, window_size):
+    """Largest rect with the logical aspect ratio centred in the window"""
+    scale = min(window_size[0] / logical_size[0], window_size[1] / logical_size[1])
+    width, height = int(logical_size[0] * scale), int(logical_size[1] * scale)
+    return pygame.Rect((window_size[0] - width) // 2, (window_size[1] - height) // 2, width, height)
+
+
+class ScaledCanvas:
+    """Draw target in logical coordinates backed by a Surface of logical size * scale; quacks like the display Surface"""
+
+    def __init__(self, logical_size, scale):
+        self.size = tuple(logical_size)
+        self.scale = scale
+        self.surface = pygame.Surface((max(1, scaled_pixel(logical_size[0], scale)), max(1, scaled_pixel(logical_size[1], scale)))).convert()
+        self._scaled_surfaces = {}
+        self._text_surfaces = collections.OrderedDict()
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def scaled_for(self, surface):
+        """Copy of a sprite at the internal scale, made once per sprite"""
+        scaled_surf = self._scaled_surfaces.get(surface)
+        if scaled_surf is None:
+            if len(self._scaled_surfaces) >= MAX_SCALED_SURFACES: self._scaled_surfaces.clear()
+            scaled_surf = self._scaled_surfaces[surface] = self._scale_surface(surface)
+        return scaled_surf
+
+    def _scale_surface(self, surface):
+        width, height = surface.get_size()
+        scale = self.scale
+        scaled_size = (max(1, scaled_pixel(width, scale)), max(1, scaled_pixel(height, scale)))
+        if surface.get_bitsize() in (24, 32): scaled_surf = pygame.transform.smoothscale(surface, scaled_size)
+        else: scaled_surf = pygame.transform.scale(surface, scaled_size)
+        return scaled_surf.convert_alpha() if surface.get_flags() & pygame.SRCALPHA else scaled_surf.convert()
+
+    def fill(self, color):
+        self.surface.fill(color)
+
+    def blit(self, surface, dest, area=None):
+        scale = self.scale
+        if area is not None:
+            area = tuple(scaled_pixel(value, scale) for value in area[:4])
+        self.surface.blit(self.scaled_for(surface), (scaled_pixel(dest[0], scale), scaled_pixel(dest[1], scale)), area)
+
+    def blits(self, blit_sequence, doreturn=True):
+        scale = self.scale
+        scaled_surfaces = self._scaled_surfaces
+        try:
+            # fast path: every sprite already scaled and no area blits (the common frame)
+            scaled_sequence = [(scaled_surfaces[surface], (scaled_pixel(dest_x, scale), scaled_pixel(dest_y, scale)))
+                               for surface, (dest_x, dest_y) in blit_sequence]
+        except (KeyError, ValueError):
+            scaled_sequence = []
+            for blit_item in blit_sequence:
+                dest_x, dest_y = blit_item[1]
+                if len(blit_item) == 2:
+                    scaled_sequence.append((self.scaled_for(blit_item[0]), (scaled_pixel(dest_x, scale), scaled_pixel(dest_y, scale))))
+                else:
+                    area = blit_item[2]
+                    scaled_sequence.append((self.scaled_for(blit_item[0]), (scaled_pixel(dest_x, scale), scaled_pixel(dest_y, scale)),
+                                            tuple(scaled_pixel(value, scale) for value in area[:4])))
+        self.surface.blits(scaled_sequence, doreturn=False)
+
+    def draw_circle(self, color, center, radius):
+        scale = self.scale
+        pygame.draw.circle(self.surface, color, (scaled_pixel(center[0], scale), scaled_pixel(center[1], scale)), max(1, scaled_pixel(radius, scale)))
+
+    def draw_particle(self, color, alpha, x_pos, y_pos, radius):
+        scale = self.scale
+        scaled_radius = max(1, scaled_pixel(radius, scale))
+        particle_surf = pygame.Surface((scaled_radius * 2, scaled_radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(particle_surf, (*color, alpha), (scaled_radius, scaled_radius), scaled_radius)
+        self.surface.blit(particle_surf, (scaled_pixel(x_pos, scale) - scaled_radius, scaled_pixel(y_pos, scale) - scaled_radius))
+
+    def draw_text(self, text, font_obj, color, x_pos, y_pos, center=True):
+        """Rendered at the font's size, scaled once per distinct string"""
+        text_key = (text, font_obj, tuple(color))
+        text_surf = self._text_surfaces.get(text_key)
+        if text_surf is None:
+            text_surf = self._text_surfaces[text_key] = self._scale_surface(font_obj.render(text, True, color))
+            if len(self._text_surfaces) > MAX_TEXT_SURFACES: self._text_surfaces.popitem(last=False)
+        else:
+            self._text_surfaces.move_to_end(text_key)
+        x_pos, y_pos = scaled_pixel(x_pos, self.scale), scaled_pixel(y_pos, self.scale)
+        if center: x_pos -= text_surf.get_width() // 2
+        self.surface.blit(text_surf, (x_pos, y_pos))
+
+
+class ScaledDisplay:
+    """Window of any size showing the logical frame letterboxed; draw into .target, then present()"""
+
+    def __init__(self, window_size, logical_size, render_scale=1.0, fullscreen=False):
+        self.window = pygame.display.set_mode((0, 0) if fullscreen and not window_size else window_size,
+                                              pygame.FULLSCREEN if fullscreen else 0)
+        self.logical_size = tuple(logical_size)
+        self.letterbox = letterbox_rect(self.logical_size, self.window.get_size())
+        if render_scale is RENDER_SCALE_NATIVE: render_scale = self.letterbox.width / self.logical_size[0]
+        self.render_scale = render_scale
+        self._letterbox_area = self.window.subsurface(self.letterbox)
+        if self.letterbox.size == self.logical_size and abs(render_scale - 1.0) < 1e-6:
+            self.target = self.window  # classic 900x700 window: draw straight to the display
+            self._frame = None
+        elif abs(render_scale - 1.0) < 1e-6:
+            self.target = self._frame = pygame.Surface(self.logical_size).convert()
+        else:
+            self.target = ScaledCanvas(self.logical_size, render_scale)
+            self._frame = self.target.surface
+
+    @property
+    def internal_size(self):
+        return self._frame.get_size() if self._frame is not None else self.window.get_size()
+
+    def present(self):
+        """The one scaled blit of the frame into the letterbox, then flip"""
+        frame = self._frame
+        if frame is not None:
+            if frame.get_size() == self.letterbox.size: self.window.blit(frame, self.letterbox.topleft)
+            else: pygame.transform.scale(frame, self.letterbox.size, self._letterbox_area)
+        pygame.display.flip()
+
+
+def parse_render_scale(value):
+    """'native' or a positive float"""
+    if str(value).lower() == "native":
+        return RENDER_SCALE_NATIVE
+    render_scale = float(value)
+    if render_scale <= 0:
+        raise ValueError("render scale must be positive")
+    return render_scale
+
+
+def parse_window_size(value):
+    """'WIDTHxHEIGHT' -> (width, height)"""
+    width, height = (int(part) for part in value.lower().split("x"))
+    return width, height
@@ -4,22 +4,121 @@ import sys
 import setuptools
 import pybind11
 import os
+import hashlib
+import platform
+import runpy
+import shutil
+import subprocess
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+NATIVE_VARIANTS = runpy.run_path(os.path.join(ROOT, 'game_accelerator', '_variants.py'))['NATIVE_VARIANTS']
+PGO_TRAINING = os.path.join(ROOT, 'pgo_training.py')
 
 class get_pybind_include:
     def __str__(self):
         return pybind11.get_include()
 
-ext_modules = [
-    Extension(
-        'game_accelerator',
+compile_args = ['-O3', '-std=c++17']
+link_args = []
+if sys.platform.startswith('linux'):
+    # SSE2 is the x86-64 baseline; the -march variants add AVX2 etc. and are picked at import time.
+    # GAME_ACCEL_NATIVE=1 builds the baseline module for this CPU instead.
+    # -ffile-prefix-map keeps the checkout path out of the binary (reproducible wheels)
+    compile_args += ['-pthread', '-fvisibility=hidden', '-ftree-vectorize', f'-ffile-prefix-map={ROOT}=.']
+    link_args += ['-pthread']
+    if os.environ.get('GAME_ACCEL_NATIVE') == '1':
+        compile_args.append('-march=native')
+
+# -march variants need GCC / Clang on x86-64; elsewhere only the baseline module is built
+build_variants = (sys.platform != 'win32' and platform.machine().lower() in ('x86_64', 'amd64')
+                  and os.environ.get('GAME_ACCEL_VARIANTS', '1') != '0')
+
+ext_modules = []
+for variant, module, march_args, _ in NATIVE_VARIANTS:
+    if march_args and not build_variants:
+        continue
+    ext = Extension(
+        'game_accelerator.' + module,  # one native backend module per variant, see game_accelerator/_variants.py
         ['game_accelerator.cpp'],
         include_dirs=[
             get_pybind_include(),
         ],
+        define_macros=[('GA_MODULE_NAME', module), ('GA_VARIANT', f'"{variant}"')],
         language='c++',
-        extra_compile_args=['-O3', '-std=c++17'],
-    ),
-]
+        extra_compile_args=compile_args + list(march_args),
+        extra_link_args=link_args,
+    )
+    ext.variant = variant
+    ext_modules.append(ext)
+
+
+class cached_build_ext(build_ext):
+    """build_ext that skips variants whose inputs did not change, keeps each variant's
+    objects apart and, with GAME_ACCEL_PGO=1 (GCC), builds profile-guided:
+    instrumented build -> pgo_training.py -> rebuild with the profile"""
+
+    def build_extensions(self):
+        # variants share one source file, so they build one after another in their own temp dirs
+        self.check_extensions_list(self.extensions)
+        for ext in self.extensions:
+            self.build_extension(ext)
+
+    def build_extension(self, ext):
+        variant_temp = os.path.join(self.build_temp, ext.variant)
+        target = self.get_ext_fullpath(ext.name)
+        pgo = os.environ.get('GAME_ACCEL_PGO') == '1' and self.compiler.compiler_type == 'unix'
+        signature = self.build_signature(ext, pgo)
+        signature_path = os.path.join(variant_temp, 'build.sig')
+        if not self.force and os.path.exists(target) and os.path.exists(signature_path):
+            with open(signature_path) as f:
+                if f.read() == signature:
+                    print(f"{ext.name} ({ext.variant}): up to date, cached build reused")
+                    return
+        if pgo and not self.build_with_profile(ext, variant_temp, target):
+            print(f"{ext.name} ({ext.variant}): PGO training failed, building without a profile")
+            pgo = False
+        if not pgo:
+            self.compile_variant(ext, variant_temp)
+        os.makedirs(variant_temp, exist_ok=True)
+        with open(signature_path, 'w') as f:
+            f.write(signature)
+
+    def build_with_profile(self, ext, variant_temp, target):
+        profile_dir = os.path.join(variant_temp, 'profile')
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        self.compile_variant(ext, variant_temp, [f'-fprofile-generate={profile_dir}', '-fprofile-update=prefer-atomic'],
+                             [f'-fprofile-generate={profile_dir}'])
+        # the training run needs the CPU features of the variant; a CPU without them fails it
+        if subprocess.run([sys.executable, PGO_TRAINING, target]).returncode != 0:
+            return False
+        self.compile_variant(ext, variant_temp, [f'-fprofile-use={profile_dir}', '-fprofile-correction', '-Wno-missing-profile'],
+                             macros=[('GA_PGO', '1')])
+        return True
+
+    def compile_variant(self, ext, variant_temp, extra_compile=(), extra_link=(), macros=()):
+        saved = (self.build_temp, self.force, ext.extra_compile_args, ext.extra_link_args, ext.define_macros)
+        self.build_temp, self.force = variant_temp, True
+        ext.extra_compile_args = ext.extra_compile_args + list(extra_compile)
+        ext.extra_link_args = ext.extra_link_args + list(extra_link)
+        ext.define_macros = ext.define_macros + list(macros)
+        try:
+            super().build_extension(ext)
+        finally:
+            self.build_temp, self.force, ext.extra_compile_args, ext.extra_link_args, ext.define_macros = saved
+
+    def build_signature(self, ext, pgo):
+        """Hash of everything that goes into the module: sources, flags, compiler, Python, training workload"""
+        digest = hashlib.sha256()
+        for path in list(ext.sources) + list(ext.depends) + ([PGO_TRAINING] if pgo else []):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        compiler_version = subprocess.run(self.compiler.compiler_so[:1] + ['--version'], capture_output=True, text=True).stdout \
+            if self.compiler.compiler_type == 'unix' else self.compiler.compiler_type
+        for part in (ext.extra_compile_args, ext.extra_link_args, ext.define_macros, getattr(self.compiler, 'compiler_so', None),
+                     compiler_version, sys.version, pybind11.__version__, pgo):
+            digest.update(repr(part).encode())
+        return digest.hexdigest()
+
 
 # Set compiler to g++ on Windows
 if sys.platform == 'win32':
@@ -31,8 +130,9 @@ setup(
     version='1.0',
     author='Game Dev',
     description='C++ accelerated game functions',
+    packages=['game_accelerator'],
     ext_modules=ext_modules,
     install_requires=['pybind11>=2.6.0'],
-    cmdclass={'build_ext': build_ext},
+    cmdclass={'build_ext': cached_build_ext},
     zip_safe=False,
 )
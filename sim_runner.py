@@ -0,0 +1,272 @@
+"""
+Sim Runner - Parallel headless simulations for balance and performance sweeps
+Fans seeded GameSession runs with synthetic input policies out over a process
+pool and collects survival time, score curves, peak entity counts and
+per-frame step costs into one columnar results file.
+
+Run:
+    python sim_runner.py --seeds 20 --policies sweep,hunter
+    python sim_runner.py --param enemy_spawn_rate_initial=45,65,85 --param boss_max_health_base=30,40,60
+    python sim_runner.py --param chaser_aggressiveness=0.4,0.54,0.7 --out chaser_sweep.csv
+
+Any SessionConfig field can be swept with --param name=v1,v2,...; every
+combination runs once per seed and policy. Output format follows the file
+extension: .npz (numpy), .csv, or .parquet (needs pyarrow).
+"""
+
+import argparse
+import csv
+import itertools
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from game_session import (GameSession, SessionConfig, FrameInput, FixedStepClock, ACCELERATION_BACKEND, SCREEN_WIDTH,
+                          GAME_STATE_GAME_OVER, GAME_STATE_BOSS_FIGHT)
+from stress_mode import percentile
+
+SIM_FPS = 90
+SCORE_SAMPLE_INTERVAL_S = 1.0
+
+
+def policy_sweep(session, frame_idx, rng, state):
+    """Same sweep as the stress benchmark: figure-eight across the playfield, always shooting"""
+    t = frame_idx * 0.02
+    return FrameInput(False, False, 0.5 + 0.38 * math.sin(t * 1.3), 0.5 + 0.3 * math.sin(t * 0.7), True)
+
+def policy_random_walk(session, frame_idx, rng, state):
+    """Finger drifts randomly, pinching about two frames in three"""
+    state["x"] = min(0.88, max(0.12, state.get("x", 0.5) + rng.uniform(-0.02, 0.02)))
+    state["y"] = min(0.8, max(0.2, state.get("y", 0.5) + rng.uniform(-0.015, 0.015)))
+    return FrameInput(False, False, state["x"], state["y"], rng.random() < 0.66)
+
+def policy_hunter(session, frame_idx, rng, state):
+    """Lines up under the lowest enemy and sidesteps the closest incoming enemy bullet"""
+    player_rect = session.player_rect
+    target_x = SCREEN_WIDTH // 2
+    if session.all_enemies_list:
+        target_x = max(session.all_enemies_list, key=lambda en: en.rect.bottom).rect.centerx
+    for eb in session.enemy_bullets_master_list:
+        if abs(eb.rect.centerx - player_rect.centerx) < 40 and 0 < player_rect.top - eb.rect.bottom < 120:
+            target_x = player_rect.centerx + (80 if eb.rect.centerx < player_rect.centerx else -80)
+            break
+    finger_x_norm = 0.12 + 0.76 * min(1.0, max(0.0, target_x / SCREEN_WIDTH))
+    return FrameInput(False, False, finger_x_norm, 0.75, True)
+
+def policy_idle(session, frame_idx, rng, state):
+    """Parks in the middle and never shoots; baseline for how fast the game kills a passive player"""
+    return FrameInput(False, False, 0.5, 0.6, False)
+
+INPUT_POLICIES = {
+    "sweep": policy_sweep,
+    "random_walk": policy_random_walk,
+    "hunter": policy_hunter,
+    "idle": policy_idle,
+}
+
+
+class SimJob:
+    """One headless run: a seed, an input policy and the SessionConfig overrides to apply"""
+
+    __slots__ = ("job_id", "seed", "policy", "params", "max_frames")
+
+    def __init__(self, job_id, seed, policy, params, max_frames):
+        self.job_id = job_id
+        self.seed = seed
+        self.policy = policy
+        self.params = params
+        self.max_frames = max_frames
+
+
+def run_simulation(job):
+    """Play one session to game over or max_frames; returns a flat dict of results"""
+    clock = FixedStepClock(SIM_FPS)
+    session = GameSession(SessionConfig(seed=job.seed, **job.params), clock)
+    policy_state = {}
+    policy_fn = INPUT_POLICIES[job.policy]
+    policy_rng = random.Random(job.seed ^ 0x5EED)
+    session.start_game()
+
+    sample_every = max(1, int(SIM_FPS * SCORE_SAMPLE_INTERVAL_S))
+    num_samples = job.max_frames // sample_every
+    score_curve = []
+    step_times_ms = []
+    peak_entities = 0
+    peak_enemy_bullets = 0
+    reached_boss = False
+    frames_simulated = 0
+    perf_counter = time.perf_counter
+    for frame_idx in range(job.max_frames):
+        clock.tick()
+        frame_input = policy_fn(session, frame_idx, policy_rng, policy_state)
+        step_start_s = perf_counter()
+        session.step(frame_input)
+        step_times_ms.append((perf_counter() - step_start_s) * 1000.0)
+        frames_simulated += 1
+        peak_entities = max(peak_entities, session.entity_count())
+        peak_enemy_bullets = max(peak_enemy_bullets, len(session.enemy_bullets_master_list) + len(session.boss_bullets_master_list))
+        reached_boss = reached_boss or session.current_game_state == GAME_STATE_BOSS_FIGHT
+        if frames_simulated % sample_every == 0: score_curve.append(session.score)
+        if session.current_game_state == GAME_STATE_GAME_OVER: break
+    # hold the final score so every run has a curve of the same length
+    score_curve.extend([session.score] * (num_samples - len(score_curve)))
+
+    sorted_times = sorted(step_times_ms)
+    result = {
+        "job_id": job.job_id,
+        "seed": job.seed,
+        "policy": job.policy,
+        "frames_simulated": frames_simulated,
+        "survival_s": frames_simulated / SIM_FPS,
+        "died": session.current_game_state == GAME_STATE_GAME_OVER,
+        "final_score": session.score,
+        "final_level": session.current_level,
+        "reached_boss": reached_boss,
+        "peak_entities": peak_entities,
+        "peak_enemy_bullets": peak_enemy_bullets,
+        "step_ms_mean": sum(step_times_ms) / len(step_times_ms),
+        "step_ms_p50": percentile(sorted_times, 50),
+        "step_ms_p95": percentile(sorted_times, 95),
+        "step_ms_max": sorted_times[-1],
+        "score_curve": score_curve,
+    }
+    for param_name, param_value in job.params.items():
+        result[param_name] = param_value
+    return result
+
+
+def build_jobs(param_grid, seeds, policies, max_frames):
+    """Cartesian product of parameter values x policies x seeds"""
+    param_names = sorted(param_grid)
+    jobs = []
+    for values in itertools.product(*(param_grid[name] for name in param_names)):
+        params = dict(zip(param_names, values))
+        for policy in policies:
+            for seed in seeds:
+                jobs.append(SimJob(len(jobs), seed, policy, params, max_frames))
+    return jobs
+
+
+def run_jobs(jobs, workers=0, progress=True):
+    """Run jobs on a process pool (workers=0: one per core); results come back in job order"""
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    results = []
+    start_s = time.perf_counter()
+    if workers == 1:
+        result_iter = map(run_simulation, jobs)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers)
+        result_iter = pool.imap_unordered(run_simulation, jobs, chunksize=max(1, len(jobs) // (workers * 8)))
+    try:
+        for result in result_iter:
+            results.append(result)
+            if progress and (len(results) % max(1, len(jobs) // 20) == 0 or len(results) == len(jobs)):
+                print(f"  {len(results)}/{len(jobs)} runs  ({time.perf_counter() - start_s:.1f} s)")
+    finally:
+        if pool is not None:
+            pool.close(); pool.join()
+    results.sort(key=lambda r: r["job_id"])
+    return results
+
+
+def write_columnar(results, out_path):
+    """One column per metric; score_curve is a (runs x samples) matrix / list column"""
+    if not results:
+        raise ValueError("no simulation results to write")
+    columns = {key: [r[key] for r in results] for key in results[0]}
+    extension = os.path.splitext(out_path)[1].lower()
+    if extension == ".parquet":
+        import pyarrow
+        import pyarrow.parquet
+        pyarrow.parquet.write_table(pyarrow.table(columns), out_path)
+    elif extension == ".csv":
+        score_curves = columns.pop("score_curve")
+        header = list(columns) + [f"score_at_{int((i + 1) * SCORE_SAMPLE_INTERVAL_S)}s" for i in range(len(score_curves[0]))]
+        with open(out_path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(header)
+            for row_idx in range(len(results)):
+                writer.writerow([columns[key][row_idx] for key in columns] + score_curves[row_idx])
+    else:
+        import numpy as np
+        arrays = {key: np.asarray(values) for key, values in columns.items()}
+        arrays["score_curve_t_s"] = np.arange(1, arrays["score_curve"].shape[1] + 1) * SCORE_SAMPLE_INTERVAL_S
+        np.savez_compressed(out_path, **arrays)
+
+
+def print_summary(results, param_names):
+    """Mean survival, score and step cost per (policy, parameter set)"""
+    groups = {}
+    for r in results:
+        groups.setdefault((r["policy"],) + tuple(r[name] for name in param_names), []).append(r)
+    print(f"{'policy':<12} {'params':<40} {'runs':>5} {'surv s':>8} {'score':>8} {'died':>5} {'peak ent':>9} {'p95 ms':>7}")
+    for group_key, runs in sorted(groups.items(), key=lambda item: str(item[0])):
+        param_text = ", ".join(f"{name}={value}" for name, value in zip(param_names, group_key[1:])) or "-"
+        n = len(runs)
+        print(f"{group_key[0]:<12} {param_text:<40} {n:>5} {sum(r['survival_s'] for r in runs) / n:>8.1f} "
+              f"{sum(r['final_score'] for r in runs) / n:>8.0f} {sum(r['died'] for r in runs) / n:>5.0%} "
+              f"{max(r['peak_entities'] for r in runs):>9} {sum(r['step_ms_p95'] for r in runs) / n:>7.2f}")
+
+
+def parse_param_value(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+def parse_sweep_args(argv):
+    parser = argparse.ArgumentParser(description="Parallel headless simulation sweeps")
+    parser.add_argument("--seeds", type=int, default=10, help="runs per parameter set and policy")
+    parser.add_argument("--seed-base", type=int, default=1000)
+    parser.add_argument("--policies", type=str, default="sweep", help="comma separated: " + ",".join(INPUT_POLICIES))
+    parser.add_argument("--param", action="append", default=[], help="SessionConfig field and values, e.g. boss_max_health_base=30,40,60")
+    parser.add_argument("--max-seconds", type=float, default=120.0, help="simulated seconds per run")
+    parser.add_argument("--workers", type=int, default=0, help="processes (0 = all cores)")
+    parser.add_argument("--out", type=str, default="sim_results.npz")
+    args = parser.parse_args(argv)
+
+    if args.seeds < 1:
+        parser.error("--seeds must be at least 1")
+    if args.max_seconds * SIM_FPS < 1:
+        parser.error("--max-seconds must cover at least one frame")
+    config_fields = vars(SessionConfig())
+    param_grid = {}
+    for param_text in args.param:
+        name, _, values_text = param_text.partition("=")
+        if name not in config_fields or name == "seed":
+            parser.error(f"unknown SessionConfig field: {name}")
+        try:
+            values = [parse_param_value(v) for v in values_text.split(",") if v.strip()]
+        except ValueError:
+            parser.error(f"--param {name}: values must be numbers, got {values_text!r}")
+        if not values:
+            parser.error(f"--param {name}: no values given (expected e.g. {name}=30,40,60)")
+        param_grid[name] = values
+    policies = [p.strip() for p in args.policies.split(",") if p.strip()]
+    if not policies:
+        parser.error("--policies: no policy given")
+    for policy in policies:
+        if policy not in INPUT_POLICIES:
+            parser.error(f"unknown policy: {policy}")
+    return args, param_grid, policies
+
+
+def main(argv):
+    args, param_grid, policies = parse_sweep_args(argv)
+    seeds = [args.seed_base + i for i in range(args.seeds)]
+    jobs = build_jobs(param_grid, seeds, policies, int(args.max_seconds * SIM_FPS))
+    print(f"{len(jobs)} runs, {args.max_seconds:.0f} s simulated each, backend: {ACCELERATION_BACKEND}")
+    results = run_jobs(jobs, args.workers)
+    write_columnar(results, args.out)
+    print_summary(results, sorted(param_grid))
+    print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,114 @@
+"""
+Sprite Cache - Pre-rendered sprites for ships, enemies, boss and power-ups
+Everything is baked once after the display exists; per frame the game only
+queues (sprite, position) pairs and flushes them with a single Surface.blits.
+"""
+
+import math
+import pygame
+
+SHIELD_PULSE_FRAMES = 32
+SHIELD_PULSE_RATE = 0.01  # radians per ms, same as the old per-frame sin()
+
+
+class SpriteCache:
+    """Baked sprites keyed by name; each entry is (surface, (offset_x, offset_y))"""
+
+    def __init__(self):
+        self._sprites = {}
+
+    def store(self, key, surface, offset=(0, 0)):
+        self._sprites[key] = (surface, offset)
+
+    def get(self, key):
+        return self._sprites[key]
+
+    def __contains__(self, key):
+        return key in self._sprites
+
+    def surfaces(self):
+        return [surface for surface, _ in self._sprites.values()]
+
+
+class SpriteBatch:
+    """Collects blits for one frame and draws them with a single Surface.blits call"""
+
+    def __init__(self):
+        self._blit_sequence = []
+
+    def add(self, sprite_entry, x_pos, y_pos, area=None):
+        surface, (offset_x, offset_y) = sprite_entry
+        if area is None:
+            self._blit_sequence.append((surface, (x_pos + offset_x, y_pos + offset_y)))
+        else:
+            self._blit_sequence.append((surface, (x_pos + offset_x, y_pos + offset_y), area))
+
+    def add_surface(self, surface, x_pos, y_pos):
+        self._blit_sequence.append((surface, (x_pos, y_pos)))
+
+    def flush(self, target_surface):
+        if self._blit_sequence:
+            target_surface.blits(self._blit_sequence, doreturn=False)
+            self._blit_sequence.clear()
+
+
+def _display_format(surf, per_pixel_alpha=False):
+    """Convert to the display pixel format for fast blits; headless sessions without a display keep the raw surface"""
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        return surf.convert_alpha() if per_pixel_alpha else surf.convert()
+    return surf
+
+
+def bake_rect_sprite(width, height, color):
+    """Opaque filled rectangle (enemies, projectiles, bars)"""
+    surf = _display_format(pygame.Surface((width, height)))
+    surf.fill(color)
+    return surf
+
+
+def bake_player_ship(width, height, ship_color, cockpit_color):
+    """Triangle hull plus cockpit, drawn exactly like helper_draw_player_ship used to"""
+    surf = _display_format(pygame.Surface((width + 1, height + 1), pygame.SRCALPHA), True)
+    pygame.draw.polygon(surf, ship_color, [(width // 2, 0), (0, height), (width, height)])
+    pygame.draw.ellipse(surf, cockpit_color, pygame.Rect(width // 2 - 6, 12, 12, 12))
+    return surf
+
+
+def bake_shield_frames(width, height, shield_color, num_frames=SHIELD_PULSE_FRAMES):
+    """One pulse period of the shield ellipse, alpha = 100 + 50 * sin(phase)"""
+    frames = []
+    for frame_idx in range(num_frames):
+        shield_alpha = 100 + math.sin(2 * math.pi * frame_idx / num_frames) * 50
+        surf = _display_format(pygame.Surface((width + 20, height + 20), pygame.SRCALPHA), True)
+        pygame.draw.ellipse(surf, (*shield_color, int(shield_alpha)), surf.get_rect(), 4)
+        frames.append(surf)
+    return frames
+
+
+def shield_frame_index(ticks_ms, num_frames=SHIELD_PULSE_FRAMES):
+    """Pulse frame matching sin(ticks_ms * SHIELD_PULSE_RATE)"""
+    phase = (ticks_ms * SHIELD_PULSE_RATE) / (2 * math.pi)
+    return int(phase * num_frames) % num_frames
+
+
+def bake_boss(width, height, body_color, core_color, eye_color):
+    """Boss hull: body, inner core and eye"""
+    surf = _display_format(pygame.Surface((width, height)))
+    body_rect = surf.get_rect()
+    surf.fill(body_color)
+    pygame.draw.rect(surf, core_color, body_rect.inflate(-20, -50))
+    pygame.draw.circle(surf, eye_color, (body_rect.centerx, 30), 15)
+    return surf
+
+
+def bake_power_up(diameter, color, label, font_obj, label_color):
+    """Power-up orb with its letter; returns (surface, offset) since the label overhangs the orb"""
+    orb_rect = pygame.Rect(0, 0, diameter, diameter)
+    label_surf = font_obj.render(label, True, label_color)
+    label_rect = label_surf.get_rect()
+    label_rect.midtop = (orb_rect.centerx, orb_rect.centery - 15)
+    bounds = orb_rect.union(label_rect)
+    surf = _display_format(pygame.Surface(bounds.size, pygame.SRCALPHA), True)
+    pygame.draw.circle(surf, color, (orb_rect.centerx - bounds.x, orb_rect.centery - bounds.y), diameter // 2)
+    surf.blit(label_surf, (label_rect.x - bounds.x, label_rect.y - bounds.y))
+    return surf, (bounds.x, bounds.y)
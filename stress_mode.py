@@ -0,0 +1,160 @@
+"""
+Stress Mode - Bullet-hell scalability benchmark
+Drives the game with synthetic input through increasing projectile tiers
+and reports frame-time percentiles for each entity-count tier.
+
+Run:
+    python airplane.py --stress                 (windowed)
+    python airplane.py --stress --headless      (no window, uncapped)
+    python airplane.py --stress --boss --seed 7 --tiers 500,1000,2000,4000
+"""
+
+import math
+import time
+
+import game_session
+from game_session import SessionConfig, EnemyProjectile
+
+FRAME_BUDGET_60_FPS_MS = 1000.0 / 60.0
+DEFAULT_PROJECTILE_TIERS = [0, 250, 500, 1000, 2000, 4000]
+
+
+class StressConfig:
+    """Settings for one stress run"""
+
+    def __init__(self, seed=1234, headless=False, spawn_multiplier=4, volley_multiplier=4,
+                 projectile_tiers=None, frames_per_tier=300, warmup_frames=30, force_boss=False):
+        self.seed = seed
+        self.headless = headless
+        self.spawn_multiplier = max(1, spawn_multiplier)
+        self.volley_multiplier = max(1, volley_multiplier)
+        self.projectile_tiers = projectile_tiers if projectile_tiers else list(DEFAULT_PROJECTILE_TIERS)
+        self.frames_per_tier = frames_per_tier
+        self.warmup_frames = warmup_frames
+        self.force_boss = force_boss
+
+
+def add_stress_arguments(parser):
+    """--stress and its options, on the game's argument parser"""
+    group = parser.add_argument_group("stress benchmark")
+    group.add_argument("--stress", action="store_true", help="run the bullet-hell stress benchmark")
+    group.add_argument("--headless", action="store_true", help="no window, no frame cap (stress mode only)")
+    group.add_argument("--seed", type=int, default=1234)
+    group.add_argument("--spawn-mult", type=int, default=4, help="enemies spawned per spawn tick")
+    group.add_argument("--volley-mult", type=int, default=4, help="multiplier for boss num_shots")
+    group.add_argument("--tiers", type=str, default=None, help="comma separated EnemyProjectile counts")
+    group.add_argument("--frames-per-tier", type=int, default=300)
+    group.add_argument("--boss", action="store_true", help="run the tiers during a boss fight")
+
+
+def stress_config_from_args(args):
+    """Return a StressConfig when --stress was passed, otherwise None"""
+    if not args.stress:
+        return None
+    tiers = [int(t) for t in args.tiers.split(",") if t.strip()] if args.tiers else None
+    return StressConfig(seed=args.seed, headless=args.headless, spawn_multiplier=args.spawn_mult,
+                        volley_multiplier=args.volley_mult, projectile_tiers=tiers,
+                        frames_per_tier=args.frames_per_tier, force_boss=args.boss)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(math.ceil(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+class StressRunner:
+    """Feeds synthetic input, walks the projectile tiers and records frame times"""
+
+    def __init__(self, config):
+        self.config = config
+        self.frame_index = 0
+        self.tier_index = 0
+        self.tier_frame_index = 0
+        self.frame_start_s = 0.0
+        self.tier_frame_times_ms = [[] for _ in config.projectile_tiers]
+        self.tier_entity_counts = [[] for _ in config.projectile_tiers]
+
+    @property
+    def projectile_target(self):
+        return self.config.projectile_tiers[self.tier_index]
+
+    def synthetic_input(self):
+        """Normalized finger position sweeping the playfield, always pinched (shooting)"""
+        t = self.frame_index * 0.02
+        finger_x_norm = 0.5 + 0.38 * math.sin(t * 1.3)
+        finger_y_norm = 0.5 + 0.3 * math.sin(t * 0.7)
+        return finger_x_norm, finger_y_norm, True
+
+    def projectile_deficit(self, live_projectiles):
+        """How many EnemyProjectiles to spawn this frame to hold the current tier"""
+        return max(0, self.projectile_target - live_projectiles)
+
+    def session_config(self):
+        """SessionConfig for the stressed session: seeded, with the spawn and volley multipliers"""
+        return SessionConfig(seed=self.config.seed, enemies_per_spawn=self.config.spawn_multiplier,
+                             boss_volley_multiplier=self.config.volley_multiplier)
+
+    def prepare_session(self, session):
+        """Skip the instructions screen and calibration; optionally start in the boss fight"""
+        session.start_game()
+        if self.config.force_boss:
+            session.start_boss_fight()
+
+    def before_step(self, session):
+        """Forced multi-shot for the whole run and top up EnemyProjectiles to the current tier"""
+        now_ms = session.clock.get_ticks()
+        session.player_multi_shot_active = True
+        session.player_multi_shot_end_time_ms = now_ms + game_session.player_multi_shot_duration_ms
+        session.player_current_shoot_cooldown_ms = game_session.player_base_shoot_cooldown_ms // 2
+        rng = session.rng
+        for _ in range(self.projectile_deficit(len(session.enemy_bullets_master_list))):
+            session.enemy_bullets_master_list.append(EnemyProjectile(rng.randint(0, game_session.SCREEN_WIDTH - 7), rng.randint(-14, game_session.SCREEN_HEIGHT // 2),
+                                                                     rng.uniform(-1.5, 1.5), rng.uniform(2.0, 6.0)))
+
+    def after_step(self, session):
+        """Keep the player alive so every tier runs to completion"""
+        session.player_lives = session.config.player_lives_start
+        if session.current_game_state == game_session.GAME_STATE_GAME_OVER:
+            session.current_game_state = game_session.GAME_STATE_BOSS_FIGHT if session.boss_active else game_session.GAME_STATE_PLAYING
+
+    def begin_frame(self):
+        self.frame_start_s = time.perf_counter()
+
+    def end_frame(self, entity_count):
+        """Record the frame; returns False once every tier has been measured"""
+        frame_ms = (time.perf_counter() - self.frame_start_s) * 1000.0
+        self.frame_index += 1
+        self.tier_frame_index += 1
+        if self.tier_frame_index > self.config.warmup_frames:
+            self.tier_frame_times_ms[self.tier_index].append(frame_ms)
+            self.tier_entity_counts[self.tier_index].append(entity_count)
+        if self.tier_frame_index >= self.config.warmup_frames + self.config.frames_per_tier:
+            self.tier_index += 1
+            self.tier_frame_index = 0
+        return self.tier_index < len(self.config.projectile_tiers)
+
+    def report(self, backend_name):
+        """Print frame-time percentiles per tier and the largest tier that holds 60 FPS"""
+        print("=" * 78)
+        print(f"Stress benchmark - backend: {backend_name}, seed: {self.config.seed}, "
+              f"{'headless' if self.config.headless else 'windowed'}")
+        print("=" * 78)
+        print(f"{'tier':>6} {'entities':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'60 FPS':>7}")
+        max_entities_at_60 = 0
+        for tier_target, frame_times, entity_counts in zip(self.config.projectile_tiers,
+                                                           self.tier_frame_times_ms, self.tier_entity_counts):
+            if not frame_times:
+                continue
+            sorted_times = sorted(frame_times)
+            avg_entities = int(sum(entity_counts) / len(entity_counts))
+            p95 = percentile(sorted_times, 95)
+            holds_60 = p95 <= FRAME_BUDGET_60_FPS_MS
+            if holds_60:
+                max_entities_at_60 = max(max_entities_at_60, avg_entities)
+            print(f"{tier_target:>6} {avg_entities:>9} {percentile(sorted_times, 50):>8.2f} {p95:>8.2f} "
+                  f"{percentile(sorted_times, 99):>8.2f} {sorted_times[-1]:>8.2f} {'yes' if holds_60 else 'NO':>7}")
+        print("-" * 78)
+        print(f"Max entities with p95 frame time under {FRAME_BUDGET_60_FPS_MS:.1f} ms: {max_entities_at_60}")
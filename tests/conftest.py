@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_accelerator
+
+
+# every native -march variant, then the Python backends
+BACKEND_PARAMS = [("native", variant) for variant in game_accelerator.NATIVE_VARIANT_NAMES] + \
+    [(name, None) for name in game_accelerator.BACKEND_NAMES if name != "native"]
+
+
+@pytest.fixture(params=BACKEND_PARAMS, ids=[name if variant is None else f"{name}-{variant}" for name, variant in BACKEND_PARAMS])
+def backend(request):
+    """Every accelerator backend (and native variant) in turn; skipped when it is not built / not runnable here"""
+    name, variant = request.param
+    try:
+        accel = game_accelerator.load_backend(name, variant)
+    except ImportError as exc:
+        pytest.skip(f"{name} backend unavailable: {exc}")
+    info = accel.accelerator_info()
+    yield accel
+    accel.set_parallelism(info["max_threads"], info["parallel_min_pairs"])
+    accel.set_simd_enabled(True)
+    accel.set_release_gil(info["release_gil"])
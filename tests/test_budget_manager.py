@@ -0,0 +1,108 @@
+"""Budget manager: degradation levels from the smoothed frame work time and the entity count"""
+
+import types
+
+import pygame
+import pytest
+
+from budget_manager import BudgetManager, BudgetConfig, frame_budget_for_fps, MAX_DEGRADATION_LEVEL, LEVEL_PROJECTILE_CULL
+from entity_compaction import RemovalMarks
+
+
+@pytest.mark.parametrize("target_fps, budget_ms", [(60, 1000 / 60 - 2), (90, 1000 / 90 - 2), (144, 1000 / 144 - 2)])
+def test_frame_budget_follows_the_target_rate(target_fps, budget_ms):
+    assert frame_budget_for_fps(target_fps) == pytest.approx(budget_ms)
+
+
+def test_idle_60hz_frames_do_not_escalate():
+    budget = BudgetManager(BudgetConfig(frame_budget_ms=frame_budget_for_fps(60)))
+    # 4 ms of work, then the present waits for the 16.7 ms refresh: only the work is fed in
+    for _ in range(2000):
+        assert budget.update(4.0, 200) == 0
+    # a frame that uses most of its 60 Hz period is still within budget
+    for _ in range(2000):
+        assert budget.update(13.0, 200) == 0
+
+
+def feed(budget, frame_ms, entity_count, frames):
+    for _ in range(frames): budget.update(frame_ms, entity_count)
+    return budget.level
+
+
+def test_smoothed_frame_time_escalates_one_level_at_a_time():
+    config = BudgetConfig(frame_budget_ms=9.0, escalate_after_frames=20)
+    budget = BudgetManager(config)
+    # single spikes are smoothed away
+    for frame_idx in range(500):
+        budget.update(40.0 if frame_idx % 50 == 0 else 4.0, 100)
+    assert budget.level == 0
+    # sustained overload: the EMA needs a few frames to cross 9 ms, then one level per escalate_after_frames
+    assert feed(budget, 20.0, 100, 10) == 0
+    levels = [budget.update(20.0, 100) for _ in range(200)]
+    assert levels[-1] == 4 and sorted(levels) == levels
+    assert [levels.index(level) for level in range(1, 5)] == [levels.index(1) + 20 * step for step in range(4)]
+
+
+def test_recovery_needs_sustained_headroom():
+    config = BudgetConfig(frame_budget_ms=9.0, recover_ratio=0.7, recover_after_frames=270)
+    budget = BudgetManager(config)
+    feed(budget, 20.0, 100, 200)
+    assert budget.level == 4
+    # between 0.7 x budget and the budget: neither over nor comfortably under, nothing changes
+    assert feed(budget, 7.5, 100, 2000) == 4
+    # well under, but too many entities for recovery (1200 > 0.7 x 1500)
+    assert feed(budget, 2.0, 1200, 2000) == 4
+    assert feed(budget, 2.0, 100, 269 + 40) == 3  # the EMA first has to fall below 6.3 ms
+    assert feed(budget, 2.0, 100, 270) == 2
+    # one over-budget frame resets the count towards the next step down
+    feed(budget, 2.0, 100, 200); budget.update(2.0, 5000)
+    assert feed(budget, 2.0, 100, 269) == 2
+    assert feed(budget, 2.0, 100, 1) == 1
+
+
+def test_entity_count_alone_escalates():
+    budget = BudgetManager(BudgetConfig(entity_budget=1500, escalate_after_frames=20))
+    assert feed(budget, 1.0, 1500, 100) == 0
+    assert feed(budget, 1.0, 1501, 19) == 0
+    assert feed(budget, 1.0, 1501, 1) == 1
+    budget.reset()
+    assert budget.level == 0 and budget.frame_ms_avg == 0.0
+
+
+def stub_session(num_enemy_bullets, num_boss_bullets):
+    """Bullets in a row along x, the player at the origin: bullet distance grows with its x"""
+    bullet = lambda x: types.SimpleNamespace(rect=pygame.Rect(x, 0, 7, 7))
+    return types.SimpleNamespace(
+        player_rect=pygame.Rect(0, 0, 1, 1),
+        enemy_bullets_master_list=[bullet(10 * idx) for idx in range(num_enemy_bullets)],
+        boss_bullets_master_list=[bullet(10 * idx + 5) for idx in range(num_boss_bullets)],
+        enemy_bullet_marks=RemovalMarks(), boss_bullet_marks=RemovalMarks())
+
+
+def test_stages_apply_in_order():
+    config = BudgetConfig(particle_scale=0.4, explosion_cap=16, projectile_cap=10, star_count=60)
+    budget = BudgetManager(config)
+    applied = []
+    for level in range(MAX_DEGRADATION_LEVEL + 1):
+        budget.level = level
+        session = stub_session(8, 8)
+        budget.cull_projectiles(session)
+        applied.append((budget.particle_count(20), budget.explosion_cap,
+                        len(session.enemy_bullet_marks) + len(session.boss_bullet_marks), budget.star_count))
+    assert applied == [(20, None, 0, None), (8, None, 0, None), (8, 16, 0, None), (8, 16, 6, None), (8, 16, 6, 60)]
+    assert budget.particle_count(1) == 1
+    assert budget.hud_text() == f"Detail {MAX_DEGRADATION_LEVEL}/{MAX_DEGRADATION_LEVEL}: fewer stars"
+
+
+def test_projectile_cull_drops_the_farthest_first():
+    budget = BudgetManager(BudgetConfig(projectile_cap=10))
+    budget.level = LEVEL_PROJECTILE_CULL
+    session = stub_session(8, 8)
+    session.enemy_bullet_marks.mark(0)  # already dying this frame: not culled again, but no longer counted
+    budget.cull_projectiles(session)
+    # 15 alive, cap 10: the five farthest go (enemy x 60, 70; boss x 55, 65, 75)
+    assert session.enemy_bullet_marks.indices == {0, 6, 7}
+    assert session.boss_bullet_marks.indices == {5, 6, 7}
+    assert budget.projectiles_culled == 5
+    budget.cull_projectiles(session)
+    assert budget.projectiles_culled == 5
@@ -0,0 +1,131 @@
+"""Bullet patterns: the unit-vector tables and the boss volleys they replaced"""
+
+import collections
+import math
+import random
+
+import pytest
+
+from bullet_patterns import SpreadPattern, AimedFanPattern, RingPattern, SpiralPattern, aimed_unit_vector
+
+Shot = collections.namedtuple("Shot", "x y vel_x vel_y")
+JITTER_QUANTUM_RAD = 0.001
+
+
+def old_spread_volley(num_shots, emitter_x, emitter_y, speed, rng):
+    """PHASE_1_ATTACK before the patterns: cos / sin per bullet"""
+    volley, angle_spread = [], math.pi / (num_shots + 1)
+    for i in range(num_shots):
+        angle = (i + 1) * angle_spread - (math.pi / 2) + rng.uniform(-0.1, 0.1)
+        vel_x, vel_y = math.cos(angle) * speed, math.sin(angle) * speed
+        if vel_y <= 0: vel_y = speed
+        volley.append((Shot(emitter_x - 3 + (i - num_shots // 2) * 20, emitter_y, vel_x, vel_y), angle))
+    return volley
+
+
+def old_aimed_fan_volley(volley_multiplier, emitter_x, emitter_y, target_x, aim_dy, speed):
+    """PHASE_2_ATTACK before the patterns: hypot per bullet"""
+    volley = []
+    for i in range(-2 * volley_multiplier, 2 * volley_multiplier + 1):
+        dx, dy = target_x - (emitter_x + i * 30), aim_dy
+        dist = math.hypot(dx, dy) if math.hypot(dx, dy) > 0 else 1
+        vel_x, vel_y = (dx / dist) * speed, (dy / dist) * speed
+        if vel_y <= 0: vel_y = speed
+        volley.append(Shot(emitter_x - 3 + i * 30, emitter_y, vel_x, vel_y))
+    return volley
+
+
+def angles(unit_vectors):
+    return [math.atan2(unit_vectors[idx + 1], unit_vectors[idx]) for idx in range(0, len(unit_vectors), 2)]
+
+
+def angle_diff(a, b):
+    return abs((a - b + math.pi) % (2 * math.pi) - math.pi)
+
+
+@pytest.mark.parametrize("num_shots", [4, 5, 9, 18])
+def test_spread_matches_the_per_bullet_cos_sin_within_the_jitter_quantum(num_shots):
+    speed = 7.5
+    pattern = SpreadPattern(num_shots, start_rad=-math.pi / 2, arc_rad=math.pi, jitter_rad=0.1, origin_spacing=20)
+    for seed in range(50):
+        new_volley = []
+        pattern.fire(new_volley, Shot, 400, 120, speed, random.Random(seed))
+        old_volley = old_spread_volley(num_shots, 400, 120, speed, random.Random(seed))
+        assert len(new_volley) == num_shots
+        for new_shot, (old_shot, old_angle) in zip(new_volley, old_volley):
+            assert (new_shot.x, new_shot.y) == (old_shot.x, old_shot.y)
+            if abs(old_angle) < JITTER_QUANTUM_RAD: continue  # quantizing may move it across "flies straight down"
+            # rounding to the nearest table step is at most half a quantum off
+            assert new_shot.vel_x == pytest.approx(old_shot.vel_x, abs=speed * JITTER_QUANTUM_RAD / 2 + 1e-12)
+            assert new_shot.vel_y == pytest.approx(old_shot.vel_y, abs=speed * JITTER_QUANTUM_RAD / 2 + 1e-12)
+
+
+def test_spread_draws_one_uniform_per_bullet():
+    rng, reference = random.Random(3), random.Random(3)
+    SpreadPattern(7).fire([], Shot, 0, 0, 5.0, rng)
+    for _ in range(7): reference.uniform(-0.1, 0.1)
+    assert rng.random() == reference.random()
+
+
+@pytest.mark.parametrize("volley_multiplier, target_x", [(1, 400), (2, 17), (3, 799), (2, 5000)])
+def test_aimed_fan_matches_the_per_bullet_hypot(volley_multiplier, target_x):
+    speed, aim_dy = 9.0, 600
+    pattern = AimedFanPattern(range(-2 * volley_multiplier, 2 * volley_multiplier + 1), origin_spacing=30, aim_dy=aim_dy)
+    new_volley = []
+    pattern.fire(new_volley, Shot, 380, 150, target_x, speed)
+    # the table is keyed by the exact integer dx (outside it, the direct computation), so nothing is quantized
+    assert new_volley == old_aimed_fan_volley(volley_multiplier, 380, 150, target_x, aim_dy, speed)
+
+
+@pytest.mark.parametrize("num_shots, start_rad", [(1, 0.0), (6, 0.0), (12, 0.3), (25, -math.pi / 2)])
+def test_ring_unit_vectors_are_evenly_spaced(num_shots, start_rad):
+    pattern = RingPattern(num_shots, start_rad=start_rad)
+    table = pattern.unit_vectors
+    assert len(table) == 2 * num_shots
+    for idx in range(0, len(table), 2):
+        assert math.hypot(table[idx], table[idx + 1]) == pytest.approx(1.0)
+    ring_angles = angles(table)
+    assert angle_diff(ring_angles[0], start_rad) == pytest.approx(0.0, abs=1e-12)
+    for shot_idx in range(num_shots):
+        spacing = (ring_angles[(shot_idx + 1) % num_shots] - ring_angles[shot_idx]) % (2 * math.pi)
+        assert spacing == pytest.approx(2 * math.pi / num_shots if num_shots > 1 else 0.0, abs=1e-9)
+    volley = []
+    pattern.fire(volley, Shot, 100, 50, 4.0)
+    assert [(shot.x, shot.y) for shot in volley] == [(97, 50)] * num_shots
+    assert [shot.vel_x for shot in volley] == pytest.approx([4.0 * table[idx] for idx in range(0, len(table), 2)])
+
+
+def spiral_volley_angles(pattern, volley_index):
+    volley = []
+    pattern.fire(volley, Shot, 0, 0, 1.0, volley_index)
+    return [math.atan2(shot.vel_y, shot.vel_x) for shot in volley]
+
+
+@pytest.mark.parametrize("num_arms, step_rad", [(3, 0.2), (4, 0.15), (8, 0.1), (5, 0.33)])
+def test_spiral_turns_by_one_step_across_the_cycle_wrap(num_arms, step_rad):
+    pattern = SpiralPattern(num_arms, step_rad=step_rad)
+    cycle = pattern.steps_per_cycle
+    snapped_step = 2 * math.pi / num_arms / cycle
+    assert snapped_step == pytest.approx(step_rad, rel=0.5)
+    assert len(pattern.unit_vectors) == 2 * cycle * num_arms
+    # every volley, including last of a cycle -> first of the next, turns every arm by the same step
+    for volley_index in range(2 * cycle + 1):
+        before, after = spiral_volley_angles(pattern, volley_index), spiral_volley_angles(pattern, volley_index + 1)
+        for arm_idx in range(num_arms):
+            turned = before[arm_idx] + snapped_step
+            assert min(angle_diff(turned, angle) for angle in after) == pytest.approx(0.0, abs=1e-9)
+    # the table repeats after one cycle
+    assert spiral_volley_angles(pattern, cycle) == spiral_volley_angles(pattern, 0)
+    assert spiral_volley_angles(pattern, 3 * cycle + 2) == spiral_volley_angles(pattern, 2)
+
+
+def test_spiral_with_explicit_cycle_keeps_its_step():
+    pattern = SpiralPattern(2, step_rad=0.1, steps_per_cycle=7)
+    assert pattern.steps_per_cycle == 7
+    assert angle_diff(spiral_volley_angles(pattern, 6)[0], 0.6) == pytest.approx(0.0, abs=1e-12)
+    assert spiral_volley_angles(pattern, 7) == spiral_volley_angles(pattern, 0)
+
+
+def test_aimed_unit_vector_handles_a_zero_vector():
+    assert aimed_unit_vector(0, 0) == (0.0, 0.0)
+    assert aimed_unit_vector(3, 4) == (0.6, 0.8)
@@ -0,0 +1,74 @@
+"""End-of-frame swap-remove compaction of the entity lists"""
+
+import random
+
+import pytest
+
+from entity_compaction import RemovalMarks, swap_remove_indices
+
+
+def compacted(items, indices):
+    items = list(items)
+    marks = RemovalMarks()
+    for idx in indices: marks.mark(idx)
+    marks.compact(items)
+    assert len(marks) == 0
+    return items
+
+
+def test_empty_mark_set_leaves_the_list_alone():
+    items = ["a", "b", "c"]
+    marks = RemovalMarks()
+    marks.compact(items)
+    assert items == ["a", "b", "c"]
+    swap_remove_indices(items, set())
+    assert items == ["a", "b", "c"]
+    empty = []
+    marks.compact(empty)
+    assert empty == []
+
+
+def test_duplicate_marks_remove_once():
+    marks = RemovalMarks()
+    marks.mark(1); marks.mark(1); marks.mark(3); marks.mark(1)
+    assert len(marks) == 2
+    items = [0, 1, 2, 3, 4]
+    marks.compact(items)
+    assert sorted(items) == [0, 2, 4]
+
+
+@pytest.mark.parametrize("indices", [{4}, {3, 4}, {0, 4}, {0, 1, 2, 3, 4}])
+def test_marking_the_last_element(indices):
+    items = compacted(range(5), indices)
+    assert sorted(items) == [value for value in range(5) if value not in indices]
+
+
+def test_swap_remove_moves_the_tail_into_each_hole():
+    # holes are filled from the highest index down, each by whatever is last at that moment
+    assert compacted("abcdef", {1, 3}) == ["a", "e", "c", "f"]
+    assert compacted("abcdef", {0}) == ["f", "b", "c", "d", "e"]
+
+
+def test_parallel_lists_stay_aligned():
+    rng = random.Random(4)
+    for _ in range(200):
+        size = rng.randint(0, 30)
+        rects = [("rect", idx) for idx in range(size)]
+        velocities = [("velocity", idx) for idx in range(size)]
+        indices = {rng.randrange(size) for _ in range(rng.randint(0, size))} if size else set()
+        swap_remove_indices(rects, indices); swap_remove_indices(velocities, indices)
+        assert [idx for _, idx in rects] == [idx for _, idx in velocities]
+        assert sorted(idx for _, idx in rects) == [idx for idx in range(size) if idx not in indices]
+
+
+def test_marks_during_the_frame():
+    items = [5, -1, 7, -2, 9]
+    marks = RemovalMarks()
+    marks.mark(0)
+    marks.mark_rejected(items, lambda value: value > 0)
+    assert marks.indices == {0, 1, 3}
+    assert marks.is_marked(3) and not marks.is_marked(2)
+    assert marks.first_unmarked([0, 1, 2, 4]) == 2
+    assert marks.first_unmarked([0, 3]) is None
+    marks.compact(items)
+    assert sorted(items) == [7, 9]
@@ -0,0 +1,77 @@
+"""Frame scheduler: deferred idle work, pacing and the frame statistics"""
+
+import argparse
+import time
+
+import pytest
+
+from frame_scheduler import FrameScheduler, FrameSchedulerConfig, parse_target_fps
+from gc_policy import GCPolicy, GCPolicyConfig, GC_MODE_AUTO
+
+
+def new_scheduler(**config):
+    # an auto-mode policy that is never started leaves the interpreter's collector alone
+    return FrameScheduler(FrameSchedulerConfig(**config), GCPolicy(GCPolicyConfig(mode=GC_MODE_AUTO)))
+
+
+def test_frame_stats_on_an_empty_window():
+    stats = new_scheduler(target_fps=120).frame_stats()
+    assert stats.pop("target_fps") == 120
+    assert stats == {"fps": 0.0, "interval_ms_mean": 0.0, "interval_ms_stdev": 0.0, "interval_ms_p99": 0.0,
+                     "interval_ms_max": 0.0, "work_ms_mean": 0.0, "work_ms_p95": 0.0, "frames_total": 0,
+                     "deadlines_missed": 0, "idle_ms_total": 0.0}
+    assert "Pace 120 Hz" in new_scheduler(target_fps=120).overlay_text()
+
+
+def test_deferred_callable_runs_once():
+    scheduler, calls = new_scheduler(), []
+    scheduler.defer(lambda: calls.append("warm"))
+    now_s = time.perf_counter()
+    scheduler._run_idle(now_s, now_s + 1.0)
+    scheduler._run_idle(time.perf_counter(), time.perf_counter() + 1.0)
+    assert calls == ["warm"]
+
+
+def test_deferred_iterator_is_advanced_step_by_step_and_dropped_when_exhausted():
+    scheduler, steps, calls = new_scheduler(), [], []
+
+    def warm_up():
+        for step in range(5):
+            steps.append(step)
+            time.sleep(0.01)
+            yield
+
+    scheduler.defer(warm_up())
+    scheduler.defer(lambda: calls.append("after"))
+    now_s = time.perf_counter()
+    scheduler._run_idle(now_s, now_s)  # no idle time: nothing runs
+    assert steps == [] and calls == []
+    scheduler._step_cost_ms = 10.0  # steps take 10 ms: one fits a 15 ms window
+    now_s = time.perf_counter()
+    scheduler._run_idle(now_s, now_s + 0.015)
+    assert steps == [0] and calls == []
+    now_s = time.perf_counter()
+    scheduler._run_idle(now_s, now_s + 1.0)
+    # deferred work runs in order: the callable only after the iterator is used up
+    assert steps == [0, 1, 2, 3, 4] and calls == ["after"]
+    assert not scheduler._deferred and scheduler.idle_ms_total > 0
+
+
+def test_tick_paces_to_the_target_and_runs_deferred_work():
+    scheduler, calls = new_scheduler(target_fps=200), []
+    assert scheduler.tick() == 0
+    scheduler.defer(lambda: calls.append("idle"))
+    started_s = time.perf_counter()
+    intervals = [scheduler.tick() for _ in range(6)]
+    assert time.perf_counter() - started_s >= 6 * 0.005 - 0.001
+    assert calls == ["idle"]
+    assert all(interval > 0 for interval in intervals)
+    stats = scheduler.frame_stats()
+    assert stats["frames_total"] == 6 and stats["interval_ms_mean"] == pytest.approx(5.0, abs=2.0)
+
+
+def test_parse_target_fps():
+    assert parse_target_fps("144") == 144
+    for text in ("0", "-60", "fast"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_target_fps(text)
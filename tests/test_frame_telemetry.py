@@ -0,0 +1,76 @@
+"""Camera frame ring, stale-frame dropping and the latency histograms"""
+
+import time
+
+import pytest
+
+from frame_telemetry import (FrameRecord, CameraFrameRing, LatencyTelemetry, histogram_bar, HISTOGRAM_BUCKET_MS,
+                             OVERLAY_HISTOGRAM_BUCKETS, LATENCY_STAGES)
+
+
+def pushed(ring, frame_id, age_s=0.0):
+    record = FrameRecord(frame_id, None, time.perf_counter() - age_s)
+    ring.push(record)
+    return record
+
+
+def test_ring_hands_out_the_newest_frame_and_counts_the_rest_superseded():
+    ring = CameraFrameRing(capacity=4)
+    assert ring.take_latest() is None
+    for frame_id in range(3): pushed(ring, frame_id)
+    record = ring.take_latest()
+    assert record.frame_id == 2 and record.consume_s > 0
+    assert ring.frames_superseded == 2
+    assert ring.take_latest() is None  # consumed frames are gone
+
+
+def test_ring_capacity_drops_the_oldest():
+    ring = CameraFrameRing(capacity=2)
+    for frame_id in range(5): pushed(ring, frame_id)
+    assert ring.take_latest().frame_id == 4
+    # frames 0-2 fell off the ring before the consumer looked; only frame 3 was still waiting
+    assert ring.frames_superseded == 1
+
+
+def test_take_latest_drops_stale_frames():
+    ring = CameraFrameRing()
+    pushed(ring, 0); pushed(ring, 1, age_s=0.5)
+    assert ring.take_latest(max_age_ms=100) is None
+    assert ring.frames_stale == 1 and ring.frames_superseded == 1
+    pushed(ring, 2, age_s=0.5)
+    assert ring.take_latest().frame_id == 2  # no budget: any age is fine
+    fresh = pushed(ring, 3)
+    assert ring.take_latest(max_age_ms=100) is fresh and ring.frames_stale == 1
+
+
+def presented(telemetry, total_ms, inference_ms=10.0):
+    record = FrameRecord(0, None, 0.0)
+    now_s = time.perf_counter()
+    record.capture_s = now_s - total_ms / 1000.0
+    record.inference_start_s = record.capture_s
+    record.inference_end_s = record.inference_start_s + inference_ms / 1000.0
+    record.consume_s = record.inference_end_s
+    telemetry.on_present(record)
+
+
+def test_histograms_and_overlay(tmp_path):
+    telemetry = LatencyTelemetry(log_path=str(tmp_path / "latency.log"))
+    for _ in range(20): presented(telemetry, 32.0)
+    presented(telemetry, 400.0)
+    assert telemetry.percentile("total", 50) == pytest.approx(32.0, abs=1.0)
+    total_hist = telemetry._histograms["total"]
+    assert total_hist[int(32 // HISTOGRAM_BUCKET_MS)] == 20 and total_hist[-1] == 1
+    lines = telemetry.overlay_histogram_lines()
+    assert [line.split()[0] for line in lines] == list(LATENCY_STAGES)
+    total_bar = lines[-1].split("|")[1]
+    assert len(total_bar) == OVERLAY_HISTOGRAM_BUCKETS
+    assert total_bar[6] == "@" and total_bar[-1] != " "  # the 400 ms frame shows in the overflow bucket
+    telemetry._last_log_s = 0.0
+    telemetry.maybe_write_log()
+    assert "total_hist[5ms]=" in (tmp_path / "latency.log").read_text()
+
+
+def test_histogram_bar_scales_to_the_fullest_bucket():
+    assert histogram_bar([0] * 30) == " " * OVERLAY_HISTOGRAM_BUCKETS
+    assert histogram_bar([100, 1, 0, 50], num_buckets=4, levels=" .:#") == "#. :"
+    assert histogram_bar([0, 0, 2, 3, 4], num_buckets=3, levels=" .:#") == "  #"
@@ -0,0 +1,269 @@
+"""Conformance tests: every accelerator backend against game_accelerator/spec.py (and pygame.Rect.colliderect)"""
+
+import math
+import os
+import random
+import subprocess
+import sys
+from array import array
+
+import pygame
+import pytest
+
+import game_accelerator
+from game_accelerator import spec
+
+# (max threads, parallel min pairs, SIMD): the native backend must give the same results on every kernel path
+KERNEL_CONFIGS = [(1, 1 << 16, True), (1, 1 << 16, False), (4, 0, True)]
+
+
+def random_rects(rng, count, extent=48, max_size=10, allow_empty=True):
+    """Small integer rects packed into a small area, so touching edges and empty rects come up often"""
+    min_size = 0 if allow_empty else 1
+    return [(rng.randint(-4, extent), rng.randint(-4, extent), rng.randint(min_size, max_size), rng.randint(min_size, max_size))
+            for _ in range(count)]
+
+
+def soa(rects):
+    return tuple(array("f", [rect[field] for rect in rects]) for field in range(4))
+
+
+def kernel_configs(backend):
+    for max_threads, parallel_min_pairs, simd in KERNEL_CONFIGS:
+        backend.set_parallelism(max_threads, parallel_min_pairs)
+        backend.set_simd_enabled(simd)
+        yield max_threads, parallel_min_pairs, simd
+
+
+def test_api_is_complete(backend):
+    for name in spec.API_FUNCTIONS + spec.API_CLASSES:
+        assert callable(getattr(backend, name)), name
+
+
+def test_native_import_picks_fastest_runnable_variant():
+    runnable = game_accelerator.native_variants()
+    if not runnable:
+        pytest.skip("native backend not built")
+    accel = game_accelerator.load_backend("native")
+    assert accel.variant == runnable[-1]
+    assert accel.accelerator_info()["variant"] == accel.variant
+    with pytest.raises(ValueError):
+        game_accelerator.load_backend("native", "no-such-variant")
+
+
+@pytest.mark.parametrize("env", [{"GAME_ACCEL_BACKEND": "cpp"}, {"GAME_ACCEL_VARIANT": "no-such-variant"}])
+def test_bad_forced_backend_warns_and_falls_back(env):
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", "import game_accelerator; print(game_accelerator.BACKEND)"],
+                            cwd=package_dir, env={**os.environ, **env}, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert "RuntimeWarning" in result.stderr and "default backend order" in result.stderr
+    assert result.stdout.strip() == game_accelerator.available_backends()[0]
+
+
+def test_spec_matches_pygame_colliderect():
+    rng = random.Random(1)
+    for _ in range(5000):
+        rect_a, rect_b = random_rects(rng, 2)
+        assert spec.rects_overlap(*rect_a, *rect_b) == bool(pygame.Rect(rect_a).colliderect(pygame.Rect(rect_b))), (rect_a, rect_b)
+
+
+@pytest.mark.parametrize("rect_b, expected", [
+    ((10, 0, 10, 10), False),   # touching right edge
+    ((0, 10, 10, 10), False),   # touching bottom edge
+    ((-10, 0, 10, 10), False),  # touching left edge
+    ((10, 10, 5, 5), False),    # touching corner
+    ((9, 9, 5, 5), True),       # one pixel of overlap
+    ((2, 2, 3, 3), True),       # contained
+    ((5, 5, 0, 3), False),      # empty, inside
+    ((5, 5, 3, 0), False),
+])
+def test_pairwise_collision_edges(backend, rect_b, expected):
+    rect_a = (0, 0, 10, 10)
+    assert spec.rects_overlap(*rect_a, *rect_b) == expected
+    assert bool(backend.player_bullet_collision(*rect_a, *rect_b)) == expected
+    assert bool(backend.bullet_boss_collision(*rect_b, *rect_a)) == expected
+
+
+def test_pairwise_collision_matches_spec(backend):
+    rng = random.Random(2)
+    for _ in range(2000):
+        rect_a, rect_b = random_rects(rng, 2)
+        expected = spec.rects_overlap(*rect_a, *rect_b)
+        assert bool(backend.player_bullet_collision(*rect_a, *rect_b)) == expected, (rect_a, rect_b)
+        assert bool(backend.bullet_boss_collision(*rect_a, *rect_b)) == expected, (rect_a, rect_b)
+
+
+def test_bullet_enemy_pairs_match_spec(backend):
+    rng = random.Random(3)
+    for num_bullets, num_enemies in [(0, 5), (5, 0), (1, 1), (13, 9), (67, 31)]:
+        for bullet_size, enemy_size in [((7, 22), (45, 35)), ((3, 3), (8, 8)), ((0, 5), (8, 8))]:
+            bullets = [rect[:2] for rect in random_rects(rng, num_bullets, extent=120)]
+            enemies = [rect[:2] for rect in random_rects(rng, num_enemies, extent=120)]
+            expected = spec.overlapping_pairs([(*pos, *bullet_size) for pos in bullets], [(*pos, *enemy_size) for pos in enemies])
+            for config in kernel_configs(backend):
+                nested = backend.check_bullet_enemy_collisions([list(pos) for pos in bullets], [list(pos) for pos in enemies],
+                                                               *bullet_size, *enemy_size)
+                flat = backend.check_bullet_enemy_collisions_soa(
+                    array("f", [pos[0] for pos in bullets]), array("f", [pos[1] for pos in bullets]),
+                    array("f", [pos[0] for pos in enemies]), array("f", [pos[1] for pos in enemies]), *bullet_size, *enemy_size)
+                assert [tuple(pair) for pair in nested] == expected, config
+                assert [tuple(pair) for pair in flat] == expected, config
+
+
+def test_player_queries_match_spec(backend):
+    rng = random.Random(4)
+    for _ in range(60):
+        player = random_rects(rng, 1, max_size=24)[0]
+        groups = [random_rects(rng, rng.randint(0, 37)) for _ in range(4)]
+        expected = [spec.overlapping_indices(player, group) for group in groups]
+        packed = [rect for group in groups for rect in group]
+        for config in kernel_configs(backend):
+            assert [list(hits) for hits in backend.check_player_hits(list(player), *[[list(r) for r in g] for g in groups])] == expected, config
+            assert [list(hits) for hits in backend.check_player_hits_soa(list(player), *soa(packed), [len(g) for g in groups])] == expected, config
+
+        enemies = groups[3]
+        fixed_size = (9, 7)
+        fixed_expected = spec.overlapping_indices(player, [(x, y, *fixed_size) for x, y, _, _ in enemies])
+        assert list(backend.check_player_enemy_collisions(list(player[:2]), [[x, y] for x, y, _, _ in enemies],
+                                                          *player[2:], *fixed_size)) == fixed_expected
+        powerup_flags = backend.check_player_powerup_collisions(list(player[:2]), [[x, y] for x, y, _, _ in enemies], *player[2:], *fixed_size)
+        assert [idx for idx, hit in enumerate(powerup_flags) if hit] == fixed_expected
+
+
+def test_projectile_index_matches_linear_scan(backend):
+    rng = random.Random(5)
+    world_w, world_h = 300, 200
+    for max_depth in (0, 3, 6):
+        index = backend.ProjectileIndex(world_w, world_h, max_depth)
+        for _ in range(4):
+            # mostly small projectiles, a few large ones and some outside the world
+            rects = random_rects(rng, rng.randint(0, 150), extent=world_w, max_size=12)
+            rects += [(rng.randint(-50, world_w), rng.randint(-50, world_h), rng.randint(0, 150), rng.randint(0, 150)) for _ in range(10)]
+            rects += [(rng.randint(-400, -100), rng.randint(world_h + 10, world_h + 300), 6, 6) for _ in range(5)]
+            index.rebuild(*soa(rects))
+            assert len(index) == len(rects)
+            queries = random_rects(rng, 25, extent=world_w, max_size=60) + [(-500, -500, 2000, 2000), (world_w, world_h, 10, 10)]
+            for query in queries:
+                assert list(index.query_rect(*query)) == spec.overlapping_indices(query, rects), (max_depth, query)
+            expected_pairs = [(q_idx, hit) for q_idx, query in enumerate(queries) for hit in spec.overlapping_indices(query, rects)]
+            assert [tuple(pair) for pair in index.query_rects(*soa(queries))] == expected_pairs
+
+
+def test_math_helpers(backend):
+    rng = random.Random(6)
+    for _ in range(200):
+        p1 = [rng.uniform(-1, 1) for _ in range(3)]
+        p2 = [rng.uniform(-1, 1) for _ in range(3)]
+        assert backend.calculate_landmark_distance(*p1, *p2) == pytest.approx(math.dist(p1, p2), rel=1e-5, abs=1e-6)
+        assert backend.point_distance(p1[0], p1[1], p2[0], p2[1]) == pytest.approx(math.dist(p1[:2], p2[:2]), rel=1e-5, abs=1e-6)
+        threshold = rng.uniform(0, 2)
+        if abs(math.dist(p1, p2) - threshold) > 1e-4:
+            assert bool(backend.is_pinch_detected(*p1, *p2, threshold)) == (math.dist(p1, p2) < threshold)
+        from_x, from_y, to_x, to_y = (rng.randint(0, 900) for _ in range(4))
+        assert list(backend.calculate_aim_direction(from_x, from_y, to_x, to_y)) == pytest.approx(
+            spec.aim_direction(from_x, from_y, to_x, to_y), rel=1e-5, abs=1e-6)
+        norm_x, norm_y = rng.random(), rng.random()
+        mapped = backend.map_finger_position(norm_x, norm_y, 0.12, 0.88, 0.2, 0.8, 0, 900, 0, 700)
+        assert list(mapped) == pytest.approx([(norm_x - 0.12) * 900 / 0.76, (norm_y - 0.2) * 700 / 0.6], rel=1e-5, abs=1e-3)
+    assert list(backend.calculate_aim_direction(10, 10, 10, 10)) == [0, 0]
+
+
+def test_update_enemy_positions_in_place(backend):
+    rng = random.Random(7)
+    enemies = [[float(rng.randint(-20, 920)), float(rng.randint(-50, 700)), 45.0, 35.0, float(rng.randint(-6, 6))] for _ in range(40)]
+    rows = list(enemies)
+    speeds = [float(rng.randint(0, 5)) for _ in enemies]
+    expected = [spec.moved_enemy(row, speed, 900) for row, speed in zip(enemies, speeds)]
+    assert backend.update_enemy_positions(enemies, speeds, 900, 700) is enemies
+    assert enemies == expected
+    assert all(row is original for row, original in zip(enemies, rows))
+
+
+MOTION_CASES = [
+    (0, None, None),
+    (spec.MOTION_CULL, None, (0, 0, 120, 90)),
+    (spec.MOTION_CULL_BEFORE, None, (-math.inf, 0, math.inf, math.inf)),
+    (spec.MOTION_CLAMP, (0, 0, 120, 90), None),
+    (spec.MOTION_CLAMP | spec.MOTION_CULL, (0, 0, 120, 90), (-math.inf, -math.inf, math.inf, 60)),
+    (spec.MOTION_CLAMP, (10, 10, 30, 30), None),  # bounds smaller than some rects: centred like clamp_ip
+]
+
+
+def random_velocities(rng, count):
+    # halves and near-halves exercise the pixel rounding rule
+    return [rng.choice([rng.uniform(-6, 6), rng.randint(-6, 6) + 0.5, -2.5, 0.49999999999999994, 1.32]) for _ in range(count)]
+
+
+@pytest.mark.parametrize("flags, clamp_bounds, keep_bounds", MOTION_CASES)
+def test_integrate_rects_matches_spec_and_pygame(backend, flags, clamp_bounds, keep_bounds):
+    rng = random.Random(8)
+    rects = [pygame.Rect(rect) for rect in random_rects(rng, 57, extent=130, max_size=25, allow_empty=False)]
+    rects[0].size = (40, 40)  # larger than the small clamp box
+    vxs, vys = random_velocities(rng, len(rects)), random_velocities(rng, len(rects))
+    expected_rects, expected_culled = [], []
+    for idx, (rect, vx, vy) in enumerate(zip(rects, vxs, vys)):
+        new_x, new_y, is_culled = spec.motion_step(rect.x, rect.y, rect.w, rect.h, vx, vy, flags, clamp_bounds, keep_bounds)
+        expected_rects.append(pygame.Rect(int(new_x), int(new_y), rect.w, rect.h))
+        if is_culled: expected_culled.append(idx)
+        # the spec is pygame's own arithmetic
+        if not (flags & spec.MOTION_CULL_BEFORE and is_culled):
+            pygame_rect = rect.copy(); pygame_rect.x += vx; pygame_rect.y += vy
+            if flags & spec.MOTION_CLAMP:
+                pygame_rect.clamp_ip(pygame.Rect(clamp_bounds[0], clamp_bounds[1], clamp_bounds[2] - clamp_bounds[0], clamp_bounds[3] - clamp_bounds[1]))
+            assert pygame_rect == expected_rects[-1]
+    culled = backend.integrate_rects(rects, array("d", vxs), array("d", vys), flags, clamp_bounds, keep_bounds)
+    assert list(culled) == expected_culled
+    assert rects == expected_rects
+
+
+def test_integrate_rects_broadcasts_scalars(backend):
+    rects = [pygame.Rect(5, y, 7, 22) for y in (-30, -22, -21, 0, 400)]
+    culled = backend.integrate_rects(rects, 0, -10, spec.MOTION_CULL_BEFORE, None, (-math.inf, 0, math.inf, math.inf))
+    assert list(culled) == [0, 1]
+    assert [rect.y for rect in rects] == [-30, -22, -31, -10, 390]
+
+
+def test_integrate_positions_matches_spec(backend):
+    rng = random.Random(9)
+    for flags, clamp_bounds, keep_bounds in MOTION_CASES:
+        count = 41
+        xs = array("d", [rng.randint(-10, 130) for _ in range(count)])
+        ys = array("d", [rng.randint(-10, 100) for _ in range(count)])
+        ws = array("d", [rng.randint(0, 20) for _ in range(count)])
+        vxs, vys = random_velocities(rng, count), random_velocities(rng, count)
+        expected = [spec.motion_step(xs[i], ys[i], ws[i], 4, vxs[i], vys[i], flags, clamp_bounds, keep_bounds) for i in range(count)]
+        culled = backend.integrate_positions(xs, ys, ws, 4, array("d", vxs), array("d", vys), flags, clamp_bounds, keep_bounds)
+        assert list(culled) == [i for i, (_, _, is_culled) in enumerate(expected) if is_culled]
+        assert list(xs) == [x for x, _, _ in expected] and list(ys) == [y for _, y, _ in expected]
+
+
+def test_integrate_positions_on_prefix_views(backend):
+    """Stars move through memoryview prefixes (the budget's reduced star count)"""
+    xs, ys, radii = array("d", [1, 2, 3, 4]), array("d", [698, 699, 700, 10]), array("d", [1, 2, 3, 4])
+    culled = backend.integrate_positions(memoryview(xs)[:3], memoryview(ys)[:3], 0, 0, 0, memoryview(radii)[:3],
+                                         spec.MOTION_CULL, None, (-math.inf, -math.inf, math.inf, 701))
+    assert list(culled) == [1, 2]
+    assert list(ys) == [699, 701, 703, 10]
+
+
+def test_mismatched_buffers_raise(backend):
+    short, full = array("f", [0.0]), array("f", [0.0, 1.0])
+    with pytest.raises(ValueError):
+        backend.check_bullet_enemy_collisions_soa(full, short, full, full, 1, 1, 1, 1)
+    with pytest.raises(ValueError):
+        backend.check_player_hits_soa([0, 0, 1, 1], full, full, full, short, [2, 0, 0, 0])
+    with pytest.raises(ValueError):
+        backend.check_player_hits_soa([0, 0, 1, 1], full, full, full, full, [1, 0, 0, 0])
+    with pytest.raises(ValueError):
+        backend.ProjectileIndex(0, 100, 4)
+    with pytest.raises(ValueError):
+        backend.ProjectileIndex(100, 100, 4).rebuild(full, full, short, full)
+    with pytest.raises(ValueError):
+        backend.integrate_positions(full, short, 0, 0, 0, 0)
+    with pytest.raises(ValueError):
+        backend.integrate_positions(array("d", [0.0, 1.0]), array("d", [0.0, 1.0]), 0, 0, short, 0)
+    with pytest.raises(ValueError):
+        backend.integrate_rects([pygame.Rect(0, 0, 1, 1)], 0, 0, spec.MOTION_CLAMP)
+    with pytest.raises(ValueError):
+        backend.update_enemy_positions([[0.0, 0.0, 1.0, 1.0, 0.0]], [], 900, 700)
@@ -0,0 +1,98 @@
+"""GC policy: start() / stop() must hand the interpreter's collector back exactly as they found it"""
+
+import argparse
+import gc
+
+import pytest
+
+from gc_policy import GCPolicy, GCPolicyConfig, GC_MODE_AUTO, parse_thresholds
+
+
+@pytest.fixture(autouse=True)
+def restore_gc_state():
+    """These tests change process-global collector state; put it back even when one fails"""
+    was_enabled, thresholds, callbacks = gc.isenabled(), gc.get_threshold(), list(gc.callbacks)
+    yield
+    gc.unfreeze()
+    gc.set_threshold(*thresholds)
+    if was_enabled: gc.enable()
+    else: gc.disable()
+    gc.callbacks[:] = callbacks
+
+
+@pytest.mark.parametrize("enabled_before", [True, False])
+def test_start_and_stop_restore_enabled_and_thresholds(enabled_before):
+    gc.set_threshold(700, 10, 10)
+    if enabled_before: gc.enable()
+    else: gc.disable()
+    policy = GCPolicy(GCPolicyConfig(thresholds=(5000, 20, 50)))
+    policy.start()
+    assert not gc.isenabled()
+    assert gc.get_threshold() == (5000, 20, 50)
+    assert policy._on_gc in gc.callbacks
+    assert policy.frozen_objects == gc.get_freeze_count() > 0
+    policy.start()  # a second start must not overwrite the saved state with the policy's own
+    policy.stop()
+    assert gc.isenabled() == enabled_before
+    assert gc.get_threshold() == (700, 10, 10)
+    assert policy._on_gc not in gc.callbacks
+    policy.stop()
+    assert gc.isenabled() == enabled_before and len(policy.minutes) == 1
+
+
+def test_auto_mode_only_measures():
+    gc.enable(); gc.set_threshold(700, 10, 10)
+    policy = GCPolicy(GCPolicyConfig(mode=GC_MODE_AUTO))
+    policy.start()
+    assert gc.isenabled() and gc.get_threshold() == (700, 10, 10) and gc.get_freeze_count() == 0
+    gc.collect(0)
+    assert policy.pauses_total == 1 and policy.frame_pauses_total == 1
+    policy.collect_if_overdue()
+    assert policy.collections_forced == 0
+    policy.stop()
+    assert gc.isenabled() and gc.get_threshold() == (700, 10, 10)
+
+
+def test_no_freeze_leaves_nothing_frozen():
+    policy = GCPolicy(GCPolicyConfig(freeze=False))
+    policy.start()
+    assert gc.get_freeze_count() == 0 and policy.frozen_objects == 0
+    policy.stop()
+
+
+def test_pending_generation_follows_the_thresholds():
+    policy = GCPolicy(GCPolicyConfig(freeze=False, thresholds=(200, 2, 50)))
+    policy.start()  # collects everything, so every count starts at 0
+    keep = [[] for _ in range(50)]
+    assert policy.pending_generation() is None
+    keep += [[] for _ in range(400)]
+    assert policy.pending_generation() == 0
+    # two young collections reach generation 1's threshold: the next pending collection is generation 1
+    gc.collect(0); gc.collect(0)
+    assert gc.get_count()[1] >= 2
+    keep += [[] for _ in range(400)]
+    assert policy.pending_generation() == 1
+    gc.collect(1)
+    assert policy.pending_generation() is None
+    policy.stop()
+    assert len(keep) == 850
+
+
+def test_idle_collection_only_runs_when_it_fits():
+    policy = GCPolicy(GCPolicyConfig(freeze=False, thresholds=(200, 20, 50)))
+    policy.start()
+    keep = [[] for _ in range(400)]
+    assert policy.collect_in_idle(10.0, 10.0) == 10.0  # no idle time left
+    assert policy.pending_generation() == 0 and policy.pauses_total == 0
+    policy.collect_in_idle(10.0, 11.0)
+    assert policy.pending_generation() is None
+    assert policy.pauses_total == 1 and policy.frame_pauses_total == 0
+    policy.stop()
+    assert len(keep) == 400
+
+
+def test_parse_thresholds():
+    assert parse_thresholds("2000,20,50") == (2000, 20, 50)
+    for text in ("2000,20", "0,20,50", "a,b,c"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_thresholds(text)
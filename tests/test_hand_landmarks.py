@@ -0,0 +1,104 @@
+"""Hand landmark arrays and the gesture classifier, on synthetic MediaPipe results"""
+
+import math
+import types
+
+import pytest
+
+from hand_landmarks import (HandLandmarks, GestureClassifier, NUM_HAND_LANDMARKS, THUMB_IP_ID, THUMB_TIP_ID,
+                            INDEX_FINGER_TIP_ID, PINKY_MCP_ID, FINGER_JOINTS, GESTURE_PINCH, GESTURE_OPEN_PALM,
+                            GESTURE_FIST, GESTURE_TWO_FINGER)
+
+WRIST = (0.5, 0.9)
+FINGER_PIPS = ((0.44, 0.7), (0.48, 0.68), (0.52, 0.69), (0.56, 0.72))  # index, middle, ring, pinky
+EXTENDED, CURLED = 1.5, 0.8  # tip-to-wrist / pip-to-wrist
+
+
+def hand_points(tip_ratios=(EXTENDED,) * 4, thumb_tip=(0.34, 0.76)):
+    """21 (x, y, z) points: each fingertip on the wrist -> PIP line at tip_ratio times the PIP distance"""
+    points = [(WRIST[0], WRIST[1], 0.0)] * NUM_HAND_LANDMARKS
+    for (tip_id, pip_id), (pip_x, pip_y), ratio in zip(FINGER_JOINTS, FINGER_PIPS, tip_ratios):
+        points[pip_id] = (pip_x, pip_y, 0.0)
+        points[tip_id] = (WRIST[0] + ratio * (pip_x - WRIST[0]), WRIST[1] + ratio * (pip_y - WRIST[1]), 0.0)
+    points[PINKY_MCP_ID] = (0.56, 0.8, 0.0)
+    points[THUMB_IP_ID] = (0.42, 0.8, 0.0)
+    points[THUMB_TIP_ID] = (thumb_tip[0], thumb_tip[1], -0.02)
+    return points
+
+
+def mediapipe_results(points):
+    landmarks = [types.SimpleNamespace(x=x, y=y, z=z) for x, y, z in points]
+    return types.SimpleNamespace(multi_hand_landmarks=[types.SimpleNamespace(landmark=landmarks)])
+
+
+def hand(**kwargs):
+    return HandLandmarks.from_results(mediapipe_results(hand_points(**kwargs)), 12.5)
+
+
+def test_conversion_to_a_float32_array():
+    points = hand_points()
+    landmarks = HandLandmarks.from_results(mediapipe_results(points + [(9.0, 9.0, 9.0)]), 12.5)
+    assert landmarks.coords.typecode == "f" and len(landmarks.coords) == 3 * NUM_HAND_LANDMARKS
+    assert landmarks.capture_s == 12.5
+    for landmark_id, point in enumerate(points):
+        assert landmarks.point(landmark_id) == pytest.approx(point, abs=1e-6)
+    thumb, index = points[THUMB_TIP_ID], points[INDEX_FINGER_TIP_ID]
+    assert landmarks.distance(THUMB_TIP_ID, INDEX_FINGER_TIP_ID) == pytest.approx(math.dist(thumb, index), abs=1e-6)
+    assert landmarks.distance_2d(THUMB_TIP_ID, INDEX_FINGER_TIP_ID) == pytest.approx(math.dist(thumb[:2], index[:2]), abs=1e-6)
+
+
+@pytest.mark.parametrize("results", [
+    None,
+    types.SimpleNamespace(multi_hand_landmarks=None),
+    types.SimpleNamespace(multi_hand_landmarks=[]),
+    mediapipe_results(hand_points()[:NUM_HAND_LANDMARKS - 1]),
+])
+def test_no_complete_hand_gives_none(results):
+    assert HandLandmarks.from_results(results, 0.0) is None
+
+
+@pytest.mark.parametrize("tip_ratios, gesture", [
+    ((EXTENDED,) * 4, GESTURE_OPEN_PALM),
+    ((CURLED,) * 4, GESTURE_FIST),
+    ((EXTENDED, EXTENDED, CURLED, CURLED), GESTURE_TWO_FINGER),
+    ((EXTENDED, CURLED, CURLED, CURLED), None),                 # pointing
+    ((EXTENDED, EXTENDED, EXTENDED, CURLED), None),
+])
+def test_classify(tip_ratios, gesture):
+    assert GestureClassifier().classify(hand(tip_ratios=tip_ratios), False) == gesture
+
+
+def test_pinch_wins_over_the_hand_shape():
+    classifier = GestureClassifier()
+    for tip_ratios in ((EXTENDED,) * 4, (CURLED,) * 4):
+        assert classifier.classify(hand(tip_ratios=tip_ratios), True) == GESTURE_PINCH
+
+
+@pytest.mark.parametrize("ratio, extended", [(1.14, False), (1.16, True)])
+def test_extension_ratio_threshold(ratio, extended):
+    classifier = GestureClassifier(extension_ratio=1.15)
+    assert classifier.extended_fingers(hand(tip_ratios=(ratio,) * 4)) == (extended,) * 4
+    assert classifier.classify(hand(tip_ratios=(ratio,) * 4), False) == (GESTURE_OPEN_PALM if extended else GESTURE_FIST)
+
+
+@pytest.mark.parametrize("thumb_tip, gesture", [
+    ((0.415, 0.8), GESTURE_OPEN_PALM),   # just further from the pinky knuckle than the thumb IP joint
+    ((0.425, 0.8), None),                # just closer: a flat hand with the thumb tucked in is not a palm
+])
+def test_open_palm_needs_the_thumb_out(thumb_tip, gesture):
+    assert GestureClassifier().classify(hand(thumb_tip=thumb_tip), False) == gesture
+
+
+def test_new_gestures_are_debounced_but_pinch_is_immediate():
+    classifier = GestureClassifier(hold_frames=3)
+    palm, fist = hand(), hand(tip_ratios=(CURLED,) * 4)
+    assert [classifier.update(palm, False) for _ in range(3)] == [None, None, GESTURE_OPEN_PALM]
+    # a one-frame flicker to another shape does not change the gesture...
+    assert classifier.update(fist, False) == GESTURE_OPEN_PALM
+    assert classifier.update(palm, False) == GESTURE_OPEN_PALM
+    # ...and the flicker's count does not carry over
+    assert [classifier.update(fist, False) for _ in range(3)] == [GESTURE_OPEN_PALM, GESTURE_OPEN_PALM, GESTURE_FIST]
+    assert classifier.update(fist, True) == GESTURE_PINCH
+    classifier.reset()
+    assert classifier.gesture is None and classifier.update(fist, False) is None
+
@@ -0,0 +1,121 @@
+"""Camera -> playfield transforms, the calibration recorder and input profiles"""
+
+import json
+import random
+
+import pytest
+
+from input_calibration import (InputTransform, CalibrationRecorder, DEFAULT_INPUT_TRANSFORM, CALIBRATION_TARGETS,
+                               PROFILE_VERSION, save_profile, load_profile)
+
+
+def old_map_value(value, in_min, in_max, out_min, out_max):
+    """The fixed-range mapping the default transform replaces"""
+    return (value - in_min) * (out_max - out_min) / (in_max - in_min) + out_min
+
+
+def tilted_camera_point(u, v):
+    """A player whose reach is small, off-centre and seen at an angle: unit playfield -> camera"""
+    w = 1.0 + 0.1 * v
+    return (0.3 + 0.4 * u + 0.05 * v) / w, (0.25 + 0.35 * v + 0.02 * u) / w
+
+
+def record(recorder, points, samples_per_point=20, jitter=0.002, seed=3):
+    rng = random.Random(seed)
+    for x, y in points:
+        for _ in range(samples_per_point):
+            recorder.add(x + rng.uniform(-jitter, jitter), y + rng.uniform(-jitter, jitter))
+
+
+def test_homography_maps_the_four_corners_to_the_targets():
+    camera_points = [tilted_camera_point(u, v) for u, v in CALIBRATION_TARGETS]
+    transform = InputTransform.from_point_pairs(camera_points, CALIBRATION_TARGETS)
+    assert not transform.is_affine
+    for (x, y), (u, v) in zip(camera_points, CALIBRATION_TARGETS):
+        assert transform.apply(x, y) == pytest.approx((u, v), abs=1e-9)
+    # a projective model of the camera is recovered everywhere, not just at the corners
+    for u, v in ((0.5, 0.5), (0.0, 0.0), (1.0, 1.0), (0.25, 0.7)):
+        assert transform.apply(*tilted_camera_point(u, v)) == pytest.approx((u, v), abs=1e-9)
+
+
+def test_recorder_takes_the_median_of_a_steady_hold():
+    recorder = CalibrationRecorder()
+    camera_points = [tilted_camera_point(u, v) for u, v in CALIBRATION_TARGETS]
+    record(recorder, camera_points)
+    assert recorder.done and recorder.current_target is None
+    for measured, expected in zip(recorder.camera_points, camera_points):
+        assert measured == pytest.approx(expected, abs=0.002)
+    transform = recorder.transform()
+    assert transform.apply(*tilted_camera_point(0.5, 0.5)) == pytest.approx((0.5, 0.5), abs=0.01)
+
+
+def test_recorder_restarts_the_hold_when_the_hand_moves():
+    recorder = CalibrationRecorder(hold_frames=10, hold_radius=0.015)
+    for _ in range(9): recorder.add(0.3, 0.3)
+    assert recorder.hold_progress() == pytest.approx(0.9)
+    assert not recorder.add(0.5, 0.5)  # jumped away: the hold starts over from this sample
+    assert recorder.hold_progress() == pytest.approx(0.1)
+    assert recorder.camera_points == []
+    for _ in range(8): recorder.add(0.5, 0.5)
+    assert recorder.add(0.5, 0.5)
+    assert recorder.camera_points == [(0.5, 0.5)] and recorder.current_target == CALIBRATION_TARGETS[1]
+    recorder.add(0.6, 0.3); recorder.reset_hold()
+    assert recorder.hold_progress() == 0.0
+
+
+def test_default_transform_matches_the_old_fixed_ranges():
+    from game_session import GameSession, SCREEN_WIDTH, PLAYER_PLAYABLE_Y_MIN, PLAYER_PLAYABLE_Y_MAX
+    assert DEFAULT_INPUT_TRANSFORM.is_affine
+    playfield = GameSession().input_transform
+    rng = random.Random(1)
+    for _ in range(1000):
+        x, y = rng.random(), rng.random()
+        expected = (old_map_value(x, 0.12, 0.88, 0, SCREEN_WIDTH), old_map_value(y, 0.2, 0.8, PLAYER_PLAYABLE_Y_MIN, PLAYER_PLAYABLE_Y_MAX))
+        assert playfield.apply(x, y) == pytest.approx(expected, abs=1e-9)
+
+
+def test_then_composes_in_order():
+    scale = InputTransform.to_rect(0, 2, 0, 2)
+    shift = InputTransform((1, 0, 5, 0, 1, -1, 0, 0, 1))
+    assert scale.then(shift).apply(1.0, 1.0) == pytest.approx((7.0, 1.0))
+    assert shift.then(scale).apply(1.0, 1.0) == pytest.approx((12.0, 0.0))
+
+
+@pytest.mark.parametrize("camera_points", [
+    [(0.5, 0.5), (0.51, 0.5), (0.51, 0.51), (0.5, 0.51)],             # too small to steer with
+    [(0.2, 0.5), (0.4, 0.5), (0.6, 0.5), (0.8, 0.5)],                 # collinear
+    [(0.7, 0.3), (0.3, 0.3), (0.3, 0.7), (0.7, 0.7)],                 # mirrored: left and right swapped
+])
+def test_degenerate_or_mirrored_corners_are_rejected(camera_points):
+    recorder = CalibrationRecorder()
+    record(recorder, camera_points, jitter=0.0)
+    assert recorder.done
+    with pytest.raises(ValueError):
+        recorder.transform()
+
+
+def test_unfinished_calibration_is_rejected():
+    with pytest.raises(ValueError):
+        CalibrationRecorder().transform()
+
+
+def test_profile_round_trip(tmp_path):
+    transform = InputTransform.from_point_pairs([tilted_camera_point(u, v) for u, v in CALIBRATION_TARGETS], CALIBRATION_TARGETS)
+    path = str(tmp_path / "profiles" / "player.json")
+    save_profile(path, transform)
+    assert load_profile(path).matrix == transform.matrix
+    assert load_profile(str(tmp_path / "missing.json")) is None
+
+
+@pytest.mark.parametrize("contents", [
+    "{not json",
+    json.dumps({"version": PROFILE_VERSION + 1, "camera_to_playfield": [1, 0, 0, 0, 1, 0, 0, 0, 1]}),
+    json.dumps({"version": PROFILE_VERSION}),
+    json.dumps({"version": PROFILE_VERSION, "camera_to_playfield": [1, 0, 0]}),
+    json.dumps([1, 2, 3]),
+])
+def test_bad_profiles_raise_value_error(tmp_path, contents):
+    path = tmp_path / "profile.json"
+    path.write_text(contents)
+    with pytest.raises(ValueError):
+        load_profile(str(path))
@@ -0,0 +1,98 @@
+"""Hand input filtering: One-Euro / exponential smoothing, the pinch hysteresis and the dead zone"""
+
+import math
+
+import pytest
+
+from input_filter import (smoothing_factor, ExponentialFilter, OneEuroFilter, PinchHysteresis, HandInputConfig,
+                          HandInputProcessor)
+
+
+def test_pinch_does_not_toggle_between_the_thresholds():
+    pinch = PinchHysteresis(0.034, 0.046)
+    assert not pinch.update(0.05)
+    # hovering between press and release never presses...
+    for distance in (0.045, 0.035, 0.040, 0.0341, 0.046):
+        assert not pinch.update(distance)
+    assert pinch.update(0.033)
+    # ...and, once pressed, never releases
+    for distance in (0.040, 0.046, 0.035, 0.0459, 0.020):
+        assert pinch.update(distance)
+    assert not pinch.update(0.047)
+    assert not pinch.update(0.040)
+
+
+def test_pinch_reset_and_bad_thresholds():
+    pinch = PinchHysteresis(0.034, 0.046)
+    assert pinch.update(0.01)
+    pinch.reset()
+    assert not pinch.pinched and not pinch.update(0.040)
+    with pytest.raises(ValueError):
+        PinchHysteresis(0.046, 0.034)
+
+
+def test_exponential_filter_first_sample_reset_and_same_timestamp():
+    ema = ExponentialFilter(0.5)
+    assert ema.filter(1.0, 0.0) == 1.0
+    assert ema.filter(3.0, 0.1) == pytest.approx(2.0)
+    # a fixed alpha has no notion of time: a repeated timestamp is just another sample
+    assert ema.filter(3.0, 0.1) == pytest.approx(2.5)
+    ema.reset()
+    assert ema.value is None
+    assert ema.filter(-4.0, 0.2) == -4.0
+    assert ExponentialFilter(1.0).filter(0.7, 0.0) == 0.7
+
+
+def test_one_euro_same_timestamp_returns_the_previous_value():
+    one_euro = OneEuroFilter()
+    assert one_euro.filter(0.5, 1.0) == 0.5
+    moved = one_euro.filter(0.6, 1.02)
+    assert 0.5 < moved < 0.6
+    derivative = one_euro.derivative
+    # the same camera frame twice (or a clock step backwards) must not divide by zero or move the output
+    assert one_euro.filter(0.9, 1.02) == moved
+    assert one_euro.filter(0.9, 1.01) == moved
+    assert one_euro.derivative == derivative and one_euro.last_t_s == 1.02
+
+
+def test_one_euro_reset_starts_from_the_next_sample():
+    one_euro = OneEuroFilter()
+    for step in range(30): one_euro.filter(0.2 + 0.01 * step, step / 30)
+    one_euro.reset()
+    assert one_euro.value is None and one_euro.derivative == 0.0
+    # no glide in from the old position, even with an earlier timestamp than before the reset
+    assert one_euro.filter(0.9, 0.5) == 0.9
+    assert 0.9 < one_euro.filter(0.95, 0.55) < 0.95
+
+
+def test_one_euro_smooths_jitter_but_follows_fast_moves():
+    still, moving = OneEuroFilter(), OneEuroFilter()
+    for step in range(60):
+        t_s = step / 60
+        still_out = still.filter(0.5 + (0.005 if step % 2 else -0.005), t_s)
+        moving_out = moving.filter(0.1 + 0.8 * t_s, t_s)
+    assert abs(still_out - 0.5) < 0.002
+    assert abs(moving_out - (0.1 + 0.8 * 59 / 60)) < 0.05
+    assert smoothing_factor(1 / 60, 1.0) < smoothing_factor(1 / 60, 10.0) < 1.0
+
+
+def test_dead_zone_holds_inside_its_radius_and_releases_outside():
+    processor = HandInputProcessor(HandInputConfig(mode="none", dead_zone=0.01))
+    assert processor.process(0.5, 0.5, 0.1, 0.0)[:2] == (0.5, 0.5)
+    # small moves around the held point stay on it, even when they add up past the radius along different axes
+    for t_idx, (x, y) in enumerate(((0.505, 0.5), (0.5, 0.507), (0.495, 0.495), (0.507, 0.507)), start=1):
+        assert processor.process(x, y, 0.1, t_idx / 30)[:2] == (0.5, 0.5)
+    # leaving the radius moves the output to the new position, which is then held
+    assert processor.process(0.52, 0.5, 0.1, 0.2)[:2] == (0.52, 0.5)
+    assert processor.process(0.515, 0.505, 0.1, 0.25)[:2] == (0.52, 0.5)
+    assert math.hypot(0.515 - 0.52, 0.505 - 0.5) < 0.01
+
+
+def test_processor_reset_drops_the_held_position_and_pinch():
+    processor = HandInputProcessor(HandInputConfig(mode="ema"))
+    processor.process(0.2, 0.2, 0.01, 0.0)
+    assert processor.pinch.pinched
+    processor.reset()
+    assert processor.process(0.8, 0.7, 0.040, 0.1) == (0.8, 0.7, False)
+    with pytest.raises(ValueError):
+        HandInputProcessor(HandInputConfig(mode="kalman"))
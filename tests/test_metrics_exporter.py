@@ -0,0 +1,90 @@
+"""Metrics exporter: Prometheus text rendering, the textfile / history writes and their failures"""
+
+import os
+import types
+
+from metrics_exporter import MetricsRegistry, MetricsExporter, RotatingTextLog, write_text_atomically, format_labels
+
+
+def stub_session():
+    """Just the attributes _publish reads"""
+    return types.SimpleNamespace(all_enemies_list=[1, 2], player_bullets_list=[], enemy_bullets_master_list=[1],
+                                 boss_bullets_master_list=[], power_ups_list=[], active_explosions_list=[],
+                                 budget=None, clock=None, phase_timings=None)
+
+
+def publish(exporter, session, frames=3):
+    for _ in range(frames):
+        exporter.begin_frame(session)
+        exporter.end_frame(session)
+    exporter._publish(session, None, exporter._window_start_s + 1.0)
+
+
+def test_registry_renders_help_type_and_sorted_labels():
+    registry = MetricsRegistry()
+    registry.declare("entities", "gauge", "Live entities per kind")
+    registry.declare("frames_total", "counter", "Frames run since start")
+    registry.declare("unused", "gauge", "Never set, never rendered")
+    registry.set("frames_total", 42)
+    registry.set("entities", 7, (("kind", "enemy"),))
+    registry.set("entities", 0.125, (("kind", "boss_bullet"),))
+    assert registry.render() == (
+        "# HELP finger_shooter_entities Live entities per kind\n"
+        "# TYPE finger_shooter_entities gauge\n"
+        'finger_shooter_entities{kind="boss_bullet"} 0.125\n'
+        'finger_shooter_entities{kind="enemy"} 7\n'
+        "# HELP finger_shooter_frames_total Frames run since start\n"
+        "# TYPE finger_shooter_frames_total counter\n"
+        "finger_shooter_frames_total 42\n")
+    # history samples: no metadata, a timestamp on every line
+    assert registry.render(1700000000000).splitlines()[-1] == "finger_shooter_frames_total 42 1700000000000"
+    assert format_labels(()) == ""
+
+
+def test_atomic_write_replaces_the_file_and_leaves_no_temp(tmp_path):
+    path = str(tmp_path / "metrics" / "finger_shooter.prom")
+    write_text_atomically(path, "first\n")
+    write_text_atomically(path, "second\n")
+    with open(path) as metrics_file:
+        assert metrics_file.read() == "second\n"
+    assert os.listdir(tmp_path / "metrics") == ["finger_shooter.prom"]
+
+
+def test_history_rotates_to_numbered_backups(tmp_path):
+    path = str(tmp_path / "history.prom")
+    history = RotatingTextLog(path, max_bytes=100, backups=2)
+    for sample_idx in range(8):
+        history.append(f"sample {sample_idx} " + "x" * 30 + "\n")  # 41 bytes: two samples per file
+    assert sorted(os.listdir(tmp_path)) == ["history.prom", "history.prom.1", "history.prom.2"]
+    with open(path) as current, open(path + ".1") as previous, open(path + ".2") as oldest:
+        assert [line.split()[1] for line in current] == ["6", "7"]
+        assert [line.split()[1] for line in previous] == ["4", "5"]
+        assert [line.split()[1] for line in oldest] == ["2", "3"]
+    for path_name in os.listdir(tmp_path):
+        assert os.path.getsize(tmp_path / path_name) <= 100
+
+
+def test_publish_writes_textfile_and_history(tmp_path):
+    textfile, history = str(tmp_path / "finger_shooter.prom"), str(tmp_path / "history.prom")
+    exporter = MetricsExporter(textfile, history)
+    session = stub_session()
+    publish(exporter, session)
+    with open(textfile) as metrics_file:
+        text = metrics_file.read()
+    assert "finger_shooter_frames_total 3\n" in text
+    assert 'finger_shooter_entities{kind="enemy"} 2\n' in text
+    with open(history) as history_file:
+        assert "finger_shooter_frames_total 3 " in history_file.read()
+    assert not exporter.write_failures
+
+
+def test_write_failures_are_counted_not_raised(tmp_path):
+    blocker = tmp_path / "not_a_directory"
+    blocker.write_text("")
+    exporter = MetricsExporter(str(blocker / "finger_shooter.prom"), str(tmp_path / "history" / "history.prom"))
+    os.rmdir(tmp_path / "history")  # the history directory disappears after start-up
+    session = stub_session()
+    publish(exporter, session)
+    publish(exporter, session)
+    assert exporter.write_failures == {"textfile": 2, "history": 2}
+    assert 'finger_shooter_metrics_write_failures_total{target="textfile"} 1\n' in exporter.registry.render()
@@ -0,0 +1,94 @@
+"""Render scale: letterboxing and the scaled canvas's blit / blits agreeing pixel for pixel"""
+
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from render_scale import (ScaledCanvas, ScaledDisplay, RENDER_SCALE_NATIVE, letterbox_rect, scaled_pixel,
+                          parse_render_scale, parse_window_size)
+
+LOGICAL_SIZE = (900, 700)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    pygame.display.init()
+    pygame.display.set_mode((64, 64))  # convert() needs a display mode
+    yield
+
+
+def sprite(color=(255, 0, 0)):
+    surface = pygame.Surface((10, 6))
+    surface.fill(color)
+    return surface
+
+
+@pytest.mark.parametrize("value, scale, pixel", [
+    (1, 0.5, 1), (3, 0.5, 2), (5, 0.5, 3),          # .5 rounds up, never to even
+    (-1, 0.5, 0), (-3, 0.5, -1), (-4, 0.5, -2),     # negative: still half up
+    (7.2, 1.0, 7), (7.7, 1.0, 8), (450, 2.0, 900),
+])
+def test_scaled_pixel_rounds_half_up(value, scale, pixel):
+    assert scaled_pixel(value, scale) == pixel
+
+
+@pytest.mark.parametrize("scale", [0.5, 0.75, 1.5])
+def test_blits_lands_where_blit_does(scale):
+    destinations = [(1, 1), (3, 5), (-3, -5), (-1, 7), (101, 203.5), (-9, 11), (0.5, -0.5)]
+    red, blue = sprite((255, 0, 0)), sprite((0, 0, 255))
+    by_blit, by_blits, by_slow_path = (ScaledCanvas((120, 240), scale) for _ in range(3))
+    for canvas in (by_blit, by_blits, by_slow_path): canvas.fill((0, 0, 0))
+    for dest_idx, dest in enumerate(destinations):
+        by_blit.blit(red if dest_idx % 2 else blue, dest)
+    by_blits.scaled_for(red); by_blits.scaled_for(blue)  # cached sprites: the batched fast path
+    by_blits.blits([(red if dest_idx % 2 else blue, dest) for dest_idx, dest in enumerate(destinations)])
+    # an area blit in the batch takes the per-item path
+    by_slow_path.blits([(red if dest_idx % 2 else blue, dest) for dest_idx, dest in enumerate(destinations)] +
+                       [(red, (50, 50), (0, 0, 0, 0))])
+    expected = pygame.image.tobytes(by_blit.surface, "RGB")
+    assert pygame.image.tobytes(by_blits.surface, "RGB") == expected
+    assert pygame.image.tobytes(by_slow_path.surface, "RGB") == expected
+
+
+@pytest.mark.parametrize("window_size, letterbox", [
+    ((900, 700), (0, 0, 900, 700)),
+    ((1800, 1400), (0, 0, 1800, 1400)),
+    ((1920, 1080), (266, 0, 1388, 1080)),     # wider: bars left and right
+    ((900, 1000), (0, 150, 900, 700)),        # taller: bars above and below
+])
+def test_letterbox_keeps_the_aspect_ratio_centred(window_size, letterbox):
+    assert letterbox_rect(LOGICAL_SIZE, window_size) == pygame.Rect(letterbox)
+
+
+def test_display_targets():
+    # the classic window draws straight to the display
+    classic = ScaledDisplay((900, 700), LOGICAL_SIZE)
+    assert classic.target is classic.window and classic.internal_size == (900, 700)
+    # a bigger window at scale 1: logical frame, scaled once at present
+    big = ScaledDisplay((1920, 1080), LOGICAL_SIZE, 1.0)
+    assert isinstance(big.target, pygame.Surface) and big.internal_size == LOGICAL_SIZE
+    big.target.fill((255, 255, 255))
+    big.present()
+    assert big.window.get_at((0, 540))[:3] == (0, 0, 0)               # letterbox bar
+    assert big.window.get_at((960, 540))[:3] == (255, 255, 255)
+    # native: the internal resolution matches the letterbox
+    native = ScaledDisplay((1920, 1080), LOGICAL_SIZE, RENDER_SCALE_NATIVE)
+    assert isinstance(native.target, ScaledCanvas) and native.internal_size == (1388, 1080)
+    assert native.target.get_size() == LOGICAL_SIZE
+    half = ScaledDisplay((1920, 1080), LOGICAL_SIZE, 0.5)
+    assert half.internal_size == (450, 350)
+    half.target.fill((0, 255, 0))
+    half.present()
+    assert half.window.get_at((960, 540))[:3] == (0, 255, 0) and half.window.get_at((10, 540))[:3] == (0, 0, 0)
+
+
+def test_option_parsing():
+    assert parse_render_scale("native") is RENDER_SCALE_NATIVE
+    assert parse_render_scale("0.5") == 0.5
+    with pytest.raises(ValueError):
+        parse_render_scale("0")
+    assert parse_window_size("1920x1080") == (1920, 1080)
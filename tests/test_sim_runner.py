@@ -0,0 +1,49 @@
+"""Simulation sweeps: argument validation and a small end-to-end run"""
+
+import csv
+
+import pytest
+
+from sim_runner import parse_sweep_args, build_jobs, run_jobs, write_columnar, SIM_FPS
+
+
+def test_param_grid_and_policies():
+    args, param_grid, policies = parse_sweep_args(["--param", "boss_max_health_base=30,40", "--param", "chaser_aggressiveness=0.4,",
+                                                   "--policies", "sweep, hunter"])
+    assert param_grid == {"boss_max_health_base": [30, 40], "chaser_aggressiveness": [0.4]}
+    assert policies == ["sweep", "hunter"]
+    assert len(build_jobs(param_grid, [1, 2, 3], policies, 10)) == 2 * 1 * 2 * 3
+
+
+@pytest.mark.parametrize("argv, message", [
+    (["--param", "boss_max_health_base="], "no values given"),
+    (["--param", "boss_max_health_base"], "no values given"),
+    (["--param", "boss_max_health_base=, ,"], "no values given"),
+    (["--param", "boss_max_health_base=30,lots"], "values must be numbers"),
+    (["--param", "no_such_field=1"], "unknown SessionConfig field"),
+    (["--param", "seed=1,2"], "unknown SessionConfig field"),
+    (["--policies", "sweep,teleport"], "unknown policy"),
+    (["--policies", ","], "no policy given"),
+    (["--seeds", "0"], "--seeds must be at least 1"),
+    (["--max-seconds", "0"], "--max-seconds must cover at least one frame"),
+])
+def test_bad_arguments_are_usage_errors(capsys, argv, message):
+    with pytest.raises(SystemExit) as exit_info:
+        parse_sweep_args(argv)
+    assert exit_info.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+def test_small_sweep_writes_csv(tmp_path):
+    jobs = build_jobs({"enemy_spawn_rate_initial": [45, 85]}, [7], ["sweep", "idle"], 2 * SIM_FPS)
+    results = run_jobs(jobs, workers=1, progress=False)
+    assert [result["job_id"] for result in results] == [0, 1, 2, 3]
+    assert all(len(result["score_curve"]) == 2 for result in results)
+    out_path = str(tmp_path / "sweep.csv")
+    write_columnar(results, out_path)
+    with open(out_path, newline="") as csv_file:
+        rows = list(csv.DictReader(csv_file))
+    assert [row["enemy_spawn_rate_initial"] for row in rows] == ["45", "45", "85", "85"]
+    assert "score_at_2s" in rows[0]
+    with pytest.raises(ValueError):
+        write_columnar([], out_path)
@@ -0,0 +1,91 @@
+"""World snapshots: a restored session must continue exactly like the one it was captured from"""
+
+import math
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from game_session import GameSession, SessionConfig, FrameInput, FixedStepClock
+from input_calibration import InputTransform, CALIBRATION_TARGETS
+from world_snapshot import (capture_snapshot, restore_snapshot, session_from_snapshot, save_snapshot, load_snapshot,
+                            snapshot_frame_index, SnapshotRing)
+
+
+def sweep_input(frame_idx):
+    """The stress / sim_runner sweep: figure-eight across the playfield, always shooting"""
+    t = frame_idx * 0.02
+    return FrameInput(False, False, 0.5 + 0.38 * math.sin(t * 1.3), 0.5 + 0.3 * math.sin(t * 0.7), frame_idx % 3 != 0)
+
+
+def new_session(seed, boss):
+    session = GameSession(SessionConfig(seed=seed), FixedStepClock())
+    session.start_game()
+    if boss: session.start_boss_fight()
+    return session
+
+
+def run(session, first_frame, num_frames):
+    for frame_idx in range(first_frame, first_frame + num_frames):
+        session.step(sweep_input(frame_idx))
+
+
+@pytest.mark.parametrize("seed, boss", [(7, False), (2024, False), (11, True)])
+def test_restored_session_continues_identically(tmp_path, seed, boss):
+    warmup_frames, continue_frames = 400, 300
+    uninterrupted = new_session(seed, boss)
+    run(uninterrupted, 0, warmup_frames)
+    data = capture_snapshot(uninterrupted, sweep_input(warmup_frames), frame_index=warmup_frames)
+
+    # through the file format, into a session that never ran
+    path = str(tmp_path / "frame.fsws")
+    save_snapshot(path, data)
+    restored, frame_input = session_from_snapshot(load_snapshot(path))
+    assert snapshot_frame_index(data) == warmup_frames
+    assert frame_input.pinched == sweep_input(warmup_frames).pinched
+    assert capture_snapshot(restored, frame_input, frame_index=warmup_frames) == data
+
+    run(uninterrupted, warmup_frames, continue_frames)
+    run(restored, warmup_frames, continue_frames)
+    assert restored.entity_count() == uninterrupted.entity_count()
+    assert restored.current_game_state == uninterrupted.current_game_state
+    assert capture_snapshot(restored) == capture_snapshot(uninterrupted)
+
+
+def test_snapshot_keeps_the_input_calibration(tmp_path):
+    # a small, tilted reach: the same fingertip lands somewhere else than with the default mapping
+    camera_points = ((0.35, 0.3), (0.62, 0.28), (0.66, 0.6), (0.3, 0.58))
+    calibrated = new_session(19, False)
+    calibrated.set_input_transform(InputTransform.from_point_pairs(camera_points, CALIBRATION_TARGETS))
+    run(calibrated, 0, 120)
+    data = capture_snapshot(calibrated, sweep_input(120), frame_index=120)
+    path = str(tmp_path / "calibrated.fsws")
+    save_snapshot(path, data)
+    restored, frame_input = session_from_snapshot(load_snapshot(path))
+    assert restored.input_transform.matrix == calibrated.input_transform.matrix
+    assert restored.input_transform.matrix != GameSession().input_transform.matrix
+
+    run(calibrated, 120, 200)
+    run(restored, 120, 200)
+    assert restored.player_rect.topleft == calibrated.player_rect.topleft
+    assert capture_snapshot(restored) == capture_snapshot(calibrated)
+
+
+def test_ring_rewind_replays_the_same_frames():
+    session = new_session(5, False)
+    ring = SnapshotRing(capacity=120)
+    for frame_idx in range(300):
+        ring.capture(session, sweep_input(frame_idx))
+        session.step(sweep_input(frame_idx))
+    reference = capture_snapshot(session)
+    # 0 frames back is the snapshot taken before the last step (frame 299), so 60 back is before frame 239
+    ring.rewind(session, 60)
+    run(session, 239, 61)
+    assert capture_snapshot(session) == reference
+
+
+def test_bad_snapshot_is_rejected():
+    data = capture_snapshot(new_session(1, False))
+    with pytest.raises(ValueError):
+        restore_snapshot(new_session(1, False), b"XXXX" + data[4:])
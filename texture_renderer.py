@@ -0,0 +1,158 @@
+"""
+Texture Renderer - SDL2 Renderer/Texture drawing backend (pygame._sdl2)
+TextureCanvas stands in for the display Surface: the session renderer keeps
+calling fill / blit / blits on it, baked sprites are uploaded once as
+textures, particles and stars are one tinted circle texture each, and HUD
+text is cached as textures per (text, font, colour). SDL picks an accelerated
+driver when one exists and falls back to its software renderer otherwise.
+The window can be any size: the renderer's logical size letterboxes the
+game resolution into it, so the render scale only applies to the surface path.
+
+Run:
+    python airplane.py --renderer texture
+    python bench_render_backends.py
+"""
+
+import collections
+
+import pygame
+
+from render_scale import ScaledDisplay, parse_render_scale, parse_window_size
+
+try:
+    from pygame._sdl2.video import Window, Renderer, Texture
+    TEXTURE_BACKEND_AVAILABLE = True
+except ImportError:
+    TEXTURE_BACKEND_AVAILABLE = False
+
+RENDER_BACKEND_SURFACE = "surface"
+RENDER_BACKEND_TEXTURE = "texture"
+RENDER_BACKENDS = (RENDER_BACKEND_SURFACE, RENDER_BACKEND_TEXTURE)
+
+PARTICLE_TEXTURE_RADIUS = 32
+MAX_SURFACE_TEXTURES = 512  # baked sprites stay well below this; per-frame surfaces (debug labels) get flushed
+MAX_TEXT_TEXTURES = 128
+
+
+class TextureCanvas:
+    """Display target drawn through an SDL2 Renderer; quacks like the display Surface for the session renderer"""
+
+    def __init__(self, window_size, title="", logical_size=None, vsync=False, accelerated=-1, fullscreen=False):
+        self.window = Window(title, size=window_size, fullscreen_desktop=fullscreen)
+        window_size = self.window.size
+        self.renderer = Renderer(self.window, accelerated=accelerated, vsync=vsync)
+        self.size = tuple(logical_size) if logical_size else tuple(window_size)
+        if self.size != tuple(window_size): self.renderer.logical_size = self.size
+        self._surface_textures = {}
+        self._text_textures = collections.OrderedDict()
+        self._circle_textures = {}
+        self._particle_texture = self._bake_circle_texture(PARTICLE_TEXTURE_RADIUS)
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def _bake_circle_texture(self, radius):
+        """White disc; draws tint it through the texture colour / alpha modulation"""
+        circle_surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(circle_surf, (255, 255, 255), (radius, radius), radius)
+        return Texture.from_surface(self.renderer, circle_surf)
+
+    def texture_for(self, surface):
+        texture = self._surface_textures.get(surface)
+        if texture is None:
+            if len(self._surface_textures) >= MAX_SURFACE_TEXTURES: self._surface_textures.clear()
+            texture = self._surface_textures[surface] = Texture.from_surface(self.renderer, surface)
+        return texture
+
+    def fill(self, color):
+        self.renderer.draw_color = (*color[:3], 255)
+        self.renderer.clear()
+
+    def blit(self, surface, dest, area=None):
+        texture = self.texture_for(surface)
+        dest_x, dest_y = dest[0], dest[1]
+        if area is None:
+            texture.draw(dstrect=(dest_x, dest_y, texture.width, texture.height))
+        else:
+            texture.draw(srcrect=area, dstrect=(dest_x, dest_y, area[2], area[3]))
+
+    def blits(self, blit_sequence, doreturn=True):
+        texture_for = self.texture_for
+        for blit_item in blit_sequence:
+            texture = texture_for(blit_item[0])
+            dest_x, dest_y = blit_item[1]
+            if len(blit_item) == 2:
+                texture.draw(dstrect=(dest_x, dest_y, texture.width, texture.height))
+            else:
+                area = blit_item[2]
+                texture.draw(srcrect=area, dstrect=(dest_x, dest_y, area[2], area[3]))
+
+    def draw_circle(self, color, center, radius):
+        texture = self._circle_textures.get(radius)
+        if texture is None: texture = self._circle_textures[radius] = self._bake_circle_texture(radius)
+        texture.color = color[:3]
+        texture.draw(dstrect=(center[0] - radius, center[1] - radius, radius * 2, radius * 2))
+
+    def draw_particle(self, color, alpha, x_pos, y_pos, radius):
+        texture = self._particle_texture
+        texture.color = color
+        texture.alpha = alpha
+        diameter = radius * 2
+        texture.draw(dstrect=(x_pos - radius, y_pos - radius, diameter, diameter))
+
+    def draw_text(self, text, font_obj, color, x_pos, y_pos, center=True):
+        """Like helper_draw_text_on_screen, but each distinct string is rendered and uploaded only once"""
+        text_key = (text, font_obj, tuple(color))
+        texture = self._text_textures.get(text_key)
+        if texture is None:
+            texture = Texture.from_surface(self.renderer, font_obj.render(text, True, color))
+            self._text_textures[text_key] = texture
+            if len(self._text_textures) > MAX_TEXT_TEXTURES: self._text_textures.popitem(last=False)
+        else:
+            self._text_textures.move_to_end(text_key)
+        if center: x_pos -= texture.width // 2
+        texture.draw(dstrect=(x_pos, y_pos, texture.width, texture.height))
+
+    def present(self):
+        self.renderer.present()
+
+    def close(self):
+        self._surface_textures.clear(); self._text_textures.clear(); self._circle_textures.clear()
+        self.window.destroy()
+
+
+def open_display(backend, logical_size, title="", window_size=None, render_scale=1.0, fullscreen=False, vsync=False):
+    """(draw target, present function) for the chosen backend. The target always takes logical coordinates;
+    window_size None = logical size (or the desktop size when fullscreen). vsync applies to the texture backend only."""
+    if backend == RENDER_BACKEND_TEXTURE:
+        if not TEXTURE_BACKEND_AVAILABLE:
+            raise RuntimeError("the texture backend needs pygame 2 built with SDL2 (pygame._sdl2.video)")
+        canvas = TextureCanvas(window_size or logical_size, title, logical_size, vsync, fullscreen=fullscreen)
+        return canvas, canvas.present
+    if backend != RENDER_BACKEND_SURFACE:
+        raise ValueError(f"unknown render backend: {backend}")
+    display = ScaledDisplay(window_size or (None if fullscreen else logical_size), logical_size, render_scale, fullscreen)
+    pygame.display.set_caption(title)
+    return display.target, display.present
+
+
+def add_render_arguments(parser):
+    """--renderer / --window / --render-scale / --fullscreen, on the game's argument parser"""
+    group = parser.add_argument_group("display")
+    group.add_argument("--renderer", choices=RENDER_BACKENDS, default=RENDER_BACKEND_SURFACE,
+                       help="surface: software display Surface, texture: SDL2 Renderer/Texture backend")
+    group.add_argument("--window", type=parse_window_size, default=None, help="window size WIDTHxHEIGHT (default: game resolution)")
+    group.add_argument("--fullscreen", action="store_true", help="fullscreen at the desktop resolution")
+    group.add_argument("--render-scale", type=parse_render_scale, default=1.0,
+                       help="internal resolution as a multiple of the game resolution, or 'native' (surface renderer)")
+
+
+def render_options_from_args(args):
+    """(backend, window_size, render_scale, fullscreen) for open_display"""
+    return args.renderer, args.window, args.render_scale, args.fullscreen
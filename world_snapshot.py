@@ -0,0 +1,411 @@
+"""
+World Snapshot - Compact binary snapshots of a GameSession
+Packs every entity, the boss state machine, timers, power-ups and the RNG
+state into flat struct / array blobs, cheap enough to capture every frame.
+A bounded SnapshotRing keeps the last few seconds for rewind; a snapshot
+dumped to disk can be reloaded into a headless session to re-run and profile
+the exact frame it was taken before.
+
+Run:
+    python airplane.py --dump-slow-frames 25                  (or S in debug mode: dump the current frame)
+    python world_snapshot.py slow_frames/frame_001234.fsws
+    python world_snapshot.py slow_frames/frame_001234.fsws --repeat 200 --profile
+"""
+
+import argparse
+import collections
+import cProfile
+import json
+import itertools
+import math
+import operator
+import os
+import pstats
+import struct
+import time
+from array import array
+
+import pygame
+
+from game_session import (GameSession, SessionConfig, FrameInput, FixedStepClock, EnemyAI, EnemyProjectile, Explosion,
+                          GAME_STATE_INSTRUCTIONS, GAME_STATE_PLAYING, GAME_STATE_LEVEL_UP, GAME_STATE_BOSS_FIGHT,
+                          GAME_STATE_GAME_OVER, GAME_STATE_PAUSED_NO_HAND, POWER_UP_TYPE_SHIELD, POWER_UP_TYPE_MULTI_SHOT,
+                          ENEMY_NORMAL_COLOR, ENEMY_CHASER_COLOR, ENEMY_SHOOTER_COLOR, ENEMY_DODGER_COLOR,
+                          EXPLOSION_COLORS_DEFAULT, enemy_width_std, enemy_height_std)
+from input_calibration import InputTransform
+
+SNAPSHOT_MAGIC = b"FSWS"
+SNAPSHOT_VERSION = 2  # 2: the session's fingertip -> player transform (input calibration)
+SNAPSHOT_EXTENSION = ".fsws"
+SLOW_FRAMES_DIR = "slow_frames"
+
+# Enum tables: strings in the session are stored as their index here
+GAME_STATES = (GAME_STATE_INSTRUCTIONS, GAME_STATE_PLAYING, GAME_STATE_LEVEL_UP, GAME_STATE_BOSS_FIGHT,
+               GAME_STATE_GAME_OVER, GAME_STATE_PAUSED_NO_HAND)
+BOSS_STATES = ("ENTERING", "PHASE_1_ATTACK", "PHASE_TRANSITION", "PHASE_2_ATTACK")
+POWER_UP_TYPES = (POWER_UP_TYPE_SHIELD, POWER_UP_TYPE_MULTI_SHOT)
+ENEMY_VARIANTS = ("normal", "shooter", "chaser", "dodger")
+ENEMY_VARIANT_COLORS = (ENEMY_NORMAL_COLOR, ENEMY_SHOOTER_COLOR, ENEMY_CHASER_COLOR, ENEMY_DODGER_COLOR)
+ENEMY_AI_STATES = ("ENTERING", "PATROLLING", "CHASING", "AIMING_SHOT", "DODGING")
+
+# GameSession scalars: (attribute, struct code, is an absolute timestamp in ms)
+SESSION_FIELDS = (
+    ("now_ms", "d", True),
+    ("player_lives", "i", False),
+    ("score", "d", False),
+    ("current_level", "i", False),
+    ("score_for_next_level", "d", False),
+    ("level_up_message_end_time_ms", "d", True),
+    ("boss_active", "?", False),
+    ("boss_current_health", "d", False),
+    ("boss_state_timer", "i", False),
+    ("boss_current_phase", "i", False),
+    ("boss_speed_x_current", "d", False),
+    ("boss_base_shoot_cooldown_ms", "d", False),
+    ("boss_last_shot_time_ms", "d", True),
+    ("enemy_spawn_timer", "i", False),
+    ("enemy_spawn_rate_current", "i", False),
+    ("player_invincible_until_ms", "d", True),
+    ("is_player_blinking_invincible", "?", False),
+    ("player_shield_active", "?", False),
+    ("player_shield_end_time_ms", "d", True),
+    ("player_multi_shot_active", "?", False),
+    ("player_multi_shot_end_time_ms", "d", True),
+    ("player_current_shoot_cooldown_ms", "d", False),
+    ("player_last_shot_time_ms", "d", True),
+    ("was_hand_detected_this_frame", "?", False),
+    ("show_debug_info", "?", False),
+)
+# game state, boss state, player x / y, boss x / y, clock ticks, then SESSION_FIELDS
+_SESSION_STRUCT = struct.Struct("<BBiiiid" + "".join(code for _, code, _ in SESSION_FIELDS))
+_FRAME_INPUT_STRUCT = struct.Struct("<???dd")
+_INPUT_TRANSFORM_STRUCT = struct.Struct("<9d")  # session.input_transform: calibration composed with the playfield rectangle
+_HEADER_STRUCT = struct.Struct("<4sHI")  # magic, version, frame index
+_BLOB_LENGTH_STRUCT = struct.Struct("<I")
+
+# EnemyProjectile: x, y, velocity x, velocity y in one float64 array (rect size is fixed)
+_projectile_fields = operator.attrgetter("rect.x", "rect.y", "velocity_x", "velocity_y")
+PROJECTILE_FIELDS = 4
+ENEMY_INT_FIELDS = 16
+ENEMY_FLOAT_FIELDS = 3
+_particle_fields = operator.itemgetter('x', 'y', 'vx', 'vy', 'radius', 'start_radius', 'alpha')
+_particle_color = operator.itemgetter('color')
+PARTICLE_FLOAT_FIELDS = 7
+EXPLOSION_FLOAT_FIELDS = 5
+
+
+def _int_or_float(value):
+    return int(value) if float(value).is_integer() else value
+
+
+def encode_config(config):
+    """SessionConfig as UTF-8 JSON; configs never change mid-session, so callers cache this"""
+    return json.dumps(vars(config), sort_keys=True).encode("utf-8")
+
+
+def capture_snapshot(session, frame_input=None, frame_index=0, config_blob=None):
+    """Pack the session (and the input about to be applied to it) into one bytes object"""
+    player_rect, boss_rect = session.player_rect, session.boss_main_rect
+    clock_ticks_ms = getattr(session.clock, "ticks_ms", session.clock.get_ticks())
+    session_blob = _SESSION_STRUCT.pack(GAME_STATES.index(session.current_game_state), BOSS_STATES.index(session.boss_state),
+                                        player_rect.x, player_rect.y, boss_rect.x, boss_rect.y, clock_ticks_ms,
+                                        *[getattr(session, name) for name, _, _ in SESSION_FIELDS])
+
+    if frame_input is None:
+        frame_input_blob = b""
+    else:
+        frame_input_blob = _FRAME_INPUT_STRUCT.pack(
+            frame_input.hand_frame, frame_input.hand_present, frame_input.pinched,
+            math.nan if frame_input.finger_x_norm is None else frame_input.finger_x_norm,
+            math.nan if frame_input.finger_y_norm is None else frame_input.finger_y_norm)
+
+    input_transform_blob = _INPUT_TRANSFORM_STRUCT.pack(*session.input_transform.matrix)
+
+    # random.Random state: 624 Mersenne Twister words + position, then the cached gauss value
+    _, mt_state, gauss_next = session.rng.getstate()
+    rng_blob = array("I", mt_state).tobytes() + struct.pack("<d", math.nan if gauss_next is None else gauss_next)
+
+    player_bullets = array("i", [v for b_rect in session.player_bullets_list for v in b_rect])
+    # the bulk of a bullet-hell frame: one flat array per list, built without per-item Python calls
+    enemy_bullets = array("d", list(itertools.chain.from_iterable(map(_projectile_fields, session.enemy_bullets_master_list))))
+    boss_bullets = array("d", list(itertools.chain.from_iterable(map(_projectile_fields, session.boss_bullets_master_list))))
+
+    power_ups = array("i")
+    for pu_rect, pu_type in session.power_ups_list:
+        power_ups.extend(pu_rect); power_ups.append(POWER_UP_TYPES.index(pu_type))
+
+    enemy_ints, enemy_floats = array("i"), array("d")
+    for en in session.all_enemies_list:
+        en_rect = en.rect
+        enemy_ints.extend((ENEMY_VARIANTS.index(en.variant), en.player_level_modifier, en_rect.x, en_rect.y,
+                           ENEMY_AI_STATES.index(en.ai_state), en.ai_state_timer_frames, en.shoot_action_cooldown_frames,
+                           en.shoot_action_timer_frames, en.dodge_timer_frames, en.dodge_direction, en.patrol_direction,
+                           en.patrol_range_x[0], en.patrol_range_x[1], en.dodge_cooldown_frames, en.dodge_duration_frames,
+                           en.health_points))
+        enemy_floats.extend((en.current_speed_y, en.current_speed_x, getattr(en, "chase_aggressiveness", 0.0)))
+
+    explosions = array("d", [v for expl in session.active_explosions_list
+                             for v in (expl.center_pos[0], expl.center_pos[1], expl.creation_time, expl.duration, len(expl.particles))])
+    all_particles = [p_data for expl in session.active_explosions_list for p_data in expl.particles]
+    particles = array("d", list(itertools.chain.from_iterable(map(_particle_fields, all_particles))))
+    particle_colors = array("B", list(itertools.chain.from_iterable(map(_particle_color, all_particles))))
+
+    blobs = (config_blob if config_blob is not None else encode_config(session.config), session_blob, frame_input_blob,
+             input_transform_blob, rng_blob,
+             player_bullets.tobytes(), enemy_bullets.tobytes(), boss_bullets.tobytes(), power_ups.tobytes(), enemy_ints.tobytes(), enemy_floats.tobytes(),
+             explosions.tobytes(), particles.tobytes(), particle_colors.tobytes())
+    pack_length = _BLOB_LENGTH_STRUCT.pack
+    return _HEADER_STRUCT.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, frame_index) + b"".join(
+        [part for blob in blobs for part in (pack_length(len(blob)), blob)])
+
+
+def _split_blobs(data):
+    magic, version, frame_index = _HEADER_STRUCT.unpack_from(data, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("not a world snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"unsupported snapshot version {version} (expected {SNAPSHOT_VERSION})")
+    blobs = []
+    offset = _HEADER_STRUCT.size
+    while offset < len(data):
+        (length,) = _BLOB_LENGTH_STRUCT.unpack_from(data, offset)
+        offset += _BLOB_LENGTH_STRUCT.size
+        blobs.append(data[offset:offset + length])
+        offset += length
+    return frame_index, blobs
+
+
+def _typed(typecode, blob):
+    values = array(typecode)
+    values.frombytes(blob)
+    return values
+
+
+def snapshot_frame_index(data):
+    return _HEADER_STRUCT.unpack_from(data, 0)[2]
+
+
+def snapshot_config(data):
+    """The SessionConfig the snapshot was taken with"""
+    _, blobs = _split_blobs(data)
+    return SessionConfig(**json.loads(blobs[0].decode("utf-8")))
+
+
+def restore_snapshot(session, data):
+    """Overwrite the session's world with a snapshot; returns the FrameInput stored with it (or None).
+
+    A FixedStepClock is set back to the snapshot time. Any other clock keeps running, so every
+    absolute timestamp in the world is shifted by (clock now - snapshot time) instead.
+    """
+    _, blobs = _split_blobs(data)
+    (config_blob, session_blob, frame_input_blob, input_transform_blob, rng_blob, player_bullets_blob, enemy_bullets_blob, boss_bullets_blob,
+     power_ups_blob, enemy_ints_blob, enemy_floats_blob, explosions_blob,
+     particles_blob, particle_colors_blob) = blobs
+
+    values = _SESSION_STRUCT.unpack(session_blob)
+    game_state_idx, boss_state_idx, player_x, player_y, boss_x, boss_y, clock_ticks_ms = values[:7]
+    clock = session.clock
+    if isinstance(clock, FixedStepClock):
+        clock.ticks_ms = clock_ticks_ms
+        time_shift_ms = 0
+    else:
+        time_shift_ms = clock.get_ticks() - int(clock_ticks_ms)
+    for (name, code, is_timestamp), value in zip(SESSION_FIELDS, values[7:]):
+        if code == "d": value = _int_or_float(value + time_shift_ms if is_timestamp else value)
+        setattr(session, name, value)
+    session.current_game_state = GAME_STATES[game_state_idx]
+    session.boss_state = BOSS_STATES[boss_state_idx]
+    session.player_rect.topleft = (player_x, player_y)
+    session.boss_main_rect.topleft = (boss_x, boss_y)
+    # a calibrated player's fingertip must land where it did when the snapshot was taken
+    session.input_transform = InputTransform(_INPUT_TRANSFORM_STRUCT.unpack(input_transform_blob))
+
+    mt_state = _typed("I", rng_blob[:-8])
+    (gauss_next,) = struct.unpack("<d", rng_blob[-8:])
+    session.rng.setstate((3, tuple(mt_state), None if math.isnan(gauss_next) else gauss_next))
+
+    rect_values = _typed("i", player_bullets_blob)
+    session.player_bullets_list = [pygame.Rect(rect_values[i:i + 4]) for i in range(0, len(rect_values), 4)]
+
+    for list_name, projectiles_blob in (("enemy_bullets_master_list", enemy_bullets_blob), ("boss_bullets_master_list", boss_bullets_blob)):
+        values = _typed("d", projectiles_blob)
+        setattr(session, list_name, [EnemyProjectile(int(values[i]), int(values[i + 1]), values[i + 2], values[i + 3])
+                                     for i in range(0, len(values), PROJECTILE_FIELDS)])
+
+    pu_values = _typed("i", power_ups_blob)
+    session.power_ups_list = [[pygame.Rect(pu_values[i:i + 4]), POWER_UP_TYPES[pu_values[i + 4]]] for i in range(0, len(pu_values), 5)]
+
+    enemy_ints, enemy_floats = _typed("i", enemy_ints_blob), _typed("d", enemy_floats_blob)
+    enemies = []
+    for en_idx in range(len(enemy_floats) // ENEMY_FLOAT_FIELDS):
+        (variant_idx, level_mod, x_pos, y_pos, ai_state_idx, ai_state_timer, shoot_cooldown, shoot_timer, dodge_timer,
+         dodge_direction, patrol_direction, patrol_min_x, patrol_max_x, dodge_cooldown, dodge_duration,
+         health_points) = enemy_ints[en_idx * ENEMY_INT_FIELDS:(en_idx + 1) * ENEMY_INT_FIELDS]
+        speed_y, speed_x, chase_aggressiveness = enemy_floats[en_idx * ENEMY_FLOAT_FIELDS:(en_idx + 1) * ENEMY_FLOAT_FIELDS]
+        en = EnemyAI.__new__(EnemyAI)  # skip __init__: it would draw from the restored RNG
+        en.session = session
+        en.variant = ENEMY_VARIANTS[variant_idx]
+        en.color_fill = ENEMY_VARIANT_COLORS[variant_idx]
+        en.player_level_modifier = level_mod
+        en.rect = pygame.Rect(x_pos, y_pos, enemy_width_std, enemy_height_std)
+        en.current_speed_y = speed_y
+        en.current_speed_x = speed_x
+        en.ai_state = ENEMY_AI_STATES[ai_state_idx]
+        en.ai_state_timer_frames = ai_state_timer
+        en.shoot_action_cooldown_frames = shoot_cooldown
+        en.shoot_action_timer_frames = shoot_timer
+        en.dodge_timer_frames = dodge_timer
+        en.dodge_direction = dodge_direction
+        en.patrol_direction = patrol_direction
+        en.patrol_range_x = (patrol_min_x, patrol_max_x)
+        en.dodge_cooldown_frames = dodge_cooldown
+        en.dodge_duration_frames = dodge_duration
+        en.health_points = health_points
+        if en.variant == "chaser": en.chase_aggressiveness = chase_aggressiveness
+        enemies.append(en)
+    session.all_enemies_list = enemies
+
+    explosion_values, particle_values = _typed("d", explosions_blob), _typed("d", particles_blob)
+    particle_colors = _typed("B", particle_colors_blob)
+    explosions = []
+    particle_idx = 0
+    for expl_idx in range(0, len(explosion_values), EXPLOSION_FLOAT_FIELDS):
+        center_x, center_y, creation_time, duration, num_particles = explosion_values[expl_idx:expl_idx + EXPLOSION_FLOAT_FIELDS]
+        expl = Explosion.__new__(Explosion)
+        expl.center_pos = (int(center_x), int(center_y))
+        expl.creation_time = _int_or_float(creation_time + time_shift_ms)
+        expl.duration = _int_or_float(duration)
+        expl.colors_to_use = EXPLOSION_COLORS_DEFAULT
+        expl.particle_min_speed, expl.particle_max_speed = 1, 3.5
+        expl.particles = []
+        for _ in range(int(num_particles)):
+            p_x, p_y, p_vx, p_vy, p_radius, p_start_radius, p_alpha = \
+                particle_values[particle_idx * PARTICLE_FLOAT_FIELDS:(particle_idx + 1) * PARTICLE_FLOAT_FIELDS]
+            expl.particles.append({
+                'x': p_x, 'y': p_y, 'vx': p_vx, 'vy': p_vy, 'radius': p_radius,
+                'color': tuple(particle_colors[particle_idx * 3:particle_idx * 3 + 3]), 'alpha': p_alpha, 'start_radius': p_start_radius
+            })
+            particle_idx += 1
+        explosions.append(expl)
+    session.active_explosions_list = explosions
+
+    if not frame_input_blob:
+        return None
+    hand_frame, hand_present, pinched, finger_x_norm, finger_y_norm = _FRAME_INPUT_STRUCT.unpack(frame_input_blob)
+    return FrameInput(hand_frame, hand_present, None if math.isnan(finger_x_norm) else finger_x_norm,
+                      None if math.isnan(finger_y_norm) else finger_y_norm, pinched)
+
+
+def session_from_snapshot(data):
+    """New headless session (FixedStepClock) holding the snapshot's world; returns (session, frame_input)"""
+    session = GameSession(snapshot_config(data), FixedStepClock())
+    frame_input = restore_snapshot(session, data)
+    return session, frame_input
+
+
+def save_snapshot(path, data):
+    directory = os.path.dirname(path)
+    if directory: os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as snapshot_file:
+        snapshot_file.write(data)
+
+
+def load_snapshot(path):
+    with open(path, "rb") as snapshot_file:
+        return snapshot_file.read()
+
+
+class SnapshotRing:
+    """The last `capacity` frame snapshots, oldest dropped first"""
+
+    def __init__(self, capacity=270):
+        self.snapshots = collections.deque(maxlen=capacity)
+        self.frame_index = 0
+        self.last_capture_ms = 0.0
+        self._config = None
+        self._config_blob = None
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def capture(self, session, frame_input=None):
+        """Snapshot the session before this frame's step(frame_input)"""
+        start_s = time.perf_counter()
+        if session.config is not self._config:
+            self._config, self._config_blob = session.config, encode_config(session.config)
+        self.snapshots.append(capture_snapshot(session, frame_input, self.frame_index, self._config_blob))
+        self.frame_index += 1
+        self.last_capture_ms = (time.perf_counter() - start_s) * 1000.0
+
+    def latest(self, frames_back=0):
+        """Snapshot taken frames_back captures ago (clamped to the oldest one kept)"""
+        if not self.snapshots:
+            return None
+        return self.snapshots[max(0, len(self.snapshots) - 1 - frames_back)]
+
+    def rewind(self, session, frames_back):
+        """Restore the session to frames_back captures ago and drop the newer snapshots"""
+        data = self.latest(frames_back)
+        if data is None:
+            return None
+        for _ in range(min(frames_back, len(self.snapshots) - 1)):
+            self.snapshots.pop()
+        return restore_snapshot(session, data)
+
+    def dump(self, path, frames_back=0):
+        data = self.latest(frames_back)
+        if data is not None:
+            save_snapshot(path, data)
+        return data is not None
+
+
+def frame_snapshot_path(frame_index, directory=SLOW_FRAMES_DIR):
+    return os.path.join(directory, f"frame_{frame_index:06d}{SNAPSHOT_EXTENSION}")
+
+
+def add_snapshot_arguments(parser):
+    """--dump-slow-frames / --snapshot-dir, on the game's argument parser"""
+    group = parser.add_argument_group("world snapshots")
+    group.add_argument("--dump-slow-frames", type=float, default=None, metavar="MS",
+                       help="write the snapshot of every frame whose step() takes longer than MS")
+    group.add_argument("--snapshot-dir", default=SLOW_FRAMES_DIR, help="where dumped snapshots go")
+
+
+def replay_frame(data, repeat=1, profile=False, top=25):
+    """Restore the snapshot and re-run its frame `repeat` times; returns the step times in ms"""
+    session, frame_input = session_from_snapshot(data)
+    if frame_input is None:
+        frame_input = FrameInput()
+    profiler = cProfile.Profile() if profile else None
+    step_times_ms = []
+    for _ in range(repeat):
+        restore_snapshot(session, data)
+        start_s = time.perf_counter()
+        if profiler: profiler.enable()
+        session.step(frame_input)
+        if profiler: profiler.disable()
+        step_times_ms.append((time.perf_counter() - start_s) * 1000.0)
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
+    return step_times_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reload a world snapshot and re-run its frame headless")
+    parser.add_argument("snapshot", help=f"{SNAPSHOT_EXTENSION} file written by SnapshotRing.dump")
+    parser.add_argument("--repeat", type=int, default=50, help="times to re-run the frame")
+    parser.add_argument("--profile", action="store_true", help="cProfile the re-runs")
+    args = parser.parse_args()
+
+    data = load_snapshot(args.snapshot)
+    session, _ = session_from_snapshot(data)
+    print(f"Snapshot {args.snapshot}: frame {snapshot_frame_index(data)}, {len(data)} bytes, "
+          f"state {session.current_game_state}, {session.entity_count()} entities")
+    step_times_ms = sorted(replay_frame(data, args.repeat, args.profile))
+    print(f"step(): min {step_times_ms[0]:.3f} ms, median {step_times_ms[len(step_times_ms) // 2]:.3f} ms, "
+          f"max {step_times_ms[-1]:.3f} ms over {len(step_times_ms)} runs")
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    main()